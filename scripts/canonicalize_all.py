@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Canonicalize every (symbol, date) pair in the dates manifest in parallel.
+
+Runs canonicalize_day from canonicalize_binance_um_day.py for each pair in
+config/dates.json on a process pool (one worker per core by default). Days
+whose outputs were built from raw files with the same checksums are
+skipped, and each day's outputs are written atomically, so the driver can
+be re-run after a failure or after downloading more days.
+
+A JSON summary with the status, rows, bytes and duration of every day is
+written to --summary. The exit status is 1 if any day failed.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from canonicalize_binance_um_day import COALESCE_MODES, atomic_output, canonicalize_day
+
+HERE = Path(__file__).parent.absolute()
+REPO_ROOT = HERE.parent
+
+
+def load_dates_manifest(manifest_path: str) -> dict:
+    """Load the dates manifest (see config/dates.json).
+
+    Raises:
+        FileNotFoundError: If manifest file does not exist.
+        json.JSONDecodeError: If manifest is not valid JSON.
+    """
+    path = Path(manifest_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Dates manifest not found: {manifest_path}")
+    with open(path) as f:
+        return json.load(f)
+
+
+def manifest_pairs(manifest: dict, symbols=None, dates=None) -> list:
+    """List the (symbol, date) pairs of a manifest, optionally filtered.
+
+    Symbols are the uppercase keys with list values (BTCUSDT, ETHUSDT).
+    """
+    pairs = []
+    for symbol, symbol_dates in manifest.items():
+        if not (isinstance(symbol_dates, list) and symbol.isupper()):
+            continue
+        if symbols and symbol not in symbols:
+            continue
+        pairs.extend((symbol, date) for date in symbol_dates if not dates or date in dates)
+    return pairs
+
+
+def canonicalize_pair(
+    symbol: str,
+    date: str,
+    force: bool = False,
+    coalesce: str = None,
+) -> dict:
+    """Worker: canonicalize one day, reporting failures in the summary."""
+    start = time.perf_counter()
+    try:
+        return canonicalize_day(date, symbol, force=force, verbose=False, coalesce=coalesce)
+    except Exception as e:
+        return {
+            "symbol": symbol,
+            "date": date,
+            "status": "failed",
+            "error": f"{type(e).__name__}: {e}",
+            "duration_s": round(time.perf_counter() - start, 3),
+        }
+
+
+def canonicalize_all(
+    pairs: list,
+    workers: int = None,
+    force: bool = False,
+    verbose: bool = True,
+    coalesce: str = None,
+) -> dict:
+    """Canonicalize pairs on a process pool.
+
+    Args:
+        pairs: (symbol, date) pairs.
+        workers: Worker processes (one per core if None).
+        force: Rewrite outputs even if up to date.
+        verbose: Print one line per finished day.
+        coalesce: bookTicker coalescing mode (see canonicalize_bookticker).
+
+    Returns:
+        Summary dict with per-status counts, total duration and one entry
+        per day, sorted by symbol and date.
+    """
+    start = time.perf_counter()
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pairs)))
+    days = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(canonicalize_pair, symbol, date, force, coalesce): (symbol, date)
+            for symbol, date in pairs
+        }
+        for future in as_completed(futures):
+            symbol, date = futures[future]
+            try:
+                day = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. killed for memory)
+                day = {"symbol": symbol, "date": date, "status": "failed",
+                       "error": f"{type(e).__name__}: {e}"}
+            days.append(day)
+            if verbose:
+                print(f"  {symbol} {date}: {_describe(day)}")
+
+    days.sort(key=lambda day: (day["symbol"], day["date"]))
+    counts = {status: 0 for status in ("written", "skipped", "failed")}
+    for day in days:
+        counts[day["status"]] += 1
+    return {
+        "workers": workers,
+        "duration_s": round(time.perf_counter() - start, 3),
+        "counts": counts,
+        "days": days,
+    }
+
+
+def _describe(day: dict) -> str:
+    if day["status"] == "failed":
+        return f"FAILED ({day['error']})"
+    outputs = day["outputs"]
+    text = (
+        f"{day['status']} - {outputs['trades']['rows']} trades, "
+        f"{outputs['tob']['rows']} tob rows in {day['duration_s']:.1f}s"
+    )
+    if day["options"]["coalesce"] and outputs["tob"]["reduction_ratio"]:
+        text += f" (tob coalesced {outputs['tob']['reduction_ratio']:.1f}x)"
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Canonicalize all Binance UM days in the dates manifest",
+    )
+    parser.add_argument(
+        "--manifest",
+        default="config/dates.json",
+        help="Path to dates manifest file (default: config/dates.json)",
+    )
+    parser.add_argument(
+        "--symbols",
+        nargs="*",
+        help="Only these symbols (e.g., BTCUSDT ETHUSDT)",
+    )
+    parser.add_argument(
+        "--dates",
+        nargs="*",
+        help="Only these dates (e.g., 2024-01-10 2024-01-11)",
+    )
+    parser.add_argument(
+        "--workers", "-j",
+        type=int,
+        default=None,
+        help="Worker processes (default: one per core)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rewrite outputs even if they are up to date",
+    )
+    parser.add_argument(
+        "--coalesce-tob",
+        choices=[mode for mode in COALESCE_MODES if mode],
+        default=None,
+        help="Coalesce bookTicker updates (see canonicalize_binance_um_day.py)",
+    )
+    parser.add_argument(
+        "--summary",
+        default="outputs/canonicalize_summary.json",
+        help="Where to write the JSON summary (default: outputs/canonicalize_summary.json)",
+    )
+    parser.add_argument(
+        "--quiet", "-q",
+        action="store_true",
+        help="Suppress progress messages",
+    )
+    args = parser.parse_args()
+    verbose = not args.quiet
+
+    try:
+        manifest = load_dates_manifest(args.manifest)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    except json.JSONDecodeError as e:
+        print(f"ERROR: Invalid JSON in manifest: {e}", file=sys.stderr)
+        return 1
+
+    pairs = manifest_pairs(manifest, args.symbols, args.dates)
+    if not pairs:
+        print("ERROR: No (symbol, date) pairs selected", file=sys.stderr)
+        return 1
+
+    if verbose:
+        print(f"Canonicalizing {len(pairs)} days...")
+    summary = canonicalize_all(pairs, args.workers, args.force, verbose, args.coalesce_tob)
+
+    summary_path = Path(args.summary)
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_output(str(summary_path)) as f:
+        json.dump(summary, f, indent=2)
+
+    if verbose:
+        counts = summary["counts"]
+        print()
+        print(
+            f"=== Canonicalization complete: {counts['written']} written, "
+            f"{counts['skipped']} up to date, {counts['failed']} failed "
+            f"in {summary['duration_s']:.1f}s ==="
+        )
+        print(f"Summary: {summary_path}")
+
+    return 1 if summary["counts"]["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
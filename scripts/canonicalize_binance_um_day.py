@@ -1,15 +1,69 @@
 import csv
+import hashlib
+import io
+import json
 import os
+import time
+import zipfile
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from typing import Optional, Tuple
 
 HERE = os.path.dirname(os.path.abspath(__file__))
 
+# Written next to the canonical files; records the sources they were built from
+MANIFEST_NAME = "canonical.json"
+# Bump when the canonical format changes so existing outputs are rebuilt
+CANONICAL_VERSION = 1
+# bookTicker coalescing: None (every update), "timestamp" or "price"
+COALESCE_MODES = (None, "timestamp", "price")
+
 def ms_to_iso(ms: int) -> str:
     dt = datetime.fromtimestamp(ms / 1000.0, tz=timezone.utc)
     return dt.isoformat()
 
-def canonicalize_aggtrades(in_path: str, out_path: str, symbol: str) -> None:
-    with open(in_path, "r", newline="") as f_in, open(out_path, "w", newline="") as f_out:
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    """Compute the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+@contextmanager
+def open_raw(in_path: str):
+    """Open a raw Binance CSV for reading, or the CSV inside a downloaded zip."""
+    if not in_path.endswith(".zip"):
+        with open(in_path, "r", newline="") as f:
+            yield f
+        return
+    with zipfile.ZipFile(in_path) as zf:
+        members = [n for n in zf.namelist() if n.endswith(".csv")]
+        if len(members) != 1:
+            raise ValueError(f"Expected one CSV file in {in_path}, found {len(members)}")
+        with zf.open(members[0]) as raw:
+            yield io.TextIOWrapper(raw, encoding="utf-8", newline="")
+
+@contextmanager
+def atomic_output(out_path: str):
+    """Write to a temp file next to out_path, moved into place on success.
+
+    Readers never see a partially written file, and a failed or interrupted
+    run leaves the previous output untouched.
+    """
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", newline="") as f:
+            yield f
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def canonicalize_aggtrades(in_path: str, out_path: str, symbol: str) -> int:
+    """Write the canonical trades CSV; returns the number of rows written."""
+    rows = 0
+    with open_raw(in_path) as f_in, atomic_output(out_path) as f_out:
         reader = csv.DictReader(f_in)
         fieldnames = ["timestamp", "symbol", "price", "size", "side", "trade_id"]
         writer = csv.DictWriter(f_out, fieldnames=fieldnames)
@@ -28,55 +82,196 @@ def canonicalize_aggtrades(in_path: str, out_path: str, symbol: str) -> None:
                 "side": side,
                 "trade_id": int(row["agg_trade_id"]),
             })
+            rows += 1
+    return rows
 
-def canonicalize_bookticker(in_path: str, out_path: str, symbol: str) -> None:
-    with open(in_path, "r", newline="") as f_in, open(out_path, "w", newline="") as f_out:
+def canonicalize_bookticker(
+    in_path: str,
+    out_path: str,
+    symbol: str,
+    coalesce: Optional[str] = None,
+) -> Tuple[int, int]:
+    """Write the canonical top-of-book CSV.
+
+    With coalesce="timestamp", only the last of consecutive updates sharing
+    an event_time is written; "price" additionally drops updates that leave
+    the bid and ask price unchanged. On event_time-sorted input this matches
+    TobTable.coalesced in the same mode.
+
+    Returns:
+        (rows read, rows written)
+    """
+    if coalesce not in COALESCE_MODES:
+        raise ValueError(f"Unknown coalesce mode: {coalesce!r}")
+    rows_in = rows_out = 0
+    with open_raw(in_path) as f_in, atomic_output(out_path) as f_out:
         reader = csv.DictReader(f_in)
         fieldnames = ["timestamp", "symbol", "bid_price", "bid_size", "ask_price", "ask_size"]
         writer = csv.DictWriter(f_out, fieldnames=fieldnames)
         writer.writeheader()
 
+        pending_ms, pending = None, None
+        last_quote = None
+
+        def flush(out: dict) -> None:
+            nonlocal rows_out, last_quote
+            if coalesce == "price":
+                quote = (out["bid_price"], out["ask_price"])
+                if quote == last_quote:
+                    return
+                last_quote = quote
+            writer.writerow(out)
+            rows_out += 1
+
         for row in reader:
             # Use event_time as the best “when this book update happened”
             ms = int(row["event_time"])
-            writer.writerow({
+            out = {
                 "timestamp": ms_to_iso(ms),
                 "symbol": symbol,
                 "bid_price": float(row["best_bid_price"]),
                 "bid_size": float(row["best_bid_qty"]),
                 "ask_price": float(row["best_ask_price"]),
                 "ask_size": float(row["best_ask_qty"]),
-            })
+            }
+            rows_in += 1
+            if coalesce is None:
+                writer.writerow(out)
+                rows_out += 1
+                continue
+            # A later update at the same event_time supersedes this one
+            if pending is not None and ms != pending_ms:
+                flush(pending)
+            pending_ms, pending = ms, out
+        if pending is not None:
+            flush(pending)
+    return rows_in, rows_out
+
+def find_raw(base: str, symbol: str, data_type: str, date: str) -> str:
+    """Return the extracted raw CSV for a day, or its zip if not extracted.
+
+    Raises:
+        FileNotFoundError: If neither exists.
+    """
+    stem = os.path.join(base, f"{symbol}-{data_type}-{date}")
+    for path in (stem + ".csv", stem + ".zip"):
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"Raw {data_type} file not found: {stem}.csv (or .zip)")
+
+def _read_manifest(path: str):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
 
-def canonicalize_day(date: str, symbol: str = "BTCUSDT") -> None:
+def _is_current(manifest, sources: dict, options: dict, out_dir: str) -> bool:
+    """Check that the outputs in out_dir were built from these exact sources."""
+    if not manifest or manifest.get("version") != CANONICAL_VERSION:
+        return False
+    if manifest.get("sources") != sources or manifest.get("options") != options:
+        return False
+    for output in manifest.get("outputs", {}).values():
+        path = os.path.join(out_dir, output["file"])
+        if not os.path.exists(path) or os.path.getsize(path) != output["bytes"]:
+            return False
+    return True
+
+def canonicalize_day(
+    date: str,
+    symbol: str = "BTCUSDT",
+    force: bool = False,
+    verbose: bool = True,
+    coalesce: Optional[str] = None,
+) -> dict:
     """Canonicalize raw Binance data for a given date.
 
+    Outputs are skipped when ``canonical.json`` shows they were built from
+    raw files with the same SHA-256 checksums and options; otherwise both
+    files are rewritten atomically and the manifest is updated.
+
     Args:
         date: Date in YYYY-MM-DD format
         symbol: Trading pair symbol (default: BTCUSDT)
+        force: Rewrite the outputs even if they are up to date
+        verbose: Print the files written
+        coalesce: bookTicker coalescing mode (see canonicalize_bookticker)
+
+    Returns:
+        Summary dict with the status ("written" or "skipped"), the rows and
+        bytes of each output, the source checksums and the duration. The
+        tob output also records the raw row count and the reduction ratio
+        (raw rows per written row).
     """
+    start = time.perf_counter()
     base = os.path.join(HERE, "..", "data", "binance", "futures_um", symbol)
-    raw_trades = os.path.join(base, f"{symbol}-aggTrades-{date}.csv")
-    raw_tob = os.path.join(base, f"{symbol}-bookTicker-{date}.csv")
-
     # Validate inputs exist
-    if not os.path.exists(raw_trades):
-        raise FileNotFoundError(f"Raw trades file not found: {raw_trades}")
-    if not os.path.exists(raw_tob):
-        raise FileNotFoundError(f"Raw TOB file not found: {raw_tob}")
+    raw_trades = find_raw(base, symbol, "aggTrades", date)
+    raw_tob = find_raw(base, symbol, "bookTicker", date)
 
     out_dir = os.path.join(base, "canonical", date)
     os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+
+    sources = {
+        name: {
+            "file": os.path.basename(path),
+            "bytes": os.path.getsize(path),
+            "sha256": file_sha256(path),
+        }
+        for name, path in (("trades", raw_trades), ("tob", raw_tob))
+    }
+    options = {"coalesce": coalesce}
+    manifest = _read_manifest(manifest_path)
+    if not force and _is_current(manifest, sources, options, out_dir):
+        if verbose:
+            print("Up to date:", out_dir)
+        return dict(
+            manifest,
+            status="skipped",
+            duration_s=round(time.perf_counter() - start, 3),
+        )
 
     out_trades = os.path.join(out_dir, "trades.csv")
     out_tob = os.path.join(out_dir, "tob.csv")
 
-    canonicalize_aggtrades(raw_trades, out_trades, symbol)
-    canonicalize_bookticker(raw_tob, out_tob, symbol)
+    trade_rows = canonicalize_aggtrades(raw_trades, out_trades, symbol)
+    tob_raw_rows, tob_rows = canonicalize_bookticker(raw_tob, out_tob, symbol, coalesce)
+    manifest = {
+        "version": CANONICAL_VERSION,
+        "symbol": symbol,
+        "date": date,
+        "sources": sources,
+        "options": options,
+        "outputs": {
+            "trades": {
+                "file": "trades.csv",
+                "rows": trade_rows,
+                "bytes": os.path.getsize(out_trades),
+            },
+            "tob": {
+                "file": "tob.csv",
+                "rows": tob_rows,
+                "bytes": os.path.getsize(out_tob),
+                "raw_rows": tob_raw_rows,
+                "reduction_ratio": round(tob_raw_rows / tob_rows, 3) if tob_rows else None,
+            },
+        },
+    }
+    # The manifest goes last: a run interrupted before this point is redone
+    with atomic_output(manifest_path) as f:
+        json.dump(manifest, f, indent=2)
 
-    print("Wrote:")
-    print(" -", out_trades)
-    print(" -", out_tob)
+    if verbose:
+        print("Wrote:")
+        print(" -", out_trades)
+        print(" -", out_tob)
+    return dict(
+        manifest,
+        status="written",
+        duration_s=round(time.perf_counter() - start, 3),
+    )
 
 
 if __name__ == "__main__":
@@ -85,6 +280,14 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Canonicalize Binance UM data for a specific date")
     parser.add_argument("--date", required=True, help="Date in YYYY-MM-DD format")
     parser.add_argument("--symbol", default="BTCUSDT", help="Trading pair symbol (default: BTCUSDT)")
+    parser.add_argument("--force", action="store_true", help="Rewrite outputs even if up to date")
+    parser.add_argument(
+        "--coalesce-tob",
+        choices=[mode for mode in COALESCE_MODES if mode],
+        default=None,
+        help="Coalesce bookTicker updates: 'timestamp' keeps the last update per "
+             "event_time, 'price' also drops size-only changes",
+    )
     args = parser.parse_args()
 
-    canonicalize_day(args.date, args.symbol)
+    canonicalize_day(args.date, args.symbol, force=args.force, coalesce=args.coalesce_tob)
@@ -6,20 +6,119 @@ Downloads aggTrades and bookTicker data for a specified symbol and date range.
 URL pattern:
 https://data.binance.vision/data/futures/um/daily/aggTrades/{SYMBOL}/{SYMBOL}-aggTrades-{DATE}.zip
 https://data.binance.vision/data/futures/um/daily/bookTicker/{SYMBOL}/{SYMBOL}-bookTicker-{DATE}.zip
+
+Files are fetched by a bounded thread pool. Each thread keeps its HTTP
+connection alive across files. Downloads go to a ``.part`` file that is
+resumed with a Range request if a previous run was interrupted, and are
+only moved into place once they match the ``.CHECKSUM`` sidecar
+(``<sha256>  <filename>``) that data.binance.vision publishes next to
+every archive. Existing files are checked against the sidecar as well.
 """
 
 import argparse
+import hashlib
+import http.client
+import json
 import os
-import urllib.request
+import re
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
 
 
 HERE = Path(__file__).parent.absolute()
 DATA_DIR = HERE.parent / "data" / "binance" / "futures_um"
 
 BASE_URL = "https://data.binance.vision/data/futures/um/daily"
+DATA_TYPES = ("aggTrades", "bookTicker")
+
+DEFAULT_CONCURRENCY = 4
+PART_SUFFIX = ".part"
+CHECKSUM_SUFFIX = ".CHECKSUM"
+# Attempts per file; interrupted transfers resume from the .part file
+MAX_ATTEMPTS = 3
+BLOCK_SIZE = 1 << 20
+
+
+class DownloadError(Exception):
+    """Raised when a file cannot be downloaded or fails verification."""
+    pass
+
+
+class HTTPSession:
+    """Keep-alive HTTP(S) connections, one per host per thread.
+
+    http.client connections are not thread-safe, so each worker thread
+    reuses its own. A connection that the server closed is reopened once.
+    Every thread's connections are also tracked, so that close() can
+    release them all once the workers are done.
+    """
+
+    def __init__(self, timeout: float = 60.0) -> None:
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._tables: List[dict] = []
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> http.client.HTTPResponse:
+        """Send a GET request and return the response (its body unread).
+
+        The caller must read the body to the end (or close the response)
+        before the next request on this thread.
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        connections = self._connections()
+        for attempt in range(2):
+            conn = connections.get(key)
+            if conn is None:
+                conn_cls = (
+                    http.client.HTTPSConnection if parts.scheme == "https"
+                    else http.client.HTTPConnection
+                )
+                conn = conn_cls(parts.netloc, timeout=self.timeout)
+                connections[key] = conn
+            try:
+                conn.request("GET", path, headers=headers or {})
+                return conn.getresponse()
+            except (http.client.HTTPException, OSError):
+                # Stale keep-alive connection: reconnect once
+                conn.close()
+                del connections[key]
+                if attempt:
+                    raise
+
+    def reset(self) -> None:
+        """Close this thread's connections; the next request reconnects."""
+        connections = self._connections()
+        for conn in connections.values():
+            conn.close()
+        connections.clear()
+
+    def close(self) -> None:
+        """Close the connections of every thread.
+
+        Call once no request is in flight, e.g. after the worker pool exits.
+        """
+        with self._lock:
+            tables = list(self._tables)
+        for connections in tables:
+            for conn in connections.values():
+                conn.close()
+            connections.clear()
+
+    def _connections(self) -> dict:
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+            with self._lock:
+                self._tables.append(connections)
+        return connections
 
 
 def date_range(start_date: str, end_date: str) -> list[str]:
@@ -34,29 +133,136 @@ def date_range(start_date: str, end_date: str) -> list[str]:
     return dates
 
 
-def download_file(url: str, dest: Path) -> bool:
+def file_sha256(path: Path) -> str:
+    """Compute the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fetch_checksum(session: HTTPSession, url: str) -> Optional[str]:
+    """Fetch the expected SHA-256 of url from its .CHECKSUM sidecar.
+
+    Returns:
+        The hex digest, or None if the server has no sidecar for the file.
+
+    Raises:
+        DownloadError: If the sidecar cannot be fetched or parsed.
+    """
+    response = session.get(url + CHECKSUM_SUFFIX)
+    body = response.read()
+    if response.status == 404:
+        return None
+    if response.status != 200:
+        raise DownloadError(f"HTTP {response.status} for {url}{CHECKSUM_SUFFIX}")
+    match = re.match(rb"\s*([0-9a-fA-F]{64})\b", body)
+    if not match:
+        raise DownloadError(f"Malformed checksum file: {url}{CHECKSUM_SUFFIX}")
+    return match.group(1).decode().lower()
+
+
+def download_file(
+    url: str,
+    dest: Path,
+    session: Optional[HTTPSession] = None,
+    verify: bool = True,
+) -> bool:
     """Download a file from URL to destination path.
 
-    Returns True if download succeeded, False if file not found (404).
-    Raises exception for other errors.
+    The body is written to ``<dest>.part``, resuming from its current size
+    if it exists, and moved to dest once complete and verified. An existing
+    dest is kept if it matches the published checksum (or if there is none).
+
+    Args:
+        url: File URL.
+        dest: Destination path.
+        session: Connection pool to use (a new one if None).
+        verify: Check the file against the ``.CHECKSUM`` sidecar.
+
+    Returns:
+        True if the file is in place, False if the server has no such file (404).
+
+    Raises:
+        DownloadError: For other HTTP errors or if the file keeps failing
+            verification.
     """
-    if dest.exists():
-        print(f"  Already exists: {dest.name}")
-        return True
+    if session is None:
+        session = HTTPSession()
+        try:
+            return download_file(url, dest, session, verify)
+        finally:
+            session.close()
+    expected = fetch_checksum(session, url) if verify else None
 
-    try:
-        print(f"  Downloading: {dest.name}")
-        urllib.request.urlretrieve(url, dest)
-        return True
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
+    if dest.exists():
+        if expected is None or file_sha256(dest) == expected:
+            print(f"  Already exists: {dest.name}")
+            return True
+        print(f"  Checksum mismatch, downloading again: {dest.name}")
+        dest.unlink()
+
+    part = dest.with_name(dest.name + PART_SUFFIX)
+    for _ in range(MAX_ATTEMPTS):
+        offset = part.stat().st_size if part.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        response = session.get(url, headers)
+
+        if response.status == 404:
+            response.read()
             print(f"  Not found (404): {dest.name}")
             return False
-        raise
+        if response.status == 416:
+            # Nothing past offset: the part file may already be complete
+            response.read()
+        elif response.status == 206 and _range_start(response) != offset:
+            # Not the range that was asked for: start over
+            response.read()
+            part.unlink()
+            continue
+        elif response.status in (200, 206):
+            resumed = response.status == 206
+            if resumed:
+                print(f"  Resuming: {dest.name} from byte {offset}")
+            else:
+                print(f"  Downloading: {dest.name}")
+            try:
+                with open(part, "ab" if resumed else "wb") as f:
+                    for block in iter(lambda: response.read(BLOCK_SIZE), b""):
+                        f.write(block)
+                if response.length:
+                    raise http.client.IncompleteRead(b"", response.length)
+            except (http.client.HTTPException, OSError) as e:
+                # Keep the part file: the next attempt resumes from it
+                print(f"  Interrupted: {dest.name} ({type(e).__name__})")
+                session.reset()
+                continue
+        else:
+            response.read()
+            raise DownloadError(f"HTTP {response.status} for {url}")
+
+        if expected is not None and file_sha256(part) != expected:
+            print(f"  Checksum mismatch: {dest.name}")
+            part.unlink()
+            continue
+        os.replace(part, dest)
+        return True
+
+    raise DownloadError(f"Giving up on {url} after {MAX_ATTEMPTS} attempts")
+
+
+def _range_start(response: http.client.HTTPResponse) -> Optional[int]:
+    match = re.match(r"bytes (\d+)-", response.getheader("Content-Range", ""))
+    return int(match.group(1)) if match else None
 
 
 def extract_zip(zip_path: Path, dest_dir: Path) -> None:
-    """Extract a zip file to destination directory."""
+    """Extract a zip file to destination directory.
+
+    Members are written to a temp name first, so an interrupted extraction
+    is redone instead of being mistaken for a complete CSV.
+    """
     csv_name = zip_path.stem + ".csv"
     csv_path = dest_dir / csv_name
 
@@ -66,56 +272,158 @@ def extract_zip(zip_path: Path, dest_dir: Path) -> None:
 
     print(f"  Extracting: {zip_path.name}")
     with zipfile.ZipFile(zip_path, 'r') as zf:
-        zf.extractall(dest_dir)
-
-
-def download_day(symbol: str, date: str, keep_zip: bool = True) -> bool:
-    """Download and extract data for a single day.
-
-    Returns True if both aggTrades and bookTicker were downloaded successfully.
+        for member in zf.infolist():
+            if member.is_dir():
+                continue
+            target = dest_dir / Path(member.filename).name
+            tmp_path = target.with_name(target.name + PART_SUFFIX)
+            with zf.open(member) as src, open(tmp_path, "wb") as dst:
+                for block in iter(lambda: src.read(BLOCK_SIZE), b""):
+                    dst.write(block)
+            os.replace(tmp_path, target)
+
+
+def download_one(
+    symbol: str,
+    date: str,
+    data_type: str,
+    session: HTTPSession,
+    keep_zip: bool = True,
+    extract: bool = True,
+    base_url: str = BASE_URL,
+    data_dir: Path = DATA_DIR,
+    verify: bool = True,
+) -> bool:
+    """Download (and optionally extract) one archive.
+
+    Returns True if the archive was downloaded, False if it does not exist.
     """
-    symbol_dir = DATA_DIR / symbol
+    symbol_dir = Path(data_dir) / symbol
     symbol_dir.mkdir(parents=True, exist_ok=True)
+    filename = f"{symbol}-{data_type}-{date}.zip"
+    url = f"{base_url}/{data_type}/{symbol}/{filename}"
+    zip_path = symbol_dir / filename
 
-    success = True
+    if not keep_zip and extract and (symbol_dir / f"{zip_path.stem}.csv").exists():
+        print(f"  Already extracted: {zip_path.stem}.csv")
+        return True
+    if not download_file(url, zip_path, session, verify):
+        return False
+    if extract:
+        extract_zip(zip_path, symbol_dir)
+        if not keep_zip and zip_path.exists():
+            zip_path.unlink()
+    return True
+
+
+def download_day(
+    symbol: str,
+    date: str,
+    keep_zip: bool = True,
+    extract: bool = True,
+    base_url: str = BASE_URL,
+    data_dir: Path = DATA_DIR,
+    verify: bool = True,
+) -> bool:
+    """Download and extract data for a single day.
 
-    for data_type in ["aggTrades", "bookTicker"]:
-        filename = f"{symbol}-{data_type}-{date}.zip"
-        url = f"{BASE_URL}/{data_type}/{symbol}/{filename}"
-        zip_path = symbol_dir / filename
+    With extract=False the zips are kept as downloaded; the pipeline loaders
+    read them directly (see market_forensics.data.binance).
 
-        if download_file(url, zip_path):
-            extract_zip(zip_path, symbol_dir)
-            if not keep_zip and zip_path.exists():
-                zip_path.unlink()
-        else:
-            success = False
-
-    return success
+    Returns True if both aggTrades and bookTicker were downloaded successfully.
+    """
+    session = HTTPSession()
+    try:
+        return all([
+            download_one(symbol, date, data_type, session, keep_zip, extract,
+                         base_url, data_dir, verify)
+            for data_type in DATA_TYPES
+        ])
+    finally:
+        session.close()
+
+
+def download_range(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    keep_zip: bool = True,
+    extract: bool = True,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    base_url: str = BASE_URL,
+    data_dir: Path = DATA_DIR,
+    verify: bool = True,
+) -> list[str]:
+    """Download data for a date range.
 
+    Every (date, data type) archive is a separate job on a pool of
+    ``concurrency`` threads, each reusing its own keep-alive connection.
 
-def download_range(symbol: str, start_date: str, end_date: str, keep_zip: bool = True) -> list[str]:
-    """Download data for a date range.
+    Returns list of dates that were successfully downloaded.
+    """
+    print(f"Downloading {symbol} data from {start_date} to {end_date}")
+    return download_dates(symbol, date_range(start_date, end_date), keep_zip, extract,
+                          concurrency, base_url, data_dir, verify)
+
+
+def download_dates(
+    symbol: str,
+    dates: list[str],
+    keep_zip: bool = True,
+    extract: bool = True,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    base_url: str = BASE_URL,
+    data_dir: Path = DATA_DIR,
+    verify: bool = True,
+) -> list[str]:
+    """Download data for a list of dates (see download_range).
 
     Returns list of dates that were successfully downloaded.
     """
-    dates = date_range(start_date, end_date)
-    successful_dates = []
+    ok = {(date, data_type): False for date in dates for data_type in DATA_TYPES}
 
-    print(f"Downloading {symbol} data from {start_date} to {end_date}")
-    print(f"Total days to process: {len(dates)}")
+    print(f"Total days to process: {len(dates)} ({len(ok)} files, {concurrency} at a time)")
     print()
 
-    for i, date in enumerate(dates, 1):
-        print(f"[{i}/{len(dates)}] {date}")
-        if download_day(symbol, date, keep_zip):
-            successful_dates.append(date)
-        print()
-
+    session = HTTPSession()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = {
+                pool.submit(download_one, symbol, date, data_type, session, keep_zip,
+                            extract, base_url, data_dir, verify): (date, data_type)
+                for date, data_type in ok
+            }
+            for future in as_completed(futures):
+                date, data_type = futures[future]
+                try:
+                    ok[(date, data_type)] = future.result()
+                except (
+                    DownloadError, http.client.HTTPException, OSError, zipfile.BadZipFile,
+                ) as e:
+                    print(f"  Failed: {symbol}-{data_type}-{date} ({e})")
+    finally:
+        session.close()
+
+    successful_dates = [date for date in dates if all(ok[(date, t)] for t in DATA_TYPES)]
+    print()
     print(f"Successfully downloaded {len(successful_dates)}/{len(dates)} days")
     return successful_dates
 
 
+def manifest_dates(manifest_path: str) -> dict:
+    """Read {symbol: dates} from a dates manifest (see config/dates.json).
+
+    Symbols are the uppercase keys with list values.
+    """
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    return {
+        symbol: dates
+        for symbol, dates in manifest.items()
+        if isinstance(dates, list) and symbol.isupper()
+    }
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Download Binance USDT-M futures data"
@@ -127,29 +435,62 @@ def main():
     )
     parser.add_argument(
         "--start-date",
-        required=True,
         help="Start date in YYYY-MM-DD format"
     )
     parser.add_argument(
         "--end-date",
-        required=True,
         help="End date in YYYY-MM-DD format"
     )
+    parser.add_argument(
+        "--manifest",
+        help="Download the (symbol, date) pairs of a dates manifest instead, "
+             "e.g. one written by prescreen_klines.py"
+    )
     parser.add_argument(
         "--delete-zip",
         action="store_true",
         help="Delete zip files after extraction"
     )
+    parser.add_argument(
+        "--no-extract",
+        action="store_true",
+        help="Keep the zips without extracting them (the loaders read zips directly)"
+    )
+    parser.add_argument(
+        "--concurrency", "-j",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Files downloaded at once (default: {DEFAULT_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--no-verify",
+        action="store_true",
+        help="Skip verification against the published .CHECKSUM files"
+    )
+    parser.add_argument(
+        "--base-url",
+        default=BASE_URL,
+        help="Base URL of the daily archives (default: data.binance.vision)"
+    )
 
     args = parser.parse_args()
-
-    successful = download_range(
-        args.symbol,
-        args.start_date,
-        args.end_date,
-        keep_zip=not args.delete_zip
+    options = dict(
+        keep_zip=not args.delete_zip,
+        extract=not args.no_extract,
+        concurrency=args.concurrency,
+        base_url=args.base_url.rstrip("/"),
+        verify=not args.no_verify,
     )
 
+    if args.manifest:
+        successful = []
+        for symbol, dates in manifest_dates(args.manifest).items():
+            successful += download_dates(symbol, dates, **options)
+    elif args.start_date and args.end_date:
+        successful = download_range(args.symbol, args.start_date, args.end_date, **options)
+    else:
+        parser.error("either --manifest or both --start-date and --end-date are required")
+
     if not successful:
         print("No data was downloaded successfully.")
         return 1
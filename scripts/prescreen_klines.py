@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""Prescreen days with 1m klines before downloading tick data.
+
+A day of aggTrades and bookTicker is hundreds of MB, while its 1m kline
+archive is a few tens of KB. A price shock of threshold_pct within
+window_seconds (see market_forensics.events.detector) moves price from the
+first observation in [t - window_seconds, t] to the one at t, so both lie in
+the ceil(window_seconds / 60) + 1 consecutive klines covering that window,
+and the move is at most (max high - min low) / min low of those klines. A
+day where that bound stays below the threshold everywhere cannot contain a
+shock and is left out of the generated dates manifest.
+
+Klines are built from trade prices, while the pipeline detects shocks on
+the bookTicker mid price, which can sit slightly outside the traded range.
+The screen therefore flags windows whose bound reaches
+threshold_pct * (1 - margin).
+
+With event_detection.adaptive_threshold set, the detector's threshold
+follows the realized volatility and never drops below min_threshold_pct
+(nor below the fixed threshold it uses while warming up), so the screen
+runs at the lower of the two.
+
+The output has the layout of config/dates.json, so the download,
+canonicalization and analysis scripts take it as --manifest. It also lists
+the candidate windows of each day (padded by the configured pre/post event
+windows) for range loads (market_forensics.data.time_index). Binance
+archives are single deflate streams, so the download itself cannot be
+limited to those windows with HTTP byte ranges.
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from download_binance_data import (
+    BASE_URL,
+    DATA_DIR,
+    DEFAULT_CONCURRENCY,
+    DownloadError,
+    HTTPSession,
+    date_range,
+    download_file,
+)
+
+from market_forensics.events.detector import AdaptiveThreshold, DetectorError
+
+KLINE_INTERVAL = "1m"
+INTERVAL_SECONDS = 60
+# Fraction of the threshold the kline bound may fall short by (see module docstring)
+DEFAULT_MARGIN = 0.1
+
+
+def kline_path(symbol: str, date: str, data_dir: Path = DATA_DIR) -> Path:
+    """Local path of a day's 1m kline archive."""
+    return Path(data_dir) / symbol / "klines" / f"{symbol}-{KLINE_INTERVAL}-{date}.zip"
+
+
+def load_klines(path: Path) -> list:
+    """Read (open_time_ms, high, low) for every kline in a Binance archive.
+
+    Newer archives start with a header row, older ones do not.
+
+    Returns:
+        Bars sorted by open time.
+    """
+    with zipfile.ZipFile(path) as zf:
+        members = [n for n in zf.namelist() if n.endswith(".csv")]
+        if len(members) != 1:
+            raise ValueError(f"Expected one CSV file in {path}, found {len(members)}")
+        with zf.open(members[0]) as raw:
+            bars = []
+            for row in csv.reader(io.TextIOWrapper(raw, encoding="utf-8", newline="")):
+                if not row or not row[0].isdigit():
+                    continue
+                bars.append((int(row[0]), float(row[2]), float(row[3])))
+    bars.sort()
+    return bars
+
+
+def screen_threshold_pct(event_config: dict) -> float:
+    """Lowest shock threshold the detector can apply under this config.
+
+    Raises:
+        DetectorError: If the adaptive_threshold entry is invalid.
+    """
+    threshold = event_config["price_shock_threshold_pct"]
+    adaptive = AdaptiveThreshold.from_config(event_config)
+    if adaptive is not None:
+        threshold = min(threshold, adaptive.min_threshold_pct)
+    return threshold
+
+
+def screen_klines(
+    bars: list,
+    threshold_pct: float,
+    window_seconds: float,
+    margin: float = DEFAULT_MARGIN,
+    pad_before_seconds: float = 0.0,
+    pad_after_seconds: float = 0.0,
+) -> dict:
+    """Find the windows of a day where a price shock is possible.
+
+    Args:
+        bars: (open_time_ms, high, low) per 1m kline, sorted by open time.
+        threshold_pct: Shock threshold in percent.
+        window_seconds: Shock detection window in seconds.
+        margin: Flag spans whose bound reaches threshold_pct * (1 - margin).
+        pad_before_seconds: Extend each candidate window this far back.
+        pad_after_seconds: Extend each candidate window this far forward.
+
+    Returns:
+        Dict with "max_range_pct" (the largest bound of the day),
+        "candidate_minutes" (number of flagged klines) and "windows"
+        (merged [start_ms, end_ms] candidate windows).
+    """
+    cutoff = threshold_pct * (1 - margin)
+    interval_ms = INTERVAL_SECONDS * 1000
+    window_ms = int(window_seconds * 1000)
+    max_range = 0.0
+    flagged = 0
+    windows = []
+    first = 0
+    for i in range(len(bars)):
+        # A shock seen during kline i started at most window_ms before its
+        # open; klines closing before then cannot hold its reference price
+        while bars[first][0] + interval_ms <= bars[i][0] - window_ms:
+            first += 1
+        low = min(bar[2] for bar in bars[first:i + 1])
+        high = max(bar[1] for bar in bars[first:i + 1])
+        if low <= 0:
+            continue
+        bound = (high - low) / low * 100
+        max_range = max(max_range, bound)
+        if bound < cutoff:
+            continue
+        flagged += 1
+        start = bars[first][0] - int(pad_before_seconds * 1000)
+        end = bars[i][0] + interval_ms + int(pad_after_seconds * 1000)
+        if windows and start <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], end)
+        else:
+            windows.append([start, end])
+    return {
+        "max_range_pct": round(max_range, 4),
+        "candidate_minutes": flagged,
+        "windows": windows,
+    }
+
+
+def prescreen_day(
+    symbol: str,
+    date: str,
+    config: dict,
+    session: HTTPSession,
+    margin: float = DEFAULT_MARGIN,
+    base_url: str = BASE_URL,
+    data_dir: Path = DATA_DIR,
+) -> dict:
+    """Download (if needed) and screen one day's klines.
+
+    Returns:
+        Dict with the symbol, date and status: "candidate", "quiet" or
+        "missing" (no kline archive), plus the screen_klines result.
+    """
+    path = kline_path(symbol, date, data_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    url = f"{base_url}/klines/{symbol}/{KLINE_INTERVAL}/{path.name}"
+    result = {"symbol": symbol, "date": date}
+    if not download_file(url, path, session):
+        return dict(result, status="missing")
+
+    event_config = config["event_detection"]
+    windows_config = config.get("windows", {})
+    screen = screen_klines(
+        load_klines(path),
+        screen_threshold_pct(event_config),
+        event_config["rolling_window_seconds"],
+        margin=margin,
+        pad_before_seconds=windows_config.get("pre_event_seconds", 0),
+        pad_after_seconds=windows_config.get("post_event_seconds", 0),
+    )
+    result.update(screen)
+    result["status"] = "candidate" if screen["windows"] else "quiet"
+    return result
+
+
+def build_manifest(days: list, config: dict, margin: float) -> dict:
+    """Turn prescreen results into a dates manifest.
+
+    Days without klines cannot be ruled out, so they are kept and listed
+    under prescreen.unscreened.
+    """
+    event_config = config["event_detection"]
+    dates = {}
+    unscreened = {}
+    candidates = {}
+    for day in sorted(days, key=lambda day: (day["symbol"], day["date"])):
+        symbol, date = day["symbol"], day["date"]
+        if day["status"] == "quiet":
+            continue
+        dates.setdefault(symbol, []).append(date)
+        if day["status"] == "missing":
+            unscreened.setdefault(symbol, []).append(date)
+            continue
+        candidates.setdefault(symbol, {})[date] = [
+            [_ms_to_iso(start), _ms_to_iso(end)] for start, end in day["windows"]
+        ]
+    return {
+        "description": "Dates flagged by the 1m kline prescreen (scripts/prescreen_klines.py)",
+        "data_source": "Binance USD-M Futures (data.binance.vision)",
+        "data_types": ["aggTrades", "bookTicker"],
+        **dates,
+        "prescreen": {
+            "interval": KLINE_INTERVAL,
+            "threshold_pct": screen_threshold_pct(event_config),
+            "window_seconds": event_config["rolling_window_seconds"],
+            "margin": margin,
+            "screened": sum(1 for day in days if day["status"] != "missing"),
+            "unscreened": unscreened,
+        },
+        "candidates": candidates,
+    }
+
+
+def _ms_to_iso(ms: int) -> str:
+    return datetime.fromtimestamp(ms / 1000.0, tz=timezone.utc).isoformat()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Flag days where a price shock is possible using 1m klines",
+    )
+    parser.add_argument(
+        "--symbols",
+        nargs="+",
+        default=["BTCUSDT"],
+        help="Trading pair symbols (default: BTCUSDT)",
+    )
+    parser.add_argument("--start-date", required=True, help="Start date in YYYY-MM-DD format")
+    parser.add_argument("--end-date", required=True, help="End date in YYYY-MM-DD format")
+    parser.add_argument(
+        "--config",
+        default="config/default.json",
+        help="Pipeline config with the event_detection settings (default: config/default.json)",
+    )
+    parser.add_argument(
+        "--margin",
+        type=float,
+        default=DEFAULT_MARGIN,
+        help=f"Flag windows reaching threshold * (1 - margin) (default: {DEFAULT_MARGIN})",
+    )
+    parser.add_argument(
+        "--output",
+        default="outputs/prescreen_dates.json",
+        help="Where to write the dates manifest (default: outputs/prescreen_dates.json)",
+    )
+    parser.add_argument(
+        "--concurrency", "-j",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Kline files downloaded at once (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=BASE_URL,
+        help="Base URL of the daily archives (default: data.binance.vision)",
+    )
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        config = json.load(f)
+    try:
+        threshold = screen_threshold_pct(config["event_detection"])
+    except DetectorError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    print(f"Screening at {threshold}% over {config['event_detection']['rolling_window_seconds']}s")
+
+    dates = date_range(args.start_date, args.end_date)
+    session = HTTPSession()
+    days = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+            futures = {
+                pool.submit(prescreen_day, symbol, date, config, session, args.margin,
+                            args.base_url.rstrip("/")): (symbol, date)
+                for symbol in args.symbols
+                for date in dates
+            }
+            for future in as_completed(futures):
+                symbol, date = futures[future]
+                try:
+                    day = future.result()
+                except (DownloadError, ValueError, OSError, zipfile.BadZipFile) as e:
+                    print(f"  Failed: {symbol} {date} ({e})", file=sys.stderr)
+                    day = {"symbol": symbol, "date": date, "status": "missing"}
+                days.append(day)
+    finally:
+        session.close()
+
+    manifest = build_manifest(days, config, args.margin)
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    counts = {status: 0 for status in ("candidate", "quiet", "missing")}
+    for day in days:
+        counts[day["status"]] += 1
+    print()
+    print(
+        f"{counts['candidate']} candidate days, {counts['quiet']} quiet, "
+        f"{counts['missing']} without klines (kept)"
+    )
+    print(f"Manifest: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
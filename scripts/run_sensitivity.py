@@ -2,7 +2,9 @@
 """Threshold sensitivity analysis runner.
 
 Runs the market forensics pipeline with varying price_shock_threshold_pct
-to check if ordering results are stable across threshold choices.
+(and optionally rolling_window_seconds) to check if ordering results are
+stable across threshold choices. All values are swept in one pipeline run,
+which loads the data and scans the price series once.
 """
 
 from __future__ import annotations
@@ -13,56 +15,41 @@ import json
 import os
 import subprocess
 import sys
-import tempfile
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 HERE = Path(__file__).parent.absolute()
 REPO_ROOT = HERE.parent
 
 
-def create_config_with_threshold(base_config_path: str, threshold: float) -> str:
-    """Create a temporary config file with modified threshold.
+def sensitivity_output_template(output_base: str, windows: Optional[List[float]]) -> str:
+    """Output directory template for the sweep (see market_forensics.run)."""
+    if windows:
+        return os.path.join(output_base, "sensitivity_{threshold}_w{window}")
+    return os.path.join(output_base, "sensitivity_{threshold}")
 
-    Args:
-        base_config_path: Path to base config file
-        threshold: New price_shock_threshold_pct value
-
-    Returns:
-        Path to temporary config file
-    """
-    with open(base_config_path) as f:
-        config = json.load(f)
-
-    # Modify threshold
-    if "event_detection" not in config:
-        config["event_detection"] = {}
-    config["event_detection"]["price_shock_threshold_pct"] = threshold
-
-    # Write to temp file
-    fd, temp_path = tempfile.mkstemp(suffix=".json", prefix=f"config_threshold_{threshold}_")
-    with os.fdopen(fd, "w") as f:
-        json.dump(config, f, indent=2)
-
-    return temp_path
 
-
-def run_pipeline_with_threshold(
-    threshold: float,
+def run_pipeline_sweep(
+    thresholds: List[float],
+    windows: Optional[List[float]],
     date: str,
     base_config: str,
     canonical_base: str,
-    output_dir: str,
+    output_base: str,
     verbose: bool = True,
 ) -> bool:
-    """Run the pipeline with a specific threshold.
+    """Run the pipeline once for all thresholds (and windows).
+
+    The data is loaded once and events for every (threshold, window) pair
+    are detected in a single pass; each pair gets its own output directory.
 
     Args:
-        threshold: price_shock_threshold_pct value
+        thresholds: price_shock_threshold_pct values
+        windows: rolling_window_seconds values (the config value if None)
         date: Date to run on (YYYY-MM-DD)
         base_config: Path to base config file
         canonical_base: Base path for canonical data
-        output_dir: Output directory for this run
+        output_base: Base output directory
 
     Returns:
         True if successful, False otherwise
@@ -76,44 +63,36 @@ def run_pipeline_with_threshold(
         print(f"ERROR: Trades file not found: {trades_path}", file=sys.stderr)
         return False
 
-    # Create temp config with modified threshold
-    temp_config = create_config_with_threshold(base_config, threshold)
-
-    try:
-        # Build command
-        cmd = [
-            sys.executable,
-            "-m", "market_forensics.run",
-            "--config", temp_config,
-            "--trades", trades_path,
-            "--tob", tob_path,
-            "--output", output_dir,
-        ]
-        if not verbose:
-            cmd.append("--quiet")
-
-        if verbose:
-            print(f"\n{'='*60}")
-            print(f"Running with threshold={threshold}%")
-            print(f"  Data: {data_dir}")
-            print(f"  Output: {output_dir}")
-            print(f"{'='*60}")
-
-        # Run pipeline
-        env = os.environ.copy()
-        env["PYTHONPATH"] = str(REPO_ROOT / "src")
-
-        result = subprocess.run(cmd, env=env, cwd=str(REPO_ROOT))
-
-        if result.returncode != 0:
-            print(f"ERROR: Pipeline failed for threshold={threshold}", file=sys.stderr)
-            return False
-
-        return True
-    finally:
-        # Clean up temp config
-        if os.path.exists(temp_config):
-            os.remove(temp_config)
+    cmd = [
+        sys.executable,
+        "-m", "market_forensics.run",
+        "--config", base_config,
+        "--trades", trades_path,
+        "--tob", tob_path,
+        "--output", sensitivity_output_template(output_base, windows),
+        "--thresholds", *[str(t) for t in thresholds],
+    ]
+    if windows:
+        cmd += ["--windows", *[str(w) for w in windows]]
+    if not verbose:
+        cmd.append("--quiet")
+
+    if verbose:
+        print(f"\n{'='*60}")
+        print(f"Running thresholds={thresholds}" + (f", windows={windows}" if windows else ""))
+        print(f"  Data: {data_dir}")
+        print(f"{'='*60}")
+
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(REPO_ROOT / "src")
+
+    result = subprocess.run(cmd, env=env, cwd=str(REPO_ROOT))
+
+    if result.returncode != 0:
+        print(f"ERROR: Pipeline sweep failed for {date}", file=sys.stderr)
+        return False
+
+    return True
 
 
 def count_orderings(output_dir: str) -> dict:
@@ -155,6 +134,11 @@ def count_orderings(output_dir: str) -> dict:
     return counts
 
 
+def _format_number(value: float) -> str:
+    """Format a window as the pipeline does in directory names (60.0 -> "60")."""
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
 def main() -> int:
     """CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -181,6 +165,13 @@ def main() -> int:
         default=[0.4, 0.5, 0.6],
         help="Threshold values to test (default: 0.4 0.5 0.6)",
     )
+    parser.add_argument(
+        "--windows",
+        nargs="+",
+        type=float,
+        default=None,
+        help="rolling_window_seconds values to test (default: the base config value)",
+    )
     parser.add_argument(
         "--output-base",
         default="outputs",
@@ -219,37 +210,37 @@ def main() -> int:
         print(f"Sensitivity analysis on date: {date}")
         print(f"Thresholds: {args.thresholds}")
 
-    # Run pipeline for each threshold
+    # One pipeline run covers every threshold and window
+    success = run_pipeline_sweep(
+        thresholds=args.thresholds,
+        windows=args.windows,
+        date=date,
+        base_config=args.base_config,
+        canonical_base=canonical_base,
+        output_base=args.output_base,
+        verbose=not args.quiet,
+    )
+
+    with open(args.base_config) as f:
+        base_window = json.load(f).get("event_detection", {}).get("rolling_window_seconds")
+    template = sensitivity_output_template(args.output_base, args.windows)
+
     results = []
-    for threshold in args.thresholds:
-        output_dir = os.path.join(args.output_base, f"sensitivity_{threshold}")
-
-        success = run_pipeline_with_threshold(
-            threshold=threshold,
-            date=date,
-            base_config=args.base_config,
-            canonical_base=canonical_base,
-            output_dir=output_dir,
-            verbose=not args.quiet,
-        )
-
-        if success:
-            counts = count_orderings(output_dir)
-            results.append({
-                "threshold_pct": threshold,
-                "date": date,
-                **counts,
-            })
-        else:
-            results.append({
-                "threshold_pct": threshold,
-                "date": date,
-                "events_detected": -1,
-                "windows_extracted": -1,
-                "liquidity_first": -1,
-                "price_first": -1,
-                "volume_first": -1,
-            })
+    for window in args.windows or [base_window]:
+        for threshold in args.thresholds:
+            row = {"threshold_pct": threshold, "window_seconds": window, "date": date}
+            if success:
+                output_dir = template.format(threshold=threshold, window=_format_number(window))
+                row.update(count_orderings(output_dir))
+            else:
+                row.update({
+                    "events_detected": -1,
+                    "windows_extracted": -1,
+                    "liquidity_first": -1,
+                    "price_first": -1,
+                    "volume_first": -1,
+                })
+            results.append(row)
 
     # Write summary CSV
     output_path = Path(args.output)
@@ -257,6 +248,7 @@ def main() -> int:
 
     fieldnames = [
         "threshold_pct",
+        "window_seconds",
         "date",
         "events_detected",
         "windows_extracted",
@@ -2,7 +2,8 @@
 """V2 threshold sensitivity analysis runner.
 
 Runs the market forensics pipeline across all v2 (asset, date) pairs with
-varying price_shock_threshold_pct values to verify results are robust.
+varying price_shock_threshold_pct values to verify results are robust. Each
+pair is run once for all thresholds (see market_forensics.run --thresholds).
 
 Outputs:
 - outputs/sensitivity.csv: threshold, n_events, pct_liquidity_first
@@ -16,9 +17,8 @@ import json
 import os
 import subprocess
 import sys
-import tempfile
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 HERE = Path(__file__).parent.absolute()
 REPO_ROOT = HERE.parent
@@ -54,38 +54,19 @@ def get_available_pairs(manifest: dict) -> List[Tuple[str, str]]:
     return pairs
 
 
-def create_config_with_threshold(base_config_path: str, threshold: float) -> str:
-    """Create a temp config file with modified threshold.
-
-    Args:
-        base_config_path: Path to base config file
-        threshold: New price_shock_threshold_pct value
-
-    Returns:
-        Path to temporary config file
-    """
-    with open(base_config_path) as f:
-        config = json.load(f)
-
-    if "event_detection" not in config:
-        config["event_detection"] = {}
-    config["event_detection"]["price_shock_threshold_pct"] = threshold
-
-    fd, temp_path = tempfile.mkstemp(suffix=".json", prefix=f"config_{threshold}_")
-    with os.fdopen(fd, "w") as f:
-        json.dump(config, f, indent=2)
-
-    return temp_path
-
-
 def run_pipeline_for_pair(
     asset: str,
     date: str,
     config_path: str,
-    output_dir: str,
+    thresholds: List[float],
+    output_base: str,
     verbose: bool = True,
 ) -> bool:
-    """Run pipeline for a single (asset, date) pair."""
+    """Run the pipeline for a single (asset, date) pair and every threshold.
+
+    One run loads the data and detects events for all thresholds in a
+    single pass; threshold t writes to {output_base}/sens_{t}/{asset}/{date}.
+    """
     data_dir = get_canonical_data_path(asset, date)
     trades_path = data_dir / "trades.csv"
     tob_path = data_dir / "tob.csv"
@@ -96,7 +77,8 @@ def run_pipeline_for_pair(
         "--config", config_path,
         "--trades", str(trades_path),
         "--tob", str(tob_path),
-        "--output", output_dir,
+        "--output", sensitivity_output_dir(output_base, "{threshold}", asset, date),
+        "--thresholds", *[str(t) for t in thresholds],
         "--quiet",
     ]
 
@@ -107,6 +89,11 @@ def run_pipeline_for_pair(
     return result.returncode == 0
 
 
+def sensitivity_output_dir(output_base: str, threshold, asset: str, date: str) -> str:
+    """Output directory of one threshold for an (asset, date) pair."""
+    return str(Path(output_base) / f"sens_{threshold}" / asset / date)
+
+
 def count_orderings_from_dir(output_dir: str) -> Tuple[int, int]:
     """Count total events and liquidity-first events from output directory.
 
@@ -132,45 +119,40 @@ def count_orderings_from_dir(output_dir: str) -> Tuple[int, int]:
     return (n_events, n_liquidity_first)
 
 
-def run_sensitivity_for_threshold(
-    threshold: float,
+def run_sensitivity(
+    thresholds: List[float],
     pairs: List[Tuple[str, str]],
     base_config: str,
     output_base: str,
     verbose: bool = True,
-) -> Tuple[int, int]:
-    """Run pipeline with specific threshold across all pairs.
+) -> Dict[float, Tuple[int, int]]:
+    """Run the pipeline with every threshold across all pairs.
 
     Returns:
-        Tuple of (total_events, total_liquidity_first)
+        {threshold: (total_events, total_liquidity_first)}
     """
-    temp_config = create_config_with_threshold(base_config, threshold)
+    totals = {threshold: (0, 0) for threshold in thresholds}
 
-    total_events = 0
-    total_liquidity_first = 0
-
-    try:
-        for asset, date in pairs:
-            output_dir = str(Path(output_base) / f"sens_{threshold}" / asset / date)
-
-            success = run_pipeline_for_pair(
-                asset=asset,
-                date=date,
-                config_path=temp_config,
-                output_dir=output_dir,
-                verbose=False,
-            )
-
-            if success:
-                n_events, n_liq_first = count_orderings_from_dir(output_dir)
-                total_events += n_events
-                total_liquidity_first += n_liq_first
-
-        return (total_events, total_liquidity_first)
+    for asset, date in pairs:
+        if verbose:
+            print(f"  {asset}/{date}")
+        success = run_pipeline_for_pair(
+            asset=asset,
+            date=date,
+            config_path=base_config,
+            thresholds=thresholds,
+            output_base=output_base,
+            verbose=False,
+        )
+        if not success:
+            continue
+        for threshold in thresholds:
+            output_dir = sensitivity_output_dir(output_base, threshold, asset, date)
+            n_events, n_liq_first = count_orderings_from_dir(output_dir)
+            total_events, total_liquidity_first = totals[threshold]
+            totals[threshold] = (total_events + n_events, total_liquidity_first + n_liq_first)
 
-    finally:
-        if os.path.exists(temp_config):
-            os.remove(temp_config)
+    return totals
 
 
 def main() -> int:
@@ -263,20 +245,20 @@ Examples:
             print(f"  ... and {len(pairs) - 10} more")
         return 0
 
-    # Run sensitivity analysis
+    # Run sensitivity analysis: one pipeline run per pair covers all thresholds
+    if verbose:
+        print(f"\nRunning thresholds {args.thresholds} on {len(pairs)} pairs...")
+    totals = run_sensitivity(
+        thresholds=args.thresholds,
+        pairs=pairs,
+        base_config=args.base_config,
+        output_base=args.output_base,
+        verbose=verbose,
+    )
+
     results = []
     for threshold in args.thresholds:
-        if verbose:
-            print(f"\nRunning threshold {threshold}% on {len(pairs)} pairs...")
-
-        n_events, n_liq_first = run_sensitivity_for_threshold(
-            threshold=threshold,
-            pairs=pairs,
-            base_config=args.base_config,
-            output_base=args.output_base,
-            verbose=verbose,
-        )
-
+        n_events, n_liq_first = totals[threshold]
         pct_liq_first = 100.0 * n_liq_first / n_events if n_events > 0 else 0.0
 
         results.append({
@@ -286,7 +268,7 @@ Examples:
         })
 
         if verbose:
-            print(f"  Events: {n_events}, Liquidity-first: {pct_liq_first:.1f}%")
+            print(f"  {threshold}%: Events: {n_events}, Liquidity-first: {pct_liq_first:.1f}%")
 
     # Write output CSV
     output_path = REPO_ROOT / args.output if not Path(args.output).is_absolute() else Path(args.output)
@@ -1,14 +1,30 @@
 """Data loading and validation utilities."""
 
+from .columnar import TobTable, TradeTable
 from .loaders import (
     DataLoadError,
+    iter_tob,
+    iter_trades,
     load_tob,
     load_tob_csv,
     load_tob_jsonl,
+    load_tob_table,
+    load_tob_table_csv,
+    load_trade_table,
+    load_trade_table_csv,
     load_trades,
     load_trades_csv,
     load_trades_jsonl,
 )
+from .binance import load_agg_trades_zip, load_book_ticker_zip
+from .time_index import (
+    load_tob_range,
+    load_tob_ranges,
+    load_tob_tail,
+    load_trades_range,
+    load_trades_ranges,
+    load_trades_tail,
+)
 from .models import Event, EventDirection, Side, TopOfBook, Trade
 
 __all__ = [
@@ -18,6 +34,9 @@ __all__ = [
     "Event",
     "Side",
     "EventDirection",
+    # Columnar tables
+    "TradeTable",
+    "TobTable",
     # Loaders
     "load_trades",
     "load_trades_csv",
@@ -25,5 +44,19 @@ __all__ = [
     "load_tob",
     "load_tob_csv",
     "load_tob_jsonl",
+    "load_trade_table",
+    "load_trade_table_csv",
+    "load_tob_table",
+    "load_tob_table_csv",
+    "iter_trades",
+    "iter_tob",
+    "load_trades_range",
+    "load_tob_range",
+    "load_trades_ranges",
+    "load_tob_ranges",
+    "load_trades_tail",
+    "load_tob_tail",
+    "load_agg_trades_zip",
+    "load_book_ticker_zip",
     "DataLoadError",
 ]
@@ -0,0 +1,370 @@
+"""Direct ingestion of Binance daily zip archives.
+
+data.binance.vision publishes each symbol-day as a zip holding a single CSV
+(``{SYMBOL}-aggTrades-{DATE}.zip``, ``{SYMBOL}-bookTicker-{DATE}.zip``).
+Extracting the archive and rewriting it as a canonical CSV with ISO
+timestamps writes and then re-parses every row as text twice. The loaders
+here stream the zip member instead and parse it straight into columnar
+tables:
+
+- millisecond timestamps stay integers and become epoch nanoseconds
+  (``ms * 1_000_000``) without any datetime formatting or parsing;
+- ``is_buyer_maker`` maps to the side code (a buyer-maker trade was
+  initiated by the seller, as in scripts/canonicalize_binance_um_day.py);
+- aggregate trade ids are kept as an int64 column (see NumericIds).
+
+The member is read in newline-aligned blocks. With NumPy each block is
+parsed in one pass by ``numpy.loadtxt``; blocks it rejects (and every block
+without NumPy) are parsed row by row, which also produces the usual
+row-numbered errors.
+
+The parsed table is stored in the zip's sidecar column cache (see
+market_forensics.data.cache), which serves as the binary canonical file:
+later loads map it without opening the archive.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import zipfile
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .cache import read_table_cache, write_table_cache
+from .columnar import (
+    NUMPY_AVAILABLE,
+    SIDE_BUY,
+    SIDE_SELL,
+    NumericIds,
+    TobTable,
+    TradeTable,
+    np,
+)
+from .loaders import DataLoadError, _check_chunk, _check_coalesce_mode, _wants_trade_ids
+
+# Column order of the archives (older files have no header row)
+AGG_TRADES_COLUMNS = (
+    "agg_trade_id", "price", "quantity", "first_trade_id",
+    "last_trade_id", "transact_time", "is_buyer_maker",
+)
+BOOK_TICKER_COLUMNS = (
+    "update_id", "best_bid_price", "best_bid_qty", "best_ask_price",
+    "best_ask_qty", "transaction_time", "event_time",
+)
+
+# Bytes of the zip member decoded and parsed at a time
+DEFAULT_BLOCK_BYTES = 1 << 20
+
+NS_PER_MS = 1_000_000
+
+# Integers below 2**53 survive the float parse of the vectorized path exactly
+_MAX_EXACT_INT = 1 << 53
+
+_FLAGS = {"true": 1, "false": 0}
+
+
+def symbol_from_filename(file_path: Union[Path, str]) -> str:
+    """Return the symbol prefix of a Binance archive name (``BTCUSDT-...``)."""
+    return Path(file_path).name.split("-", 1)[0]
+
+
+def load_agg_trades_zip(
+    file_path: Union[Path, str],
+    symbol: Optional[str] = None,
+    use_cache: bool = True,
+    columns: Optional[Iterable[str]] = None,
+    block_bytes: int = DEFAULT_BLOCK_BYTES,
+) -> TradeTable:
+    """Load a Binance aggTrades zip into a TradeTable.
+
+    Args:
+        file_path: Path to ``{SYMBOL}-aggTrades-{DATE}.zip``.
+        symbol: Symbol for every row (taken from the file name if None).
+        use_cache: Read and write the binary column cache.
+        columns: Column projection (see load_trade_table_csv).
+        block_bytes: Bytes of the archive member parsed at a time.
+
+    Returns:
+        TradeTable sorted by timestamp, with ``transact_time`` as the
+        timestamp and ``agg_trade_id`` as the trade id.
+
+    Raises:
+        DataLoadError: If the file is missing, is not a single-CSV zip, or
+            has invalid rows.
+    """
+    file_path = Path(file_path)
+    if not file_path.exists():
+        raise DataLoadError(f"Trades file not found: {file_path}")
+    symbol = symbol or symbol_from_filename(file_path)
+    with_trade_ids = _wants_trade_ids(columns)
+
+    table = _cached(file_path, TradeTable, symbol) if use_cache else None
+    if table is None:
+        table = TradeTable.concat(_read_agg_trades_chunks(file_path, symbol, block_bytes))
+        table = table.sorted_by_timestamp()
+        if use_cache:
+            write_table_cache(file_path, table)
+    if not with_trade_ids:
+        table.trade_ids = None
+    return table
+
+
+def load_book_ticker_zip(
+    file_path: Union[Path, str],
+    symbol: Optional[str] = None,
+    use_cache: bool = True,
+    block_bytes: int = DEFAULT_BLOCK_BYTES,
+    coalesce: Optional[str] = None,
+) -> TobTable:
+    """Load a Binance bookTicker zip into a TobTable.
+
+    Args:
+        file_path: Path to ``{SYMBOL}-bookTicker-{DATE}.zip``.
+        symbol: Symbol for every row (taken from the file name if None).
+        use_cache: Read and write the binary column cache.
+        block_bytes: Bytes of the archive member parsed at a time.
+        coalesce: Coalesce mode for redundant updates (see
+            load_tob_table_csv); None keeps every row.
+
+    Returns:
+        TobTable sorted by timestamp, with ``event_time`` as the timestamp.
+
+    Raises:
+        DataLoadError: If the file is missing, is not a single-CSV zip, or
+            has invalid rows.
+    """
+    file_path = Path(file_path)
+    if not file_path.exists():
+        raise DataLoadError(f"Top-of-book file not found: {file_path}")
+    symbol = symbol or symbol_from_filename(file_path)
+    _check_coalesce_mode(coalesce)
+
+    table = _cached(file_path, TobTable, symbol) if use_cache else None
+    if table is None:
+        table = TobTable.concat(_read_book_ticker_chunks(file_path, symbol, block_bytes))
+        table = table.sorted_by_timestamp()
+        if use_cache:
+            write_table_cache(file_path, table)
+    return table.coalesced(coalesce) if coalesce else table
+
+
+def _cached(file_path: Path, table_cls, symbol: str):
+    cached = read_table_cache(file_path, table_cls)
+    # The cache holds the symbol of the load that wrote it
+    if cached is not None and cached.symbols in ((symbol,), ()):
+        return cached
+    return None
+
+
+def _read_agg_trades_chunks(
+    file_path: Path, symbol: str, block_bytes: int
+) -> Iterator[TradeTable]:
+    """Parse an aggTrades archive into one TradeTable per block, in file order."""
+    names = ("agg_trade_id", "transact_time", "price", "quantity", "is_buyer_maker")
+    kinds = ("int", "int", "float", "float", "flag")
+    blocks = _read_blocks(file_path, AGG_TRADES_COLUMNS, names, kinds, "trade", block_bytes)
+    for first_row, (ids, ms, prices, sizes, makers) in blocks:
+        if NUMPY_AVAILABLE:
+            timestamps = array("q", (np.asarray(ms) * NS_PER_MS).tobytes())
+            codes = np.where(np.asarray(makers) == 1, SIDE_SELL, SIDE_BUY)
+            sides = array("b", codes.astype(np.int8).tobytes())
+        else:
+            timestamps = array("q", [v * NS_PER_MS for v in ms])
+            sides = array("b", [SIDE_SELL if v else SIDE_BUY for v in makers])
+        chunk = TradeTable(
+            timestamps=timestamps,
+            prices=prices,
+            sizes=sizes,
+            sides=sides,
+            symbol_codes=array("H", bytes(2 * len(ms))),
+            symbols=(symbol,),
+            trade_ids=NumericIds(ids),
+        )
+        _check_chunk(chunk, [], first_row, "trade", file_path)
+        yield chunk
+
+
+def _read_book_ticker_chunks(
+    file_path: Path, symbol: str, block_bytes: int
+) -> Iterator[TobTable]:
+    """Parse a bookTicker archive into one TobTable per block, in file order."""
+    names = ("event_time", "best_bid_price", "best_bid_qty", "best_ask_price", "best_ask_qty")
+    kinds = ("int", "float", "float", "float", "float")
+    blocks = _read_blocks(
+        file_path, BOOK_TICKER_COLUMNS, names, kinds, "top-of-book", block_bytes
+    )
+    for first_row, (ms, bid_prices, bid_sizes, ask_prices, ask_sizes) in blocks:
+        if NUMPY_AVAILABLE:
+            timestamps = array("q", (np.asarray(ms) * NS_PER_MS).tobytes())
+        else:
+            timestamps = array("q", [v * NS_PER_MS for v in ms])
+        chunk = TobTable(
+            timestamps=timestamps,
+            bid_prices=bid_prices,
+            bid_sizes=bid_sizes,
+            ask_prices=ask_prices,
+            ask_sizes=ask_sizes,
+            symbol_codes=array("H", bytes(2 * len(ms))),
+            symbols=(symbol,),
+        )
+        _check_chunk(chunk, [], first_row, "top-of-book", file_path)
+        yield chunk
+
+
+def _read_blocks(
+    file_path: Path,
+    default_header: Sequence[str],
+    names: Sequence[str],
+    kinds: Sequence[str],
+    label: str,
+    block_bytes: int,
+) -> Iterator[Tuple[int, List[array]]]:
+    """Stream the archive's CSV member as parsed column blocks.
+
+    Args:
+        file_path: Path to the zip archive.
+        default_header: Column order used when the member has no header.
+        names: Columns to extract.
+        kinds: Per extracted column: "int" (int64), "float" (float64) or
+            "flag" (true/false as int8 1/0).
+        label: Record name for error messages.
+        block_bytes: Bytes read from the member at a time.
+
+    Yields:
+        ``(first_row, columns)`` per block, where first_row is the file row
+        number of the block's first row (the header, if any, is row 1).
+    """
+    try:
+        with zipfile.ZipFile(file_path) as zf:
+            members = [n for n in zf.namelist() if n.lower().endswith(".csv")]
+            if len(members) != 1:
+                raise DataLoadError(
+                    f"Expected one CSV file in {file_path}, found {len(members)}"
+                )
+            with zf.open(members[0]) as f:
+                first = f.readline()
+                if not first.strip():
+                    return
+                if first[:1].isdigit():
+                    header = list(default_header)
+                    pending, row_num = first, 0
+                else:
+                    header = [name.strip() for name in first.decode().split(",")]
+                    pending, row_num = b"", 1
+                missing = sorted(set(names) - set(header))
+                if missing:
+                    raise DataLoadError(f"Missing required columns in {file_path}: {missing}")
+                spec = (len(header), [header.index(name) for name in names], kinds)
+
+                while True:
+                    data = f.read(block_bytes)
+                    if not data:
+                        break
+                    data = pending + data
+                    cut = data.rfind(b"\n") + 1
+                    if cut == 0:
+                        pending = data
+                        continue
+                    pending = data[cut:]
+                    rows, cols = _parse_block(data[:cut], spec, row_num + 1, label, file_path)
+                    yield row_num + 1, cols
+                    row_num += rows
+                if pending.strip():
+                    _, cols = _parse_block(pending + b"\n", spec, row_num + 1, label, file_path)
+                    yield row_num + 1, cols
+    except (zipfile.BadZipFile, zipfile.LargeZipFile) as e:
+        raise DataLoadError(f"Cannot read zip archive {file_path}: {e}") from e
+
+
+def _parse_block(
+    block: bytes,
+    spec: Tuple[int, List[int], Sequence[str]],
+    first_row: int,
+    label: str,
+    file_path: Path,
+) -> Tuple[int, List[array]]:
+    """Parse newline-terminated CSV lines into typed columns.
+
+    Returns:
+        ``(rows, columns)`` with one array per extracted column.
+    """
+    if NUMPY_AVAILABLE:
+        cols = _parse_block_numpy(block, spec)
+        if cols is not None:
+            return len(cols[0]), cols
+    return _parse_block_rows(block, spec, first_row, label, file_path)
+
+
+def _parse_block_numpy(block: bytes, spec) -> Optional[List[array]]:
+    """Vectorized parse, or None if the block needs the row-by-row parser."""
+    ncols, indices, kinds = spec
+    if "flag" in kinds:
+        block = block.replace(b"true", b"1").replace(b"false", b"0")
+    try:
+        table = np.loadtxt(
+            io.BytesIO(block), dtype=np.float64, delimiter=",", comments=None,
+            usecols=indices, ndmin=2,
+        )
+    except ValueError:
+        return None
+    # loadtxt skips blank lines, which would shift the reported row numbers
+    if len(table) != block.count(b"\n"):
+        return None
+
+    cols = []
+    for i, kind in enumerate(kinds):
+        column = table[:, i]
+        if kind == "float":
+            cols.append(array("d", np.ascontiguousarray(column).tobytes()))
+            continue
+        if not (np.abs(column) < _MAX_EXACT_INT).all():
+            return None
+        ints = column.astype(np.int64)
+        if not (ints == column).all():
+            return None
+        if kind == "flag":
+            if not ((ints == 0) | (ints == 1)).all():
+                return None
+            cols.append(array("b", ints.astype(np.int8).tobytes()))
+        else:
+            cols.append(array("q", ints.tobytes()))
+    return cols
+
+
+def _parse_block_rows(
+    block: bytes,
+    spec,
+    first_row: int,
+    label: str,
+    file_path: Path,
+) -> Tuple[int, List[array]]:
+    """Row-by-row parse with row-numbered errors."""
+    _, indices, kinds = spec
+    cols = [array("d" if kind == "float" else "b" if kind == "flag" else "q") for kind in kinds]
+    parsers = [_PARSERS[kind] for kind in kinds]
+    row_num = first_row - 1
+    for row in csv.reader(io.StringIO(block.decode())):
+        if not row:
+            continue
+        row_num += 1
+        try:
+            values = [parse(row[i]) for parse, i in zip(parsers, indices)]
+        except (ValueError, IndexError) as e:
+            raise DataLoadError(
+                f"Error parsing {label} at row {row_num} in {file_path}: {e}"
+            ) from e
+        for column, value in zip(cols, values):
+            column.append(value)
+    return row_num - first_row + 1, cols
+
+
+def _parse_flag(value: str) -> int:
+    flag = _FLAGS.get(value.strip().lower())
+    if flag is None:
+        raise ValueError(f"Invalid boolean: {value!r}. Must be 'true' or 'false'")
+    return flag
+
+
+_PARSERS: Dict[str, object] = {"int": int, "float": float, "flag": _parse_flag}
@@ -0,0 +1,268 @@
+"""Persistent binary column cache for canonical CSV files.
+
+Parsing a canonical day from text dominates every pipeline run, and the
+replication and sensitivity scripts reload the same days many times. After a
+CSV is parsed, its columns are written to a sidecar directory next to it:
+
+    trades.csv
+    trades.csv.cache/
+        manifest.json
+        timestamps.<token>.npy
+        prices.<token>.npy
+        ...
+
+Each column is a standard ``.npy`` file (readable with ``numpy.load``), but
+the reader only needs the standard library: files are memory-mapped and the
+data region is cast to a typed memoryview, so reloading a day maps files
+instead of parsing text.
+
+The manifest records the source file's size, mtime and SHA-256. A cache hit
+requires a matching size and mtime; if only the mtime differs (for example
+after copying the file) the hash is recomputed and the cache is reused when
+it still matches. Any mismatch or unreadable cache falls back to parsing.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Optional, Type, Union
+
+from .columnar import NumericIds, _ColumnTable, _typecode
+
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".cache"
+MANIFEST_NAME = "manifest.json"
+
+_NPY_MAGIC = b"\x93NUMPY"
+_NPY_DESCR = {"q": "<i8", "d": "<f8", "b": "|i1", "H": "<u2"}
+_TYPECODE_FOR_DESCR = {descr: code for code, descr in _NPY_DESCR.items()}
+
+
+def cache_dir_for(source: Union[Path, str]) -> Path:
+    """Return the sidecar cache directory for a source file."""
+    source = Path(source)
+    return source.with_name(source.name + CACHE_SUFFIX)
+
+
+def file_sha256(path: Union[Path, str], block_size: int = 1 << 20) -> str:
+    """Compute the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_fingerprint(source: Path, sha256: Optional[str] = None) -> dict:
+    stat = source.stat()
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256 if sha256 is not None else file_sha256(source),
+    }
+
+
+def write_npy(path: Path, column: Union[array, memoryview]) -> None:
+    """Write a 1-D column as a version 1.0 ``.npy`` file."""
+    typecode = _typecode(column)
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (
+        _NPY_DESCR[typecode], len(column),
+    )
+    # Pad so the data region starts on a 64-byte boundary, as numpy does
+    preamble = len(_NPY_MAGIC) + 2 + 2
+    header += " " * (-(preamble + len(header) + 1) % 64) + "\n"
+    with open(path, "wb") as f:
+        f.write(_NPY_MAGIC + bytes([1, 0]))
+        f.write(struct.pack("<H", len(header)))
+        f.write(header.encode("latin1"))
+        f.write(memoryview(column).cast("B"))
+
+
+def read_npy(path: Path) -> memoryview:
+    """Memory-map a 1-D ``.npy`` file written by write_npy.
+
+    Returns:
+        A read-only typed memoryview over the mapped data region.
+
+    Raises:
+        ValueError: If the file is not a supported ``.npy`` column.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mapped[:6] != _NPY_MAGIC or mapped[6:8] != bytes([1, 0]):
+        raise ValueError(f"Not a version 1.0 .npy file: {path}")
+    (header_len,) = struct.unpack("<H", mapped[8:10])
+    header = ast.literal_eval(mapped[10:10 + header_len].decode("latin1"))
+    typecode = _TYPECODE_FOR_DESCR.get(header.get("descr"))
+    shape = header.get("shape")
+    if typecode is None or header.get("fortran_order") or len(shape) != 1:
+        raise ValueError(f"Unsupported .npy layout in {path}: {header}")
+    offset = 10 + header_len
+    nbytes = shape[0] * array(typecode).itemsize
+    if len(mapped) < offset + nbytes:
+        raise ValueError(f"Truncated .npy file: {path}")
+    return memoryview(mapped)[offset:offset + nbytes].cast(typecode)
+
+
+def _cacheable() -> bool:
+    # Column files are little-endian; big-endian hosts just parse the CSV
+    return sys.byteorder == "little"
+
+
+def read_table_cache(
+    source: Union[Path, str],
+    table_cls: Type[_ColumnTable],
+) -> Optional[_ColumnTable]:
+    """Load a table from the source file's cache if it is still valid.
+
+    Args:
+        source: Path to the source CSV file.
+        table_cls: TradeTable or TobTable.
+
+    Returns:
+        The cached table backed by memory-mapped columns, or None on a miss.
+    """
+    if not _cacheable():
+        return None
+    source = Path(source)
+    cache_dir = cache_dir_for(source)
+    manifest_path = cache_dir / MANIFEST_NAME
+    refreshed = None
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get("version") != CACHE_VERSION or manifest.get("kind") != table_cls.__name__:
+            return None
+        cached = manifest["source"]
+        stat = source.stat()
+        if stat.st_size != cached["size"]:
+            return None
+        if stat.st_mtime_ns != cached["mtime_ns"]:
+            if file_sha256(source) != cached["sha256"]:
+                return None
+            refreshed = _source_fingerprint(source, cached["sha256"])
+    except (OSError, ValueError, KeyError, AttributeError, TypeError):
+        # Unreadable, older or hand-edited manifests are misses
+        return None
+    if refreshed is not None:
+        # Same content with a new mtime (e.g. copied): refresh the manifest if
+        # the cache directory is writable; the columns are valid either way
+        manifest["source"] = refreshed
+        try:
+            _write_manifest(cache_dir, manifest)
+        except OSError:
+            pass
+
+    try:
+        columns = {
+            name: read_npy(cache_dir / filename)
+            for name, filename in manifest["columns"].items()
+        }
+        trade_ids = manifest.get("trade_ids")
+        if trade_ids and trade_ids.endswith(".npy"):
+            columns["trade_ids"] = NumericIds(read_npy(cache_dir / trade_ids))
+        elif trade_ids:
+            text = (cache_dir / trade_ids).read_text(encoding="utf-8")
+            columns["trade_ids"] = text.split("\n") if manifest["rows"] else []
+        symbols = tuple(manifest["symbols"])
+    except (OSError, ValueError, KeyError, AttributeError, TypeError):
+        return None
+    return table_cls(symbols=symbols, **columns)
+
+
+def write_table_cache(source: Union[Path, str], table: _ColumnTable) -> bool:
+    """Write a parsed table to the source file's cache.
+
+    Failures (read-only directory, full disk) are not errors: the cache is
+    an optimization, so they just return False.
+
+    Args:
+        source: Path to the source CSV file the table was parsed from.
+        table: The parsed table.
+
+    Returns:
+        True if the cache was written.
+    """
+    if not _cacheable():
+        return False
+    trade_ids = getattr(table, "trade_ids", None)
+    if trade_ids is not None and not isinstance(trade_ids, NumericIds):
+        # String ids are stored one per line; checked before any file is written
+        if any(tid is None or "\n" in tid for tid in trade_ids):
+            return False
+    source = Path(source)
+    cache_dir = cache_dir_for(source)
+    try:
+        fingerprint = _source_fingerprint(source)
+        token = f"{fingerprint['sha256'][:12]}-{os.getpid()}"
+        cache_dir.mkdir(exist_ok=True)
+
+        manifest = {
+            "version": CACHE_VERSION,
+            "kind": type(table).__name__,
+            "source": fingerprint,
+            "rows": len(table),
+            "symbols": list(table.symbols),
+            "columns": {},
+            "trade_ids": None,
+        }
+        for name in table.column_names():
+            filename = f"{name}.{token}.npy"
+            write_npy(cache_dir / filename, getattr(table, name))
+            manifest["columns"][name] = filename
+
+        if isinstance(trade_ids, NumericIds):
+            filename = f"trade_ids.{token}.npy"
+            write_npy(cache_dir / filename, trade_ids.values)
+            manifest["trade_ids"] = filename
+        elif trade_ids is not None:
+            filename = f"trade_ids.{token}.txt"
+            (cache_dir / filename).write_text("\n".join(trade_ids), encoding="utf-8")
+            manifest["trade_ids"] = filename
+
+        # The manifest is replaced last, so readers never see partial columns
+        _write_manifest(cache_dir, manifest)
+        _remove_stale_files(cache_dir, manifest)
+        return True
+    except OSError:
+        return False
+
+
+def clear_table_cache(source: Union[Path, str]) -> None:
+    """Delete the cache directory for a source file, if present."""
+    cache_dir = cache_dir_for(source)
+    if not cache_dir.is_dir():
+        return
+    for path in cache_dir.iterdir():
+        path.unlink()
+    cache_dir.rmdir()
+
+
+def _write_manifest(cache_dir: Path, manifest: dict) -> None:
+    tmp_path = cache_dir / f"{MANIFEST_NAME}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, cache_dir / MANIFEST_NAME)
+
+
+def _remove_stale_files(cache_dir: Path, manifest: dict) -> None:
+    keep = set(manifest["columns"].values())
+    if manifest.get("trade_ids"):
+        keep.add(manifest["trade_ids"])
+    for path in cache_dir.iterdir():
+        # Only column files are managed here; other sidecar files (such as the
+        # time index) have their own lifecycle
+        if path.suffix not in (".npy", ".txt") or path.name in keep:
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,768 @@
+"""Columnar containers for trade and top-of-book series.
+
+A single day of Binance bookTicker data is tens of millions of rows, and
+holding each row as a dataclass with its own datetime costs gigabytes before
+detection even starts. The tables here keep one typed array per field:
+
+- timestamps: int64 epoch nanoseconds (UTC)
+- prices and sizes: float64
+- trade side: int8 code (+1 buy, -1 sell)
+- symbol: uint16 code into a tuple of interned symbol strings
+- trade id: int64 when every id in a chunk is a plain integer (Binance
+  ``agg_trade_id``), decoded to a string only when read; otherwise strings
+
+Indexing or iterating a table yields the canonical Trade/TopOfBook records,
+so code written against lists keeps working. The hot paths (detection,
+window extraction, metrics, ordering) read the columns directly.
+
+Contiguous slices (``table[a:b]`` or ``table.view(a, b)``) are zero-copy
+views: numeric columns become memoryview slices of the parent's buffers, so
+event windows share memory with the full-day table. Tables are treated as
+immutable once built; a buffer with live views cannot be resized.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Sequence as SequenceABC
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .models import Side, TopOfBook, Trade, _trusted_tob, _trusted_trade
+
+# NumPy is optional: when installed, columns are viewed as ndarrays (zero-copy)
+# for vectorized paths; otherwise the pure-Python paths are used.
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None  # type: ignore
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+NS_PER_SECOND = 1_000_000_000
+
+SIDE_BUY = 1
+SIDE_SELL = -1
+_SIDE_TO_CODE = {Side.BUY: SIDE_BUY, Side.SELL: SIDE_SELL}
+_CODE_TO_SIDE = {SIDE_BUY: Side.BUY, SIDE_SELL: Side.SELL}
+
+
+def timedelta_to_ns(delta: timedelta) -> int:
+    """Convert a timedelta to integer nanoseconds."""
+    return (delta.days * 86400 + delta.seconds) * NS_PER_SECOND + delta.microseconds * 1000
+
+
+def datetime_to_ns(dt: datetime) -> int:
+    """Convert a datetime to integer epoch nanoseconds.
+
+    Naive datetimes are interpreted as UTC, matching the loaders.
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return timedelta_to_ns(dt - EPOCH)
+
+
+def seconds_to_ns(seconds: float) -> int:
+    """Convert a duration in seconds to integer nanoseconds.
+
+    The duration is rounded through timedelta, so comparisons in nanoseconds
+    agree exactly with the datetime arithmetic used on record lists.
+    """
+    return timedelta_to_ns(timedelta(seconds=seconds))
+
+
+def ns_to_datetime(ns: int) -> datetime:
+    """Convert integer epoch nanoseconds to a UTC datetime (microsecond precision)."""
+    return EPOCH + timedelta(microseconds=ns // 1000)
+
+
+def as_ndarray(column: Sequence, dtype: str):
+    """View a column as a NumPy array without copying where possible.
+
+    Buffer-backed columns (array.array, memoryview, ndarray) are wrapped in
+    place; other sequences are converted.
+
+    Raises:
+        RuntimeError: If NumPy is not installed.
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("NumPy is required for vectorized column access")
+    if isinstance(column, np.ndarray):
+        return column.astype(dtype, copy=False)
+    try:
+        return np.frombuffer(column, dtype=dtype)
+    except (TypeError, ValueError):
+        return np.asarray(column, dtype=dtype)
+
+
+# A numeric column: an owning array or a memoryview slice of one
+Column = Union[array, memoryview]
+
+_NUMPY_DTYPES = {"q": "int64", "d": "float64", "b": "int8", "H": "uint16"}
+
+# Modes of TobTable.coalesced
+TOB_COALESCE_MODES = ("timestamp", "price")
+
+
+def _typecode(column: Column) -> str:
+    """Return the array typecode of an array or memoryview column."""
+    return column.typecode if isinstance(column, array) else column.format
+
+
+def is_non_decreasing(column: Sequence[int]) -> bool:
+    """Check whether an integer column is in non-decreasing order."""
+    if NUMPY_AVAILABLE and len(column) > 1:
+        values = as_ndarray(column, "int64")
+        return bool((values[1:] >= values[:-1]).all())
+    return all(column[i - 1] <= column[i] for i in range(1, len(column)))
+
+
+class SequenceView(SequenceABC):
+    """Read-only window [start, stop) onto a list without copying it.
+
+    Used for object columns (such as trade ids) in table views, where a
+    memoryview is not available.
+    """
+
+    __slots__ = ("_base", "_start", "_stop")
+
+    def __init__(self, base: Sequence, start: int, stop: int) -> None:
+        if isinstance(base, SequenceView):
+            start += base._start
+            stop += base._start
+            base = base._base
+        self._base = base
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step == 1:
+                return SequenceView(self, start, max(start, stop))
+            return [self[i] for i in range(start, stop, step)]
+        n = len(self)
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError("SequenceView index out of range")
+        return self._base[self._start + key]
+
+    def __iter__(self) -> Iterator:
+        return islice(self._base, self._start, self._stop)
+
+
+class NumericIds(SequenceABC):
+    """Trade ids held as an int64 column and decoded to strings on access.
+
+    Only used when every id round-trips exactly through int (see
+    encode_trade_ids), so readers see the same strings the file held.
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: Column) -> None:
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step == 1:
+                return NumericIds(memoryview(self.values)[start:max(start, stop)])
+            return [str(self.values[i]) for i in range(start, stop, step)]
+        return str(self.values[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return map(str, self.values)
+
+    def take(self, indices: Sequence[int]) -> "NumericIds":
+        """Return the ids at the given rows as a new column."""
+        values = self.values
+        if NUMPY_AVAILABLE and isinstance(indices, np.ndarray):
+            return NumericIds(array("q", as_ndarray(values, "int64")[indices].tobytes()))
+        return NumericIds(array("q", [values[i] for i in indices]))
+
+
+def encode_trade_ids(values: List[Optional[str]]) -> Union[NumericIds, List[Optional[str]]]:
+    """Store a block of trade ids as int64 if they are all plain integers.
+
+    Ids that int() would accept but not reproduce (such as "007", "+7" or
+    " 7") keep the block as strings, so decoding is always exact.
+    """
+    try:
+        ids = array("q", map(int, values))
+    except (TypeError, ValueError, OverflowError):
+        return values
+    if list(map(str, ids)) != values:
+        return values
+    return NumericIds(ids)
+
+
+class SymbolInterner:
+    """Assigns stable integer codes to symbol strings.
+
+    Each distinct symbol is interned once; tables store only the code per row.
+    """
+
+    def __init__(self, symbols: Iterable[str] = ()) -> None:
+        self._codes: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        for symbol in symbols:
+            self.code(symbol)
+
+    def code(self, symbol: str) -> int:
+        """Return the code for a symbol, registering it if new."""
+        code = self._codes.get(symbol)
+        if code is None:
+            code = len(self._symbols)
+            symbol = sys.intern(symbol)
+            self._codes[symbol] = code
+            self._symbols.append(symbol)
+        return code
+
+    @property
+    def symbols(self) -> Tuple[str, ...]:
+        """Symbols in code order."""
+        return tuple(self._symbols)
+
+
+class _ColumnTable:
+    """Shared behaviour for columnar tables.
+
+    Subclasses declare their numeric columns in ``_numeric_columns`` (in
+    constructor order, after ``timestamps``), any optional per-row object
+    columns in ``_object_columns``, and implement ``_record`` and ``empty``.
+    """
+
+    __slots__ = ()
+
+    _numeric_columns: Tuple[str, ...] = ()
+    _object_columns: Tuple[str, ...] = ()
+
+    timestamps: Column
+    symbol_codes: Column
+    symbols: Tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __iter__(self) -> Iterator:
+        for i in range(len(self)):
+            yield self._record(i)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step == 1:
+                return self.view(start, stop)
+            return self.take(range(start, stop, step))
+        n = len(self)
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError(f"{type(self).__name__} index out of range")
+        return self._record(key)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(rows={len(self)}, symbols={list(self.symbols)})"
+
+    def _record(self, i: int, trusted: bool = False):
+        raise NotImplementedError
+
+    def first_invalid_row(self) -> Optional[int]:
+        """Index of the first row the record type would reject, or None.
+
+        Checks whole columns at once (vectorized when NumPy is available).
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def column_names(cls) -> Tuple[str, ...]:
+        """Names of the typed (array-backed) columns, in constructor order."""
+        return ("timestamps", *cls._numeric_columns, "symbol_codes")
+
+    def _columns(self) -> Dict[str, object]:
+        """Return constructor keyword arguments for this table's data."""
+        columns = {"timestamps": self.timestamps}
+        for name in self._numeric_columns:
+            columns[name] = getattr(self, name)
+        columns["symbol_codes"] = self.symbol_codes
+        columns["symbols"] = self.symbols
+        return columns
+
+    def timestamp_at(self, i: int) -> datetime:
+        """Return the timestamp of row i as a UTC datetime."""
+        return ns_to_datetime(self.timestamps[i])
+
+    def symbol_at(self, i: int) -> str:
+        """Return the symbol of row i."""
+        return self.symbols[self.symbol_codes[i]]
+
+    def to_records(self, trusted: bool = False) -> list:
+        """Materialize the table as a list of canonical records.
+
+        Args:
+            trusted: Skip the records' per-row validation. Only for tables
+                whose columns were already validated (as the loaders do).
+        """
+        if not trusted:
+            return list(self)
+        return [self._record(i, True) for i in range(len(self))]
+
+    def is_sorted(self) -> bool:
+        """Check whether timestamps are in non-decreasing order."""
+        return is_non_decreasing(self.timestamps)
+
+    def view(self, start: int, stop: int):
+        """Return a zero-copy view of rows [start, stop).
+
+        Numeric columns are memoryview slices and object columns are
+        SequenceViews over this table's storage; nothing is copied until
+        records are materialized.
+        """
+        n = len(self)
+        start = min(max(start, 0), n)
+        stop = min(max(stop, start), n)
+        columns = {}
+        for name, column in self._columns().items():
+            if name == "symbols" or column is None:
+                columns[name] = column
+            elif isinstance(column, (array, memoryview)):
+                columns[name] = memoryview(column)[start:stop]
+            elif isinstance(column, NumericIds):
+                columns[name] = column[start:stop]
+            else:
+                columns[name] = SequenceView(column, start, stop)
+        return type(self)(**columns)
+
+    def take(self, indices: Iterable[int]):
+        """Return a new table containing the given rows (copied), in the given order."""
+        positions = None
+        if NUMPY_AVAILABLE:
+            positions = np.asarray(
+                indices if isinstance(indices, np.ndarray) else list(indices), dtype=np.intp
+            )
+            # Python ints only for list columns (string trade ids)
+            indices = None
+        else:
+            indices = list(indices)
+        columns = {}
+        for name, column in self._columns().items():
+            if name == "symbols":
+                columns[name] = column
+            elif isinstance(column, (array, memoryview)):
+                typecode = _typecode(column)
+                if positions is not None:
+                    values = as_ndarray(column, _NUMPY_DTYPES[typecode])[positions]
+                    columns[name] = array(typecode, values.tobytes())
+                else:
+                    columns[name] = array(typecode, [column[i] for i in indices])
+            elif column is None:
+                columns[name] = None
+            elif isinstance(column, NumericIds):
+                columns[name] = column.take(positions if positions is not None else indices)
+            else:
+                if indices is None:
+                    indices = positions.tolist()
+                columns[name] = [column[i] for i in indices]
+        return type(self)(**columns)
+
+    def partition_by_symbol(self) -> Dict[str, "_ColumnTable"]:
+        """Split the table into one table per symbol, preserving row order.
+
+        A single-symbol table is returned as-is without copying.
+        """
+        if len(self) == 0:
+            return {}
+        if len(self.symbols) == 1:
+            return {self.symbols[0]: self}
+        if NUMPY_AVAILABLE:
+            codes = as_ndarray(self.symbol_codes, _NUMPY_DTYPES[_typecode(self.symbol_codes)])
+            # A stable sort by code keeps each symbol's rows in table order
+            order = np.argsort(codes, kind="stable")
+            sorted_codes = codes[order]
+            bounds = np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1
+            starts = [0] + bounds.tolist()
+            stops = bounds.tolist() + [len(order)]
+            rows = {
+                int(sorted_codes[start]): order[start:stop]
+                for start, stop in zip(starts, stops)
+            }
+        else:
+            rows = {}
+            for i, code in enumerate(self.symbol_codes):
+                rows.setdefault(code, []).append(i)
+        partitions = {}
+        for code in sorted(rows):
+            part = self.take(rows[code])
+            part.symbol_codes = array(_typecode(self.symbol_codes), [0]) * len(part)
+            part.symbols = (self.symbols[code],)
+            partitions[self.symbols[code]] = part
+        return partitions
+
+    def sorted_by_timestamp(self):
+        """Return the table stably sorted by timestamp (self if already sorted)."""
+        if self.is_sorted():
+            return self
+        ts = self.timestamps
+        return self.take(sorted(range(len(ts)), key=ts.__getitem__))
+
+    @classmethod
+    def concat(cls, tables: Iterable["_ColumnTable"]):
+        """Concatenate tables row-wise into a new table.
+
+        Tables are consumed one at a time, so a generator of chunks can be
+        concatenated without holding every chunk at once. Symbol codes are
+        remapped onto the union of the tables' symbols in first-seen order,
+        and object columns missing from some tables are padded with None.
+        Numeric trade ids stay numeric unless mixed with other ids.
+        """
+        interner = SymbolInterner()
+        out = cls.empty()
+        objects: Dict[str, Union[None, list, NumericIds]] = {
+            name: None for name in cls._object_columns
+        }
+        for t in tables:
+            rows_before = len(out)
+            for name in ("timestamps", *cls._numeric_columns):
+                getattr(out, name).frombytes(memoryview(getattr(t, name)).cast("B"))
+            code_map = [interner.code(symbol) for symbol in t.symbols]
+            if code_map == list(range(len(code_map))):
+                out.symbol_codes.frombytes(memoryview(t.symbol_codes).cast("B"))
+            else:
+                out.symbol_codes.extend(code_map[c] for c in t.symbol_codes)
+            for name in cls._object_columns:
+                column = getattr(t, name)
+                values = objects[name]
+                if isinstance(column, NumericIds) and (values is None and not rows_before):
+                    values = objects[name] = NumericIds(array("q"))
+                if isinstance(values, NumericIds):
+                    if isinstance(column, NumericIds):
+                        values.values.frombytes(memoryview(column.values).cast("B"))
+                        continue
+                    values = objects[name] = list(values)
+                if column is not None and values is None:
+                    values = objects[name] = [None] * rows_before
+                if values is not None:
+                    values.extend(column if column is not None else [None] * len(t))
+        out.symbols = interner.symbols
+        for name, values in objects.items():
+            setattr(out, name, values)
+        return out
+
+
+def _check_lengths(columns: Dict[str, Optional[Sequence]]) -> None:
+    lengths = {name: len(col) for name, col in columns.items() if col is not None}
+    if len(set(lengths.values())) > 1:
+        raise ValueError(f"Column lengths differ: {lengths}")
+
+
+class TradeTable(_ColumnTable):
+    """Columnar storage for a series of trades.
+
+    Attributes:
+        timestamps: Epoch nanoseconds (int64 column 'q').
+        prices: Execution prices (float64 column 'd').
+        sizes: Trade sizes in base currency (float64 column 'd').
+        sides: Side codes, SIDE_BUY or SIDE_SELL (int8 column 'b').
+        symbol_codes: Per-row index into ``symbols`` (uint16 column 'H').
+        symbols: Interned symbol strings.
+        trade_ids: Optional per-row trade identifiers.
+    """
+
+    __slots__ = (
+        "timestamps", "prices", "sizes", "sides", "symbol_codes", "symbols", "trade_ids",
+    )
+
+    _numeric_columns = ("prices", "sizes", "sides")
+    _object_columns = ("trade_ids",)
+
+    def __init__(
+        self,
+        timestamps: Column,
+        prices: Column,
+        sizes: Column,
+        sides: Column,
+        symbol_codes: Column,
+        symbols: Tuple[str, ...],
+        trade_ids: Optional[Sequence[Optional[str]]] = None,
+    ) -> None:
+        _check_lengths({
+            "timestamps": timestamps, "prices": prices, "sizes": sizes,
+            "sides": sides, "symbol_codes": symbol_codes, "trade_ids": trade_ids,
+        })
+        self.timestamps = timestamps
+        self.prices = prices
+        self.sizes = sizes
+        self.sides = sides
+        self.symbol_codes = symbol_codes
+        self.symbols = tuple(symbols)
+        self.trade_ids = trade_ids
+
+    def _columns(self) -> Dict[str, object]:
+        columns = super()._columns()
+        columns["trade_ids"] = self.trade_ids
+        return columns
+
+    def _record(self, i: int, trusted: bool = False) -> Trade:
+        return (_trusted_trade if trusted else Trade)(
+            timestamp=ns_to_datetime(self.timestamps[i]),
+            symbol=self.symbols[self.symbol_codes[i]],
+            price=self.prices[i],
+            size=self.sizes[i],
+            side=_CODE_TO_SIDE[self.sides[i]],
+            trade_id=self.trade_ids[i] if self.trade_ids is not None else None,
+        )
+
+    def first_invalid_row(self) -> Optional[int]:
+        """Index of the first row with a non-positive price or size, or None."""
+        if NUMPY_AVAILABLE:
+            prices = as_ndarray(self.prices, "float64")
+            sizes = as_ndarray(self.sizes, "float64")
+            bad = np.flatnonzero((prices <= 0) | (sizes <= 0))
+            return int(bad[0]) if len(bad) else None
+        for i, (price, size) in enumerate(zip(self.prices, self.sizes)):
+            if price <= 0 or size <= 0:
+                return i
+        return None
+
+    @classmethod
+    def empty(cls) -> "TradeTable":
+        """Create a table with no rows."""
+        return cls(array("q"), array("d"), array("d"), array("b"), array("H"), ())
+
+    @classmethod
+    def from_records(cls, trades: Iterable[Trade]) -> "TradeTable":
+        """Build a table from Trade records, preserving their order."""
+        table = cls.empty()
+        interner = SymbolInterner()
+        trade_ids: List[Optional[str]] = []
+        for t in trades:
+            table.timestamps.append(datetime_to_ns(t.timestamp))
+            table.prices.append(t.price)
+            table.sizes.append(t.size)
+            table.sides.append(_SIDE_TO_CODE[t.side])
+            table.symbol_codes.append(interner.code(t.symbol))
+            trade_ids.append(t.trade_id)
+        table.symbols = interner.symbols
+        if any(tid is not None for tid in trade_ids):
+            table.trade_ids = trade_ids
+        return table
+
+
+class TobTable(_ColumnTable):
+    """Columnar storage for a series of top-of-book snapshots.
+
+    Attributes:
+        timestamps: Epoch nanoseconds (int64 column 'q').
+        bid_prices: Best bid prices (float64 column 'd').
+        bid_sizes: Sizes at best bid (float64 column 'd').
+        ask_prices: Best ask prices (float64 column 'd').
+        ask_sizes: Sizes at best ask (float64 column 'd').
+        symbol_codes: Per-row index into ``symbols`` (uint16 column 'H').
+        symbols: Interned symbol strings.
+    """
+
+    __slots__ = (
+        "timestamps", "bid_prices", "bid_sizes", "ask_prices", "ask_sizes",
+        "symbol_codes", "symbols",
+    )
+
+    _numeric_columns = ("bid_prices", "bid_sizes", "ask_prices", "ask_sizes")
+
+    def __init__(
+        self,
+        timestamps: Column,
+        bid_prices: Column,
+        bid_sizes: Column,
+        ask_prices: Column,
+        ask_sizes: Column,
+        symbol_codes: Column,
+        symbols: Tuple[str, ...],
+    ) -> None:
+        _check_lengths({
+            "timestamps": timestamps, "bid_prices": bid_prices, "bid_sizes": bid_sizes,
+            "ask_prices": ask_prices, "ask_sizes": ask_sizes, "symbol_codes": symbol_codes,
+        })
+        self.timestamps = timestamps
+        self.bid_prices = bid_prices
+        self.bid_sizes = bid_sizes
+        self.ask_prices = ask_prices
+        self.ask_sizes = ask_sizes
+        self.symbol_codes = symbol_codes
+        self.symbols = tuple(symbols)
+
+    def _record(self, i: int, trusted: bool = False) -> TopOfBook:
+        return (_trusted_tob if trusted else TopOfBook)(
+            timestamp=ns_to_datetime(self.timestamps[i]),
+            symbol=self.symbols[self.symbol_codes[i]],
+            bid_price=self.bid_prices[i],
+            bid_size=self.bid_sizes[i],
+            ask_price=self.ask_prices[i],
+            ask_size=self.ask_sizes[i],
+        )
+
+    def first_invalid_row(self) -> Optional[int]:
+        """Index of the first row with a bad price or size or a crossed book, or None."""
+        if NUMPY_AVAILABLE:
+            bids = as_ndarray(self.bid_prices, "float64")
+            asks = as_ndarray(self.ask_prices, "float64")
+            bad = np.flatnonzero(
+                (bids <= 0) | (asks <= 0)
+                | (as_ndarray(self.bid_sizes, "float64") < 0)
+                | (as_ndarray(self.ask_sizes, "float64") < 0)
+                | (bids > asks)
+            )
+            return int(bad[0]) if len(bad) else None
+        rows = zip(self.bid_prices, self.bid_sizes, self.ask_prices, self.ask_sizes)
+        for i, (bid, bid_size, ask, ask_size) in enumerate(rows):
+            if bid <= 0 or ask <= 0 or bid_size < 0 or ask_size < 0 or bid > ask:
+                return i
+        return None
+
+    def coalesced(self, mode: str = "timestamp") -> "TobTable":
+        """Drop redundant updates from a timestamp-sorted table.
+
+        Exchanges can publish many book updates at one timestamp, and many
+        updates only change the quoted sizes. Modes:
+
+        - ``"timestamp"``: keep only the last update of each symbol at each
+          timestamp, i.e. the book once every update at that instant applied.
+        - ``"price"``: as ``"timestamp"``, then also drop updates that leave
+          both the bid and ask price of their symbol unchanged. Mid, spread
+          and price signals are unaffected, but the kept sizes are those of
+          the first update at each price pair.
+
+        Args:
+            mode: One of TOB_COALESCE_MODES.
+
+        Returns:
+            The coalesced table (self if no row is dropped).
+
+        Raises:
+            ValueError: If mode is unknown.
+        """
+        if mode not in TOB_COALESCE_MODES:
+            raise ValueError(
+                f"Unknown coalesce mode: {mode!r}. Supported: {', '.join(TOB_COALESCE_MODES)}"
+            )
+        if len(self) == 0:
+            return self
+        if NUMPY_AVAILABLE:
+            keep = self._coalesce_rows_numpy(mode == "price")
+        else:
+            keep = self._coalesce_rows_python(mode == "price")
+        if len(keep) == len(self):
+            return self
+        return self.take(keep)
+
+    def _coalesce_rows_numpy(self, by_price: bool):
+        n = len(self)
+        ts = as_ndarray(self.timestamps, "int64")
+        codes = as_ndarray(self.symbol_codes, "uint16")
+        single = len(self.symbols) <= 1
+
+        # Last row of each (timestamp, symbol) group
+        last = np.ones(n, dtype=bool)
+        if single:
+            last[:-1] = ts[1:] != ts[:-1]
+            keep = np.flatnonzero(last)
+        else:
+            group = np.concatenate(([0], np.cumsum(ts[1:] != ts[:-1])))
+            order = np.lexsort((codes, group))  # stable: file order within a group
+            g, c = group[order], codes[order]
+            last[:-1] = (g[1:] != g[:-1]) | (c[1:] != c[:-1])
+            keep = np.sort(order[last])
+        if not by_price:
+            return keep
+
+        # Rows whose bid or ask differs from the symbol's previous kept row
+        b = as_ndarray(self.bid_prices, "float64")[keep]
+        a = as_ndarray(self.ask_prices, "float64")[keep]
+        c = codes[keep]
+        order = None
+        if not single:
+            order = np.argsort(c, kind="stable")
+            b, a, c = b[order], a[order], c[order]
+        changed = np.ones(len(keep), dtype=bool)
+        changed[1:] = (c[1:] != c[:-1]) | (b[1:] != b[:-1]) | (a[1:] != a[:-1])
+        if order is not None:
+            in_order = np.empty_like(changed)
+            in_order[order] = changed
+            changed = in_order
+        return keep[changed]
+
+    def _coalesce_rows_python(self, by_price: bool) -> List[int]:
+        ts, codes = self.timestamps, self.symbol_codes
+        keep: List[int] = []
+        current = None
+        seen: set = set()
+        # Walk backwards so the first row seen for a symbol is its last update
+        for i in range(len(self) - 1, -1, -1):
+            if ts[i] != current:
+                current = ts[i]
+                seen = set()
+            if codes[i] not in seen:
+                seen.add(codes[i])
+                keep.append(i)
+        keep.reverse()
+        if not by_price:
+            return keep
+
+        prices: Dict[int, Tuple[float, float]] = {}
+        changed = []
+        for i in keep:
+            quote = (self.bid_prices[i], self.ask_prices[i])
+            previous = prices.get(codes[i])
+            if previous is None or previous[0] != quote[0] or previous[1] != quote[1]:
+                prices[codes[i]] = quote
+                changed.append(i)
+        return changed
+
+    def mid_prices(self) -> array:
+        """Mid price per row, computed as in TopOfBook.mid_price."""
+        return array("d", [(b + a) / 2 for b, a in zip(self.bid_prices, self.ask_prices)])
+
+    def spreads(self) -> array:
+        """Absolute spread per row, computed as in TopOfBook.spread."""
+        return array("d", [a - b for b, a in zip(self.bid_prices, self.ask_prices)])
+
+    def spreads_bps(self) -> array:
+        """Spread in basis points per row, computed as in TopOfBook.spread_bps."""
+        return array(
+            "d",
+            [((a - b) / ((b + a) / 2)) * 10000 for b, a in zip(self.bid_prices, self.ask_prices)],
+        )
+
+    @classmethod
+    def empty(cls) -> "TobTable":
+        """Create a table with no rows."""
+        return cls(array("q"), array("d"), array("d"), array("d"), array("d"), array("H"), ())
+
+    @classmethod
+    def from_records(cls, tob: Iterable[TopOfBook]) -> "TobTable":
+        """Build a table from TopOfBook records, preserving their order."""
+        table = cls.empty()
+        interner = SymbolInterner()
+        for t in tob:
+            table.timestamps.append(datetime_to_ns(t.timestamp))
+            table.bid_prices.append(t.bid_price)
+            table.bid_sizes.append(t.bid_size)
+            table.ask_prices.append(t.ask_price)
+            table.ask_sizes.append(t.ask_size)
+            table.symbol_codes.append(interner.code(t.symbol))
+        table.symbols = interner.symbols
+        return table
+
+
+TradeSeries = Union[List[Trade], TradeTable]
+TobSeries = Union[List[TopOfBook], TobTable]
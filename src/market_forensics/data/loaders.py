@@ -2,17 +2,45 @@
 
 Loaders read CSV or JSONL files and convert them to canonical types.
 All loaders validate required fields and fail loudly with clear errors.
+
+The ``load_*_table`` loaders return columnar TradeTable/TobTable containers,
+which is what the pipeline runs on. The list loaders return the same data as
+Trade/TopOfBook records for compatibility. ``iter_trades``/``iter_tob`` stream
+the same rows as bounded-size chunks.
 """
 
 from __future__ import annotations
 
 import csv
+import io
 import json
+from array import array
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Set, Union
-
-from .models import Event, EventDirection, Side, TopOfBook, Trade
+from typing import Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .cache import read_table_cache, write_table_cache
+from .columnar import (
+    SIDE_BUY,
+    SIDE_SELL,
+    TOB_COALESCE_MODES,
+    SymbolInterner,
+    TobTable,
+    TradeTable,
+    datetime_to_ns,
+    encode_trade_ids,
+)
+from .models import (
+    Event,
+    EventDirection,
+    Side,
+    TopOfBook,
+    Trade,
+    validate_tob_values,
+    validate_trade_values,
+)
+from .streaming import OutOfOrderError, ordered_chunks
+from .timestamps import _is_epoch_digits, parse_timestamp_column
 
 # Required columns for each data type
 TRADE_REQUIRED_COLUMNS = {"timestamp", "symbol", "price", "size", "side"}
@@ -24,6 +52,10 @@ TOB_REQUIRED_COLUMNS = {
     "ask_price",
     "ask_size",
 }
+TRADE_OPTIONAL_COLUMNS = {"trade_id"}
+
+# CSVs are parsed (and timestamps bulk-converted) in chunks of this many rows
+DEFAULT_CHUNK_ROWS = 65536
 
 
 class DataLoadError(Exception):
@@ -36,15 +68,19 @@ def _parse_timestamp(value: str) -> datetime:
     """Parse a timestamp string to datetime.
 
     Supports ISO 8601 format and Unix timestamps (seconds or milliseconds).
+    All-digit values are ISO basic dates only at the lengths fromisoformat
+    can read as such (8 or 11 digits); epoch milliseconds such as
+    1712031500000 would otherwise be read as 1712-03-15T00:00.
     """
     # Try ISO format first
-    try:
-        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt
-    except ValueError:
-        pass
+    if not _is_epoch_digits(value):
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt
+        except ValueError:
+            pass
 
     # Try Unix timestamp (seconds or milliseconds)
     try:
@@ -59,6 +95,28 @@ def _parse_timestamp(value: str) -> datetime:
     raise DataLoadError(f"Cannot parse timestamp: {value}")
 
 
+def _parse_timestamps_ns(values: List[str]) -> array:
+    """Parse a block of timestamp strings to epoch nanoseconds.
+
+    Uses the bulk parser when the block has a fixed canonical layout and
+    falls back to _parse_timestamp row by row otherwise, so unusual formats
+    and error messages behave exactly as before.
+    """
+    column = parse_timestamp_column(values)
+    if column is None:
+        column = array("q", [datetime_to_ns(_parse_timestamp(v)) for v in values])
+    return column
+
+
+def _read_byte_range(file_path: Path, byte_range: Tuple[int, int], encoding: str) -> io.StringIO:
+    """Read and decode the bytes [start, end) of a file for csv.reader."""
+    start, end = byte_range
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return io.StringIO(data.decode(encoding), newline="")
+
+
 def _parse_side(value: str) -> Side:
     """Parse trade side from string."""
     value_lower = value.lower().strip()
@@ -70,6 +128,11 @@ def _parse_side(value: str) -> Side:
         raise DataLoadError(f"Invalid trade side: {value}")
 
 
+def _parse_side_code(value: str) -> int:
+    """Parse trade side from string into a columnar side code."""
+    return SIDE_BUY if _parse_side(value) is Side.BUY else SIDE_SELL
+
+
 def _validate_columns(actual: Set[str], required: Set[str], file_path: Path) -> None:
     """Validate that all required columns are present."""
     missing = required - actual
@@ -80,17 +143,96 @@ def _validate_columns(actual: Set[str], required: Set[str], file_path: Path) ->
         )
 
 
-def load_trades_csv(file_path: Union[Path, str]) -> List[Trade]:
-    """Load trades from a CSV file.
+def _wants_trade_ids(columns: Optional[Iterable[str]]) -> bool:
+    """Resolve a trades column projection to whether trade ids are parsed.
+
+    Required columns are always loaded, since every table row needs them;
+    the projection only decides which optional columns are parsed.
+
+    Raises:
+        DataLoadError: If the projection names an unknown column.
+    """
+    if columns is None:
+        return True
+    columns = set(columns)
+    unknown = columns - TRADE_REQUIRED_COLUMNS - TRADE_OPTIONAL_COLUMNS
+    if unknown:
+        raise DataLoadError(f"Unknown trade columns in projection: {sorted(unknown)}")
+    return "trade_id" in columns
+
+
+def _check_coalesce_mode(coalesce: Optional[str]) -> None:
+    """Reject unknown top-of-book coalesce modes before parsing anything."""
+    if coalesce is not None and coalesce not in TOB_COALESCE_MODES:
+        raise DataLoadError(
+            f"Unknown coalesce mode: {coalesce!r}. Supported: {', '.join(TOB_COALESCE_MODES)}"
+        )
+
+
+def _check_chunk(
+    chunk: Union[TradeTable, TobTable],
+    ts_values: List[str],
+    first_row: int,
+    label: str,
+    file_path: Path,
+) -> None:
+    """Validate a parsed chunk's value columns in bulk.
+
+    Raises the error the row-by-row checks would have raised: the first
+    invalid row is reported with the record type's message, unless an
+    earlier (or the same) row has a bad timestamp, which is reported first.
+
+    Args:
+        chunk: Chunk whose value columns have been filled so far.
+        ts_values: Raw timestamps of the chunk's rows, in the same order.
+        first_row: File row number of the chunk's first row.
+        label: Record name for error messages ("trade" or "top-of-book").
+        file_path: Path of the file being parsed.
+    """
+    bad = chunk.first_invalid_row()
+    if bad is None:
+        return
+    _parse_timestamps_ns(ts_values[:bad + 1])
+    try:
+        if isinstance(chunk, TradeTable):
+            validate_trade_values(chunk.prices[bad], chunk.sizes[bad])
+        else:
+            validate_tob_values(
+                chunk.bid_prices[bad], chunk.bid_sizes[bad],
+                chunk.ask_prices[bad], chunk.ask_sizes[bad],
+            )
+    except ValueError as e:
+        raise DataLoadError(
+            f"Error parsing {label} at row {first_row + bad} in {file_path}: {e}"
+        ) from e
+
+
+def load_trade_table_csv(
+    file_path: Union[Path, str],
+    use_cache: bool = True,
+    workers: Optional[int] = 1,
+    columns: Optional[Iterable[str]] = None,
+) -> TradeTable:
+    """Load trades from a CSV file into a columnar table.
 
     Expected columns: timestamp, symbol, price, size, side
     Optional columns: trade_id
 
+    Parsed columns are cached in a sidecar ``<file>.cache/`` directory (see
+    market_forensics.data.cache), so reloading an unchanged file maps the
+    cached columns instead of parsing text. Integer trade ids are held as
+    int64 (see NumericIds).
+
     Args:
         file_path: Path to the CSV file.
+        use_cache: Read and write the binary column cache.
+        workers: Processes to parse with (None for one per CPU); see
+            market_forensics.data.parallel.
+        columns: Column projection. Optional columns left out (trade_id)
+            are not parsed and load as None; None loads every column.
 
     Returns:
-        List of Trade objects sorted by timestamp.
+        TradeTable sorted by timestamp.
 
     Raises:
         DataLoadError: If file is missing, has invalid data, or missing columns.
@@ -98,38 +240,143 @@ def load_trades_csv(file_path: Union[Path, str]) -> List[Trade]:
     file_path = Path(file_path)
     if not file_path.exists():
         raise DataLoadError(f"Trades file not found: {file_path}")
-
-    trades = []
+    with_trade_ids = _wants_trade_ids(columns)
+    if use_cache:
+        cached = read_table_cache(file_path, TradeTable)
+        if cached is not None:
+            if not with_trade_ids:
+                cached.trade_ids = None
+            return cached
+
+    if workers == 1:
+        table = TradeTable.concat(
+            _read_trade_csv_chunks(file_path, DEFAULT_CHUNK_ROWS, with_trade_ids=with_trade_ids)
+        )
+    else:
+        # Imported here: the parallel module builds on this one
+        from .parallel import load_table_parallel
+        table = load_table_parallel(
+            file_path, TradeTable, workers, with_trade_ids=with_trade_ids
+        )
+    table = table.sorted_by_timestamp()
+    # A projected table would be missing columns for later full loads
+    if use_cache and with_trade_ids:
+        write_table_cache(file_path, table)
+    return table
+
+
+def _read_trade_csv_chunks(
+    file_path: Path,
+    chunk_rows: int,
+    byte_range: Optional[Tuple[int, int]] = None,
+    row_offset: int = 0,
+    with_trade_ids: bool = True,
+) -> Iterator[TradeTable]:
+    """Parse a trades CSV into tables of up to chunk_rows rows, in file order.
+
+    Chunks share one symbol interner, so codes agree across chunks. Fields
+    are parsed row by row, while value checks run on whole chunks at once
+    (see _check_chunk); either way errors name the first offending row.
+
+    If byte_range is given, only the rows in that newline-aligned
+    ``[start, end)`` byte range are parsed; row_offset is the number of data
+    rows before the range, so errors still name the row in the whole file.
+    Trade ids are skipped unless with_trade_ids is set.
+    """
+    interner = SymbolInterner()
+    ts_values: List[str] = []
+    chunk = TradeTable.empty()
+    row_num = 1 + row_offset  # Header is row 1
+    chunk_start = row_num + 1
     try:
         with open(file_path, "r", newline="") as f:
-            reader = csv.DictReader(f)
-            if reader.fieldnames is None:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
                 raise DataLoadError(f"CSV file is empty or has no header: {file_path}")
-
-            _validate_columns(
-                set(reader.fieldnames), TRADE_REQUIRED_COLUMNS, file_path
-            )
-
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is 1)
+            if byte_range is not None:
+                reader = csv.reader(_read_byte_range(file_path, byte_range, f.encoding))
+
+            _validate_columns(set(header), TRADE_REQUIRED_COLUMNS, file_path)
+            col = {name: i for i, name in enumerate(header)}
+            ts_i, sym_i, price_i = col["timestamp"], col["symbol"], col["price"]
+            size_i, side_i = col["size"], col["side"]
+            tid_i = col.get("trade_id") if with_trade_ids else None
+
+            trade_ids: List[Optional[str]] = []
+            for row in reader:
+                if not row:
+                    continue
+                row_num += 1
                 try:
-                    trade = Trade(
-                        timestamp=_parse_timestamp(row["timestamp"]),
-                        symbol=row["symbol"].strip(),
-                        price=float(row["price"]),
-                        size=float(row["size"]),
-                        side=_parse_side(row["side"]),
-                        trade_id=row.get("trade_id"),
-                    )
-                    trades.append(trade)
-                except (ValueError, KeyError) as e:
+                    ts_values.append(row[ts_i])
+                    price = float(row[price_i])
+                    size = float(row[size_i])
+                    side = _parse_side_code(row[side_i])
+                    symbol_code = interner.code(row[sym_i].strip())
+                    trade_id = row[tid_i] if tid_i is not None else None
+                except (ValueError, IndexError, DataLoadError) as e:
+                    # Bad values or timestamps on earlier rows are reported first
+                    _check_chunk(chunk, ts_values, chunk_start, "trade", file_path)
+                    _parse_timestamps_ns(ts_values)
                     raise DataLoadError(
                         f"Error parsing trade at row {row_num} in {file_path}: {e}"
                     ) from e
+                chunk.prices.append(price)
+                chunk.sizes.append(size)
+                chunk.sides.append(side)
+                chunk.symbol_codes.append(symbol_code)
+                trade_ids.append(trade_id)
+                if len(ts_values) == chunk_rows:
+                    _check_chunk(chunk, ts_values, chunk_start, "trade", file_path)
+                    chunk.timestamps = _parse_timestamps_ns(ts_values)
+                    chunk.symbols = interner.symbols
+                    chunk.trade_ids = encode_trade_ids(trade_ids) if tid_i is not None else None
+                    yield chunk
+                    chunk = TradeTable.empty()
+                    trade_ids = []
+                    ts_values = []
+                    chunk_start = row_num + 1
+
+            if ts_values:
+                _check_chunk(chunk, ts_values, chunk_start, "trade", file_path)
+                chunk.timestamps = _parse_timestamps_ns(ts_values)
+                chunk.symbols = interner.symbols
+                chunk.trade_ids = encode_trade_ids(trade_ids) if tid_i is not None else None
+                yield chunk
 
     except csv.Error as e:
+        _check_chunk(chunk, ts_values, chunk_start, "trade", file_path)
+        _parse_timestamps_ns(ts_values)
         raise DataLoadError(f"CSV parsing error in {file_path}: {e}") from e
 
-    return sorted(trades, key=lambda t: t.timestamp)
+
+def load_trades_csv(
+    file_path: Union[Path, str],
+    trusted: bool = False,
+    columns: Optional[Iterable[str]] = None,
+) -> List[Trade]:
+    """Load trades from a CSV file.
+
+    Expected columns: timestamp, symbol, price, size, side
+    Optional columns: trade_id
+
+    Args:
+        file_path: Path to the CSV file.
+        trusted: Build the records without per-record validation. The
+            columns are always validated in bulk while loading, so this only
+            skips the redundant checks in each record's constructor.
+        columns: Column projection (see load_trade_table_csv); trade ids
+            left out are None.
+
+    Returns:
+        List of Trade objects sorted by timestamp.
+
+    Raises:
+        DataLoadError: If file is missing, has invalid data, or missing columns.
+    """
+    table = load_trade_table_csv(file_path, columns=columns)
+    return table.to_records(trusted=trusted)
 
 
 def load_trades_jsonl(file_path: Union[Path, str]) -> List[Trade]:
@@ -189,16 +436,31 @@ def load_trades_jsonl(file_path: Union[Path, str]) -> List[Trade]:
     return sorted(trades, key=lambda t: t.timestamp)
 
 
-def load_tob_csv(file_path: Union[Path, str]) -> List[TopOfBook]:
-    """Load top-of-book snapshots from a CSV file.
+def load_tob_table_csv(
+    file_path: Union[Path, str],
+    use_cache: bool = True,
+    workers: Optional[int] = 1,
+    coalesce: Optional[str] = None,
+) -> TobTable:
+    """Load top-of-book snapshots from a CSV file into a columnar table.
 
     Expected columns: timestamp, symbol, bid_price, bid_size, ask_price, ask_size
 
+    Parsed columns are cached in a sidecar ``<file>.cache/`` directory (see
+    market_forensics.data.cache), so reloading an unchanged file maps the
+    cached columns instead of parsing text.
+
     Args:
         file_path: Path to the CSV file.
+        use_cache: Read and write the binary column cache.
+        workers: Processes to parse with (None for one per CPU); see
+            market_forensics.data.parallel.
+        coalesce: Drop redundant updates with TobTable.coalesced in this
+            mode ("timestamp" or "price"); None keeps every row. The cache
+            always holds every row.
 
     Returns:
-        List of TopOfBook objects sorted by timestamp.
+        TobTable sorted by timestamp.
 
     Raises:
         DataLoadError: If file is missing, has invalid data, or missing columns.
@@ -206,36 +468,122 @@ def load_tob_csv(file_path: Union[Path, str]) -> List[TopOfBook]:
     file_path = Path(file_path)
     if not file_path.exists():
         raise DataLoadError(f"Top-of-book file not found: {file_path}")
-
-    tob_list = []
+    _check_coalesce_mode(coalesce)
+    if use_cache:
+        cached = read_table_cache(file_path, TobTable)
+        if cached is not None:
+            return cached.coalesced(coalesce) if coalesce else cached
+
+    if workers == 1:
+        table = TobTable.concat(_read_tob_csv_chunks(file_path, DEFAULT_CHUNK_ROWS))
+    else:
+        # Imported here: the parallel module builds on this one
+        from .parallel import load_table_parallel
+        table = load_table_parallel(file_path, TobTable, workers)
+    table = table.sorted_by_timestamp()
+    if use_cache:
+        write_table_cache(file_path, table)
+    return table.coalesced(coalesce) if coalesce else table
+
+
+def _read_tob_csv_chunks(
+    file_path: Path,
+    chunk_rows: int,
+    byte_range: Optional[Tuple[int, int]] = None,
+    row_offset: int = 0,
+) -> Iterator[TobTable]:
+    """Parse a top-of-book CSV into tables of up to chunk_rows rows, in file order.
+
+    Chunks share one symbol interner, so codes agree across chunks. Fields
+    are parsed row by row, while value checks run on whole chunks at once
+    (see _check_chunk); either way errors name the first offending row.
+
+    If byte_range is given, only the rows in that newline-aligned
+    ``[start, end)`` byte range are parsed; row_offset is the number of data
+    rows before the range, so errors still name the row in the whole file.
+    """
+    interner = SymbolInterner()
+    ts_values: List[str] = []
+    chunk = TobTable.empty()
+    row_num = 1 + row_offset  # Header is row 1
+    chunk_start = row_num + 1
     try:
         with open(file_path, "r", newline="") as f:
-            reader = csv.DictReader(f)
-            if reader.fieldnames is None:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
                 raise DataLoadError(f"CSV file is empty or has no header: {file_path}")
-
-            _validate_columns(set(reader.fieldnames), TOB_REQUIRED_COLUMNS, file_path)
-
-            for row_num, row in enumerate(reader, start=2):
+            if byte_range is not None:
+                reader = csv.reader(_read_byte_range(file_path, byte_range, f.encoding))
+
+            _validate_columns(set(header), TOB_REQUIRED_COLUMNS, file_path)
+            col = {name: i for i, name in enumerate(header)}
+            ts_i, sym_i = col["timestamp"], col["symbol"]
+            bid_i, bid_size_i = col["bid_price"], col["bid_size"]
+            ask_i, ask_size_i = col["ask_price"], col["ask_size"]
+
+            for row in reader:
+                if not row:
+                    continue
+                row_num += 1
                 try:
-                    tob = TopOfBook(
-                        timestamp=_parse_timestamp(row["timestamp"]),
-                        symbol=row["symbol"].strip(),
-                        bid_price=float(row["bid_price"]),
-                        bid_size=float(row["bid_size"]),
-                        ask_price=float(row["ask_price"]),
-                        ask_size=float(row["ask_size"]),
-                    )
-                    tob_list.append(tob)
-                except (ValueError, KeyError) as e:
+                    ts_values.append(row[ts_i])
+                    bid_price = float(row[bid_i])
+                    bid_size = float(row[bid_size_i])
+                    ask_price = float(row[ask_i])
+                    ask_size = float(row[ask_size_i])
+                    symbol_code = interner.code(row[sym_i].strip())
+                except (ValueError, IndexError) as e:
+                    # Bad values or timestamps on earlier rows are reported first
+                    _check_chunk(chunk, ts_values, chunk_start, "top-of-book", file_path)
+                    _parse_timestamps_ns(ts_values)
                     raise DataLoadError(
                         f"Error parsing top-of-book at row {row_num} in {file_path}: {e}"
                     ) from e
+                chunk.bid_prices.append(bid_price)
+                chunk.bid_sizes.append(bid_size)
+                chunk.ask_prices.append(ask_price)
+                chunk.ask_sizes.append(ask_size)
+                chunk.symbol_codes.append(symbol_code)
+                if len(ts_values) == chunk_rows:
+                    _check_chunk(chunk, ts_values, chunk_start, "top-of-book", file_path)
+                    chunk.timestamps = _parse_timestamps_ns(ts_values)
+                    chunk.symbols = interner.symbols
+                    yield chunk
+                    chunk = TobTable.empty()
+                    ts_values = []
+                    chunk_start = row_num + 1
+
+            if ts_values:
+                _check_chunk(chunk, ts_values, chunk_start, "top-of-book", file_path)
+                chunk.timestamps = _parse_timestamps_ns(ts_values)
+                chunk.symbols = interner.symbols
+                yield chunk
 
     except csv.Error as e:
+        _check_chunk(chunk, ts_values, chunk_start, "top-of-book", file_path)
+        _parse_timestamps_ns(ts_values)
         raise DataLoadError(f"CSV parsing error in {file_path}: {e}") from e
 
-    return sorted(tob_list, key=lambda t: t.timestamp)
+
+def load_tob_csv(file_path: Union[Path, str], trusted: bool = False) -> List[TopOfBook]:
+    """Load top-of-book snapshots from a CSV file.
+
+    Expected columns: timestamp, symbol, bid_price, bid_size, ask_price, ask_size
+
+    Args:
+        file_path: Path to the CSV file.
+        trusted: Build the records without per-record validation. The
+            columns are always validated in bulk while loading, so this only
+            skips the redundant checks in each record's constructor.
+
+    Returns:
+        List of TopOfBook objects sorted by timestamp.
+
+    Raises:
+        DataLoadError: If file is missing, has invalid data, or missing columns.
+    """
+    return load_tob_table_csv(file_path).to_records(trusted=trusted)
 
 
 def load_tob_jsonl(file_path: Union[Path, str]) -> List[TopOfBook]:
@@ -294,13 +642,21 @@ def load_tob_jsonl(file_path: Union[Path, str]) -> List[TopOfBook]:
     return sorted(tob_list, key=lambda t: t.timestamp)
 
 
-def load_trades(file_path: Union[Path, str]) -> List[Trade]:
+def load_trades(
+    file_path: Union[Path, str],
+    trusted: bool = False,
+    columns: Optional[Iterable[str]] = None,
+) -> List[Trade]:
     """Load trades from a file, auto-detecting format from extension.
 
-    Supports: .csv, .jsonl
+    Supports: .csv, .jsonl, .zip (Binance aggTrades archives)
 
     Args:
         file_path: Path to the trades file.
+        trusted: For CSV and zip files, skip per-record validation (see
+            load_trades_csv). JSONL records are always validated one by one.
+        columns: For CSV and zip files, a column projection (see
+            load_trade_table_csv).
 
     Returns:
         List of Trade objects sorted by timestamp.
@@ -312,22 +668,26 @@ def load_trades(file_path: Union[Path, str]) -> List[Trade]:
     suffix = file_path.suffix.lower()
 
     if suffix == ".csv":
-        return load_trades_csv(file_path)
+        return load_trades_csv(file_path, trusted=trusted, columns=columns)
     elif suffix == ".jsonl":
         return load_trades_jsonl(file_path)
+    elif suffix == ".zip":
+        return load_trade_table(file_path, columns=columns).to_records(trusted=trusted)
     else:
         raise DataLoadError(
-            f"Unsupported file format '{suffix}' for trades. Supported: .csv, .jsonl"
+            f"Unsupported file format '{suffix}' for trades. Supported: .csv, .jsonl, .zip"
         )
 
 
-def load_tob(file_path: Union[Path, str]) -> List[TopOfBook]:
+def load_tob(file_path: Union[Path, str], trusted: bool = False) -> List[TopOfBook]:
     """Load top-of-book from a file, auto-detecting format from extension.
 
-    Supports: .csv, .jsonl
+    Supports: .csv, .jsonl, .zip (Binance bookTicker archives)
 
     Args:
         file_path: Path to the top-of-book file.
+        trusted: For CSV and zip files, skip per-record validation (see
+            load_tob_csv). JSONL records are always validated one by one.
 
     Returns:
         List of TopOfBook objects sorted by timestamp.
@@ -339,10 +699,197 @@ def load_tob(file_path: Union[Path, str]) -> List[TopOfBook]:
     suffix = file_path.suffix.lower()
 
     if suffix == ".csv":
-        return load_tob_csv(file_path)
+        return load_tob_csv(file_path, trusted=trusted)
     elif suffix == ".jsonl":
         return load_tob_jsonl(file_path)
+    elif suffix == ".zip":
+        return load_tob_table(file_path).to_records(trusted=trusted)
+    else:
+        raise DataLoadError(
+            f"Unsupported file format '{suffix}' for top-of-book. Supported: .csv, .jsonl, .zip"
+        )
+
+
+def load_trade_table(
+    file_path: Union[Path, str],
+    workers: Optional[int] = 1,
+    columns: Optional[Iterable[str]] = None,
+) -> TradeTable:
+    """Load trades into a columnar table, auto-detecting format from extension.
+
+    Supports: .csv, .jsonl, .zip (Binance aggTrades archives, see
+    market_forensics.data.binance)
+
+    Args:
+        file_path: Path to the trades file.
+        workers: Processes to parse CSV files with (None for one per CPU).
+        columns: Column projection (see load_trade_table_csv).
+
+    Returns:
+        TradeTable sorted by timestamp.
+
+    Raises:
+        DataLoadError: If format is unsupported or data is invalid.
+    """
+    file_path = Path(file_path)
+    suffix = file_path.suffix.lower()
+
+    if suffix == ".csv":
+        return load_trade_table_csv(file_path, workers=workers, columns=columns)
+    elif suffix == ".jsonl":
+        table = TradeTable.from_records(load_trades_jsonl(file_path))
+        if not _wants_trade_ids(columns):
+            table.trade_ids = None
+        return table
+    elif suffix == ".zip":
+        # Imported here: the binance module builds on this one
+        from .binance import load_agg_trades_zip
+        return load_agg_trades_zip(file_path, columns=columns)
+    else:
+        raise DataLoadError(
+            f"Unsupported file format '{suffix}' for trades. Supported: .csv, .jsonl, .zip"
+        )
+
+
+def load_tob_table(
+    file_path: Union[Path, str],
+    workers: Optional[int] = 1,
+    coalesce: Optional[str] = None,
+) -> TobTable:
+    """Load top-of-book into a columnar table, auto-detecting format from extension.
+
+    Supports: .csv, .jsonl, .zip (Binance bookTicker archives, see
+    market_forensics.data.binance)
+
+    Args:
+        file_path: Path to the top-of-book file.
+        workers: Processes to parse CSV files with (None for one per CPU).
+        coalesce: Coalesce mode for redundant updates (see
+            load_tob_table_csv); None keeps every row.
+
+    Returns:
+        TobTable sorted by timestamp.
+
+    Raises:
+        DataLoadError: If format is unsupported or data is invalid.
+    """
+    file_path = Path(file_path)
+    suffix = file_path.suffix.lower()
+
+    if suffix == ".csv":
+        return load_tob_table_csv(file_path, workers=workers, coalesce=coalesce)
+    elif suffix == ".jsonl":
+        _check_coalesce_mode(coalesce)
+        table = TobTable.from_records(load_tob_jsonl(file_path))
+        return table.coalesced(coalesce) if coalesce else table
+    elif suffix == ".zip":
+        # Imported here: the binance module builds on this one
+        from .binance import load_book_ticker_zip
+        return load_book_ticker_zip(file_path, coalesce=coalesce)
+    else:
+        raise DataLoadError(
+            f"Unsupported file format '{suffix}' for top-of-book. Supported: .csv, .jsonl, .zip"
+        )
+
+
+def iter_trades(
+    file_path: Union[Path, str],
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    spill_dir: Optional[Union[Path, str]] = None,
+) -> Iterator[TradeTable]:
+    """Stream trades as columnar chunks in timestamp order.
+
+    CSV files are parsed chunk by chunk, so memory stays bounded by a few
+    chunks. Timestamps are checked for order as chunks are read; only if
+    out-of-order rows are found is the rest of the file sorted with an
+    external merge sort spilled to ``spill_dir`` (see
+    market_forensics.data.streaming). JSONL files are loaded whole and then
+    chunked.
+
+    Only one chunk is held back before it is yielded, so a row can be at
+    most one chunk late: a row older than a chunk already yielded raises
+    DataLoadError. Load such files whole with load_trade_table, which sorts.
+
+    Concatenating the chunks gives the same rows as load_trade_table.
+
+    Args:
+        file_path: Path to the trades file (.csv or .jsonl).
+        chunk_rows: Maximum rows per chunk.
+        spill_dir: Directory for external sort runs (system temp if None).
+
+    Yields:
+        TradeTable chunks of at most chunk_rows rows.
+
+    Raises:
+        DataLoadError: If the file is missing, invalid, or has a row older
+            than a chunk already yielded.
+    """
+    file_path = Path(file_path)
+    suffix = file_path.suffix.lower()
+    if suffix == ".csv":
+        if not file_path.exists():
+            raise DataLoadError(f"Trades file not found: {file_path}")
+        chunks = _read_trade_csv_chunks(file_path, chunk_rows)
+    elif suffix == ".jsonl":
+        table = TradeTable.from_records(load_trades_jsonl(file_path))
+        chunks = (table.view(i, i + chunk_rows) for i in range(0, len(table), chunk_rows))
+    else:
+        raise DataLoadError(
+            f"Unsupported file format '{suffix}' for trades. Supported: .csv, .jsonl"
+        )
+    yield from _ordered(chunks, file_path, chunk_rows, spill_dir)
+
+
+def iter_tob(
+    file_path: Union[Path, str],
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    spill_dir: Optional[Union[Path, str]] = None,
+) -> Iterator[TobTable]:
+    """Stream top-of-book snapshots as columnar chunks in timestamp order.
+
+    See iter_trades for how ordering and memory are handled. As there, a
+    row can be at most one chunk late; a row older than a chunk already
+    yielded raises DataLoadError (load_tob_table sorts the whole file).
+    Concatenating the chunks gives the same rows as load_tob_table.
+
+    Args:
+        file_path: Path to the top-of-book file (.csv or .jsonl).
+        chunk_rows: Maximum rows per chunk.
+        spill_dir: Directory for external sort runs (system temp if None).
+
+    Yields:
+        TobTable chunks of at most chunk_rows rows.
+
+    Raises:
+        DataLoadError: If the file is missing, invalid, or has a row older
+            than a chunk already yielded.
+    """
+    file_path = Path(file_path)
+    suffix = file_path.suffix.lower()
+    if suffix == ".csv":
+        if not file_path.exists():
+            raise DataLoadError(f"Top-of-book file not found: {file_path}")
+        chunks = _read_tob_csv_chunks(file_path, chunk_rows)
+    elif suffix == ".jsonl":
+        table = TobTable.from_records(load_tob_jsonl(file_path))
+        chunks = (table.view(i, i + chunk_rows) for i in range(0, len(table), chunk_rows))
     else:
         raise DataLoadError(
             f"Unsupported file format '{suffix}' for top-of-book. Supported: .csv, .jsonl"
         )
+    yield from _ordered(chunks, file_path, chunk_rows, spill_dir)
+
+
+def _ordered(
+    chunks: Iterator,
+    file_path: Path,
+    chunk_rows: int,
+    spill_dir: Optional[Union[Path, str]],
+) -> Iterator:
+    """Apply streaming order checks, reporting failures as DataLoadError."""
+    try:
+        yield from ordered_chunks(
+            chunks, chunk_rows, Path(spill_dir) if spill_dir is not None else None
+        )
+    except OutOfOrderError as e:
+        raise DataLoadError(f"Timestamps out of order in {file_path}: {e}") from e
@@ -2,6 +2,10 @@
 
 These schemas define the expected structure for all market data flowing through
 the pipeline. Loaders must convert raw data into these types.
+
+Trade and TopOfBook are slotted (no per-instance ``__dict__``) because a
+materialized day holds millions of them; bulk data should stay in the
+columnar tables of market_forensics.data.columnar.
 """
 
 from dataclasses import dataclass
@@ -24,7 +28,45 @@ class EventDirection(Enum):
     DOWN = "down"
 
 
-@dataclass(frozen=True)
+def validate_trade_values(price: float, size: float) -> None:
+    """Validate trade fields.
+
+    Shared by Trade construction and the columnar loaders so both report
+    the same errors.
+
+    Raises:
+        ValueError: If price or size is not positive.
+    """
+    if price <= 0:
+        raise ValueError(f"Trade price must be positive, got {price}")
+    if size <= 0:
+        raise ValueError(f"Trade size must be positive, got {size}")
+
+
+def validate_tob_values(
+    bid_price: float, bid_size: float, ask_price: float, ask_size: float
+) -> None:
+    """Validate top-of-book fields.
+
+    Raises:
+        ValueError: If a price is not positive, a size is negative, or the
+                    book is crossed.
+    """
+    if bid_price <= 0:
+        raise ValueError(f"Bid price must be positive, got {bid_price}")
+    if ask_price <= 0:
+        raise ValueError(f"Ask price must be positive, got {ask_price}")
+    if bid_size < 0:
+        raise ValueError(f"Bid size must be non-negative, got {bid_size}")
+    if ask_size < 0:
+        raise ValueError(f"Ask size must be non-negative, got {ask_size}")
+    if bid_price > ask_price:
+        raise ValueError(
+            f"Bid price ({bid_price}) cannot exceed ask price ({ask_price})"
+        )
+
+
+@dataclass(frozen=True, slots=True)
 class Trade:
     """A single trade execution.
 
@@ -46,16 +88,27 @@ class Trade:
 
     def __post_init__(self) -> None:
         """Validate trade data."""
-        if self.price <= 0:
-            raise ValueError(f"Trade price must be positive, got {self.price}")
-        if self.size <= 0:
-            raise ValueError(f"Trade size must be positive, got {self.size}")
+        validate_trade_values(self.price, self.size)
 
 
-@dataclass(frozen=True)
-class TopOfBook:
+class _DerivedTobSlots:
+    """Cache slots of TopOfBook's derived values.
+
+    Declared on a plain base class so they are not dataclass fields:
+    asdict(), astuple(), fields() and comparisons see only the snapshot.
+    """
+
+    __slots__ = ("_mid_price", "_spread", "_spread_bps")
+
+
+@dataclass(frozen=True, slots=True)
+class TopOfBook(_DerivedTobSlots):
     """Top of book (best bid/ask) snapshot.
 
+    The derived mid price, spread and spread in bps are computed together
+    on first access and cached in slots that stay empty until then, so
+    building a snapshot costs no more than the plain fields.
+
     Attributes:
         timestamp: UTC timestamp of the snapshot.
         symbol: Trading pair symbol (e.g., 'BTC-USDT').
@@ -74,33 +127,101 @@ class TopOfBook:
 
     def __post_init__(self) -> None:
         """Validate top of book data."""
-        if self.bid_price <= 0:
-            raise ValueError(f"Bid price must be positive, got {self.bid_price}")
-        if self.ask_price <= 0:
-            raise ValueError(f"Ask price must be positive, got {self.ask_price}")
-        if self.bid_size < 0:
-            raise ValueError(f"Bid size must be non-negative, got {self.bid_size}")
-        if self.ask_size < 0:
-            raise ValueError(f"Ask size must be non-negative, got {self.ask_size}")
-        if self.bid_price > self.ask_price:
-            raise ValueError(
-                f"Bid price ({self.bid_price}) cannot exceed ask price ({self.ask_price})"
-            )
+        validate_tob_values(self.bid_price, self.bid_size, self.ask_price, self.ask_size)
+
+    def __reduce__(self):
+        # Pickle only the public fields; the cache slots may be unset
+        return (type(self), (
+            self.timestamp, self.symbol,
+            self.bid_price, self.bid_size, self.ask_price, self.ask_size,
+        ))
+
+    def _derive(self) -> None:
+        """Compute and cache the derived fields."""
+        mid = (self.bid_price + self.ask_price) / 2
+        spread = self.ask_price - self.bid_price
+        object.__setattr__(self, "_mid_price", mid)
+        object.__setattr__(self, "_spread", spread)
+        object.__setattr__(self, "_spread_bps", (spread / mid) * 10000)
 
     @property
     def mid_price(self) -> float:
         """Calculate mid price."""
-        return (self.bid_price + self.ask_price) / 2
+        try:
+            return self._mid_price
+        except AttributeError:
+            self._derive()
+            return self._mid_price
 
     @property
     def spread(self) -> float:
         """Calculate absolute spread."""
-        return self.ask_price - self.bid_price
+        try:
+            return self._spread
+        except AttributeError:
+            self._derive()
+            return self._spread
 
     @property
     def spread_bps(self) -> float:
         """Calculate spread in basis points relative to mid price."""
-        return (self.spread / self.mid_price) * 10000
+        try:
+            return self._spread_bps
+        except AttributeError:
+            self._derive()
+            return self._spread_bps
+
+
+# Slot setters used by the trusted constructors below. Setting slots through
+# their descriptors skips the frozen __setattr__ and __post_init__.
+_TRADE_SETTERS = tuple(
+    getattr(Trade, name).__set__
+    for name in ("timestamp", "symbol", "price", "size", "side", "trade_id")
+)
+_TOB_SETTERS = tuple(
+    getattr(TopOfBook, name).__set__
+    for name in ("timestamp", "symbol", "bid_price", "bid_size", "ask_price", "ask_size")
+)
+
+
+def _trusted_trade(
+    timestamp: datetime,
+    symbol: str,
+    price: float,
+    size: float,
+    side: Side,
+    trade_id: Optional[str] = None,
+) -> Trade:
+    """Build a Trade from values that were already validated in bulk."""
+    set_ts, set_symbol, set_price, set_size, set_side, set_id = _TRADE_SETTERS
+    trade = object.__new__(Trade)
+    set_ts(trade, timestamp)
+    set_symbol(trade, symbol)
+    set_price(trade, price)
+    set_size(trade, size)
+    set_side(trade, side)
+    set_id(trade, trade_id)
+    return trade
+
+
+def _trusted_tob(
+    timestamp: datetime,
+    symbol: str,
+    bid_price: float,
+    bid_size: float,
+    ask_price: float,
+    ask_size: float,
+) -> TopOfBook:
+    """Build a TopOfBook from values that were already validated in bulk."""
+    set_ts, set_symbol, set_bid, set_bid_size, set_ask, set_ask_size = _TOB_SETTERS
+    tob = object.__new__(TopOfBook)
+    set_ts(tob, timestamp)
+    set_symbol(tob, symbol)
+    set_bid(tob, bid_price)
+    set_bid_size(tob, bid_size)
+    set_ask(tob, ask_price)
+    set_ask_size(tob, ask_size)
+    return tob
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,231 @@
+"""Parallel byte-range parsing of canonical CSV files.
+
+A canonical day is one large CSV, and parsing it in one process leaves the
+other cores idle. load_table_parallel splits the file into newline-aligned
+byte ranges, parses each range in a worker process into a columnar table,
+and concatenates the tables in file order.
+
+Workers hand their numeric columns back through
+``multiprocessing.shared_memory`` blocks rather than pickling rows: the
+parent maps each block, copies the columns into the final table and unlinks
+it. Only the small per-range metadata (row count, symbols, column layout)
+and the optional trade id column are pickled.
+
+Byte-range splitting assumes no quoted field contains a newline, which holds
+for the canonical files. Any worker failure falls back to a sequential parse,
+so error messages (and the row numbers in them) are the sequential loader's.
+"""
+
+from __future__ import annotations
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import List, Optional, Tuple, Type, Union
+
+from .columnar import NumericIds, TobTable, TradeTable, _ColumnTable, _typecode
+from .loaders import DEFAULT_CHUNK_ROWS, _read_tob_csv_chunks, _read_trade_csv_chunks
+
+# Files smaller than this are parsed in-process; worker startup would dominate
+MIN_PARALLEL_BYTES = 8 * 1024 * 1024
+
+_CHUNK_READERS = {
+    "TradeTable": _read_trade_csv_chunks,
+    "TobTable": _read_tob_csv_chunks,
+}
+_TABLE_TYPES = {"TradeTable": TradeTable, "TobTable": TobTable}
+
+
+def default_workers() -> int:
+    """Number of worker processes to use when not specified."""
+    return os.cpu_count() or 1
+
+
+def split_byte_ranges(file_path: Union[Path, str], parts: int) -> List[Tuple[int, int]]:
+    """Split the data rows of a CSV into newline-aligned byte ranges.
+
+    Args:
+        file_path: Path to a CSV file with a one-line header.
+        parts: Desired number of ranges.
+
+    Returns:
+        Non-empty ``[start, end)`` ranges covering every byte after the
+        header line, in file order (at most ``parts`` of them).
+    """
+    with open(file_path, "rb") as f:
+        f.readline()
+        data_start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+        bounds = [data_start]
+        for i in range(1, parts):
+            target = data_start + (size - data_start) * i // parts
+            if target <= bounds[-1]:
+                continue
+            # Move to the start of the line containing target
+            f.seek(target - 1)
+            f.readline()
+            boundary = f.tell()
+            if bounds[-1] < boundary < size:
+                bounds.append(boundary)
+        bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def load_table_parallel(
+    file_path: Union[Path, str],
+    table_cls: Type[_ColumnTable],
+    workers: Optional[int] = None,
+    min_parallel_bytes: int = MIN_PARALLEL_BYTES,
+    with_trade_ids: bool = True,
+) -> _ColumnTable:
+    """Parse a CSV into a table using several worker processes.
+
+    The result has the rows in file order (not yet sorted), exactly as the
+    sequential chunk reader would produce them.
+
+    Args:
+        file_path: Path to the CSV file.
+        table_cls: TradeTable or TobTable.
+        workers: Number of worker processes (CPU count if None).
+        min_parallel_bytes: Files smaller than this are parsed in-process.
+        with_trade_ids: Parse trade ids (TradeTable only); when False the
+            workers skip them and the table has none.
+
+    Returns:
+        The parsed table in file order.
+
+    Raises:
+        DataLoadError: If the file is invalid (raised by the sequential
+            re-parse, with the usual row numbers).
+    """
+    file_path = Path(file_path)
+    kind = table_cls.__name__
+    workers = workers or default_workers()
+    options = {} if with_trade_ids else {"with_trade_ids": False}
+    if workers <= 1 or file_path.stat().st_size < min_parallel_bytes:
+        return _load_sequential(file_path, kind, options)
+
+    ranges = split_byte_ranges(file_path, workers)
+    results: List[dict] = []
+    failed = False
+    # Workers inherit the parent's resource tracker, so their shared memory
+    # blocks are not reclaimed when a worker exits before the parent reads them
+    resource_tracker.ensure_running()
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+            futures = [
+                pool.submit(_parse_range, kind, str(file_path), byte_range, options)
+                for byte_range in ranges
+            ]
+            for future in futures:
+                # Keep collecting after a failure: every block handed back
+                # by the other workers must still be unlinked
+                try:
+                    results.append(future.result())
+                except Exception:
+                    failed = True
+        if not failed:
+            return table_cls.concat(_SharedTables(results, kind))
+    finally:
+        for result in results:
+            _unlink(result["shm"])
+    return _load_sequential(file_path, kind, options)
+
+
+def _load_sequential(file_path: Path, kind: str, options: dict) -> _ColumnTable:
+    chunks = _CHUNK_READERS[kind](file_path, DEFAULT_CHUNK_ROWS, **options)
+    return _TABLE_TYPES[kind].concat(chunks)
+
+
+def _parse_range(
+    kind: str,
+    file_path: str,
+    byte_range: Tuple[int, int],
+    options: dict,
+) -> dict:
+    """Worker: parse one byte range and publish its columns in shared memory.
+
+    options are extra keyword arguments for the chunk reader.
+    """
+    table = _TABLE_TYPES[kind].concat(
+        _CHUNK_READERS[kind](Path(file_path), DEFAULT_CHUNK_ROWS, byte_range, **options)
+    )
+    trade_ids = getattr(table, "trade_ids", None)
+    typed = {name: getattr(table, name) for name in table.column_names()}
+    if isinstance(trade_ids, NumericIds):
+        # Integer ids travel through shared memory like the other columns
+        typed["trade_ids"] = trade_ids.values
+        trade_ids = None
+    layout = []
+    offset = 0
+    for name, column in typed.items():
+        layout.append((name, _typecode(column), offset, len(column)))
+        offset += len(column) * column.itemsize
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    handed_back = False
+    try:
+        for name, _, start, _ in layout:
+            data = memoryview(typed[name]).cast("B")
+            shm.buf[start:start + len(data)] = data
+        result = {
+            "shm": shm.name,
+            "layout": layout,
+            "symbols": table.symbols,
+            # Ids cannot contain newlines (ranges are split on them), so one
+            # joined string pickles far faster than a list of strings
+            "trade_ids": "\n".join(trade_ids) if trade_ids is not None else None,
+            "rows": len(table),
+        }
+        handed_back = True
+        return result
+    finally:
+        shm.close()
+        # The parent only learns the name from the result, so a block that
+        # is never handed back has to be unlinked here
+        if not handed_back:
+            shm.unlink()
+
+
+class _SharedTables:
+    """Iterate worker results as tables backed by their shared memory blocks.
+
+    Each block is only mapped while its table is being concatenated.
+    """
+
+    def __init__(self, results: List[dict], kind: str) -> None:
+        self._results = results
+        self._table_cls = _TABLE_TYPES[kind]
+
+    def __iter__(self):
+        for result in self._results:
+            shm = shared_memory.SharedMemory(name=result["shm"])
+            views = []
+            try:
+                columns = {}
+                for name, typecode, start, length in result["layout"]:
+                    raw = shm.buf[start:start + length * array(typecode).itemsize]
+                    views.append(raw)
+                    columns[name] = raw.cast(typecode)
+                    views.append(columns[name])
+                if "trade_ids" in columns:
+                    columns["trade_ids"] = NumericIds(columns["trade_ids"])
+                trade_ids = result["trade_ids"]
+                if trade_ids is not None:
+                    columns["trade_ids"] = trade_ids.split("\n") if result["rows"] else []
+                yield self._table_cls(symbols=result["symbols"], **columns)
+            finally:
+                columns = None
+                for view in reversed(views):
+                    view.release()
+                shm.close()
+
+
+def _unlink(name: str) -> None:
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
@@ -0,0 +1,240 @@
+"""Ordering for streamed table chunks.
+
+The chunked loaders (iter_trades / iter_tob) read a file in fixed-size
+column chunks so multi-day spans can be processed in bounded memory. Instead
+of sorting globally, they check that timestamps are non-decreasing as they
+go and only fall back to an external merge sort when disorder is found.
+
+One chunk is held back before it is yielded, so disorder that straddles a
+chunk boundary is still repaired. Once disorder is found, the held chunk and
+the rest of the stream are sorted into runs spilled to temporary ``.npy``
+files and k-way merged back into chunks. A row older than something already
+yielded cannot be repaired and raises OutOfOrderError: files with rows more
+than one chunk late must be loaded whole (load_trades_csv and friends sort).
+
+Spilled runs are read back a block at a time with open/seek/read, so no
+file stays open between blocks and the number of runs (many days at a small
+chunk_rows) is not limited by the open-file limit.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import tempfile
+from array import array
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from .cache import write_npy
+from .columnar import _ColumnTable, _typecode, ns_to_datetime
+
+T = TypeVar("T", bound=_ColumnTable)
+
+# Rows of each spilled run held in memory at a time during the merge
+RUN_BLOCK_ROWS = 1024
+
+
+class OutOfOrderError(ValueError):
+    """Raised when a streamed row is older than rows already yielded."""
+
+    pass
+
+
+def ordered_chunks(
+    chunks: Iterable[T],
+    chunk_rows: int,
+    spill_dir: Optional[Path] = None,
+) -> Iterator[T]:
+    """Yield chunks in non-decreasing timestamp order.
+
+    Chunks that are already in order pass through unchanged. Equal
+    timestamps keep their input order, so the concatenated output matches a
+    stable sort of the whole input.
+
+    Args:
+        chunks: Tables in input order, sharing one set of symbol codes (each
+            chunk's symbols extend the previous chunk's).
+        chunk_rows: Rows per chunk produced by the external merge.
+        spill_dir: Directory for temporary sort runs (system default if None).
+
+    Raises:
+        OutOfOrderError: If a row is older than a row already yielded.
+    """
+    chunks = iter(chunks)
+    pending: Optional[T] = None
+    emitted_ns: Optional[int] = None
+    for chunk in chunks:
+        if not len(chunk):
+            continue
+        in_order = chunk.is_sorted() and (
+            pending is None or pending.timestamps[-1] <= chunk.timestamps[0]
+        )
+        if not in_order:
+            held = [pending, chunk] if pending is not None else [chunk]
+            yield from _external_sort(chain(held, chunks), chunk_rows, emitted_ns, spill_dir)
+            return
+        if pending is not None:
+            yield pending
+            emitted_ns = pending.timestamps[-1]
+        pending = chunk
+    if pending is not None:
+        yield pending
+
+
+def _external_sort(
+    chunks: Iterator[T],
+    chunk_rows: int,
+    emitted_ns: Optional[int],
+    spill_dir: Optional[Path],
+) -> Iterator[T]:
+    """Sort the remaining chunks via spilled runs and a k-way merge."""
+    with tempfile.TemporaryDirectory(prefix="mf-sort-", dir=spill_dir) as tmp:
+        runs: List[_SpilledRun] = []
+        table_cls = None
+        symbols: tuple = ()
+        for i, chunk in enumerate(chunks):
+            if not len(chunk):
+                continue
+            table_cls = type(chunk)
+            symbols = chunk.symbols
+            run = chunk.sorted_by_timestamp()
+            if emitted_ns is not None and run.timestamps[0] < emitted_ns:
+                raise OutOfOrderError(
+                    f"row at {ns_to_datetime(run.timestamps[0]).isoformat()} follows "
+                    f"rows up to {ns_to_datetime(emitted_ns).isoformat()} that were "
+                    f"already yielded"
+                )
+            runs.append(_SpilledRun(run, Path(tmp) / f"run{i}"))
+        if table_cls is None:
+            return
+
+        # (timestamp, run, row) keys break ties by input order: a stable merge
+        merged = heapq.merge(*(run.keys(i) for i, run in enumerate(runs)))
+        out = _MergeBuffer(table_cls, symbols)
+        for _, run_index, row in merged:
+            out.append(runs[run_index], row)
+            if len(out) == chunk_rows:
+                yield out.flush()
+        if len(out):
+            yield out.flush()
+
+
+class _SpilledRun:
+    """A sorted run written to disk and read back block by block for the merge.
+
+    Typed columns are ``.npy`` files; object columns (trade ids) are written
+    one JSON value per line. Each block is read with its own open/seek/read,
+    so a run holds no open file between blocks.
+
+    Attributes:
+        block: Column name -> values of the current block (object columns
+            only if the run has them).
+        block_start: Run row of the block's first value.
+        block_rows: Rows in the block.
+    """
+
+    def __init__(self, run: _ColumnTable, prefix: Path) -> None:
+        self.rows = len(run)
+        self._typed: Dict[str, Tuple[Path, str, int]] = {}
+        for name in run.column_names():
+            column = getattr(run, name)
+            path = prefix.with_name(f"{prefix.name}.{name}.npy")
+            write_npy(path, column)
+            typecode = _typecode(column)
+            # The data region is the end of the file
+            offset = path.stat().st_size - len(column) * array(typecode).itemsize
+            self._typed[name] = (path, typecode, offset)
+        self._objects: Dict[str, List] = {}
+        for name in run._object_columns:
+            column = getattr(run, name)
+            if column is None:
+                continue
+            path = prefix.with_name(f"{prefix.name}.{name}.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                for value in column:
+                    f.write(json.dumps(value) + "\n")
+            # [path, byte offset of the next unread line]
+            self._objects[name] = [path, 0]
+        self.block: Dict[str, object] = {}
+        self.block_start = 0
+        self.block_rows = 0
+
+    def has_objects(self, name: str) -> bool:
+        return name in self._objects
+
+    def keys(self, run_index: int) -> Iterator[Tuple[int, int, int]]:
+        for start in range(0, self.rows, RUN_BLOCK_ROWS):
+            timestamps = self._read_typed("timestamps", start)
+            for row, ts in enumerate(timestamps, start):
+                yield ts, run_index, row
+
+    def seek(self, row: int) -> int:
+        """Load the block holding row (rows are visited in order); returns its position."""
+        if not 0 <= row - self.block_start < self.block_rows:
+            self.block_start = row
+            self.block_rows = min(self.rows, row + RUN_BLOCK_ROWS) - row
+            self.block = {name: self._read_typed(name, row) for name in self._typed}
+            for name in self._objects:
+                self.block[name] = self._read_objects(name, self.block_rows)
+        return row - self.block_start
+
+    def _read_typed(self, name: str, start: int) -> array:
+        path, typecode, offset = self._typed[name]
+        values = array(typecode)
+        stop = min(self.rows, start + RUN_BLOCK_ROWS)
+        with open(path, "rb") as f:
+            f.seek(offset + start * values.itemsize)
+            values.frombytes(f.read((stop - start) * values.itemsize))
+        return values
+
+    def _read_objects(self, name: str, count: int) -> list:
+        state = self._objects[name]
+        with open(state[0], "rb") as f:
+            f.seek(state[1])
+            values = [json.loads(f.readline()) for _ in range(count)]
+            state[1] = f.tell()
+        return values
+
+
+class _MergeBuffer:
+    """Accumulates merged rows into an output chunk."""
+
+    def __init__(self, table_cls, symbols: tuple) -> None:
+        self._table_cls = table_cls
+        self._symbols = symbols
+        self._reset()
+
+    def _reset(self) -> None:
+        self._table = self._table_cls.empty()
+        self._typed = [
+            (getattr(self._table, name), name) for name in self._table.column_names()
+        ]
+        self._objects: Dict[str, list] = {name: [] for name in self._table_cls._object_columns}
+        self._has_objects = {name: False for name in self._objects}
+
+    def __len__(self) -> int:
+        return len(self._table.timestamps)
+
+    def append(self, run: _SpilledRun, row: int) -> None:
+        position = row - run.block_start
+        if not 0 <= position < run.block_rows:
+            position = run.seek(row)
+        block = run.block
+        for column, name in self._typed:
+            column.append(block[name][position])
+        for name, values in self._objects.items():
+            if run.has_objects(name):
+                self._has_objects[name] = True
+                values.append(block[name][position])
+            else:
+                values.append(None)
+
+    def flush(self) -> _ColumnTable:
+        table = self._table
+        table.symbols = self._symbols
+        for name, values in self._objects.items():
+            setattr(table, name, values if self._has_objects[name] else None)
+        self._reset()
+        return table
@@ -0,0 +1,516 @@
+"""Byte-offset time index for canonical CSV files.
+
+Event windows cover a few minutes, yet loading a day parses every row. The
+time index records a (timestamp, byte offset) checkpoint every ``stride``
+data rows of a time-sorted CSV, so a time range can be served by seeking to
+the checkpoint before it and parsing only the rows up to the checkpoint
+after it.
+
+Indexes are stored as ``time_index.json`` in the file's sidecar cache
+directory (see market_forensics.data.cache) and are rebuilt whenever the
+source file's size or mtime changes. Building an index parses every
+timestamp once, which also verifies the file is sorted; unsorted files are
+indexed as such and range loads fall back to a full load.
+
+For the last minutes of a file, e.g. the pre-event rows a window after
+midnight needs from the previous day, load_trades_tail and load_tob_tail
+read the file backwards from its end in blocks instead, stopping at the
+first row before the start time, so no index has to be built.
+
+Like the parallel loader, the index and the tail reader assume no quoted
+field contains a newline, which holds for the canonical files.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+from .cache import cache_dir_for, read_table_cache
+from .columnar import TobTable, TradeTable, datetime_to_ns, is_non_decreasing
+from .loaders import (
+    DEFAULT_CHUNK_ROWS,
+    DataLoadError,
+    _parse_timestamps_ns,
+    _read_tob_csv_chunks,
+    _read_trade_csv_chunks,
+    load_tob_table,
+    load_trade_table,
+)
+
+INDEX_VERSION = 1
+INDEX_NAME = "time_index.json"
+DEFAULT_INDEX_STRIDE = 4096
+DEFAULT_TAIL_BLOCK_BYTES = 1 << 16
+
+_BLANK_LINES = (b"\n", b"\r\n", b"\r", b"")
+
+
+@dataclass
+class TimeIndex:
+    """Checkpoints into a CSV file, one every ``stride`` data rows.
+
+    Attributes:
+        stride: Data rows between checkpoints.
+        rows: Number of data rows in the file.
+        is_sorted: Whether the file's timestamps are non-decreasing.
+        data_end: Byte offset of the end of the file.
+        timestamps: Epoch-ns timestamp of each checkpoint row.
+        offsets: Byte offset of each checkpoint row (checkpoint i is data
+            row ``i * stride``).
+    """
+
+    stride: int
+    rows: int
+    is_sorted: bool
+    data_end: int
+    timestamps: array
+    offsets: array
+
+    def locate(self, start_ns: int, end_ns: int) -> Tuple[Tuple[int, int], int]:
+        """Find the byte range holding every row with start_ns <= ts < end_ns.
+
+        Returns:
+            ``((start_offset, end_offset), rows_before)`` where rows_before is
+            the number of data rows preceding start_offset. The range may
+            include a few rows outside the time range on either side.
+
+        Raises:
+            ValueError: If the index is for an unsorted file.
+        """
+        if not self.is_sorted:
+            raise ValueError("Cannot locate time ranges in an unsorted file")
+        if not self.offsets:
+            return (self.data_end, self.data_end), 0
+        # Start at the last checkpoint strictly before start_ns: rows equal to
+        # start_ns may precede a checkpoint that has that timestamp
+        first = max(bisect_left(self.timestamps, start_ns) - 1, 0)
+        # Stop at the first checkpoint at or after end_ns
+        last = bisect_left(self.timestamps, end_ns)
+        end_offset = self.offsets[last] if last < len(self.offsets) else self.data_end
+        start_offset = min(self.offsets[first], end_offset)
+        return (start_offset, end_offset), first * self.stride
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "stride": self.stride,
+            "rows": self.rows,
+            "is_sorted": self.is_sorted,
+            "data_end": self.data_end,
+            "timestamps": list(self.timestamps),
+            "offsets": list(self.offsets),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TimeIndex":
+        """Create from a dictionary produced by to_dict."""
+        return cls(
+            stride=data["stride"],
+            rows=data["rows"],
+            is_sorted=data["is_sorted"],
+            data_end=data["data_end"],
+            timestamps=array("q", data["timestamps"]),
+            offsets=array("q", data["offsets"]),
+        )
+
+
+def build_time_index(
+    file_path: Union[Path, str],
+    stride: int = DEFAULT_INDEX_STRIDE,
+) -> TimeIndex:
+    """Scan a CSV file and build its time index.
+
+    Args:
+        file_path: Path to a CSV file with a ``timestamp`` column.
+        stride: Data rows between checkpoints.
+
+    Returns:
+        The time index.
+
+    Raises:
+        DataLoadError: If the file has no timestamp column or a timestamp
+            cannot be parsed.
+    """
+    file_path = Path(file_path)
+    timestamps = array("q")
+    offsets = array("q")
+    checkpoint_rows: List[int] = []
+    last_ns: Optional[int] = None
+    is_sorted = True
+    rows = 0
+
+    with open(file_path, "rb") as f:
+        header = next(csv.reader([f.readline().decode()]), [])
+        if "timestamp" not in header:
+            raise DataLoadError(f"Missing required columns in {file_path}: ['timestamp']")
+        ts_col = header.index("timestamp")
+        offset = f.tell()
+
+        block: List[str] = []
+
+        def flush() -> None:
+            nonlocal last_ns, is_sorted
+            parsed = _parse_timestamps_ns(block)
+            for row in checkpoint_rows:
+                timestamps.append(parsed[row - (rows - len(block))])
+            checkpoint_rows.clear()
+            if is_sorted and parsed:
+                is_sorted = is_non_decreasing(parsed) and (
+                    last_ns is None or last_ns <= parsed[0]
+                )
+                last_ns = parsed[-1]
+            block.clear()
+
+        for line in f:
+            if line in _BLANK_LINES:
+                offset += len(line)
+                continue
+            if rows % stride == 0:
+                offsets.append(offset)
+                checkpoint_rows.append(rows)
+            block.append(line.split(b",", ts_col + 1)[ts_col].decode().strip('"'))
+            offset += len(line)
+            rows += 1
+            if len(block) == DEFAULT_CHUNK_ROWS:
+                flush()
+        flush()
+
+    return TimeIndex(
+        stride=stride,
+        rows=rows,
+        is_sorted=is_sorted,
+        data_end=offset,
+        timestamps=timestamps,
+        offsets=offsets,
+    )
+
+
+def load_time_index(
+    file_path: Union[Path, str],
+    stride: int = DEFAULT_INDEX_STRIDE,
+    use_cache: bool = True,
+) -> TimeIndex:
+    """Return the time index for a file, building and caching it if needed.
+
+    Args:
+        file_path: Path to the CSV file.
+        stride: Data rows between checkpoints for a newly built index.
+        use_cache: Read and write the index in the sidecar cache directory.
+
+    Returns:
+        The time index.
+    """
+    file_path = Path(file_path)
+    index_path = cache_dir_for(file_path) / INDEX_NAME
+    stat = file_path.stat()
+    source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if use_cache:
+        try:
+            with open(index_path) as f:
+                stored = json.load(f)
+            if stored.get("version") == INDEX_VERSION and stored.get("source") == source:
+                return TimeIndex.from_dict(stored["index"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    index = build_time_index(file_path, stride)
+    if use_cache:
+        try:
+            index_path.parent.mkdir(exist_ok=True)
+            tmp_path = index_path.with_name(f"{INDEX_NAME}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"version": INDEX_VERSION, "source": source, "index": index.to_dict()}, f)
+            os.replace(tmp_path, index_path)
+        except OSError:
+            pass
+    return index
+
+
+def load_trades_range(
+    file_path: Union[Path, str],
+    start: datetime,
+    end: datetime,
+    use_cache: bool = True,
+) -> TradeTable:
+    """Load only the trades with start <= timestamp < end.
+
+    For a sorted CSV, only the rows between the surrounding index checkpoints
+    are parsed. A valid column cache is sliced instead; unsorted and JSONL
+    files are loaded in full and filtered.
+
+    Args:
+        file_path: Path to the trades file.
+        start: Inclusive range start (naive datetimes are UTC).
+        end: Exclusive range end.
+        use_cache: Use the column cache and the cached time index.
+
+    Returns:
+        TradeTable of the rows in range, sorted by timestamp.
+
+    Raises:
+        DataLoadError: If the file is missing or has invalid rows in range.
+    """
+    return _load_range(Path(file_path), start, end, use_cache, TradeTable)
+
+
+def load_tob_range(
+    file_path: Union[Path, str],
+    start: datetime,
+    end: datetime,
+    use_cache: bool = True,
+) -> TobTable:
+    """Load only the top-of-book snapshots with start <= timestamp < end.
+
+    See load_trades_range.
+
+    Args:
+        file_path: Path to the top-of-book file.
+        start: Inclusive range start (naive datetimes are UTC).
+        end: Exclusive range end.
+        use_cache: Use the column cache and the cached time index.
+
+    Returns:
+        TobTable of the rows in range, sorted by timestamp.
+
+    Raises:
+        DataLoadError: If the file is missing or has invalid rows in range.
+    """
+    return _load_range(Path(file_path), start, end, use_cache, TobTable)
+
+
+def load_trades_ranges(
+    file_path: Union[Path, str],
+    ranges: Iterable[Tuple[datetime, datetime]],
+    use_cache: bool = True,
+) -> TradeTable:
+    """Load the trades falling in any of several ``[start, end)`` ranges.
+
+    Overlapping ranges are merged first, so every row appears once and the
+    result is sorted by timestamp. The index (or column cache) is resolved
+    once for all ranges.
+
+    Args:
+        file_path: Path to the trades file.
+        ranges: ``(start, end)`` pairs in any order.
+        use_cache: Use the column cache and the cached time index.
+
+    Returns:
+        TradeTable of the rows in any range.
+
+    Raises:
+        DataLoadError: If the file is missing or has invalid rows in range.
+    """
+    return _load_ranges(Path(file_path), ranges, use_cache, TradeTable)
+
+
+def load_tob_ranges(
+    file_path: Union[Path, str],
+    ranges: Iterable[Tuple[datetime, datetime]],
+    use_cache: bool = True,
+) -> TobTable:
+    """Load the top-of-book snapshots falling in any of several ranges.
+
+    See load_trades_ranges.
+
+    Args:
+        file_path: Path to the top-of-book file.
+        ranges: ``(start, end)`` pairs in any order.
+        use_cache: Use the column cache and the cached time index.
+
+    Returns:
+        TobTable of the rows in any range.
+
+    Raises:
+        DataLoadError: If the file is missing or has invalid rows in range.
+    """
+    return _load_ranges(Path(file_path), ranges, use_cache, TobTable)
+
+
+def load_trades_tail(
+    file_path: Union[Path, str],
+    start: datetime,
+    block_bytes: int = DEFAULT_TAIL_BLOCK_BYTES,
+    use_cache: bool = True,
+) -> TradeTable:
+    """Load the trades with timestamp >= start from the end of a sorted file.
+
+    The CSV is read backwards from its end, block_bytes at a time, until a
+    row before start is found; only the rows after it are parsed. The cost
+    is proportional to the size of the tail, not of the file. A valid column
+    cache is sliced instead, JSONL files are loaded in full, and a tail that
+    turns out unsorted falls back to a full load. Rows above the first row
+    before start are assumed earlier than it, as in any sorted file. Row
+    numbers in parse errors count from the start of the tail.
+
+    Args:
+        file_path: Path to the trades file.
+        start: Inclusive start (naive datetimes are UTC).
+        block_bytes: Bytes read per backward step.
+        use_cache: Use the column cache.
+
+    Returns:
+        TradeTable of the rows from start to the end of the file, sorted by
+        timestamp.
+
+    Raises:
+        DataLoadError: If the file is missing or has invalid rows in the tail.
+    """
+    return _load_tail(Path(file_path), start, block_bytes, use_cache, TradeTable)
+
+
+def load_tob_tail(
+    file_path: Union[Path, str],
+    start: datetime,
+    block_bytes: int = DEFAULT_TAIL_BLOCK_BYTES,
+    use_cache: bool = True,
+) -> TobTable:
+    """Load the top-of-book snapshots with timestamp >= start from the end of a file.
+
+    See load_trades_tail.
+
+    Args:
+        file_path: Path to the top-of-book file.
+        start: Inclusive start (naive datetimes are UTC).
+        block_bytes: Bytes read per backward step.
+        use_cache: Use the column cache.
+
+    Returns:
+        TobTable of the rows from start to the end of the file, sorted by
+        timestamp.
+
+    Raises:
+        DataLoadError: If the file is missing or has invalid rows in the tail.
+    """
+    return _load_tail(Path(file_path), start, block_bytes, use_cache, TobTable)
+
+
+def merge_ranges(ranges: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge ``[start, end)`` ranges into sorted, disjoint, non-empty ranges."""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _load_range(file_path: Path, start: datetime, end: datetime, use_cache: bool, table_cls):
+    return _load_ranges(file_path, [(start, end)], use_cache, table_cls)
+
+
+def _load_ranges(file_path: Path, ranges, use_cache: bool, table_cls):
+    is_trades = table_cls is TradeTable
+    if not file_path.exists():
+        label = "Trades" if is_trades else "Top-of-book"
+        raise DataLoadError(f"{label} file not found: {file_path}")
+    ranges_ns = merge_ranges(
+        (datetime_to_ns(start), datetime_to_ns(end)) for start, end in ranges
+    )
+
+    full = None
+    if file_path.suffix.lower() != ".csv":
+        full = load_trade_table(file_path) if is_trades else load_tob_table(file_path)
+    elif use_cache:
+        full = read_table_cache(file_path, table_cls)
+    if full is None:
+        index = load_time_index(file_path, use_cache=use_cache)
+        if not index.is_sorted:
+            full = load_trade_table(file_path) if is_trades else load_tob_table(file_path)
+    if full is not None:
+        parts = [_slice_sorted(full, a, b) for a, b in ranges_ns]
+    else:
+        reader = _read_trade_csv_chunks if is_trades else _read_tob_csv_chunks
+        parts = []
+        for start_ns, end_ns in ranges_ns:
+            byte_range, rows_before = index.locate(start_ns, end_ns)
+            table = table_cls.concat(
+                reader(file_path, DEFAULT_CHUNK_ROWS, byte_range, rows_before)
+            )
+            parts.append(_slice_sorted(table, start_ns, end_ns))
+    if len(parts) == 1:
+        return parts[0]
+    return table_cls.concat(parts)
+
+
+def _load_tail(file_path: Path, start: datetime, block_bytes: int, use_cache: bool, table_cls):
+    is_trades = table_cls is TradeTable
+    if not file_path.exists():
+        label = "Trades" if is_trades else "Top-of-book"
+        raise DataLoadError(f"{label} file not found: {file_path}")
+    if block_bytes <= 0:
+        raise ValueError(f"block_bytes must be positive, got {block_bytes}")
+    start_ns = datetime_to_ns(start)
+
+    full = None
+    if file_path.suffix.lower() != ".csv":
+        full = load_trade_table(file_path) if is_trades else load_tob_table(file_path)
+    elif use_cache:
+        full = read_table_cache(file_path, table_cls)
+    if full is None:
+        reader = _read_trade_csv_chunks if is_trades else _read_tob_csv_chunks
+        byte_range = _tail_byte_range(file_path, start_ns, block_bytes)
+        tail = table_cls.concat(reader(file_path, DEFAULT_CHUNK_ROWS, byte_range))
+        if is_non_decreasing(tail.timestamps):
+            return tail
+        full = load_trade_table(file_path) if is_trades else load_tob_table(file_path)
+    ts = full.timestamps
+    return full.view(bisect_left(ts, start_ns), len(ts))
+
+
+def _tail_byte_range(file_path: Path, start_ns: int, block_bytes: int) -> Tuple[int, int]:
+    """Find the byte range from the row after the last row before start_ns to the end.
+
+    Blocks are read backwards from the end of the file; each block's
+    complete lines are checked from last to first.
+    """
+    with open(file_path, "rb") as f:
+        header = next(csv.reader([f.readline().decode()]), [])
+        if "timestamp" not in header:
+            raise DataLoadError(f"Missing required columns in {file_path}: ['timestamp']")
+        ts_col = header.index("timestamp")
+        data_start = f.tell()
+        data_end = f.seek(0, os.SEEK_END)
+
+        position = data_end
+        # Start of a line cut by the previous block boundary
+        partial = b""
+        while position > data_start:
+            block_start = max(position - block_bytes, data_start)
+            f.seek(block_start)
+            lines = (f.read(position - block_start) + partial).split(b"\n")
+            offset = block_start
+            if block_start > data_start:
+                # The first piece may continue a line from an earlier block
+                partial = lines.pop(0)
+                offset += len(partial) + 1
+            starts = []
+            values = []
+            for line in lines:
+                if line.rstrip(b"\r"):
+                    starts.append(offset)
+                    values.append(line.split(b",", ts_col + 1)[ts_col].decode().strip('"\r'))
+                offset += len(line) + 1
+            parsed = _parse_timestamps_ns(values)
+            for i in range(len(parsed) - 1, -1, -1):
+                if parsed[i] < start_ns:
+                    next_start = starts[i + 1] if i + 1 < len(starts) else offset
+                    return min(next_start, data_end), data_end
+            position = block_start
+    return data_start, data_end
+
+
+def _slice_sorted(table, start_ns: int, end_ns: int):
+    """View the rows of a sorted table with start_ns <= ts < end_ns."""
+    ts = table.timestamps
+    return table.view(bisect_left(ts, start_ns), bisect_left(ts, end_ns))
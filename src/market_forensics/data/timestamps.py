@@ -0,0 +1,297 @@
+"""Bulk timestamp parsing for canonical files.
+
+Canonical CSVs written by ``canonicalize_binance_um_day.py`` use a single
+fixed layout for every row (``YYYY-MM-DDTHH:MM:SS.ffffff+00:00``), and raw
+Binance files carry integer epoch milliseconds. Parsing those row by row
+with ``datetime.fromisoformat`` is the largest single cost of loading a day.
+
+parse_timestamp_column detects the layout once from the first value and
+converts the whole column straight to int64 epoch nanoseconds, using NumPy
+when available. It returns None when the column does not fit a fast layout,
+so callers fall back to their per-row parser, which stays the reference for
+every accepted format and every error message.
+"""
+
+from __future__ import annotations
+
+from array import array
+from datetime import date
+from typing import Dict, Optional, Sequence
+
+from .columnar import NUMPY_AVAILABLE, NS_PER_SECOND, np
+
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+NS_PER_MS = 1_000_000
+
+# Fraction widths accepted by datetime.fromisoformat on every supported Python
+_FRACTION_DIGITS = (3, 6)
+_UTC_SUFFIXES = ("+00:00", "Z")
+_SECONDS_WIDTH = len("YYYY-MM-DDTHH:MM:SS")
+
+# Integer epochs are only taken on the fast path below 2**32 seconds, where
+# float(value) / 1000 is exact to the microsecond (matching the row parser)
+_MAX_EPOCH_SECONDS = 2**32
+_MS_THRESHOLD = 10**12
+_MAX_EPOCH_DIGITS = 13
+# All-digit lengths datetime.fromisoformat reads as ISO basic format on
+# Python 3.11+ ("20240328" is 2024-03-28; 11 digits add an hour after any
+# separator character). The row parser takes those as dates, so they
+# never take the epoch path. 13 digits would be a date, separator, hour and
+# minute; the row parser reads them as epoch milliseconds first instead.
+_ISO_DIGIT_LENGTHS = (8, 11)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_MONTH_DAYS = (
+    np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+    if NUMPY_AVAILABLE else None
+)
+
+
+class IsoLayout:
+    """A fixed-width UTC ISO 8601 layout.
+
+    ``datetime.isoformat()`` drops the fraction when it is zero, so a
+    canonical column mixes ``...SS.ffffff+00:00`` with ``...SS+00:00``. A
+    layout therefore accepts values with exactly ``fraction_digits`` digits
+    of fraction or with none.
+
+    Attributes:
+        fraction_digits: Digits after the seconds' decimal point (0, 3 or 6).
+        suffix: UTC designator, ``+00:00`` or ``Z``.
+        width: Length of a value with a fraction.
+        short_width: Length of a value without one.
+    """
+
+    __slots__ = ("fraction_digits", "suffix", "width", "short_width")
+
+    def __init__(self, fraction_digits: int, suffix: str) -> None:
+        self.fraction_digits = fraction_digits
+        self.suffix = suffix
+        self.short_width = _SECONDS_WIDTH + len(suffix)
+        self.width = self.short_width + (fraction_digits + 1 if fraction_digits else 0)
+
+    @classmethod
+    def detect(cls, values: Sequence[str]) -> Optional["IsoLayout"]:
+        """Detect the layout of a column from its first and longest values.
+
+        Returns:
+            The layout, or None if the column does not look like a fixed
+            UTC layout (individual values are still checked on conversion).
+        """
+        first = values[0]
+        for suffix in _UTC_SUFFIXES:
+            if first.endswith(suffix) and len(first) >= _SECONDS_WIDTH + len(suffix):
+                break
+        else:
+            return None
+        fraction_width = max(map(len, values)) - _SECONDS_WIDTH - len(suffix)
+        if fraction_width == 0:
+            return cls(0, suffix)
+        if fraction_width - 1 in _FRACTION_DIGITS:
+            return cls(fraction_width - 1, suffix)
+        return None
+
+    def template(self, with_fraction: bool) -> str:
+        """The layout with ``#`` standing for each digit."""
+        fraction = "." + "#" * self.fraction_digits if with_fraction else ""
+        return "####-##-##T##:##:##" + fraction + self.suffix
+
+
+def parse_timestamp_column(values: Sequence[str]) -> Optional[array]:
+    """Convert a column of timestamp strings to epoch nanoseconds.
+
+    Args:
+        values: Timestamp strings, one per row.
+
+    Returns:
+        array('q') of epoch nanoseconds, or None if any value does not fit
+        the layout detected for the column.
+    """
+    if not values:
+        return array("q")
+    if _is_epoch_digits(values[0]):
+        if NUMPY_AVAILABLE:
+            return _parse_epoch_numpy(values)
+        return _parse_epoch_python(values)
+    layout = IsoLayout.detect(values)
+    if layout is None:
+        return None
+    if NUMPY_AVAILABLE:
+        return _parse_iso_numpy(values, layout)
+    return _parse_iso_python(values, layout)
+
+
+def _is_epoch_digits(value: str) -> bool:
+    """Whether the row parser reads value as an integer epoch."""
+    return (
+        len(value) <= _MAX_EPOCH_DIGITS
+        and len(value) not in _ISO_DIGIT_LENGTHS
+        and value.isascii()
+        and value.isdigit()
+    )
+
+
+def _parse_iso_python(values: Sequence[str], layout: IsoLayout) -> Optional[array]:
+    day_ns: Dict[str, int] = {}
+    widths = {layout.width, layout.short_width}
+    frac_end = 20 + layout.fraction_digits
+    frac_scale = 10 ** (9 - layout.fraction_digits)
+    out = array("q")
+    append = out.append
+    try:
+        for value in values:
+            if len(value) not in widths or not value.isascii():
+                return None
+            if value[4] != "-" or value[7] != "-" or value[10] != "T":
+                return None
+            if value[13] != ":" or value[16] != ":" or not value.endswith(layout.suffix):
+                return None
+            day = value[:10]
+            base = day_ns.get(day)
+            if base is None:
+                if not (day[:4].isdigit() and day[5:7].isdigit() and day[8:].isdigit()):
+                    return None
+                ordinal = date(int(day[:4]), int(day[5:7]), int(day[8:])).toordinal()
+                base = day_ns[day] = (ordinal - _EPOCH_ORDINAL) * NS_PER_DAY
+            hh, mm, ss = value[11:13], value[14:16], value[17:19]
+            if not (hh.isdigit() and mm.isdigit() and ss.isdigit()):
+                return None
+            hour, minute, second = int(hh), int(mm), int(ss)
+            if hour > 23 or minute > 59 or second > 59:
+                return None
+            ns = base + (hour * 3600 + minute * 60 + second) * NS_PER_SECOND
+            if len(value) != layout.short_width:
+                fraction = value[20:frac_end]
+                if value[19] != "." or not fraction.isdigit():
+                    return None
+                ns += int(fraction) * frac_scale
+            append(ns)
+    except ValueError:
+        # Out-of-range calendar date
+        return None
+    return out
+
+
+def _parse_epoch_python(values: Sequence[str]) -> Optional[array]:
+    out = array("q")
+    append = out.append
+    for value in values:
+        if not _is_epoch_digits(value):
+            return None
+        epoch = int(value)
+        if epoch > _MS_THRESHOLD:
+            if epoch >= _MAX_EPOCH_SECONDS * 1000:
+                return None
+            append(epoch * NS_PER_MS)
+        else:
+            if epoch >= _MAX_EPOCH_SECONDS:
+                return None
+            append(epoch * NS_PER_SECOND)
+    return out
+
+
+def _byte_columns(values: Sequence[str], width: int):
+    """Encode ASCII strings of at most ``width`` chars as zero-padded byte columns.
+
+    Returns:
+        A (width, n) uint8 array whose rows are character positions, or None.
+    """
+    try:
+        # One spare byte per value exposes values longer than the layout
+        encoded = np.array(values, dtype=f"S{width + 1}")
+    except UnicodeEncodeError:
+        return None
+    columns = np.ascontiguousarray(encoded.view(np.uint8).reshape(len(values), width + 1).T)
+    if columns[width].any():
+        return None
+    return columns[:width]
+
+
+def _field(digits, start: int, stop: int):
+    """Combine ASCII digit positions [start, stop) into integers."""
+    out = np.zeros(digits.shape[1], dtype=np.int64)
+    for pos in range(start, stop):
+        out *= 10
+        out += digits[pos]
+        out -= ord("0")
+    return out
+
+
+def _matches_template(columns, template: str, rows=None) -> bool:
+    """Check byte columns against a template (``#`` digit, ``\\0`` padding)."""
+    for pos, char in enumerate(template):
+        column = columns[pos] if rows is None else columns[pos][rows]
+        if char == "#":
+            ok = (column - np.uint8(ord("0"))) <= 9
+        else:
+            ok = column == ord(char)
+        if not ok.all():
+            return False
+    return True
+
+
+def _parse_iso_numpy(values: Sequence[str], layout: IsoLayout) -> Optional[array]:
+    columns = _byte_columns(values, layout.width)
+    if columns is None:
+        return None
+
+    # The date and time part is shared; the tail differs with and without a fraction
+    full = layout.template(with_fraction=True)
+    if not _matches_template(columns, full[:_SECONDS_WIDTH]):
+        return None
+    tail = columns[_SECONDS_WIDTH:]
+    short_tail = layout.template(with_fraction=False)[_SECONDS_WIDTH:]
+    short_tail = short_tail.ljust(layout.width - _SECONDS_WIDTH, "\0")
+    if layout.fraction_digits:
+        has_fraction = tail[0] == ord(".")
+        if not (
+            _matches_template(tail, full[_SECONDS_WIDTH:], has_fraction)
+            and _matches_template(tail, short_tail, ~has_fraction)
+        ):
+            return None
+    else:
+        has_fraction = None
+        if not _matches_template(tail, short_tail):
+            return None
+    digits = columns
+
+    year = _field(digits, 0, 4)
+    month = _field(digits, 5, 7)
+    day = _field(digits, 8, 10)
+    hour = _field(digits, 11, 13)
+    minute = _field(digits, 14, 16)
+    second = _field(digits, 17, 19)
+    if (
+        (year < 1).any() or (month < 1).any() or (month > 12).any() or (day < 1).any()
+        or (hour > 23).any() or (minute > 59).any() or (second > 59).any()
+    ):
+        return None
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    if (day > _MONTH_DAYS[month] + (leap & (month == 2))).any():
+        return None
+
+    # Days since the epoch from the civil date (proleptic Gregorian calendar)
+    y = year - (month <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * np.where(month > 2, month - 3, month + 9) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    days = era * 146097 + doe - 719468
+
+    ns = days * NS_PER_DAY + (hour * 3600 + minute * 60 + second) * NS_PER_SECOND
+    if has_fraction is not None:
+        fraction = _field(digits, 20, 20 + layout.fraction_digits)
+        ns += np.where(has_fraction, fraction, 0) * 10 ** (9 - layout.fraction_digits)
+    return array("q", ns.tobytes())
+
+
+def _parse_epoch_numpy(values: Sequence[str]) -> Optional[array]:
+    if not all(_is_epoch_digits(value) for value in values):
+        return None
+    epochs = np.array(values, dtype=np.int64)
+    is_ms = epochs > _MS_THRESHOLD
+    if (epochs[is_ms] >= _MAX_EPOCH_SECONDS * 1000).any():
+        return None
+    if (epochs[~is_ms] >= _MAX_EPOCH_SECONDS).any():
+        return None
+    ns = np.where(is_ms, epochs * NS_PER_MS, epochs * NS_PER_SECOND)
+    return array("q", ns.tobytes())
@@ -1,9 +1,12 @@
 """Event detection modules."""
 
 from .detector import (
+    AdaptiveThreshold,
     DetectorError,
+    StreamingShockDetector,
     detect_price_shocks,
     detect_price_shocks_from_config,
+    detect_price_shocks_grid,
 )
 from .ordering import (
     EventOrdering,
@@ -19,16 +22,19 @@ from .ordering import (
 )
 
 __all__ = [
+    "AdaptiveThreshold",
     "DetectorError",
     "EventOrdering",
     "OnsetDetection",
     "OnsetType",
     "OrderingError",
+    "StreamingShockDetector",
     "analyze_all_orderings",
     "analyze_event_ordering",
     "analyze_event_ordering_from_config",
     "detect_price_shocks",
     "detect_price_shocks_from_config",
+    "detect_price_shocks_grid",
     "save_orderings",
     "save_orderings_csv",
     "save_orderings_json",
@@ -1,14 +1,38 @@
 """Price-shock event detector.
 
 Detects moments where price moves by a configurable threshold within a rolling window.
+
+When NumPy is installed the scan runs vectorized over the timestamp and price
+columns; otherwise a pure-Python two-pointer loop is used. Both produce the
+same events. detect_price_shocks_grid runs a threshold/window sweep in one
+pass, and StreamingShockDetector applies the same rules incrementally to
+feeds that do not fit in memory. An AdaptiveThreshold replaces the fixed
+threshold with a multiple of the EWMA realized volatility. Data holding
+several symbols is partitioned and scanned per symbol, optionally on a
+process pool.
 """
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import List, Union
+import math
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Sequence, Tuple, Union
 
+from ..data.columnar import (
+    NUMPY_AVAILABLE,
+    TobTable,
+    TradeTable,
+    as_ndarray,
+    datetime_to_ns,
+    np,
+    ns_to_datetime,
+    seconds_to_ns,
+)
 from ..data.models import Event, EventDirection, TopOfBook, Trade
+from ..data.parallel import default_workers
 
 
 class DetectorError(Exception):
@@ -17,55 +41,525 @@ class DetectorError(Exception):
     pass
 
 
+# "reference" compares each price with the first price in its window;
+# "peak_to_trough" with the window's running high and low
+DETECTION_MODES = ("reference", "peak_to_trough")
+
+
+@dataclass(frozen=True)
+class AdaptiveThreshold:
+    """Shock threshold that follows the realized volatility.
+
+    The threshold of each row is vol_multiplier times the volatility
+    expected over one rolling window, estimated from the log returns of
+    the rows before it with an exponentially weighted moving average (EWMA)
+    whose weights halve every halflife_seconds. The estimate is updated in
+    O(1) per row, so it only ever depends on earlier rows. Until
+    warmup_seconds of data have been seen the fixed threshold is used.
+
+    Attributes:
+        vol_multiplier: Threshold as a multiple of the window volatility.
+        halflife_seconds: Half-life of the EWMA weights.
+        min_threshold_pct: Lower bound of the threshold (positive, so a
+            flat stretch of prices does not reduce it to zero).
+        max_threshold_pct: Upper bound of the threshold (None for no bound).
+        warmup_seconds: Data needed before the estimate is used (None for
+            halflife_seconds).
+    """
+
+    vol_multiplier: float
+    halflife_seconds: float = 300.0
+    min_threshold_pct: float = 0.1
+    max_threshold_pct: Optional[float] = None
+    warmup_seconds: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        """Validate the parameters."""
+        if self.vol_multiplier <= 0:
+            raise DetectorError(f"vol_multiplier must be positive, got {self.vol_multiplier}")
+        if self.halflife_seconds <= 0:
+            raise DetectorError(
+                f"halflife_seconds must be positive, got {self.halflife_seconds}"
+            )
+        if self.min_threshold_pct <= 0:
+            raise DetectorError(
+                f"min_threshold_pct must be positive, got {self.min_threshold_pct}"
+            )
+        if self.max_threshold_pct is not None and self.max_threshold_pct < self.min_threshold_pct:
+            raise DetectorError(
+                f"max_threshold_pct ({self.max_threshold_pct}) is below "
+                f"min_threshold_pct ({self.min_threshold_pct})"
+            )
+        if self.warmup_seconds is not None and self.warmup_seconds <= 0:
+            raise DetectorError(f"warmup_seconds must be positive, got {self.warmup_seconds}")
+
+    @classmethod
+    def from_config(cls, event_config: dict) -> Optional["AdaptiveThreshold"]:
+        """Read the 'adaptive_threshold' entry of an 'event_detection' section.
+
+        Returns:
+            None if the entry is absent or null (fixed threshold).
+
+        Raises:
+            DetectorError: If the entry has unknown keys or invalid values.
+        """
+        section = event_config.get("adaptive_threshold")
+        if section is None:
+            return None
+        try:
+            return cls(**section)
+        except TypeError as e:
+            raise DetectorError(f"Invalid adaptive_threshold config: {e}")
+
+
 def detect_price_shocks(
-    data: Union[List[Trade], List[TopOfBook]],
+    data: Union[List[Trade], List[TopOfBook], TradeTable, TobTable],
     threshold_pct: float,
     window_seconds: float,
+    mode: str = "reference",
+    adaptive: Optional[AdaptiveThreshold] = None,
+    workers: Optional[int] = 1,
 ) -> List[Event]:
     """Detect price shock events in trade or top-of-book data.
 
     A price shock is detected when the price moves by >= threshold_pct within
     a rolling window of window_seconds.
 
+    In "reference" mode the move is measured from the first price in the
+    window. In "peak_to_trough" mode it is measured from the window's high
+    (a drop) or low (a rise), whichever is further from the current price,
+    so a move that starts mid-window from a local extreme is caught as soon
+    as it crosses the threshold. Those events also record the mode and the
+    ISO timestamps of the extreme and of the trigger in their metadata.
+
+    With an AdaptiveThreshold each row is compared with its own threshold,
+    derived from the volatility of the rows before it (threshold_pct only
+    applies during the warmup). Event metadata then holds that row's
+    threshold and the volatility estimate ("volatility_pct", None during
+    the warmup).
+
+    Data holding several symbols is partitioned by symbol once and each
+    symbol is scanned on its own, in worker processes when workers allows.
+    The events of all symbols are merged by (timestamp, symbol), so the
+    result does not depend on the number of workers.
+
     Args:
-        data: List of Trade or TopOfBook records, must be sorted by timestamp.
+        data: Trade or TopOfBook records (list or columnar table), must be
+              sorted by timestamp within each symbol.
         threshold_pct: Minimum percentage move to trigger an event (e.g., 1.0 for 1%).
         window_seconds: Rolling window duration in seconds.
+        mode: "reference" or "peak_to_trough" (see DETECTION_MODES).
+        adaptive: Volatility-scaled threshold (None for the fixed threshold_pct).
+        workers: Processes scanning symbols concurrently (None for one per
+            CPU; 1 scans them in this process).
 
     Returns:
-        List of detected Event objects, sorted by timestamp.
+        List of detected Event objects, sorted by timestamp (then symbol).
 
     Raises:
         DetectorError: If input validation fails.
     """
+    _validate_params(threshold_pct, window_seconds)
+    _validate_mode(mode)
+
+    if len(data) == 0:
+        return []
+
+    partitions = _symbol_partitions(data)
+    found = _map_partitions(
+        _find_shocks,
+        [(timestamps, prices, threshold_pct, window_seconds, mode, adaptive)
+         for _, _, timestamps, prices in partitions],
+        workers,
+    )
+    events = []
+    for (symbol, part, _, prices), shocks in zip(partitions, found):
+        events.extend(_shock_events(part, symbol, prices, shocks, window_seconds, mode, adaptive))
+    return _merge_symbol_events(events, len(partitions))
+
+
+def _validate_params(threshold_pct: float, window_seconds: float) -> None:
+    """Raise DetectorError for a non-positive threshold or window."""
     if threshold_pct <= 0:
         raise DetectorError(f"threshold_pct must be positive, got {threshold_pct}")
     if window_seconds <= 0:
         raise DetectorError(f"window_seconds must be positive, got {window_seconds}")
 
-    if not data:
-        return []
 
-    # Validate and extract price series
-    prices = _extract_prices(data)
-    timestamps = [_get_timestamp(d) for d in data]
-    symbol = _get_symbol(data[0])
+def _validate_mode(mode: str) -> None:
+    """Raise DetectorError for an unknown detection mode."""
+    if mode not in DETECTION_MODES:
+        raise DetectorError(f"Unknown detection mode {mode!r} (expected one of {DETECTION_MODES})")
+
+
+def _make_event(
+    timestamp: datetime,
+    symbol: str,
+    reference_price: float,
+    current_price: float,
+    pct_change: float,
+    threshold_pct: float,
+    window_seconds: float,
+    extra: Optional[dict] = None,
+) -> Event:
+    """Build the Event for one detected shock; extra is added to its metadata."""
+    metadata = {
+        "reference_price": reference_price,
+        "current_price": current_price,
+        "threshold_pct": threshold_pct,
+        "window_seconds": window_seconds,
+    }
+    if extra:
+        metadata.update(extra)
+    return Event(
+        timestamp=timestamp,
+        symbol=symbol,
+        event_type="price_shock",
+        direction=EventDirection.UP if pct_change > 0 else EventDirection.DOWN,
+        magnitude=pct_change,
+        metadata=metadata,
+    )
+
+
+# Span of one rebasing block of _EwmaThreshold.series_numpy, in e-folding
+# times; exp(200) is far from float64 overflow
+_EWMA_BLOCK_SPAN = 200.0
+
+
+class _EwmaThreshold:
+    """Online state of an AdaptiveThreshold for one threshold and window."""
+
+    def __init__(
+        self,
+        adaptive: AdaptiveThreshold,
+        threshold_pct: float,
+        window_seconds: float,
+    ) -> None:
+        self._adaptive = adaptive
+        self._fixed_pct = threshold_pct
+        # e-folding time of the weights; the decayed sum of squared returns
+        # then estimates variance per second times this time
+        self._tau_ns = adaptive.halflife_seconds * 1e9 / math.log(2)
+        self._window_ratio = seconds_to_ns(window_seconds) / self._tau_ns
+        warmup = adaptive.warmup_seconds
+        # At least 1ns, so the first row (which has no earlier rows) is in the warmup
+        warmup_ns = seconds_to_ns(adaptive.halflife_seconds if warmup is None else warmup)
+        self._warmup_ns = max(warmup_ns, 1)
+        self._sum = 0.0
+        self._first_ns: Optional[int] = None
+        self._last_ns = 0
+        self._last_price = 0.0
+
+    def step(self, ts: int, price: float) -> Tuple[float, Optional[float]]:
+        """Return the threshold of a row from the rows before it, then add the row.
+
+        Returns:
+            (threshold_pct, volatility_pct): volatility_pct is the window
+            volatility estimate, None while warming up.
+        """
+        thresholds, volatilities = self.step_many((ts,), (price,))
+        return thresholds[0], volatilities[0]
+
+    def step_many(
+        self,
+        timestamps: Sequence[int],
+        prices: Sequence[float],
+    ) -> Tuple[List[float], List[Optional[float]]]:
+        """step() over a series; returns the threshold and volatility columns."""
+        thresholds: List[float] = []
+        volatilities: List[Optional[float]] = []
+        if len(timestamps) == 0:
+            return thresholds, volatilities
+        if self._first_ns is None:
+            self._first_ns = self._last_ns = timestamps[0]
+
+        adaptive = self._adaptive
+        multiplier = adaptive.vol_multiplier
+        floor = adaptive.min_threshold_pct
+        ceiling = math.inf if adaptive.max_threshold_pct is None else adaptive.max_threshold_pct
+        fixed_pct = self._fixed_pct
+        tau_ns = self._tau_ns
+        window_ratio = self._window_ratio
+        warm_ns = self._first_ns + self._warmup_ns
+        exp, log, sqrt = math.exp, math.log, math.sqrt
+        total, last_ns, last_price = self._sum, self._last_ns, self._last_price
+
+        for ts, price in zip(timestamps, prices):
+            if ts != last_ns:
+                total *= exp((last_ns - ts) / tau_ns)
+            # Threshold from the earlier rows only, so a jump cannot mask itself
+            if ts >= warm_ns:
+                volatility = 100 * sqrt(total * window_ratio)
+                threshold = multiplier * volatility
+                if threshold < floor:
+                    threshold = floor
+                elif threshold > ceiling:
+                    threshold = ceiling
+                thresholds.append(threshold)
+                volatilities.append(volatility)
+            else:
+                thresholds.append(fixed_pct)
+                volatilities.append(None)
+            if price != last_price and price > 0 and last_price > 0:
+                total += log(price / last_price) ** 2
+            last_ns = ts
+            last_price = price
+
+        self._sum, self._last_ns, self._last_price = total, last_ns, last_price
+        return thresholds, volatilities
+
+    def series_numpy(self, ts, px):
+        """Vectorized step_many() over a whole series from a fresh state.
+
+        The decayed sum before row i is exp(-x_i) * sum_{j<i} r_j * exp(x_j)
+        with x the time in e-folding units and r_j the squared log return
+        added at row j, i.e. an exclusive cumulative sum. exp(x_j) would
+        overflow over a long series, so the sum is rebased every
+        _EWMA_BLOCK_SPAN units and carried from one block to the next. The
+        result matches the row-by-row update up to rounding. Does not
+        update the online state.
+
+        Args:
+            ts: Sorted int64 epoch-nanosecond timestamps (ndarray).
+            px: float64 prices (ndarray).
+
+        Returns:
+            (thresholds, volatilities) as float64 arrays; volatilities are
+            NaN while warming up.
+        """
+        n = len(ts)
+        if n == 0:
+            return np.zeros(0), np.zeros(0)
+        returns = np.zeros(n)
+        prev, cur = px[:-1], px[1:]
+        moved = (cur != prev) & (cur > 0) & (prev > 0)
+        returns[1:][moved] = np.log(cur[moved] / prev[moved]) ** 2
+        units = (ts - ts[0]) / self._tau_ns
+        blocks = np.floor(units / _EWMA_BLOCK_SPAN)
+        bounds = (np.flatnonzero(np.diff(blocks)) + 1).tolist()
+        sums = np.empty(n)
+        carry = 0.0
+        previous_base = 0.0
+        for start, end in zip([0] + bounds, bounds + [n]):
+            base = float(blocks[start]) * _EWMA_BLOCK_SPAN
+            carry *= math.exp(previous_base - base)
+            previous_base = base
+            offsets = units[start:end] - base
+            weighted = returns[start:end] * np.exp(offsets)
+            before = np.cumsum(weighted)
+            total = float(before[-1])
+            before[1:] = before[:-1]
+            before[0] = 0.0
+            sums[start:end] = (carry + before) * np.exp(-offsets)
+            carry += total
+
+        adaptive = self._adaptive
+        volatilities = 100 * np.sqrt(sums * self._window_ratio)
+        ceiling = np.inf if adaptive.max_threshold_pct is None else adaptive.max_threshold_pct
+        thresholds = np.clip(
+            adaptive.vol_multiplier * volatilities, adaptive.min_threshold_pct, ceiling
+        )
+        warming = int(np.searchsorted(ts, ts[0] + self._warmup_ns))
+        thresholds[:warming] = self._fixed_pct
+        volatilities[:warming] = np.nan
+        return thresholds, volatilities
+
+
+def _adaptive_thresholds(
+    timestamps: Sequence[int],
+    prices: Sequence[float],
+    adaptive: AdaptiveThreshold,
+    threshold_pct: float,
+    window_seconds: float,
+) -> Tuple[Sequence[float], Sequence[Optional[float]]]:
+    """Per-row (thresholds, volatilities) of an AdaptiveThreshold over a series.
+
+    Volatilities are None (NaN with NumPy) while warming up; see
+    _shock_threshold.
+    """
+    state = _EwmaThreshold(adaptive, threshold_pct, window_seconds)
+    if NUMPY_AVAILABLE:
+        return state.series_numpy(
+            as_ndarray(timestamps, "int64"), as_ndarray(prices, "float64")
+        )
+    return state.step_many(timestamps, prices)
+
+
+def _shock_threshold(
+    i: int,
+    threshold_pct: float,
+    thresholds: Optional[Sequence[float]],
+    volatilities: Optional[Sequence[Optional[float]]],
+) -> Tuple[float, Optional[float]]:
+    """(threshold_pct, volatility_pct) of a shock row, as stored in its Event."""
+    if thresholds is None:
+        return threshold_pct, None
+    volatility = volatilities[i]
+    if volatility is None or math.isnan(volatility):
+        return float(thresholds[i]), None
+    return float(thresholds[i]), float(volatility)
 
-    # Validate timestamps are sorted
-    _validate_sorted_timestamps(timestamps)
 
-    events: List[Event] = []
-    window_delta = timedelta(seconds=window_seconds)
+# A shock found on the price columns alone: (row, extreme_row,
+# reference_price, pct_change, threshold_pct, volatility_pct). extreme_row is
+# -1 outside peak_to_trough mode and volatility_pct None without an
+# AdaptiveThreshold (or during its warmup).
+Shock = Tuple[int, int, float, float, float, Optional[float]]
+
+
+def _find_shocks(
+    timestamps: Sequence[int],
+    prices: Sequence[float],
+    threshold_pct: float,
+    window_seconds: float,
+    mode: str,
+    adaptive: Optional[AdaptiveThreshold],
+) -> List[Shock]:
+    """Detect the shocks of one symbol's sorted price series.
+
+    Needs only the two columns, so it can run in a worker process.
+    """
+    window_ns = seconds_to_ns(window_seconds)
+    thresholds = volatilities = None
+    if adaptive is not None:
+        thresholds, volatilities = _adaptive_thresholds(
+            timestamps, prices, adaptive, threshold_pct, window_seconds
+        )
+
+    if mode == "peak_to_trough":
+        extremes, changes = _peak_to_trough_changes(timestamps, prices, window_ns)
+        rows = _dedup_shocks(timestamps, changes, threshold_pct, window_ns, thresholds)
+        return [
+            (i, extremes[i], float(prices[extremes[i]]), changes[i],
+             *_shock_threshold(i, threshold_pct, thresholds, volatilities))
+            for i in rows
+        ]
+
+    scan = _scan_price_shocks_numpy if NUMPY_AVAILABLE else _scan_price_shocks
+    return [
+        (i, -1, reference_price, pct_change,
+         *_shock_threshold(i, threshold_pct, thresholds, volatilities))
+        for i, reference_price, pct_change in scan(
+            timestamps, prices, threshold_pct, window_ns, thresholds
+        )
+    ]
+
+
+def _shock_events(
+    data: Union[List[Trade], List[TopOfBook], TradeTable, TobTable],
+    symbol: str,
+    prices: Sequence[float],
+    shocks: List[Shock],
+    window_seconds: float,
+    mode: str,
+    adaptive: Optional[AdaptiveThreshold],
+) -> List[Event]:
+    """Build the Events of one symbol's shocks, with timestamps taken from data."""
+    events = []
+    for i, extreme, reference_price, pct_change, threshold_pct, volatility in shocks:
+        trigger_time = _get_timestamp(data, i)
+        extra = {}
+        if mode == "peak_to_trough":
+            extra.update({
+                "mode": "peak_to_trough",
+                "extreme_timestamp": _get_timestamp(data, extreme).isoformat(),
+                "trigger_timestamp": trigger_time.isoformat(),
+            })
+        if adaptive is not None:
+            extra["volatility_pct"] = volatility
+        events.append(_make_event(
+            trigger_time,
+            symbol,
+            reference_price,
+            float(prices[i]),
+            pct_change,
+            threshold_pct,
+            window_seconds,
+            extra,
+        ))
+    return events
+
+
+def _symbol_partitions(
+    data: Union[List[Trade], List[TopOfBook], TradeTable, TobTable],
+) -> List[tuple]:
+    """Split data by symbol and extract each symbol's detection columns.
+
+    Returns:
+        (symbol, rows, timestamps, prices) per symbol, ordered by symbol.
+        Single-symbol data is not copied.
+
+    Raises:
+        DetectorError: If a symbol's timestamps are not sorted.
+    """
+    if isinstance(data, (TradeTable, TobTable)):
+        groups = data.partition_by_symbol()
+    else:
+        groups = {}
+        for record in data:
+            groups.setdefault(getattr(record, "symbol", None), []).append(record)
+        if len(groups) == 1:
+            groups = {symbol: data for symbol in groups}
+
+    partitions = []
+    for symbol in sorted(groups):
+        part = groups[symbol]
+        timestamps = _extract_timestamps_ns(part)
+        _validate_sorted_timestamps(timestamps, part)
+        partitions.append((symbol, part, timestamps, _extract_prices(part)))
+    return partitions
+
+
+def _map_partitions(function, jobs: List[tuple], workers: Optional[int]) -> list:
+    """Run function(*job) for every job, in worker processes when workers allows.
+
+    Results are returned in job order whichever worker finishes first.
+    """
+    workers = workers or default_workers()
+    if workers <= 1 or len(jobs) <= 1:
+        return [function(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = [pool.submit(function, *job) for job in jobs]
+        return [future.result() for future in futures]
+
+
+def _merge_symbol_events(events: List[Event], symbols: int) -> List[Event]:
+    """Order the concatenated per-symbol events by (timestamp, symbol)."""
+    if symbols > 1:
+        events.sort(key=lambda e: (e.timestamp, e.symbol))
+    return events
+
+
+def _scan_price_shocks(
+    timestamps: Sequence[int],
+    prices: Sequence[float],
+    threshold_pct: float,
+    window_ns: int,
+    row_thresholds: Optional[Sequence[float]] = None,
+) -> List[Tuple[int, float, float]]:
+    """Scan a price series for shocks.
+
+    Args:
+        timestamps: Sorted epoch-nanosecond timestamps.
+        prices: Price per timestamp.
+        threshold_pct: Minimum percentage move to trigger an event.
+        window_ns: Rolling window duration in nanoseconds.
+        row_thresholds: Per-row thresholds replacing threshold_pct.
+
+    Returns:
+        List of (index, reference_price, pct_change) for each emitted event.
+    """
+    shocks: List[Tuple[int, float, float]] = []
 
     # O(n) two-pointer sliding window approach
     # left pointer tracks the start of the window, advances monotonically
     left = 0
-    n = len(data)
+    n = len(timestamps)
 
     for i in range(n):
         current_ts = timestamps[i]
         current_price = prices[i]
-        window_start = current_ts - window_delta
+        window_start = current_ts - window_ns
 
         # Advance left pointer to maintain window boundary (O(n) total across all iterations)
         while left < i and timestamps[left] < window_start:
@@ -81,61 +575,365 @@ def detect_price_shocks(
             continue
 
         pct_change = ((current_price - reference_price) / reference_price) * 100
+        if row_thresholds is not None:
+            threshold_pct = row_thresholds[i]
 
         if abs(pct_change) >= threshold_pct:
-            direction = EventDirection.UP if pct_change > 0 else EventDirection.DOWN
-
             # Avoid duplicate events too close together
             # Only emit if this is the first event or sufficiently distant from last
-            if events:
-                last_event_ts = events[-1].timestamp
-                if (current_ts - last_event_ts) < window_delta:
-                    # Update existing event if magnitude is larger
-                    if abs(pct_change) > abs(events[-1].magnitude):
-                        # Replace with larger magnitude event
-                        events[-1] = Event(
-                            timestamp=current_ts,
-                            symbol=symbol,
-                            event_type="price_shock",
-                            direction=direction,
-                            magnitude=pct_change,
-                            metadata={
-                                "reference_price": reference_price,
-                                "current_price": current_price,
-                                "threshold_pct": threshold_pct,
-                                "window_seconds": window_seconds,
-                            },
-                        )
+            if shocks:
+                last_index, _, last_pct = shocks[-1]
+                if (current_ts - timestamps[last_index]) < window_ns:
+                    # Replace with larger magnitude event
+                    if abs(pct_change) > abs(last_pct):
+                        shocks[-1] = (i, reference_price, pct_change)
+                    continue
+
+            shocks.append((i, reference_price, pct_change))
+
+    return shocks
+
+
+def _scan_price_shocks_grid(
+    timestamps: Sequence[int],
+    prices: Sequence[float],
+    thresholds: Sequence[float],
+    window_ns_values: Sequence[int],
+) -> Dict[Tuple[float, int], List[Tuple[int, float, float]]]:
+    """Scan a price series for shocks at every (threshold, window) pair at once.
+
+    One pass over the series advances a left pointer per window; the
+    percentage change against each window's reference is computed once and
+    checked against every threshold.
+
+    Returns:
+        {(threshold_pct, window_ns): shocks}, each as _scan_price_shocks
+        returns them for that pair.
+    """
+    shocks = {(t, w): [] for w in window_ns_values for t in thresholds}
+    lefts = [0] * len(window_ns_values)
+    lowest = min(thresholds)
+
+    for i in range(len(timestamps)):
+        current_ts = timestamps[i]
+        current_price = prices[i]
+        for k, window_ns in enumerate(window_ns_values):
+            left = lefts[k]
+            window_start = current_ts - window_ns
+            while left < i and timestamps[left] < window_start:
+                left += 1
+            lefts[k] = left
+
+            if i - left < 1:
+                continue
+            reference_price = prices[left]
+            if reference_price == 0:
+                continue
+            pct_change = ((current_price - reference_price) / reference_price) * 100
+            magnitude = abs(pct_change)
+            if magnitude < lowest:
+                continue
+
+            for threshold_pct in thresholds:
+                if magnitude < threshold_pct:
                     continue
+                found = shocks[(threshold_pct, window_ns)]
+                # Same dedup rule as _scan_price_shocks
+                if found:
+                    last_index, _, last_pct = found[-1]
+                    if (current_ts - timestamps[last_index]) < window_ns:
+                        if magnitude > abs(last_pct):
+                            found[-1] = (i, reference_price, pct_change)
+                        continue
+                found.append((i, reference_price, pct_change))
+
+    return shocks
+
 
-            events.append(
-                Event(
-                    timestamp=current_ts,
-                    symbol=symbol,
-                    event_type="price_shock",
-                    direction=direction,
-                    magnitude=pct_change,
-                    metadata={
-                        "reference_price": reference_price,
-                        "current_price": current_price,
-                        "threshold_pct": threshold_pct,
-                        "window_seconds": window_seconds,
-                    },
-                )
+def _peak_to_trough_changes(
+    timestamps: Sequence[int],
+    prices: Sequence[float],
+    window_ns: int,
+) -> Tuple[List[int], List[float]]:
+    """Largest move of every row from its window's high or low.
+
+    The window of row i holds the rows with timestamp >= timestamps[i] -
+    window_ns, as in _scan_price_shocks; its high and low come from
+    _window_extreme_indices.
+
+    Returns:
+        (extremes, changes): per row, the index of the extreme the move is
+        measured from (-1 if the row has no earlier row in its window) and
+        the percentage move (drops are negative).
+    """
+    if NUMPY_AVAILABLE:
+        return _peak_to_trough_changes_numpy(timestamps, prices, window_ns)
+
+    n = len(timestamps)
+    lefts = []
+    left = 0
+    for i in range(n):
+        window_start = timestamps[i] - window_ns
+        while left < i and timestamps[left] < window_start:
+            left += 1
+        lefts.append(left)
+    high_indices, low_indices = _window_extreme_indices(prices, lefts)
+
+    extremes = [-1] * n
+    changes = [0.0] * n
+    for i in range(n):
+        # Need at least 2 points in window to detect a shock
+        if i - lefts[i] < 1:
+            continue
+        current_price = prices[i]
+        high = prices[high_indices[i]]
+        low = prices[low_indices[i]]
+        drop = ((current_price - high) / high) * 100 if high != 0 else 0.0
+        rise = ((current_price - low) / low) * 100 if low != 0 else 0.0
+        if rise >= -drop:
+            extremes[i], changes[i] = low_indices[i], rise
+        else:
+            extremes[i], changes[i] = high_indices[i], drop
+
+    return extremes, changes
+
+
+def _peak_to_trough_changes_numpy(
+    timestamps: Sequence[int],
+    prices: Sequence[float],
+    window_ns: int,
+) -> Tuple[List[int], List[float]]:
+    """Vectorized equivalent of _peak_to_trough_changes.
+
+    Only the deque pass stays in Python; the window-left indices and the
+    percentage moves are computed in bulk.
+    """
+    ts = as_ndarray(timestamps, "int64")
+    px = as_ndarray(prices, "float64")
+    left = _window_left_indices(ts, window_ns)
+    high_indices, low_indices = _window_extreme_indices(px.tolist(), left.tolist())
+    high_idx = np.asarray(high_indices, dtype=np.intp)
+    low_idx = np.asarray(low_indices, dtype=np.intp)
+    high = px[high_idx]
+    low = px[low_idx]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drop = np.where(high != 0, ((px - high) / high) * 100, 0.0)
+        rise = np.where(low != 0, ((px - low) / low) * 100, 0.0)
+    use_low = rise >= -drop
+    extremes = np.where(use_low, low_idx, high_idx)
+    changes = np.where(use_low, rise, drop)
+    alone = left == np.arange(len(ts))
+    extremes[alone] = -1
+    changes[alone] = 0.0
+    return extremes.tolist(), changes.tolist()
+
+
+def _window_extreme_indices(
+    prices: Sequence[float],
+    lefts: Sequence[int],
+) -> Tuple[List[int], List[int]]:
+    """Index of the high and the low of prices[lefts[i]:i + 1] for every row.
+
+    Monotonic deques of row indices (prices decreasing for the highs,
+    increasing for the lows) keep the extremes at their fronts; each row is
+    pushed and popped at most once per deque, so the pass is O(n). Of equal
+    extremes the latest is used.
+    """
+    n = len(prices)
+    high_indices = [0] * n
+    low_indices = [0] * n
+    highs: Deque[int] = deque()
+    lows: Deque[int] = deque()
+
+    for i in range(n):
+        current_price = prices[i]
+        # A new row dominates older rows that are no higher (no lower)
+        while highs and prices[highs[-1]] <= current_price:
+            highs.pop()
+        highs.append(i)
+        while lows and prices[lows[-1]] >= current_price:
+            lows.pop()
+        lows.append(i)
+        left = lefts[i]
+        while highs[0] < left:
+            highs.popleft()
+        while lows[0] < left:
+            lows.popleft()
+        high_indices[i] = highs[0]
+        low_indices[i] = lows[0]
+
+    return high_indices, low_indices
+
+
+def _dedup_shocks(
+    timestamps: Sequence[int],
+    changes: Sequence[float],
+    threshold_pct: float,
+    window_ns: int,
+    row_thresholds: Optional[Sequence[float]] = None,
+) -> List[int]:
+    """Apply the threshold and the dedup rule of _scan_price_shocks to per-row changes.
+
+    Returns:
+        Indices of the event rows.
+    """
+    if NUMPY_AVAILABLE:
+        ts = as_ndarray(timestamps, "int64")
+        abs_changes = np.abs(np.asarray(changes, dtype="float64"))
+        if row_thresholds is not None:
+            candidates = np.flatnonzero(
+                abs_changes >= np.asarray(row_thresholds, dtype="float64")
             )
+        else:
+            candidates = np.flatnonzero(abs_changes >= threshold_pct)
+        return _dedup_candidates_numpy(candidates, ts, abs_changes, window_ns)
 
-    return events
+    chosen: List[int] = []
+    for i, change in enumerate(changes):
+        if row_thresholds is not None:
+            threshold_pct = row_thresholds[i]
+        if abs(change) < threshold_pct:
+            continue
+        if chosen and timestamps[i] - timestamps[chosen[-1]] < window_ns:
+            if abs(change) > abs(changes[chosen[-1]]):
+                chosen[-1] = i
+            continue
+        chosen.append(i)
+    return chosen
+
+
+_SEARCH_BLOCK_ROWS = 4096
+
+
+def _window_left_indices(ts, window_ns: int):
+    """For each row, the first index with timestamp >= timestamp - window_ns.
+
+    Queries are searched block by block against only the slice of timestamps
+    they can land in, which keeps the haystack cache-resident; on a day of
+    bookTicker data this halves the cost of one global searchsorted.
+    """
+    n = len(ts)
+    targets = ts - window_ns
+    left = np.empty(n, dtype=np.intp)
+    starts = np.arange(0, n, _SEARCH_BLOCK_ROWS)
+    lows = np.searchsorted(ts, targets[starts], side="left")
+    for start, low in zip(starts.tolist(), lows.tolist()):
+        stop = min(n, start + _SEARCH_BLOCK_ROWS)
+        left[start:stop] = np.searchsorted(ts[low:stop], targets[start:stop], side="left") + low
+    return left
+
+
+def _scan_price_shocks_numpy(
+    timestamps: Sequence[int],
+    prices: Sequence[float],
+    threshold_pct: float,
+    window_ns: int,
+    row_thresholds: Optional[Sequence[float]] = None,
+) -> List[Tuple[int, float, float]]:
+    """Vectorized equivalent of _scan_price_shocks.
+
+    The window-left index of every row comes from one searchsorted call and
+    the percentage changes are computed in bulk. The dedup rule (an event
+    absorbs later candidates within window_ns of it, moving to any candidate
+    with a strictly larger magnitude) is applied in one pass over the
+    candidate rows only.
+    """
+    if row_thresholds is None:
+        grid = _scan_price_shocks_grid_numpy(timestamps, prices, [threshold_pct], [window_ns])
+        return grid[(threshold_pct, window_ns)]
+
+    ts = as_ndarray(timestamps, "int64")
+    px = as_ndarray(prices, "float64")
+    reference, pct, abs_pct = _window_changes_numpy(ts, px, window_ns)
+    candidates = np.flatnonzero(abs_pct >= np.asarray(row_thresholds, dtype="float64"))
+    return [
+        (i, float(reference[i]), float(pct[i]))
+        for i in _dedup_candidates_numpy(candidates, ts, abs_pct, window_ns)
+    ]
+
+
+def _scan_price_shocks_grid_numpy(
+    timestamps: Sequence[int],
+    prices: Sequence[float],
+    thresholds: Sequence[float],
+    window_ns_values: Sequence[int],
+) -> Dict[Tuple[float, int], List[Tuple[int, float, float]]]:
+    """Vectorized equivalent of _scan_price_shocks_grid.
+
+    The window pointers and percentage changes are computed once per
+    window; each threshold then only filters and dedups the candidates of
+    the lowest one.
+    """
+    ts = as_ndarray(timestamps, "int64")
+    px = as_ndarray(prices, "float64")
+    n = len(ts)
+    shocks = {(t, w): [] for w in window_ns_values for t in thresholds}
+    if n < 2:
+        return shocks
+
+    for window_ns in window_ns_values:
+        reference, pct, abs_pct = _window_changes_numpy(ts, px, window_ns)
+        lowest = np.flatnonzero(abs_pct >= min(thresholds))
+        for threshold_pct in thresholds:
+            candidates = lowest[abs_pct[lowest] >= threshold_pct]
+            shocks[(threshold_pct, window_ns)] = [
+                (i, float(reference[i]), float(pct[i]))
+                for i in _dedup_candidates_numpy(candidates, ts, abs_pct, window_ns)
+            ]
+    return shocks
+
+
+def _window_changes_numpy(ts, px, window_ns: int):
+    """Reference prices, percentage changes and their magnitudes for one window.
+
+    Rows without an earlier row in the window or with a zero reference can
+    never be candidates; their magnitude is set to 0.
+    """
+    left = _window_left_indices(ts, window_ns)
+    reference = px[left]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = ((px - reference) / reference) * 100
+    abs_pct = np.abs(pct)
+    abs_pct[(np.arange(len(ts)) - left < 1) | (reference == 0)] = 0
+    return reference, pct, abs_pct
+
+
+def _dedup_candidates_numpy(candidates, ts, abs_pct, window_ns: int) -> List[int]:
+    """Apply the dedup rule to candidate rows; returns the event rows.
+
+    One linear pass over the candidates only: inside a dense cluster every
+    candidate is compared with the current event, so re-reducing the rest of
+    the cluster after each event would be O(events x candidates).
+    """
+    cand_ts = ts[candidates].tolist()
+    cand_abs = abs_pct[candidates].tolist()
+    chosen: List[int] = []
+    event_ts = event_abs = 0
+    for k, current_ts in enumerate(cand_ts):
+        if chosen and current_ts - event_ts < window_ns:
+            # Within the event's window: move it to a strictly larger move
+            if cand_abs[k] > event_abs:
+                chosen[-1] = k
+                event_ts, event_abs = current_ts, cand_abs[k]
+            continue
+        chosen.append(k)
+        event_ts, event_abs = current_ts, cand_abs[k]
+    return candidates[chosen].tolist() if chosen else []
 
 
 def detect_price_shocks_from_config(
-    data: Union[List[Trade], List[TopOfBook]],
+    data: Union[List[Trade], List[TopOfBook], TradeTable, TobTable],
     config: dict,
+    workers: Optional[int] = 1,
 ) -> List[Event]:
     """Detect price shocks using configuration dictionary.
 
     Args:
-        data: List of Trade or TopOfBook records.
-        config: Configuration dictionary with 'event_detection' section.
+        data: Trade or TopOfBook records (list or columnar table).
+        config: Configuration dictionary with 'event_detection' section
+            (its optional 'mode' defaults to "reference"; an optional
+            'adaptive_threshold' object holds AdaptiveThreshold's fields).
+        workers: Processes scanning symbols concurrently (see detect_price_shocks).
 
     Returns:
         List of detected Event objects.
@@ -149,12 +947,384 @@ def detect_price_shocks_from_config(
         window_seconds = event_config["rolling_window_seconds"]
     except KeyError as e:
         raise DetectorError(f"Missing required config key: {e}")
+    mode = event_config.get("mode", "reference")
+    adaptive = AdaptiveThreshold.from_config(event_config)
+
+    return detect_price_shocks(data, threshold_pct, window_seconds, mode, adaptive, workers)
+
+
+def detect_price_shocks_grid(
+    data: Union[List[Trade], List[TopOfBook], TradeTable, TobTable],
+    thresholds_pct: Sequence[float],
+    windows_seconds: Sequence[float],
+    mode: str = "reference",
+    workers: Optional[int] = 1,
+) -> Dict[Tuple[float, float], List[Event]]:
+    """Detect price shocks for every (threshold, window) pair in one pass.
+
+    Equivalent to calling detect_price_shocks once per pair, but the prices
+    are extracted and validated once, the window pointers and percentage
+    changes are shared by all thresholds of a window, and the thresholds
+    only filter candidates. A sweep over many thresholds costs about as
+    much as a single run. Symbols are partitioned and merged as in
+    detect_price_shocks.
+
+    Args:
+        data: Trade or TopOfBook records (list or columnar table), must be
+              sorted by timestamp within each symbol.
+        thresholds_pct: Thresholds to test (e.g., [0.3, 0.4, 0.5]).
+        windows_seconds: Rolling window durations to test, in seconds.
+        mode: Detection mode (see detect_price_shocks).
+        workers: Processes scanning symbols concurrently (see detect_price_shocks).
+
+    Returns:
+        {(threshold_pct, window_seconds): events} for every pair.
+
+    Raises:
+        DetectorError: If input validation fails.
+    """
+    thresholds = list(dict.fromkeys(thresholds_pct))
+    windows = list(dict.fromkeys(windows_seconds))
+    if not thresholds or not windows:
+        raise DetectorError("At least one threshold and one window are required")
+    for threshold_pct in thresholds:
+        for window_seconds in windows:
+            _validate_params(threshold_pct, window_seconds)
+    _validate_mode(mode)
+
+    if len(data) == 0:
+        return {(t, w): [] for w in windows for t in thresholds}
+
+    partitions = _symbol_partitions(data)
+    found = _map_partitions(
+        _find_shocks_grid,
+        [(timestamps, prices, thresholds, windows, mode)
+         for _, _, timestamps, prices in partitions],
+        workers,
+    )
+    grid = {}
+    for window_seconds in windows:
+        for threshold_pct in thresholds:
+            events = []
+            for (symbol, part, _, prices), shocks in zip(partitions, found):
+                events.extend(_shock_events(
+                    part, symbol, prices, shocks[(threshold_pct, window_seconds)],
+                    window_seconds, mode, None,
+                ))
+            grid[(threshold_pct, window_seconds)] = _merge_symbol_events(events, len(partitions))
+    return grid
+
+
+def _find_shocks_grid(
+    timestamps: Sequence[int],
+    prices: Sequence[float],
+    thresholds: List[float],
+    windows: List[float],
+    mode: str,
+) -> Dict[Tuple[float, float], List[Shock]]:
+    """_find_shocks for every (threshold, window) pair of one symbol's series."""
+    if mode == "peak_to_trough":
+        grid = {}
+        for window_seconds in windows:
+            window_ns = seconds_to_ns(window_seconds)
+            extremes, changes = _peak_to_trough_changes(timestamps, prices, window_ns)
+            for threshold_pct in thresholds:
+                grid[(threshold_pct, window_seconds)] = [
+                    (i, extremes[i], float(prices[extremes[i]]), changes[i], threshold_pct, None)
+                    for i in _dedup_shocks(timestamps, changes, threshold_pct, window_ns)
+                ]
+        return grid
+
+    window_ns = {w: seconds_to_ns(w) for w in windows}
+    scan = _scan_price_shocks_grid_numpy if NUMPY_AVAILABLE else _scan_price_shocks_grid
+    found = scan(timestamps, prices, thresholds, list(dict.fromkeys(window_ns.values())))
+    return {
+        (threshold_pct, window_seconds): [
+            (i, -1, reference_price, pct_change, threshold_pct, None)
+            for i, reference_price, pct_change in found[(threshold_pct, window_ns[window_seconds])]
+        ]
+        for window_seconds in windows
+        for threshold_pct in thresholds
+    }
+
+
+class StreamingShockDetector:
+    """Incremental price-shock detector for unbounded or chunked feeds.
+
+    Applies the same rules as detect_price_shocks to prices pushed one at a
+    time or in batches, holding only the rows of the current rolling window.
+    An event is returned once no later row can replace it, i.e. once a row at
+    least window_seconds after it has been pushed, or when flush() is called
+    at the end of the feed. Pushing a series and then flushing returns the
+    same events as detect_price_shocks on the whole series.
+
+    Example:
+        detector = StreamingShockDetector(0.5, 60, symbol="BTCUSDT")
+        for chunk in iter_tob(path):
+            events.extend(detector.push_table(chunk))
+        events.extend(detector.flush())
+    """
+
+    def __init__(
+        self,
+        threshold_pct: float,
+        window_seconds: float,
+        symbol: Optional[str] = None,
+        mode: str = "reference",
+        adaptive: Optional[AdaptiveThreshold] = None,
+    ) -> None:
+        """Create a detector.
+
+        Args:
+            threshold_pct: Minimum percentage move to trigger an event.
+            window_seconds: Rolling window duration in seconds.
+            symbol: Symbol of the emitted events (taken from the first table
+                passed to push_table if None).
+            mode: Detection mode (see detect_price_shocks).
+            adaptive: Volatility-scaled threshold (see detect_price_shocks);
+                its estimate is updated with every pushed row.
+
+        Raises:
+            DetectorError: If threshold_pct or window_seconds is not positive
+                or mode is unknown.
+        """
+        _validate_params(threshold_pct, window_seconds)
+        _validate_mode(mode)
+        self.threshold_pct = threshold_pct
+        self.window_seconds = window_seconds
+        self.symbol = symbol
+        self.mode = mode
+        self.adaptive = adaptive
+        self._window_ns = seconds_to_ns(window_seconds)
+        self._ewma = (
+            _EwmaThreshold(adaptive, threshold_pct, window_seconds) if adaptive else None
+        )
+        # (timestamp_ns, price) of the rows in the current rolling window
+        self._window: Deque[Tuple[int, float]] = deque()
+        # peak_to_trough mode: monotonic deques of (timestamp_ns, price,
+        # timestamp) whose fronts are the window's high and low
+        self._highs: Deque[Tuple[int, float, Optional[datetime]]] = deque()
+        self._lows: Deque[Tuple[int, float, Optional[datetime]]] = deque()
+        self._last_ns: Optional[int] = None
+        # Latest shock, still replaceable: (timestamp_ns, timestamp,
+        # reference_price, current_price, pct_change, extreme, threshold_pct,
+        # volatility_pct)
+        self._pending: Optional[tuple] = None
+
+    @classmethod
+    def from_config(cls, config: dict, symbol: Optional[str] = None) -> "StreamingShockDetector":
+        """Create a detector from the 'event_detection' config section.
+
+        Raises:
+            DetectorError: If config is missing required keys.
+        """
+        try:
+            event_config = config["event_detection"]
+            threshold_pct = event_config["price_shock_threshold_pct"]
+            window_seconds = event_config["rolling_window_seconds"]
+        except KeyError as e:
+            raise DetectorError(f"Missing required config key: {e}")
+        return cls(
+            threshold_pct,
+            window_seconds,
+            symbol,
+            event_config.get("mode", "reference"),
+            AdaptiveThreshold.from_config(event_config),
+        )
 
-    return detect_price_shocks(data, threshold_pct, window_seconds)
+    def push(self, timestamp: Union[datetime, int], price: float) -> List[Event]:
+        """Add one observation.
 
+        Args:
+            timestamp: Observation time, as a datetime or epoch nanoseconds.
+                Datetimes are passed through to the emitted events unchanged.
+            price: Observed price.
 
-def _extract_prices(data: Union[List[Trade], List[TopOfBook]]) -> List[float]:
+        Returns:
+            Events finalized by this observation (at most one).
+
+        Raises:
+            DetectorError: If timestamp is earlier than the previous one.
+        """
+        if isinstance(timestamp, datetime):
+            ts = datetime_to_ns(timestamp)
+        else:
+            ts, timestamp = int(timestamp), None
+        emitted = self._advance(ts)
+        self._observe(ts, timestamp, float(price))
+        return emitted
+
+    def push_batch(self, timestamps: Sequence[int], prices: Sequence[float]) -> List[Event]:
+        """Add observations given as epoch-nanosecond timestamps and prices.
+
+        Args:
+            timestamps: Non-decreasing epoch-nanosecond timestamps (any
+                sequence, e.g. an array column or NumPy array).
+            prices: Price per timestamp.
+
+        Returns:
+            Events finalized by these observations.
+
+        Raises:
+            DetectorError: If the lengths differ or a timestamp is earlier
+                than the one before it.
+        """
+        if len(timestamps) != len(prices):
+            raise DetectorError(
+                f"timestamps and prices differ in length: {len(timestamps)} != {len(prices)}"
+            )
+        if NUMPY_AVAILABLE:
+            timestamps = as_ndarray(timestamps, "int64").tolist()
+            prices = as_ndarray(prices, "float64").tolist()
+        emitted: List[Event] = []
+        for ts, price in zip(timestamps, prices):
+            emitted.extend(self._advance(ts))
+            self._observe(ts, None, price)
+        return emitted
+
+    def push_table(self, table: Union[TradeTable, TobTable]) -> List[Event]:
+        """Add the trade prices or top-of-book mid prices of a table chunk.
+
+        Returns:
+            Events finalized by these rows.
+        """
+        if len(table) == 0:
+            return []
+        if self.symbol is None:
+            self.symbol = table.symbol_at(0)
+        return self.push_batch(table.timestamps, _extract_prices(table))
+
+    def flush(self) -> List[Event]:
+        """Return the pending event, if any, at the end of the feed.
+
+        The rolling window is kept, so pushing can continue afterwards, but
+        a flushed event can no longer be replaced by a larger later move.
+        """
+        if self._pending is None:
+            return []
+        event = self._emit(self._pending)
+        self._pending = None
+        return [event]
+
+    def _advance(self, ts: int) -> List[Event]:
+        """Check ordering and finalize the pending event if ts is past its horizon."""
+        if self._last_ns is not None and ts < self._last_ns:
+            raise DetectorError(
+                f"Timestamps must be sorted in ascending order. "
+                f"Found {ns_to_datetime(ts)} after {ns_to_datetime(self._last_ns)}"
+            )
+        self._last_ns = ts
+        pending = self._pending
+        if pending is not None and ts - pending[0] >= self._window_ns:
+            self._pending = None
+            return [self._emit(pending)]
+        return []
+
+    def _observe(self, ts: int, timestamp: Optional[datetime], price: float) -> None:
+        """Slide the window to include this row and check it for a shock."""
+        threshold_pct, volatility = self.threshold_pct, None
+        if self._ewma is not None:
+            threshold_pct, volatility = self._ewma.step(ts, price)
+        window = self._window
+        window.append((ts, price))
+        window_start = ts - self._window_ns
+        while len(window) > 1 and window[0][0] < window_start:
+            window.popleft()
+
+        extreme = None
+        if self.mode == "peak_to_trough":
+            extreme, pct_change = self._peak_to_trough(ts, timestamp, price, window_start)
+            # Need at least 2 points in window to detect a shock
+            if len(window) < 2:
+                return
+            reference_price = extreme[1]
+        else:
+            if len(window) < 2:
+                return
+            reference_price = window[0][1]
+            if reference_price == 0:
+                return
+            pct_change = ((price - reference_price) / reference_price) * 100
+        if abs(pct_change) < threshold_pct:
+            return
+        # Within the horizon of the pending event (otherwise _advance emitted
+        # it): only a strictly larger move replaces it
+        if self._pending is not None and abs(pct_change) <= abs(self._pending[4]):
+            return
+        self._pending = (
+            ts, timestamp, reference_price, price, pct_change, extreme, threshold_pct, volatility
+        )
+
+    def _peak_to_trough(
+        self,
+        ts: int,
+        timestamp: Optional[datetime],
+        price: float,
+        window_start: int,
+    ) -> Tuple[Tuple[int, float, Optional[datetime]], float]:
+        """Update the high/low deques; returns the extreme and the move from it.
+
+        Same rules as _peak_to_trough_changes.
+        """
+        highs, lows = self._highs, self._lows
+        row = (ts, price, timestamp)
+        while highs and highs[-1][1] <= price:
+            highs.pop()
+        highs.append(row)
+        while lows and lows[-1][1] >= price:
+            lows.pop()
+        lows.append(row)
+        while highs[0][0] < window_start:
+            highs.popleft()
+        while lows[0][0] < window_start:
+            lows.popleft()
+
+        high = highs[0][1]
+        low = lows[0][1]
+        drop = ((price - high) / high) * 100 if high != 0 else 0.0
+        rise = ((price - low) / low) * 100 if low != 0 else 0.0
+        if rise >= -drop:
+            return lows[0], rise
+        return highs[0], drop
+
+    def _emit(self, shock: tuple) -> Event:
+        (ts, timestamp, reference_price, current_price, pct_change, extreme,
+         threshold_pct, volatility) = shock
+        trigger_time = timestamp if timestamp is not None else ns_to_datetime(ts)
+        extra = {}
+        if extreme is not None:
+            extreme_time = extreme[2] if extreme[2] is not None else ns_to_datetime(extreme[0])
+            extra.update({
+                "mode": "peak_to_trough",
+                "extreme_timestamp": extreme_time.isoformat(),
+                "trigger_timestamp": trigger_time.isoformat(),
+            })
+        if self._ewma is not None:
+            extra["volatility_pct"] = volatility
+        return _make_event(
+            trigger_time,
+            self.symbol,
+            reference_price,
+            current_price,
+            pct_change,
+            threshold_pct,
+            self.window_seconds,
+            extra,
+        )
+
+
+def _extract_prices(
+    data: Union[List[Trade], List[TopOfBook], TradeTable, TobTable],
+) -> Sequence[float]:
     """Extract prices from trade or top-of-book data."""
+    if isinstance(data, TradeTable):
+        return data.prices
+    if isinstance(data, TobTable):
+        if NUMPY_AVAILABLE:
+            bid = as_ndarray(data.bid_prices, "float64")
+            ask = as_ndarray(data.ask_prices, "float64")
+            return (bid + ask) / 2
+        return data.mid_prices()
     if not data:
         return []
 
@@ -166,26 +1336,49 @@ def _extract_prices(data: Union[List[Trade], List[TopOfBook]]) -> List[float]:
         raise DetectorError(f"Unsupported data type: {type(data[0])}")
 
 
-def _get_timestamp(record: Union[Trade, TopOfBook]) -> datetime:
-    """Get timestamp from a data record."""
-    return record.timestamp
+def _extract_timestamps_ns(
+    data: Union[List[Trade], List[TopOfBook], TradeTable, TobTable],
+) -> Sequence[int]:
+    """Extract epoch-nanosecond timestamps from trade or top-of-book data."""
+    if isinstance(data, (TradeTable, TobTable)):
+        return data.timestamps
+    return [datetime_to_ns(d.timestamp) for d in data]
 
 
-def _get_symbol(record: Union[Trade, TopOfBook]) -> str:
-    """Get symbol from a data record."""
-    return record.symbol
+def _get_timestamp(
+    data: Union[List[Trade], List[TopOfBook], TradeTable, TobTable], index: int
+) -> datetime:
+    """Get the timestamp of a data record."""
+    if isinstance(data, (TradeTable, TobTable)):
+        return data.timestamp_at(index)
+    return data[index].timestamp
 
 
-def _validate_sorted_timestamps(timestamps: List[datetime]) -> None:
+def _validate_sorted_timestamps(
+    timestamps: Sequence[int],
+    data: Union[List[Trade], List[TopOfBook], TradeTable, TobTable],
+) -> None:
     """Validate that timestamps are sorted in ascending order.
 
     Raises:
         DetectorError: If timestamps are not sorted or contain duplicates that
                        would indicate data quality issues.
     """
+    if NUMPY_AVAILABLE:
+        unsorted = np.flatnonzero(np.diff(as_ndarray(timestamps, "int64")) < 0)
+        if len(unsorted):
+            i = int(unsorted[0]) + 1
+            raise DetectorError(
+                f"Timestamps must be sorted in ascending order. "
+                f"Found {_get_timestamp(data, i)} after {_get_timestamp(data, i - 1)} "
+                f"at index {i}"
+            )
+        return
+
     for i in range(1, len(timestamps)):
         if timestamps[i] < timestamps[i - 1]:
             raise DetectorError(
                 f"Timestamps must be sorted in ascending order. "
-                f"Found {timestamps[i]} after {timestamps[i - 1]} at index {i}"
+                f"Found {_get_timestamp(data, i)} after {_get_timestamp(data, i - 1)} "
+                f"at index {i}"
             )
@@ -12,9 +12,16 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
-
-from ..data.models import TopOfBook, Trade
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from ..data.columnar import (
+    NS_PER_SECOND,
+    TobSeries,
+    TobTable,
+    TradeSeries,
+    TradeTable,
+    ns_to_datetime,
+)
 from ..windows.extractor import EventWindow
 
 
@@ -144,9 +151,30 @@ def _compute_baseline_stats(values: List[float]) -> Tuple[Optional[float], Optio
     return (mean, std)
 
 
+def _tob_timestamp(tob: TobSeries, index: int) -> datetime:
+    """Get the timestamp of one row of a top-of-book list or table."""
+    if isinstance(tob, TobTable):
+        return tob.timestamp_at(index)
+    return tob[index].timestamp
+
+
+def _spreads(tob: TobSeries) -> Sequence[float]:
+    """Spread per row of a top-of-book list or table."""
+    if isinstance(tob, TobTable):
+        return tob.spreads()
+    return [t.spread for t in tob]
+
+
+def _mid_prices(tob: TobSeries) -> Sequence[float]:
+    """Mid price per row of a top-of-book list or table."""
+    if isinstance(tob, TobTable):
+        return tob.mid_prices()
+    return [t.mid_price for t in tob]
+
+
 def detect_spread_onset(
-    pre_tob: List[TopOfBook],
-    post_tob: List[TopOfBook],
+    pre_tob: TobSeries,
+    post_tob: TobSeries,
     k_std: float,
 ) -> OnsetDetection:
     """Detect when spread first exceeds baseline + k*std.
@@ -154,15 +182,15 @@ def detect_spread_onset(
     Spread widening indicates liquidity withdrawal.
 
     Args:
-        pre_tob: Pre-event top-of-book data.
-        post_tob: Post-event top-of-book data.
+        pre_tob: Pre-event top-of-book data (list or TobTable).
+        post_tob: Post-event top-of-book data (list or TobTable).
         k_std: Number of standard deviations for threshold.
 
     Returns:
         OnsetDetection for spread/liquidity.
     """
     # Compute baseline from pre-window spreads
-    pre_spreads = [t.spread for t in pre_tob]
+    pre_spreads = _spreads(pre_tob)
     baseline, std = _compute_baseline_stats(pre_spreads)
 
     if baseline is None:
@@ -184,10 +212,10 @@ def detect_spread_onset(
     # Find first time spread exceeds threshold in post-window
     onset_time = None
     onset_value = None
-    for tob in post_tob:
-        if tob.spread >= threshold:
-            onset_time = tob.timestamp
-            onset_value = tob.spread
+    for i, spread in enumerate(_spreads(post_tob)):
+        if spread >= threshold:
+            onset_time = _tob_timestamp(post_tob, i)
+            onset_value = spread
             break
 
     return OnsetDetection(
@@ -202,8 +230,8 @@ def detect_spread_onset(
 
 
 def detect_volume_onset(
-    pre_trades: List[Trade],
-    post_trades: List[Trade],
+    pre_trades: TradeSeries,
+    post_trades: TradeSeries,
     k_std: float,
     bucket_seconds: float = 5.0,
 ) -> OnsetDetection:
@@ -212,19 +240,34 @@ def detect_volume_onset(
     Volume is aggregated into time buckets.
 
     Args:
-        pre_trades: Pre-event trades.
-        post_trades: Post-event trades.
+        pre_trades: Pre-event trades (list or TradeTable).
+        post_trades: Post-event trades (list or TradeTable).
         k_std: Number of standard deviations for threshold.
         bucket_seconds: Duration of each volume bucket.
 
     Returns:
         OnsetDetection for volume.
     """
-    def _bucket_volume(trades: List[Trade], bucket_sec: float) -> List[Tuple[datetime, float]]:
+    def _bucket_volume(trades: TradeSeries, bucket_sec: float) -> List[Tuple[datetime, float]]:
         """Aggregate trade volume into time buckets."""
         if not trades:
             return []
 
+        if isinstance(trades, TradeTable):
+            # Same bucketing as below, done on epoch nanoseconds
+            ns_buckets: Dict[int, float] = {}
+            for ts_ns, size in zip(trades.timestamps, trades.sizes):
+                epoch_second = ts_ns // NS_PER_SECOND
+                second = epoch_second % 60
+                bucket_second = (
+                    epoch_second - second + int(second // bucket_sec) * int(bucket_sec)
+                )
+                ns_buckets[bucket_second] = ns_buckets.get(bucket_second, 0.0) + size
+            return sorted(
+                (ns_to_datetime(sec * NS_PER_SECOND), volume)
+                for sec, volume in ns_buckets.items()
+            )
+
         buckets: Dict[datetime, float] = {}
         for t in trades:
             # Round down to bucket start
@@ -280,8 +323,8 @@ def detect_volume_onset(
 
 
 def detect_price_onset(
-    pre_tob: List[TopOfBook],
-    post_tob: List[TopOfBook],
+    pre_tob: TobSeries,
+    post_tob: TobSeries,
     k_std: float,
     event_direction: str,
 ) -> OnsetDetection:
@@ -290,8 +333,8 @@ def detect_price_onset(
     Uses midprice from top-of-book.
 
     Args:
-        pre_tob: Pre-event top-of-book data.
-        post_tob: Post-event top-of-book data.
+        pre_tob: Pre-event top-of-book data (list or TobTable).
+        post_tob: Post-event top-of-book data (list or TobTable).
         k_std: Number of standard deviations for threshold.
         event_direction: Direction of event ("up" or "down").
 
@@ -299,7 +342,7 @@ def detect_price_onset(
         OnsetDetection for price movement.
     """
     # Compute baseline from pre-window midprices
-    pre_prices = [t.mid_price for t in pre_tob]
+    pre_prices = _mid_prices(pre_tob)
     baseline, std = _compute_baseline_stats(pre_prices)
 
     if baseline is None:
@@ -325,14 +368,14 @@ def detect_price_onset(
     # Find first time price crosses threshold
     onset_time = None
     onset_value = None
-    for tob in post_tob:
-        if event_direction == "down" and tob.mid_price <= threshold:
-            onset_time = tob.timestamp
-            onset_value = tob.mid_price
+    for i, mid_price in enumerate(_mid_prices(post_tob)):
+        if event_direction == "down" and mid_price <= threshold:
+            onset_time = _tob_timestamp(post_tob, i)
+            onset_value = mid_price
             break
-        elif event_direction == "up" and tob.mid_price >= threshold:
-            onset_time = tob.timestamp
-            onset_value = tob.mid_price
+        elif event_direction == "up" and mid_price >= threshold:
+            onset_time = _tob_timestamp(post_tob, i)
+            onset_value = mid_price
             break
 
     return OnsetDetection(
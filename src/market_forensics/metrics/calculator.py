@@ -10,9 +10,9 @@ import json
 import math
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import List, Optional, Sequence, Tuple, Union
 
-from ..data.models import TopOfBook, Trade
+from ..data.columnar import TobSeries, TobTable, TradeSeries, TradeTable
 from ..windows.extractor import EventWindow
 
 
@@ -121,11 +121,31 @@ class EventMetrics:
         }
 
 
-def compute_trade_metrics(trades: List[Trade]) -> tuple:
+def _trade_columns(trades: TradeSeries) -> Tuple[Sequence[float], Sequence[float]]:
+    """Return (prices, sizes) for a trade list or table."""
+    if isinstance(trades, TradeTable):
+        return trades.prices, trades.sizes
+    return [t.price for t in trades], [t.size for t in trades]
+
+
+def _tob_columns(
+    tob: TobSeries,
+) -> Tuple[Sequence[float], Sequence[float], Sequence[float]]:
+    """Return (spreads, spreads_bps, midprices) for a top-of-book list or table."""
+    if isinstance(tob, TobTable):
+        return tob.spreads(), tob.spreads_bps(), tob.mid_prices()
+    return (
+        [t.spread for t in tob],
+        [t.spread_bps for t in tob],
+        [t.mid_price for t in tob],
+    )
+
+
+def compute_trade_metrics(trades: TradeSeries) -> tuple:
     """Compute trade-based metrics.
 
     Args:
-        trades: List of trades.
+        trades: Trades as a list or TradeTable.
 
     Returns:
         Tuple of (trade_count, trade_volume, avg_trade_size, vwap, realized_vol, min_price, max_price)
@@ -135,14 +155,14 @@ def compute_trade_metrics(trades: List[Trade]) -> tuple:
     if trade_count == 0:
         return (0, 0.0, None, None, None, None, None)
 
-    trade_volume = sum(t.size for t in trades)
+    prices, sizes = _trade_columns(trades)
+    trade_volume = sum(sizes)
     avg_trade_size = trade_volume / trade_count
 
     # VWAP = sum(price * size) / sum(size)
-    vwap = sum(t.price * t.size for t in trades) / trade_volume
+    vwap = sum(p * s for p, s in zip(prices, sizes)) / trade_volume
 
     # Price stats
-    prices = [t.price for t in trades]
     min_price = min(prices)
     max_price = max(prices)
 
@@ -151,9 +171,9 @@ def compute_trade_metrics(trades: List[Trade]) -> tuple:
     realized_vol = None
     if trade_count >= 2:
         log_returns = []
-        for i in range(1, len(trades)):
-            if trades[i - 1].price > 0:
-                log_return = math.log(trades[i].price / trades[i - 1].price)
+        for i in range(1, len(prices)):
+            if prices[i - 1] > 0:
+                log_return = math.log(prices[i] / prices[i - 1])
                 log_returns.append(log_return)
 
         if log_returns:
@@ -164,11 +184,11 @@ def compute_trade_metrics(trades: List[Trade]) -> tuple:
     return (trade_count, trade_volume, avg_trade_size, vwap, realized_vol, min_price, max_price)
 
 
-def compute_tob_metrics(tob: List[TopOfBook]) -> tuple:
+def compute_tob_metrics(tob: TobSeries) -> tuple:
     """Compute top-of-book based metrics.
 
     Args:
-        tob: List of top-of-book snapshots.
+        tob: Top-of-book snapshots as a list or TobTable.
 
     Returns:
         Tuple of (avg_spread, avg_spread_bps, avg_midprice)
@@ -176,9 +196,7 @@ def compute_tob_metrics(tob: List[TopOfBook]) -> tuple:
     if not tob:
         return (None, None, None)
 
-    spreads = [t.spread for t in tob]
-    spreads_bps = [t.spread_bps for t in tob]
-    midprices = [t.mid_price for t in tob]
+    spreads, spreads_bps, midprices = _tob_columns(tob)
 
     avg_spread = sum(spreads) / len(spreads)
     avg_spread_bps = sum(spreads_bps) / len(spreads_bps)
@@ -187,12 +205,12 @@ def compute_tob_metrics(tob: List[TopOfBook]) -> tuple:
     return (avg_spread, avg_spread_bps, avg_midprice)
 
 
-def compute_window_metrics(trades: List[Trade], tob: List[TopOfBook]) -> WindowMetrics:
+def compute_window_metrics(trades: TradeSeries, tob: TobSeries) -> WindowMetrics:
     """Compute all metrics for a single window.
 
     Args:
-        trades: Trades in the window.
-        tob: Top-of-book snapshots in the window.
+        trades: Trades in the window (list or TradeTable).
+        tob: Top-of-book snapshots in the window (list or TobTable).
 
     Returns:
         WindowMetrics with all computed values.
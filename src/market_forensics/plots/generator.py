@@ -86,14 +86,14 @@ def plot_event_price(
     event_time = window.event.timestamp
 
     # Plot TOB midprices
-    all_tob = window.pre_tob + window.post_tob
+    all_tob = [*window.pre_tob, *window.post_tob]
     if all_tob:
         times = [t.timestamp for t in all_tob]
         prices = [t.mid_price for t in all_tob]
         ax.plot(times, prices, 'b-', label='Mid Price', linewidth=1.5)
 
     # Plot trade prices
-    all_trades = window.pre_trades + window.post_trades
+    all_trades = [*window.pre_trades, *window.post_trades]
     if all_trades:
         times = [t.timestamp for t in all_trades]
         prices = [t.price for t in all_trades]
@@ -146,7 +146,7 @@ def plot_event_spread(
 
     event_time = window.event.timestamp
 
-    all_tob = window.pre_tob + window.post_tob
+    all_tob = [*window.pre_tob, *window.post_tob]
     if all_tob:
         times = [t.timestamp for t in all_tob]
         spreads = [t.spread for t in all_tob]
@@ -201,7 +201,7 @@ def plot_event_volume(
     event_time = window.event.timestamp
 
     # Bucket trades by time
-    all_trades = window.pre_trades + window.post_trades
+    all_trades = [*window.pre_trades, *window.post_trades]
     if all_trades:
         buckets: Dict[datetime, float] = {}
         for t in all_trades:
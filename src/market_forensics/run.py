@@ -9,13 +9,33 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+from bisect import bisect_left
+from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 from .config import load_config
-from .data.loaders import load_tob, load_trades
-from .data.models import TopOfBook, Trade
-from .events.detector import detect_price_shocks_from_config
+from .data.columnar import (
+    TOB_COALESCE_MODES,
+    datetime_to_ns,
+    ns_to_datetime,
+    seconds_to_ns,
+)
+from .data.loaders import load_tob_table, load_trade_table
+from .data.time_index import (
+    load_tob_ranges,
+    load_tob_tail,
+    load_trades_ranges,
+    load_trades_tail,
+)
+from .data.models import Event
+from .events.detector import (
+    AdaptiveThreshold,
+    DetectorError,
+    StreamingShockDetector,
+    detect_price_shocks_from_config,
+    detect_price_shocks_grid,
+)
 from .events.ordering import (
     analyze_all_orderings,
     analyze_event_ordering_from_config,
@@ -24,6 +44,7 @@ from .events.ordering import (
 from .metrics.calculator import compute_all_metrics, save_metrics
 from .plots.generator import MATPLOTLIB_AVAILABLE, generate_all_plots
 from .windows.extractor import (
+    event_intervals_from_config,
     extract_windows_from_config,
     save_windows,
 )
@@ -31,19 +52,34 @@ from .windows.extractor import (
 
 def run_pipeline(
     config_path: str,
-    trades_path: str,
-    tob_path: str,
+    trades_path: Union[str, Sequence[str]],
+    tob_path: Union[str, Sequence[str]],
     output_dir: str,
     verbose: bool = True,
+    workers: Optional[int] = 1,
+    event_driven: bool = False,
+    tob_coalesce: Optional[str] = None,
 ) -> dict:
     """Run the full pipeline end-to-end.
 
     Args:
         config_path: Path to configuration file.
-        trades_path: Path to trades data file (CSV or JSONL).
-        tob_path: Path to top-of-book data file (CSV or JSONL).
+        trades_path: Path to trades data file (CSV or JSONL), or a list of
+            files (e.g. one per symbol) that are analyzed together.
+        tob_path: Path to top-of-book data file (CSV or JSONL), or a list of files.
         output_dir: Directory to save all outputs.
         verbose: Whether to print progress messages.
+        workers: Processes used to parse large CSV inputs and to scan the
+            symbols of a multi-symbol dataset concurrently (None for one per CPU).
+        event_driven: Detect events on the top-of-book first, then load only
+            the trades inside event windows instead of the whole trades file.
+            The top-of-book is still loaded in full rather than streamed
+            through StreamingShockDetector: the windows and metrics read it
+            again after detection, and coalescing and multi-symbol detection
+            work on whole tables, so only the trades side is saved.
+        tob_coalesce: Drop redundant top-of-book updates before detection
+            ("timestamp" or "price", see TobTable.coalesced). The row counts
+            and reduction ratio are recorded under 'tob_coalescing'.
 
     Returns:
         Dictionary with paths to all generated outputs.
@@ -69,19 +105,464 @@ def run_pipeline(
     config = load_config(config_path)
 
     # Load data
-    log(f"Loading trades from {trades_path}...")
-    trades = load_trades(trades_path)
-    log(f"  Loaded {len(trades)} trades")
+    if not event_driven:
+        trades = _load_trades(trades_path, workers, log)
 
-    log(f"Loading top-of-book from {tob_path}...")
-    tob = load_tob(tob_path)
-    log(f"  Loaded {len(tob)} TOB snapshots")
+    tob = _load_tob(tob_path, workers, tob_coalesce, results, log)
 
     # Detect events
     log("Detecting price shock events...")
-    events = detect_price_shocks_from_config(tob, config)
+    events = detect_price_shocks_from_config(tob, config, workers=workers)
     log(f"  Detected {len(events)} events")
-    results['events'] = [
+    results['events'] = _event_summaries(events)
+
+    if not events:
+        log("No events detected. Pipeline complete.")
+        return results
+
+    if event_driven:
+        # Trades are only used inside windows: load just those time ranges
+        intervals = event_intervals_from_config(events, config)
+        trades = _load_trades_ranges(trades_path, intervals, log)
+
+    return _analyze_events(events, trades, tob, config, output_dir, results, log)
+
+
+def run_sweep(
+    config_path: str,
+    trades_path: Union[str, Sequence[str]],
+    tob_path: Union[str, Sequence[str]],
+    output_dirs: Dict[Tuple[float, float], str],
+    verbose: bool = True,
+    workers: Optional[int] = 1,
+    event_driven: bool = False,
+    tob_coalesce: Optional[str] = None,
+    plots: bool = False,
+) -> Dict[Tuple[float, float], dict]:
+    """Run the pipeline for a grid of detection thresholds and windows.
+
+    The inputs are loaded once and events for every (threshold, window)
+    pair are detected in one pass (see detect_price_shocks_grid). Windows,
+    metrics and orderings are then produced per pair, as run_pipeline would
+    with that pair in the config's event_detection section.
+
+    Args:
+        config_path: Path to configuration file.
+        trades_path: Path to trades data file, or a list of files.
+        tob_path: Path to top-of-book data file, or a list of files.
+        output_dirs: Output directory per (threshold_pct, window_seconds).
+        verbose: Whether to print progress messages.
+        workers: Processes used to parse large CSV inputs and to scan
+            symbols concurrently (None for one per CPU).
+        event_driven: Load only the trades inside the event windows of any pair.
+        tob_coalesce: Top-of-book coalescing mode (see run_pipeline).
+        plots: Also generate the per-event plots (only the ordering summary
+            table otherwise).
+
+    Returns:
+        {(threshold_pct, window_seconds): results} with run_pipeline's
+        results for each pair, plus its 'event_detection' settings.
+
+    Raises:
+        DetectorError: If the config sets event_detection.adaptive_threshold,
+            which has no single threshold to sweep.
+    """
+    def log(msg: str) -> None:
+        if verbose:
+            print(msg)
+
+    log(f"Loading config from {config_path}...")
+    config = load_config(config_path)
+
+    if not event_driven:
+        trades = _load_trades(trades_path, workers, log)
+
+    shared: dict = {}
+    tob = _load_tob(tob_path, workers, tob_coalesce, shared, log)
+
+    thresholds = [threshold for threshold, _ in output_dirs]
+    windows = [window for _, window in output_dirs]
+    log(f"Detecting price shock events for {len(output_dirs)} threshold/window pairs...")
+    event_config = config.get("event_detection", {})
+    if AdaptiveThreshold.from_config(event_config) is not None:
+        raise DetectorError(
+            "Sweeps use fixed thresholds; remove event_detection.adaptive_threshold"
+        )
+    grid = detect_price_shocks_grid(
+        tob, thresholds, windows, event_config.get("mode", "reference"), workers=workers
+    )
+
+    if event_driven:
+        intervals = [
+            interval
+            for key in output_dirs
+            for interval in event_intervals_from_config(grid[key], config)
+        ]
+        trades = _load_trades_ranges(trades_path, intervals, log)
+
+    sweep = {}
+    for (threshold, window), output_dir in output_dirs.items():
+        events = grid[(threshold, window)]
+        log(f"\nthreshold={threshold}%, window={_format_number(window)}s: {len(events)} events")
+        pair_config = dict(
+            config,
+            event_detection=dict(
+                config.get("event_detection", {}),
+                price_shock_threshold_pct=threshold,
+                rolling_window_seconds=window,
+            ),
+        )
+        results = {
+            'config': config_path,
+            'event_detection': pair_config['event_detection'],
+            'events': _event_summaries(events),
+            'windows': [],
+            'metrics': {},
+            'orderings': {},
+            'plots': {},
+            **shared,
+        }
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        if events:
+            results = _analyze_events(
+                events, trades, tob, pair_config, Path(output_dir), results,
+                lambda msg: None, plots=plots,
+            )
+        sweep[(threshold, window)] = results
+        log(f"  Outputs saved to: {output_dir}")
+    return sweep
+
+
+DayPaths = Tuple[Union[str, Sequence[str]], Union[str, Sequence[str]]]
+
+
+def run_days(
+    config_path: str,
+    days: Sequence[DayPaths],
+    output_dir: str,
+    verbose: bool = True,
+    workers: Optional[int] = 1,
+    tob_coalesce: Optional[str] = None,
+    previous_day: Optional[DayPaths] = None,
+) -> dict:
+    """Run the pipeline over consecutive days as one continuous stream.
+
+    run_pipeline on a single day cannot see across midnight: events in its
+    first minutes get truncated pre-windows, and a move spanning midnight is
+    split between two runs (or missed). Here the top-of-book of each day is
+    pushed, one day at a time, through a StreamingShockDetector per symbol,
+    so the rolling window and the pending (still replaceable) event carry
+    over from one day to the next. Windows are then extracted from just the
+    event intervals of each day's files (see load_trades_ranges), so a
+    window near midnight is filled from both days without loading either
+    day's trades in full.
+
+    Events match detect_price_shocks on the days' rows concatenated, and
+    the outputs match run_pipeline on such a concatenation (with
+    tob_coalesce, the rows loaded from each file for the windows are
+    coalesced on their own).
+
+    Args:
+        config_path: Path to configuration file.
+        days: (trades_path, tob_path) per day, in time order; each path may
+            be a list of files (e.g. one per symbol).
+        output_dir: Directory to save all outputs.
+        verbose: Whether to print progress messages.
+        workers: Processes used to parse large CSV inputs (None for one per CPU).
+        tob_coalesce: Top-of-book coalescing mode (see run_pipeline).
+        previous_day: (trades_path, tob_path) of the day before the first
+            one. Only its tail is read, backwards from the end of the file
+            (see load_trades_tail): the detector is warmed up on its last two
+            rolling windows (plus four halflives of an adaptive threshold),
+            and windows of early events take their pre-event rows from it.
+            Events before the first day are not reported.
+
+    Returns:
+        Dictionary with paths to all generated outputs, as run_pipeline.
+
+    Raises:
+        ValueError: If days is empty.
+    """
+    if not days:
+        raise ValueError("days must list at least one day")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    results = {
+        'config': config_path,
+        'events': [],
+        'windows': [],
+        'metrics': {},
+        'orderings': {},
+        'plots': {},
+    }
+
+    def log(msg: str) -> None:
+        if verbose:
+            print(msg)
+
+    log(f"Loading config from {config_path}...")
+    config = load_config(config_path)
+
+    detectors: Dict[str, StreamingShockDetector] = {}
+    events: List[Event] = []
+    # First top-of-book timestamp of each day: the boundaries between days
+    starts: List[Optional[int]] = []
+    rows_in = rows_out = 0
+    for number, (_, tob_path) in enumerate(days, 1):
+        log(f"\nDay {number}/{len(days)}")
+        coalescing: dict = {}
+        tob = _load_tob(tob_path, workers, tob_coalesce, coalescing, log)
+        if tob_coalesce:
+            rows_in += coalescing['tob_coalescing']['rows_in']
+            rows_out += coalescing['tob_coalescing']['rows_out']
+        starts.append(tob.timestamps[0] if len(tob) else None)
+        if len(tob) == 0:
+            continue
+        if not detectors and previous_day is not None:
+            _warm_up(detectors, previous_day[1], tob.timestamps[0], config, tob_coalesce, log)
+        emitted = _push_day(detectors, tob, config)
+        events.extend(emitted)
+        log(f"  {len(emitted)} events finalized")
+    for detector in detectors.values():
+        events.extend(detector.flush())
+    stream_start = next((start for start in starts if start is not None), None)
+    if previous_day is not None and stream_start is not None:
+        # Events of the previous day belong to its own run
+        events = [e for e in events if datetime_to_ns(e.timestamp) >= stream_start]
+    events.sort(key=lambda e: (e.timestamp, e.symbol))
+    if tob_coalesce:
+        results['tob_coalescing'] = {
+            'mode': tob_coalesce,
+            'rows_in': rows_in,
+            'rows_out': rows_out,
+            'reduction_ratio': rows_in / rows_out if rows_out else None,
+        }
+
+    log(f"\nDetected {len(events)} events over {len(days)} days")
+    results['events'] = _event_summaries(events)
+    if not events:
+        log("No events detected. Pipeline complete.")
+        return results
+
+    # Each day's files serve the parts of the event intervals between its
+    # first timestamp and the next day's; the previous day serves the rest
+    files = list(days)
+    if previous_day is not None:
+        files.insert(0, previous_day)
+        starts.insert(0, None)
+    starts[0] = None
+    intervals = [
+        (datetime_to_ns(start), datetime_to_ns(end))
+        for start, end in event_intervals_from_config(events, config)
+    ]
+    trades_parts = []
+    tob_parts = []
+    for i, (trades_path, tob_path) in enumerate(files):
+        if i > 0 and starts[i] is None:
+            continue
+        span_end = next((start for start in starts[i + 1:] if start is not None), None)
+        ranges = _clip_intervals(intervals, starts[i], span_end)
+        if not ranges:
+            continue
+        if i == 0 and previous_day is not None:
+            # Windows reach into the previous day only up to the first day's
+            # start, so they need just the end of its files
+            tail_start = ranges[0][0]
+            for path in _as_paths(trades_path):
+                log(f"Loading trades from {tail_start} to the end of {path}...")
+                trades_parts.append(_rows_before(load_trades_tail(path, tail_start), span_end))
+            for path in _as_paths(tob_path):
+                log(f"Loading top-of-book from {tail_start} to the end of {path}...")
+                part = _rows_before(load_tob_tail(path, tail_start), span_end)
+                tob_parts.append(part.coalesced(tob_coalesce) if tob_coalesce else part)
+            continue
+        for path in _as_paths(trades_path):
+            log(f"Loading trades in {len(ranges)} event intervals from {path}...")
+            trades_parts.append(load_trades_ranges(path, ranges))
+        for path in _as_paths(tob_path):
+            log(f"Loading top-of-book in {len(ranges)} event intervals from {path}...")
+            part = load_tob_ranges(path, ranges)
+            tob_parts.append(part.coalesced(tob_coalesce) if tob_coalesce else part)
+    trades = _concat(trades_parts)
+    tob = _concat(tob_parts)
+    log(f"  Loaded {len(trades)} trades and {len(tob)} TOB snapshots")
+
+    return _analyze_events(events, trades, tob, config, output_dir, results, log)
+
+
+def _day_paths(day_dir: str) -> Tuple[str, str]:
+    """(trades_path, tob_path) of a canonical day directory."""
+    return str(Path(day_dir) / "trades.csv"), str(Path(day_dir) / "tob.csv")
+
+
+def _push_day(
+    detectors: Dict[str, StreamingShockDetector],
+    tob,
+    config: dict,
+) -> List[Event]:
+    """Push one day's top-of-book through the per-symbol streaming detectors."""
+    emitted: List[Event] = []
+    for symbol, part in sorted(tob.partition_by_symbol().items()):
+        detector = detectors.get(symbol)
+        if detector is None:
+            detector = detectors[symbol] = StreamingShockDetector.from_config(config, symbol)
+        emitted.extend(detector.push_table(part))
+    return emitted
+
+
+def _warm_up(
+    detectors: Dict[str, StreamingShockDetector],
+    tob_path: Union[str, Sequence[str]],
+    start_ns: int,
+    config: dict,
+    tob_coalesce: Optional[str],
+    log: Callable[[str], None],
+) -> None:
+    """Feed the detectors the tail of the day before the stream starts."""
+    event_config = config.get("event_detection", {})
+    lookback = 2 * event_config.get("rolling_window_seconds", 0)
+    adaptive = AdaptiveThreshold.from_config(event_config)
+    if adaptive is not None:
+        lookback += 4 * adaptive.halflife_seconds
+    start = ns_to_datetime(start_ns - seconds_to_ns(lookback))
+    for path in _as_paths(tob_path):
+        log(f"Loading the last {_format_number(lookback)}s of top-of-book from {path}...")
+        tail = _rows_before(load_tob_tail(path, start), start_ns)
+        _push_day(detectors, tail.coalesced(tob_coalesce) if tob_coalesce else tail, config)
+
+
+def _rows_before(table, end_ns: Optional[int]):
+    """View the rows of a sorted table before end_ns (all rows if None)."""
+    if end_ns is None:
+        return table
+    return table.view(0, bisect_left(table.timestamps, end_ns))
+
+
+def _clip_intervals(
+    intervals: Iterable[Tuple[int, int]],
+    start_ns: Optional[int],
+    end_ns: Optional[int],
+) -> List[Tuple[datetime, datetime]]:
+    """Intersect [start, end) ns intervals with a span (None for unbounded).
+
+    Returns:
+        The non-empty intersections, as datetimes.
+    """
+    clipped = []
+    for start, end in intervals:
+        if start_ns is not None:
+            start = max(start, start_ns)
+        if end_ns is not None:
+            end = min(end, end_ns)
+        if start < end:
+            clipped.append((ns_to_datetime(start), ns_to_datetime(end)))
+    return clipped
+
+
+def sweep_output_dirs(
+    output: str,
+    thresholds: List[float],
+    windows: List[float],
+) -> Dict[Tuple[float, float], str]:
+    """Output directory per sweep point.
+
+    output may contain ``{threshold}`` and ``{window}`` placeholders;
+    otherwise each point gets a ``threshold_{threshold}_window_{window}``
+    subdirectory of it.
+
+    Raises:
+        ValueError: If two points would share a directory.
+    """
+    if "{threshold}" not in output and "{window}" not in output:
+        output = str(Path(output) / "threshold_{threshold}_window_{window}")
+    output_dirs = {
+        (threshold, window): output.format(threshold=threshold, window=_format_number(window))
+        for window in windows
+        for threshold in thresholds
+    }
+    if len(set(output_dirs.values())) != len(output_dirs):
+        raise ValueError(f"Output {output!r} must distinguish every threshold and window")
+    return output_dirs
+
+
+def _format_number(value: float) -> str:
+    """Format 60.0 as "60" and 0.5 as "0.5"."""
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+def _as_paths(paths: Union[str, Sequence[str]]) -> List[str]:
+    """A single path or a list of paths as a list."""
+    return [paths] if isinstance(paths, (str, Path)) else list(paths)
+
+
+def _concat(tables: list):
+    """One table from the tables of several files (not copied if only one)."""
+    return tables[0] if len(tables) == 1 else type(tables[0]).concat(tables)
+
+
+def _load_trades(
+    trades_path: Union[str, Sequence[str]],
+    workers: Optional[int],
+    log: Callable[[str], None],
+):
+    """Load the trades table of one or several files."""
+    tables = []
+    for path in _as_paths(trades_path):
+        log(f"Loading trades from {path}...")
+        tables.append(load_trade_table(path, workers=workers))
+    trades = _concat(tables)
+    log(f"  Loaded {len(trades)} trades")
+    return trades
+
+
+def _load_trades_ranges(
+    trades_path: Union[str, Sequence[str]],
+    intervals: list,
+    log: Callable[[str], None],
+):
+    """Load the trades inside the given time intervals from one or several files."""
+    tables = []
+    for path in _as_paths(trades_path):
+        log(f"Loading trades in {len(intervals)} event intervals from {path}...")
+        tables.append(load_trades_ranges(path, intervals))
+    trades = _concat(tables)
+    log(f"  Loaded {len(trades)} trades")
+    return trades
+
+
+def _load_tob(
+    tob_path: Union[str, Sequence[str]],
+    workers: Optional[int],
+    tob_coalesce: Optional[str],
+    results: dict,
+    log: Callable[[str], None],
+):
+    """Load (and optionally coalesce) the top-of-book table of one or several files.
+
+    Each file is coalesced on its own, before the files are combined.
+    """
+    tables = []
+    for path in _as_paths(tob_path):
+        log(f"Loading top-of-book from {path}...")
+        tables.append(load_tob_table(path, workers=workers))
+    rows_in = sum(len(table) for table in tables)
+    log(f"  Loaded {rows_in} TOB snapshots")
+    if not tob_coalesce:
+        return _concat(tables)
+    tob = _concat([table.coalesced(tob_coalesce) for table in tables])
+    results['tob_coalescing'] = {
+        'mode': tob_coalesce,
+        'rows_in': rows_in,
+        'rows_out': len(tob),
+        'reduction_ratio': rows_in / len(tob) if len(tob) else None,
+    }
+    log(f"  Coalesced to {len(tob)} TOB snapshots ({tob_coalesce} mode)")
+    return tob
+
+
+def _event_summaries(events: List[Event]) -> List[dict]:
+    return [
         {
             'timestamp': e.timestamp.isoformat(),
             'symbol': e.symbol,
@@ -91,10 +572,18 @@ def run_pipeline(
         for e in events
     ]
 
-    if not events:
-        log("No events detected. Pipeline complete.")
-        return results
 
+def _analyze_events(
+    events: List[Event],
+    trades,
+    tob,
+    config: dict,
+    output_dir: Path,
+    results: dict,
+    log: Callable[[str], None],
+    plots: bool = True,
+) -> dict:
+    """Run windows -> metrics -> ordering -> plots for detected events."""
     # Extract windows
     log("Extracting event windows...")
     windows = extract_windows_from_config(events, trades, tob, config)
@@ -126,12 +615,13 @@ def run_pipeline(
 
     # Generate plots
     log("Generating plots...")
-    if MATPLOTLIB_AVAILABLE:
+    if plots and MATPLOTLIB_AVAILABLE:
         plot_paths = generate_all_plots(windows, orderings, output_dir / "plots")
         results['plots'] = plot_paths
         log(f"  Generated {len(plot_paths.get('event_plots', []))} event plots")
     else:
-        log("  matplotlib not available, skipping graphical plots")
+        if plots:
+            log("  matplotlib not available, skipping graphical plots")
         # Still generate summary table
         from .plots.generator import generate_summary_table
         table_path = generate_summary_table(
@@ -176,6 +666,14 @@ Examples:
       --trades data/sample/trades.csv \\
       --tob data/sample/tob.csv \\
       --output outputs
+
+  # Consecutive days as one stream (directories holding trades.csv and tob.csv)
+  python -m market_forensics.run \\
+      --days data/binance/futures_um/BTCUSDT/canonical/2024-03-2{7,8}
+
+  # Threshold/window sweep, loading the data once
+  python -m market_forensics.run --thresholds 0.4 0.5 0.6 --windows 30 60 \\
+      --output "outputs/sweep/t{threshold}_w{window}"
         """,
     )
 
@@ -189,13 +687,17 @@ Examples:
     )
     parser.add_argument(
         "--trades", "-t",
+        nargs="+",
         default=None,
-        help="Path to trades CSV/JSONL file (default: from config paths.data_dir)",
+        help="Path to trades CSV/JSONL file; several files (e.g. one per symbol) are "
+             "analyzed together (default: from config paths.data_dir)",
     )
     parser.add_argument(
         "--tob", "-b",
+        nargs="+",
         default=None,
-        help="Path to top-of-book CSV/JSONL file (default: from config paths.data_dir)",
+        help="Path to top-of-book CSV/JSONL file, or several files "
+             "(default: from config paths.data_dir)",
     )
     parser.add_argument(
         "--output", "-o",
@@ -207,6 +709,65 @@ Examples:
         action="store_true",
         help="Suppress progress messages",
     )
+    parser.add_argument(
+        "--workers", "-j",
+        type=int,
+        default=1,
+        help="Processes used to parse large CSV inputs and to scan symbols concurrently "
+             "(0 for one per CPU; default: 1)",
+    )
+
+    parser.add_argument(
+        "--event-driven",
+        action="store_true",
+        help="Detect events first and load only the trades inside event windows",
+    )
+
+    parser.add_argument(
+        "--coalesce-tob",
+        choices=TOB_COALESCE_MODES,
+        default=None,
+        help="Drop redundant top-of-book updates: 'timestamp' keeps the last update "
+             "per timestamp, 'price' also drops size-only changes",
+    )
+
+    parser.add_argument(
+        "--days",
+        nargs="+",
+        default=None,
+        metavar="DIR",
+        help="Run consecutive days, each a directory with trades.csv and tob.csv, "
+             "as one continuous stream (instead of --trades/--tob)",
+    )
+    parser.add_argument(
+        "--previous-day",
+        default=None,
+        metavar="DIR",
+        help="With --days: the day before the first one, of which only the tail is read "
+             "to warm up detection and fill early pre-event windows",
+    )
+
+    parser.add_argument(
+        "--thresholds",
+        nargs="+",
+        type=float,
+        default=None,
+        help="Sweep these price_shock_threshold_pct values in one pass "
+             "(default: the config value)",
+    )
+    parser.add_argument(
+        "--windows",
+        nargs="+",
+        type=float,
+        default=None,
+        help="Sweep these rolling_window_seconds values in one pass "
+             "(default: the config value)",
+    )
+    parser.add_argument(
+        "--plots",
+        action="store_true",
+        help="Generate per-event plots for every sweep point (only the summary table otherwise)",
+    )
 
     args = parser.parse_args()
 
@@ -221,12 +782,48 @@ Examples:
     output_path = args.output if args.output else output_dir
 
     try:
+        if args.days:
+            if args.thresholds or args.windows:
+                raise ValueError("--days does not support --thresholds/--windows sweeps")
+            run_days(
+                config_path=args.config,
+                days=[_day_paths(day) for day in args.days],
+                output_dir=output_path,
+                verbose=not args.quiet,
+                workers=args.workers or None,
+                tob_coalesce=args.coalesce_tob,
+                previous_day=_day_paths(args.previous_day) if args.previous_day else None,
+            )
+            return 0
+        if args.thresholds or args.windows:
+            event_config = config.get("event_detection", {})
+            thresholds = args.thresholds or [event_config["price_shock_threshold_pct"]]
+            # 60.0 -> 60, as the window is written in config files
+            windows = [
+                int(w) if float(w).is_integer() else w
+                for w in args.windows or [event_config["rolling_window_seconds"]]
+            ]
+            run_sweep(
+                config_path=args.config,
+                trades_path=trades_path,
+                tob_path=tob_path,
+                output_dirs=sweep_output_dirs(output_path, thresholds, windows),
+                verbose=not args.quiet,
+                workers=args.workers or None,
+                event_driven=args.event_driven,
+                tob_coalesce=args.coalesce_tob,
+                plots=args.plots,
+            )
+            return 0
         run_pipeline(
             config_path=args.config,
             trades_path=trades_path,
             tob_path=tob_path,
             output_dir=output_path,
             verbose=not args.quiet,
+            workers=args.workers or None,
+            event_driven=args.event_driven,
+            tob_coalesce=args.coalesce_tob,
         )
         return 0
     except Exception as e:
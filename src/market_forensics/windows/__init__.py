@@ -3,6 +3,8 @@
 from .extractor import (
     EventWindow,
     WindowError,
+    event_intervals,
+    event_intervals_from_config,
     extract_window,
     extract_windows,
     extract_windows_from_config,
@@ -13,6 +15,8 @@ from .extractor import (
 __all__ = [
     "EventWindow",
     "WindowError",
+    "event_intervals",
+    "event_intervals_from_config",
     "extract_window",
     "extract_windows",
     "extract_windows_from_config",
@@ -7,12 +7,23 @@ from __future__ import annotations
 
 import csv
 import json
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Dict, List, Tuple, Union
 
-from ..data.models import Event, TopOfBook, Trade
+from ..data.columnar import (
+    SIDE_BUY,
+    SIDE_SELL,
+    TobSeries,
+    TobTable,
+    TradeSeries,
+    TradeTable,
+    datetime_to_ns,
+    ns_to_datetime,
+)
+from ..data.models import Event, Side
 
 
 class WindowError(Exception):
@@ -25,6 +36,11 @@ class WindowError(Exception):
 class EventWindow:
     """Container for extracted pre/post window data around an event.
 
+    The trade and top-of-book series are lists of records or columnar tables,
+    matching whatever the window was extracted from. Windows extracted from
+    tables hold zero-copy views into the full series; Trade/TopOfBook objects
+    are only built when the view is indexed or iterated.
+
     Attributes:
         event: The detected event this window is centered on.
         pre_trades: Trades in the pre-event window.
@@ -36,10 +52,10 @@ class EventWindow:
     """
 
     event: Event
-    pre_trades: List[Trade]
-    post_trades: List[Trade]
-    pre_tob: List[TopOfBook]
-    post_tob: List[TopOfBook]
+    pre_trades: TradeSeries
+    post_trades: TradeSeries
+    pre_tob: TobSeries
+    post_tob: TobSeries
     pre_seconds: float
     post_seconds: float
 
@@ -52,8 +68,8 @@ class EventWindow:
 
 def extract_window(
     event: Event,
-    trades: List[Trade],
-    tob: List[TopOfBook],
+    trades: TradeSeries,
+    tob: TobSeries,
     pre_seconds: float,
     post_seconds: float,
 ) -> EventWindow:
@@ -64,8 +80,8 @@ def extract_window(
 
     Args:
         event: The detected event to center the window on.
-        trades: Full list of trades (must be sorted by timestamp).
-        tob: Full list of top-of-book snapshots (must be sorted by timestamp).
+        trades: Full trade series, list or table (must be sorted by timestamp).
+        tob: Full top-of-book series, list or table (must be sorted by timestamp).
         pre_seconds: Duration of pre-event window in seconds.
         post_seconds: Duration of post-event window in seconds.
 
@@ -80,29 +96,82 @@ def extract_window(
     if post_seconds < 0:
         raise WindowError(f"post_seconds must be non-negative, got {post_seconds}")
 
+    return _extract_indexed_window(
+        event, _SeriesIndex(trades), _SeriesIndex(tob), pre_seconds, post_seconds
+    )
+
+
+class _SeriesIndex:
+    """Per-symbol timestamp index over a trade or top-of-book series.
+
+    Built once per series: the series is partitioned by symbol and each
+    partition gets a sorted key column, so every window lookup is two or
+    three bisections plus a slice instead of a scan over all rows. Slices of
+    table partitions are zero-copy views into the partition's columns.
+    """
+
+    def __init__(self, series: Union[TradeSeries, TobSeries]) -> None:
+        self._is_table = isinstance(series, (TradeTable, TobTable))
+        self._empty = series[:0]
+        self._partitions = {}
+        if self._is_table:
+            for symbol, part in series.partition_by_symbol().items():
+                part = part.sorted_by_timestamp()
+                self._partitions[symbol] = (part, part.timestamps)
+        else:
+            groups: dict = {}
+            for record in series:
+                groups.setdefault(record.symbol, []).append(record)
+            for symbol, rows in groups.items():
+                keys = [r.timestamp for r in rows]
+                if any(keys[i] < keys[i - 1] for i in range(1, len(keys))):
+                    rows = sorted(rows, key=lambda r: r.timestamp)
+                    keys = [r.timestamp for r in rows]
+                self._partitions[symbol] = (rows, keys)
+
+    def split(
+        self,
+        symbol: str,
+        pre_start: datetime,
+        event_time: datetime,
+        post_end: datetime,
+    ) -> Tuple[Union[TradeSeries, TobSeries], Union[TradeSeries, TobSeries]]:
+        """Return the (pre, post) rows for one symbol.
+
+        Pre covers (pre_start, event_time); post covers [event_time, post_end).
+        """
+        partition = self._partitions.get(symbol)
+        if partition is None:
+            return self._empty, self._empty
+        rows, keys = partition
+        if self._is_table:
+            pre_start = datetime_to_ns(pre_start)
+            event_time = datetime_to_ns(event_time)
+            post_end = datetime_to_ns(post_end)
+        lo = bisect_right(keys, pre_start)
+        mid = bisect_left(keys, event_time, lo)
+        hi = bisect_left(keys, post_end, mid)
+        return rows[lo:mid], rows[mid:hi]
+
+
+def _extract_indexed_window(
+    event: Event,
+    trade_index: _SeriesIndex,
+    tob_index: _SeriesIndex,
+    pre_seconds: float,
+    post_seconds: float,
+) -> EventWindow:
+    """Extract one event window from prebuilt series indexes."""
     event_time = event.timestamp
     pre_start = event_time - timedelta(seconds=pre_seconds)
     post_end = event_time + timedelta(seconds=post_seconds)
 
-    # Extract trades in windows
-    pre_trades = [
-        t for t in trades
-        if pre_start < t.timestamp < event_time and t.symbol == event.symbol
-    ]
-    post_trades = [
-        t for t in trades
-        if event_time <= t.timestamp < post_end and t.symbol == event.symbol
-    ]
-
-    # Extract top-of-book in windows
-    pre_tob = [
-        t for t in tob
-        if pre_start < t.timestamp < event_time and t.symbol == event.symbol
-    ]
-    post_tob = [
-        t for t in tob
-        if event_time <= t.timestamp < post_end and t.symbol == event.symbol
-    ]
+    pre_trades, post_trades = trade_index.split(
+        event.symbol, pre_start, event_time, post_end
+    )
+    pre_tob, post_tob = tob_index.split(
+        event.symbol, pre_start, event_time, post_end
+    )
 
     return EventWindow(
         event=event,
@@ -117,8 +186,8 @@ def extract_window(
 
 def extract_windows(
     events: List[Event],
-    trades: List[Trade],
-    tob: List[TopOfBook],
+    trades: TradeSeries,
+    tob: TobSeries,
     pre_seconds: float,
     post_seconds: float,
     overlap_strategy: str = "keep_first",
@@ -128,12 +197,16 @@ def extract_windows(
     Overlapping events are handled deterministically based on the strategy:
     - "keep_first": Keep the first event, skip subsequent overlapping events.
                     An event overlaps if its timestamp falls within the window
-                    of a previous event (pre_start to post_end).
+                    of a previous event (pre_start to post_end) of the same
+                    symbol.
+
+    Events and series may hold several symbols: each series is partitioned
+    by symbol once, and windows are returned ordered by (timestamp, symbol).
 
     Args:
         events: List of detected events (should be sorted by timestamp).
-        trades: Full list of trades.
-        tob: Full list of top-of-book snapshots.
+        trades: Full trade series (list or table).
+        tob: Full top-of-book series (list or table).
         pre_seconds: Duration of pre-event window in seconds.
         post_seconds: Duration of post-event window in seconds.
         overlap_strategy: How to handle overlapping events ("keep_first").
@@ -153,39 +226,52 @@ def extract_windows(
         return []
 
     # Sort events by timestamp to ensure deterministic processing
-    sorted_events = sorted(events, key=lambda e: e.timestamp)
+    sorted_events = sorted(events, key=lambda e: (e.timestamp, e.symbol))
+
+    if pre_seconds < 0:
+        raise WindowError(f"pre_seconds must be non-negative, got {pre_seconds}")
+    if post_seconds < 0:
+        raise WindowError(f"post_seconds must be non-negative, got {post_seconds}")
+
+    # Index each series once; every window is then a few bisections
+    trade_index = _SeriesIndex(trades)
+    tob_index = _SeriesIndex(tob)
 
     windows: List[EventWindow] = []
-    excluded_until: Optional[datetime] = None
+    # End of the latest kept window per symbol
+    excluded_until: Dict[str, datetime] = {}
 
     for event in sorted_events:
         # Check if this event overlaps with a previously processed window
-        if excluded_until is not None and event.timestamp < excluded_until:
+        previous_end = excluded_until.get(event.symbol)
+        if previous_end is not None and event.timestamp < previous_end:
             # Skip this event as it falls within a previous window
             continue
 
         # Extract window for this event
-        window = extract_window(event, trades, tob, pre_seconds, post_seconds)
+        window = _extract_indexed_window(
+            event, trade_index, tob_index, pre_seconds, post_seconds
+        )
         windows.append(window)
 
         # Update the exclusion boundary (end of this event's post-window)
-        excluded_until = event.timestamp + timedelta(seconds=post_seconds)
+        excluded_until[event.symbol] = event.timestamp + timedelta(seconds=post_seconds)
 
     return windows
 
 
 def extract_windows_from_config(
     events: List[Event],
-    trades: List[Trade],
-    tob: List[TopOfBook],
+    trades: TradeSeries,
+    tob: TobSeries,
     config: dict,
 ) -> List[EventWindow]:
     """Extract windows using configuration dictionary.
 
     Args:
         events: List of detected events.
-        trades: Full list of trades.
-        tob: Full list of top-of-book snapshots.
+        trades: Full trade series (list or table).
+        tob: Full top-of-book series (list or table).
         config: Configuration dictionary with 'windows' section.
 
     Returns:
@@ -204,6 +290,71 @@ def extract_windows_from_config(
     return extract_windows(events, trades, tob, pre_seconds, post_seconds)
 
 
+def event_intervals(
+    events: List[Event],
+    pre_seconds: float,
+    post_seconds: float,
+) -> List[Tuple[datetime, datetime]]:
+    """Return the merged time intervals covered by the events' windows.
+
+    Each event needs data in [event_time - pre_seconds, event_time +
+    post_seconds); overlapping intervals are merged. Loading just these
+    intervals is enough for extract_windows to produce the same windows as
+    it would from the full series.
+
+    Args:
+        events: Detected events (any order).
+        pre_seconds: Duration of pre-event window in seconds.
+        post_seconds: Duration of post-event window in seconds.
+
+    Returns:
+        Sorted, non-overlapping (start, end) intervals.
+
+    Raises:
+        WindowError: If parameters are invalid.
+    """
+    if pre_seconds < 0:
+        raise WindowError(f"pre_seconds must be non-negative, got {pre_seconds}")
+    if post_seconds < 0:
+        raise WindowError(f"post_seconds must be non-negative, got {post_seconds}")
+
+    intervals: List[Tuple[datetime, datetime]] = []
+    for event in sorted(events, key=lambda e: e.timestamp):
+        start = event.timestamp - timedelta(seconds=pre_seconds)
+        end = event.timestamp + timedelta(seconds=post_seconds)
+        if intervals and start <= intervals[-1][1]:
+            intervals[-1] = (intervals[-1][0], max(intervals[-1][1], end))
+        else:
+            intervals.append((start, end))
+    return intervals
+
+
+def event_intervals_from_config(
+    events: List[Event],
+    config: dict,
+) -> List[Tuple[datetime, datetime]]:
+    """Return the merged window intervals using configuration dictionary.
+
+    Args:
+        events: List of detected events.
+        config: Configuration dictionary with 'windows' section.
+
+    Returns:
+        Sorted, non-overlapping (start, end) intervals.
+
+    Raises:
+        WindowError: If config is missing required keys.
+    """
+    try:
+        window_config = config["windows"]
+        pre_seconds = window_config["pre_event_seconds"]
+        post_seconds = window_config["post_event_seconds"]
+    except KeyError as e:
+        raise WindowError(f"Missing required config key: {e}")
+
+    return event_intervals(events, pre_seconds, post_seconds)
+
+
 def save_window(
     window: EventWindow,
     output_dir: Union[Path, str],
@@ -290,10 +441,26 @@ def save_windows(
     return [save_window(w, output_dir) for w in windows]
 
 
-def _save_trades_csv(trades: List[Trade], path: Path) -> None:
+def _save_trades_csv(trades: TradeSeries, path: Path) -> None:
     """Save trades to a CSV file."""
     fieldnames = ["timestamp", "symbol", "price", "size", "side", "trade_id"]
     with open(path, "w", newline="") as f:
+        if isinstance(trades, TradeTable):
+            # Write straight from the columns without building Trade objects
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            side_names = {SIDE_BUY: Side.BUY.value, SIDE_SELL: Side.SELL.value}
+            trade_ids = trades.trade_ids
+            for i, ts in enumerate(trades.timestamps):
+                writer.writerow([
+                    ns_to_datetime(ts).isoformat(),
+                    trades.symbols[trades.symbol_codes[i]],
+                    trades.prices[i],
+                    trades.sizes[i],
+                    side_names[trades.sides[i]],
+                    (trade_ids[i] if trade_ids is not None else None) or "",
+                ])
+            return
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
         for trade in trades:
@@ -307,12 +474,26 @@ def _save_trades_csv(trades: List[Trade], path: Path) -> None:
             })
 
 
-def _save_tob_csv(tob_list: List[TopOfBook], path: Path) -> None:
+def _save_tob_csv(tob_list: TobSeries, path: Path) -> None:
     """Save top-of-book snapshots to a CSV file."""
     fieldnames = [
         "timestamp", "symbol", "bid_price", "bid_size", "ask_price", "ask_size"
     ]
     with open(path, "w", newline="") as f:
+        if isinstance(tob_list, TobTable):
+            # Write straight from the columns without building TopOfBook objects
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            for i, ts in enumerate(tob_list.timestamps):
+                writer.writerow([
+                    ns_to_datetime(ts).isoformat(),
+                    tob_list.symbols[tob_list.symbol_codes[i]],
+                    tob_list.bid_prices[i],
+                    tob_list.bid_sizes[i],
+                    tob_list.ask_prices[i],
+                    tob_list.ask_sizes[i],
+                ])
+            return
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
         for tob in tob_list:
@@ -0,0 +1,237 @@
+"""Tests for direct ingestion of Binance daily zip archives."""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+from market_forensics.data.binance import (
+    AGG_TRADES_COLUMNS,
+    BOOK_TICKER_COLUMNS,
+    load_agg_trades_zip,
+    load_book_ticker_zip,
+)
+from market_forensics.data.cache import cache_dir_for
+from market_forensics.data.columnar import NumericIds
+from market_forensics.data.loaders import (
+    DataLoadError,
+    load_tob_table_csv,
+    load_trade_table,
+    load_trade_table_csv,
+)
+
+BASE_MS = 1711584000000  # 2024-03-28 00:00:00 UTC
+
+
+def _iso(ms: int) -> str:
+    # Same conversion as scripts/canonicalize_binance_um_day.py
+    return datetime.fromtimestamp(ms / 1000.0, tz=timezone.utc).isoformat()
+
+
+def _agg_rows(n: int) -> List[list]:
+    rows = []
+    for i in range(n):
+        ms = BASE_MS + 7 * i - (5 if i % 50 == 49 else 0)  # a few out of order
+        maker = "true" if i % 3 == 0 else "false"
+        rows.append([5000 + i, 60000.5 + i % 11, 0.001 * (1 + i % 9), 9 * i, 9 * i + 2, ms, maker])
+    return rows
+
+
+def _ticker_rows(n: int) -> List[list]:
+    rows = []
+    for i in range(n):
+        bid = 60000.1 + i % 13
+        ms = BASE_MS + 3 * i
+        rows.append([i, bid, 1.5 + i % 4, bid + 0.1, 0.25 * (1 + i % 5), ms - 1, ms])
+    return rows
+
+
+def _write_zip(path: Path, rows: List[list], header=None, newline: str = "\n") -> None:
+    lines = [",".join(header)] if header else []
+    lines += [",".join(str(v) for v in row) for row in rows]
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(path.stem + ".csv", newline.join(lines) + newline)
+
+
+def _write_canonical_trades(path: Path, rows: List[list]) -> None:
+    lines = ["timestamp,symbol,price,size,side,trade_id"]
+    for tid, price, qty, _, _, ms, maker in rows:
+        side = "sell" if maker == "true" else "buy"
+        lines.append(f"{_iso(ms)},BTCUSDT,{float(price)},{float(qty)},{side},{tid}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _write_canonical_tob(path: Path, rows: List[list]) -> None:
+    lines = ["timestamp,symbol,bid_price,bid_size,ask_price,ask_size"]
+    for _, bid, bid_qty, ask, ask_qty, _, ms in rows:
+        lines.append(f"{_iso(ms)},BTCUSDT,{float(bid)},{float(bid_qty)},{float(ask)},{float(ask_qty)}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _assert_same(a, b) -> None:
+    assert a.symbols == b.symbols
+    for name in ("timestamps", "symbol_codes", *type(a)._numeric_columns):
+        assert list(getattr(a, name)) == list(getattr(b, name)), name
+
+
+class TestAggTradesZip:
+    """aggTrades archives load exactly like their canonicalized CSVs."""
+
+    def test_matches_canonical_csv(self) -> None:
+        """Rows spanning many blocks match the canonical CSV path, ids stay int64."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            rows = _agg_rows(1000)
+            zip_path = temp_dir / "BTCUSDT-aggTrades-2024-03-28.zip"
+            _write_zip(zip_path, rows, AGG_TRADES_COLUMNS)
+            _write_canonical_trades(temp_dir / "trades.csv", rows)
+
+            table = load_agg_trades_zip(zip_path, use_cache=False, block_bytes=4096)
+            expected = load_trade_table_csv(temp_dir / "trades.csv", use_cache=False)
+            _assert_same(table, expected)
+            assert isinstance(table.trade_ids, NumericIds)
+            assert list(table.trade_ids) == list(expected.trade_ids)
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_headerless_archive(self) -> None:
+        """Older archives without a header use the standard column order."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            rows = _agg_rows(200)
+            with_header = temp_dir / "BTCUSDT-aggTrades-2024-03-28.zip"
+            without_header = temp_dir / "BTCUSDT-aggTrades-2024-03-29.zip"
+            _write_zip(with_header, rows, AGG_TRADES_COLUMNS)
+            _write_zip(without_header, rows, newline="\r\n")
+
+            _assert_same(
+                load_agg_trades_zip(without_header, use_cache=False),
+                load_agg_trades_zip(with_header, use_cache=False),
+            )
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_errors_report_file_row(self) -> None:
+        """Invalid values name the row in the archive's CSV (header is row 1)."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            zip_path = temp_dir / "BTCUSDT-aggTrades-2024-03-28.zip"
+            rows = _agg_rows(300)
+            rows[149][6] = "maybe"
+            _write_zip(zip_path, rows, AGG_TRADES_COLUMNS)
+            try:
+                load_agg_trades_zip(zip_path, use_cache=False, block_bytes=2048)
+                assert False, "Expected DataLoadError"
+            except DataLoadError as e:
+                assert "row 151" in str(e), str(e)
+
+            rows = _agg_rows(300)
+            rows[219][1] = -1.0
+            _write_zip(zip_path, rows, AGG_TRADES_COLUMNS)
+            try:
+                load_agg_trades_zip(zip_path, use_cache=False, block_bytes=2048)
+                assert False, "Expected DataLoadError"
+            except DataLoadError as e:
+                assert "row 221" in str(e), str(e)
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_dispatch_and_cache(self) -> None:
+        """load_trade_table reads zips and later loads map the column cache."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            zip_path = temp_dir / "ETHUSDT-aggTrades-2024-03-28.zip"
+            _write_zip(zip_path, _agg_rows(100), AGG_TRADES_COLUMNS)
+
+            first = load_trade_table(zip_path)
+            assert first.symbols == ("ETHUSDT",)
+            assert cache_dir_for(zip_path).is_dir()
+            second = load_trade_table(zip_path)
+            assert isinstance(second.timestamps, memoryview)
+            _assert_same(second, first)
+            assert list(second.trade_ids) == list(first.trade_ids)
+            assert load_trade_table(zip_path, columns=["trade_id"]).trade_ids is not None
+            assert load_trade_table(zip_path, columns=[]).trade_ids is None
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_rejects_non_binance_zip(self) -> None:
+        """Archives without exactly one CSV raise DataLoadError."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            zip_path = temp_dir / "BTCUSDT-aggTrades-2024-03-28.zip"
+            with zipfile.ZipFile(zip_path, "w") as zf:
+                zf.writestr("readme.txt", "nothing here")
+            try:
+                load_agg_trades_zip(zip_path, use_cache=False)
+                assert False, "Expected DataLoadError"
+            except DataLoadError as e:
+                assert "Expected one CSV" in str(e)
+
+            try:
+                load_agg_trades_zip(temp_dir / "missing.zip")
+                assert False, "Expected DataLoadError"
+            except DataLoadError as e:
+                assert "not found" in str(e)
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class TestBookTickerZip:
+    """bookTicker archives load exactly like their canonicalized CSVs."""
+
+    def test_matches_canonical_csv(self) -> None:
+        """event_time becomes the timestamp; quotes match the canonical CSV path."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            rows = _ticker_rows(800)
+            zip_path = temp_dir / "BTCUSDT-bookTicker-2024-03-28.zip"
+            _write_zip(zip_path, rows, BOOK_TICKER_COLUMNS)
+            _write_canonical_tob(temp_dir / "tob.csv", rows)
+
+            table = load_book_ticker_zip(zip_path, use_cache=False, block_bytes=4096)
+            _assert_same(table, load_tob_table_csv(temp_dir / "tob.csv", use_cache=False))
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+def run_all_tests() -> None:
+    """Run all tests and print results.
+
+    This can be run standalone: python -m tests.test_binance
+    """
+    test_classes = [
+        TestAggTradesZip,
+        TestBookTickerZip,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_class in test_classes:
+        instance = test_class()
+        for method_name in dir(instance):
+            if method_name.startswith("test_"):
+                method = getattr(instance, method_name)
+                try:
+                    method()
+                    print(f"  PASS: {test_class.__name__}.{method_name}")
+                    passed += 1
+                except AssertionError as e:
+                    print(f"  FAIL: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+                except Exception as e:
+                    print(f"  ERROR: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    if failed > 0:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
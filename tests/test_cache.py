@@ -0,0 +1,240 @@
+"""Tests for the persistent binary column cache.
+
+Checks that cached loads return the same tables as parsing, that the cache
+is invalidated when the source changes, and that column files are valid
+``.npy`` files.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from market_forensics.data.cache import (
+    MANIFEST_NAME,
+    cache_dir_for,
+    clear_table_cache,
+    read_table_cache,
+    write_table_cache,
+)
+from market_forensics.data.columnar import NUMPY_AVAILABLE, NumericIds, TradeTable
+from market_forensics.data.loaders import (
+    load_tob_table_csv,
+    load_trade_table_csv,
+    load_trades,
+)
+
+SAMPLE_DIR = Path(__file__).parent.parent / "data" / "sample"
+
+TRADES_CSV = (
+    "timestamp,symbol,price,size,side,trade_id\n"
+    "2024-01-15T10:00:01Z,BTC-USDT,101.5,0.2,sell,t2\n"
+    "2024-01-15T10:00:00Z,BTC-USDT,100.0,1.0,buy,t1\n"
+    "2024-01-15T10:00:02.250Z,ETH-USDT,3000.0,0.5,buy,t3\n"
+)
+
+
+def _write_temp_trades(text: str = TRADES_CSV) -> Path:
+    temp_dir = Path(tempfile.mkdtemp())
+    path = temp_dir / "trades.csv"
+    path.write_text(text)
+    return path
+
+
+class TestTableCache:
+    """Tests for cache hits, misses and invalidation."""
+
+    def test_cached_load_matches_parse(self) -> None:
+        """The second load is served from the cache with identical rows."""
+        path = _write_temp_trades()
+        try:
+            parsed = load_trade_table_csv(path)
+            assert (cache_dir_for(path) / MANIFEST_NAME).exists()
+
+            cached = load_trade_table_csv(path)
+            assert isinstance(cached.prices, memoryview)
+            assert cached.to_records() == parsed.to_records()
+            assert cached.symbols == parsed.symbols
+            assert list(cached.trade_ids) == ["t1", "t2", "t3"]
+            assert load_trades(path) == parsed.to_records()
+        finally:
+            shutil.rmtree(path.parent)
+
+    def test_numeric_trade_ids_cached_as_column(self) -> None:
+        """Integer trade ids are cached as an int64 column and decode the same."""
+        text = TRADES_CSV
+        for i in (1, 2, 3):
+            text = text.replace(f",t{i}\n", f",50{i}\n")
+        path = _write_temp_trades(text)
+        try:
+            parsed = load_trade_table_csv(path)
+            cached = load_trade_table_csv(path)
+            assert isinstance(cached.trade_ids, NumericIds)
+            assert isinstance(cached.trade_ids.values, memoryview)
+            assert list(cached.trade_ids) == list(parsed.trade_ids) == ["501", "502", "503"]
+        finally:
+            shutil.rmtree(path.parent)
+
+    def test_modified_source_invalidates_cache(self) -> None:
+        """Changing the source file forces a re-parse."""
+        path = _write_temp_trades()
+        try:
+            load_trade_table_csv(path)
+            path.write_text(TRADES_CSV.replace("101.5", "101.75"))
+            assert read_table_cache(path, TradeTable) is None
+
+            reloaded = load_trade_table_csv(path)
+            assert reloaded.prices[1] == 101.75
+            assert read_table_cache(path, TradeTable) is not None
+        finally:
+            shutil.rmtree(path.parent)
+
+    def test_touched_source_reuses_cache_by_hash(self) -> None:
+        """A new mtime with unchanged content is still a hit."""
+        path = _write_temp_trades()
+        try:
+            load_trade_table_csv(path)
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            assert read_table_cache(path, TradeTable) is not None
+
+            manifest = json.loads((cache_dir_for(path) / MANIFEST_NAME).read_text())
+            assert manifest["source"]["mtime_ns"] == stat.st_mtime_ns + 10**9
+        finally:
+            shutil.rmtree(path.parent)
+
+    def test_unwritable_manifest_refresh_still_hits(self) -> None:
+        """A failed manifest refresh after a touch still returns the cached table."""
+        path = _write_temp_trades()
+        try:
+            expected = load_trade_table_csv(path).to_records()
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            # A directory where the manifest's temp file goes makes the write fail
+            (cache_dir_for(path) / f"{MANIFEST_NAME}.{os.getpid()}.tmp").mkdir()
+            cached = read_table_cache(path, TradeTable)
+            assert cached is not None and cached.to_records() == expected
+        finally:
+            shutil.rmtree(path.parent)
+
+    def test_incomplete_manifest_is_a_miss(self) -> None:
+        """A manifest missing source fields falls back to parsing."""
+        path = _write_temp_trades()
+        try:
+            expected = load_trade_table_csv(path).to_records()
+            manifest_path = cache_dir_for(path) / MANIFEST_NAME
+            manifest = json.loads(manifest_path.read_text())
+            for broken_source in ({"size": manifest["source"]["size"]}, None):
+                manifest["source"] = broken_source
+                manifest_path.write_text(json.dumps(manifest))
+                assert read_table_cache(path, TradeTable) is None
+            del manifest["source"]
+            manifest_path.write_text(json.dumps(manifest))
+            assert read_table_cache(path, TradeTable) is None
+            assert load_trade_table_csv(path).to_records() == expected
+        finally:
+            shutil.rmtree(path.parent)
+
+    def test_corrupt_cache_falls_back_to_parse(self) -> None:
+        """An unreadable cache is ignored rather than raising."""
+        path = _write_temp_trades()
+        try:
+            expected = load_trade_table_csv(path).to_records()
+            for column_file in cache_dir_for(path).glob("*.npy"):
+                column_file.write_bytes(b"garbage")
+            assert load_trade_table_csv(path).to_records() == expected
+        finally:
+            shutil.rmtree(path.parent)
+
+    def test_use_cache_false_writes_nothing(self) -> None:
+        """Disabling the cache leaves no sidecar directory."""
+        path = _write_temp_trades()
+        try:
+            load_trade_table_csv(path, use_cache=False)
+            assert not cache_dir_for(path).exists()
+        finally:
+            shutil.rmtree(path.parent)
+
+    def test_uncacheable_trade_ids_write_nothing(self) -> None:
+        """Trade ids that cannot be stored skip the cache without partial files."""
+        path = _write_temp_trades(TRADES_CSV.replace(",t2\n", ',"t\n2"\n'))
+        try:
+            table = load_trade_table_csv(path)
+            assert list(table.trade_ids) == ["t1", "t\n2", "t3"]
+            assert not cache_dir_for(path).exists()
+            table.trade_ids = ["t1", None, "t3"]
+            assert not write_table_cache(path, table)
+            assert not cache_dir_for(path).exists()
+        finally:
+            shutil.rmtree(path.parent)
+
+    def test_sample_tob_round_trip(self) -> None:
+        """Sample top-of-book data survives a cache round trip."""
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "tob.csv"
+        shutil.copy(SAMPLE_DIR / "tob.csv", path)
+        try:
+            parsed = load_tob_table_csv(path)
+            cached = load_tob_table_csv(path)
+            assert isinstance(cached.timestamps, memoryview)
+            assert cached.to_records() == parsed.to_records()
+            clear_table_cache(path)
+            assert not cache_dir_for(path).exists()
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_column_files_load_with_numpy(self) -> None:
+        """Column files are standard .npy files."""
+        if not NUMPY_AVAILABLE:
+            return
+        import numpy as np
+
+        path = _write_temp_trades()
+        try:
+            load_trade_table_csv(path)
+            manifest = json.loads((cache_dir_for(path) / MANIFEST_NAME).read_text())
+            prices = np.load(cache_dir_for(path) / manifest["columns"]["prices"])
+            assert prices.dtype == np.float64
+            assert prices.tolist() == [100.0, 101.5, 3000.0]
+        finally:
+            shutil.rmtree(path.parent)
+
+
+def run_all_tests() -> None:
+    """Run all tests and print results.
+
+    This can be run standalone: python -m tests.test_cache
+    """
+    test_classes = [
+        TestTableCache,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_class in test_classes:
+        instance = test_class()
+        for method_name in dir(instance):
+            if method_name.startswith("test_"):
+                method = getattr(instance, method_name)
+                try:
+                    method()
+                    print(f"  PASS: {test_class.__name__}.{method_name}")
+                    passed += 1
+                except AssertionError as e:
+                    print(f"  FAIL: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+                except Exception as e:
+                    print(f"  ERROR: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    if failed > 0:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,296 @@
+"""Tests for the canonicalization scripts.
+
+The raw Binance files are written to a temporary tree, and the day script's
+HERE is pointed at it so outputs never touch the repository's data/.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import canonicalize_binance_um_day as day_script  # noqa: E402
+from canonicalize_all import canonicalize_pair, main, manifest_pairs  # noqa: E402
+
+SYMBOL = "BTCUSDT"
+DATE = "2024-01-10"
+
+
+def _raw_dir(root: Path) -> Path:
+    return root / "data" / "binance" / "futures_um" / SYMBOL
+
+
+def _out_dir(root: Path) -> Path:
+    return _raw_dir(root) / "canonical" / DATE
+
+
+def _write_raw(root: Path, trades: int = 5) -> None:
+    """Write aggTrades and bookTicker CSVs; bookTicker repeats each event_time twice."""
+    raw_dir = _raw_dir(root)
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    rows = ["agg_trade_id,price,quantity,first_trade_id,last_trade_id,transact_time,is_buyer_maker"]
+    for i in range(trades):
+        rows.append(f"{i},{42000 + i}.5,0.01,{i},{i},{1704844800000 + i * 100},{str(i % 2 == 0)}")
+    (raw_dir / f"{SYMBOL}-aggTrades-{DATE}.csv").write_text("\n".join(rows) + "\n")
+
+    rows = [
+        "update_id,best_bid_price,best_bid_qty,best_ask_price,"
+        "best_ask_qty,transaction_time,event_time"
+    ]
+    for i in range(6):
+        ms = 1704844800000 + (i // 2) * 100
+        rows.append(f"{i},42000.0,{1 + i}.0,42000.1,2.0,{ms},{ms}")
+    (raw_dir / f"{SYMBOL}-bookTicker-{DATE}.csv").write_text("\n".join(rows) + "\n")
+
+
+@contextmanager
+def _data_root():
+    """A temporary tree with HERE pointed at its scripts/ directory."""
+    root = Path(tempfile.mkdtemp())
+    (root / "scripts").mkdir()
+    saved = day_script.HERE
+    day_script.HERE = str(root / "scripts")
+    try:
+        yield root
+    finally:
+        day_script.HERE = saved
+        shutil.rmtree(root)
+
+
+def _tmp_files(directory: Path) -> list:
+    return [name for name in os.listdir(directory) if name.endswith(".tmp")]
+
+
+class TestCanonicalizeDay:
+    """Tests for canonicalize_day's up-to-date check."""
+
+    def test_second_run_skipped(self) -> None:
+        """A second run with the same raw files is skipped."""
+        with _data_root() as root:
+            _write_raw(root)
+            first = day_script.canonicalize_day(DATE, SYMBOL, verbose=False)
+            assert first["status"] == "written"
+            assert first["outputs"]["trades"]["rows"] == 5
+            assert first["outputs"]["tob"]["rows"] == 6
+
+            second = day_script.canonicalize_day(DATE, SYMBOL, verbose=False)
+            assert second["status"] == "skipped"
+            assert second["outputs"] == first["outputs"]
+
+    def test_force_rewrites(self) -> None:
+        """force=True rewrites up-to-date outputs."""
+        with _data_root() as root:
+            _write_raw(root)
+            day_script.canonicalize_day(DATE, SYMBOL, verbose=False)
+            result = day_script.canonicalize_day(DATE, SYMBOL, force=True, verbose=False)
+            assert result["status"] == "written"
+
+    def test_changed_raw_checksum_rebuilds(self) -> None:
+        """Raw files with the same size but different contents trigger a rebuild."""
+        with _data_root() as root:
+            _write_raw(root)
+            first = day_script.canonicalize_day(DATE, SYMBOL, verbose=False)
+            raw = _raw_dir(root) / f"{SYMBOL}-aggTrades-{DATE}.csv"
+            raw.write_text(raw.read_text().replace("42000.5", "42009.5"))
+
+            result = day_script.canonicalize_day(DATE, SYMBOL, verbose=False)
+            assert result["status"] == "written"
+            trades = result["sources"]["trades"]
+            assert trades["bytes"] == first["sources"]["trades"]["bytes"]
+            assert trades["sha256"] != first["sources"]["trades"]["sha256"]
+            assert "42009.5" in (_out_dir(root) / "trades.csv").read_text()
+
+    def test_changed_coalesce_rebuilds(self) -> None:
+        """A different coalesce option rebuilds, and then is up to date itself."""
+        with _data_root() as root:
+            _write_raw(root)
+            day_script.canonicalize_day(DATE, SYMBOL, verbose=False)
+            result = day_script.canonicalize_day(
+                DATE, SYMBOL, verbose=False, coalesce="timestamp",
+            )
+            assert result["status"] == "written"
+            assert result["options"] == {"coalesce": "timestamp"}
+            assert result["outputs"]["tob"]["rows"] == 3
+            assert result["outputs"]["tob"]["raw_rows"] == 6
+
+            again = day_script.canonicalize_day(
+                DATE, SYMBOL, verbose=False, coalesce="timestamp",
+            )
+            assert again["status"] == "skipped"
+
+    def test_truncated_output_rebuilds(self) -> None:
+        """An output whose size no longer matches the manifest is rebuilt."""
+        with _data_root() as root:
+            _write_raw(root)
+            first = day_script.canonicalize_day(DATE, SYMBOL, verbose=False)
+            tob = _out_dir(root) / "tob.csv"
+            with open(tob, "r+") as f:
+                f.truncate(tob.stat().st_size // 2)
+
+            result = day_script.canonicalize_day(DATE, SYMBOL, verbose=False)
+            assert result["status"] == "written"
+            assert tob.stat().st_size == first["outputs"]["tob"]["bytes"]
+
+    def test_failed_rebuild_keeps_previous_output(self) -> None:
+        """A rebuild that fails part-way leaves the previous outputs and no temp files."""
+        with _data_root() as root:
+            _write_raw(root)
+            day_script.canonicalize_day(DATE, SYMBOL, verbose=False)
+            out_dir = _out_dir(root)
+            before = {name: (out_dir / name).read_text() for name in os.listdir(out_dir)}
+
+            raw = _raw_dir(root) / f"{SYMBOL}-bookTicker-{DATE}.csv"
+            raw.write_text(raw.read_text() + "6,not-a-price,1.0,42000.1,2.0,0,1704844800500\n")
+            try:
+                day_script.canonicalize_day(DATE, SYMBOL, verbose=False)
+                assert False, "Should have raised ValueError"
+            except ValueError:
+                pass
+
+            assert _tmp_files(out_dir) == []
+            assert {name: (out_dir / name).read_text() for name in os.listdir(out_dir)} == before
+
+    def test_missing_raw_file(self) -> None:
+        """A day without raw files raises FileNotFoundError."""
+        with _data_root():
+            try:
+                day_script.canonicalize_day(DATE, SYMBOL, verbose=False)
+                assert False, "Should have raised FileNotFoundError"
+            except FileNotFoundError:
+                pass
+
+
+class TestAtomicOutput:
+    """Tests for atomic_output."""
+
+    def test_replaces_on_success(self) -> None:
+        """The new contents replace the file only once the block completes."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            path = temp_dir / "out.csv"
+            path.write_text("old\n")
+            with day_script.atomic_output(str(path)) as f:
+                f.write("new\n")
+                assert path.read_text() == "old\n"
+            assert path.read_text() == "new\n"
+            assert _tmp_files(temp_dir) == []
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_failing_writer_keeps_previous(self) -> None:
+        """An exception in the block keeps the previous file and removes the temp file."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            path = temp_dir / "out.csv"
+            path.write_text("old\n")
+            try:
+                with day_script.atomic_output(str(path)) as f:
+                    f.write("partial")
+                    raise RuntimeError("writer failed")
+            except RuntimeError:
+                pass
+            assert path.read_text() == "old\n"
+            assert _tmp_files(temp_dir) == []
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class TestCanonicalizeAll:
+    """Tests for the batch driver."""
+
+    def test_manifest_pairs_skips_non_symbol_keys(self) -> None:
+        """Only uppercase keys with list values are symbols."""
+        manifest = {
+            "description": "Test dates",
+            "notes": ["not", "dates"],
+            "BTCUSDT": ["2024-01-10", "2024-01-11"],
+            "ETHUSDT": ["2024-01-10"],
+            "DEFAULTS": {"coalesce": "price"},
+        }
+        assert manifest_pairs(manifest) == [
+            ("BTCUSDT", "2024-01-10"),
+            ("BTCUSDT", "2024-01-11"),
+            ("ETHUSDT", "2024-01-10"),
+        ]
+        assert manifest_pairs(manifest, symbols=["ETHUSDT"]) == [("ETHUSDT", "2024-01-10")]
+        assert manifest_pairs(manifest, dates=["2024-01-11"]) == [("BTCUSDT", "2024-01-11")]
+
+    def test_canonicalize_pair_reports_failure(self) -> None:
+        """A failing day is returned as a "failed" entry instead of raising."""
+        with _data_root() as root:
+            _write_raw(root)
+            assert canonicalize_pair(SYMBOL, DATE)["status"] == "written"
+            failed = canonicalize_pair(SYMBOL, "2024-01-11")
+            assert failed["status"] == "failed"
+            assert failed["error"].startswith("FileNotFoundError")
+
+    def test_failed_day_sets_exit_status(self) -> None:
+        """main returns 1 and records the failed day in the summary."""
+        temp_dir = Path(tempfile.mkdtemp())
+        saved_argv = sys.argv
+        try:
+            # No raw data exists for this symbol, wherever the worker looks
+            manifest = temp_dir / "dates.json"
+            manifest.write_text(json.dumps({"description": "x", "NOSUCHUSDT": [DATE]}))
+            summary_path = temp_dir / "out" / "summary.json"
+            sys.argv = [
+                "canonicalize_all.py", "--manifest", str(manifest),
+                "--summary", str(summary_path), "--workers", "1", "--quiet",
+            ]
+            assert main() == 1
+
+            summary = json.loads(summary_path.read_text())
+            assert summary["counts"] == {"written": 0, "skipped": 0, "failed": 1}
+            day = summary["days"][0]
+            assert (day["symbol"], day["date"], day["status"]) == ("NOSUCHUSDT", DATE, "failed")
+            assert "FileNotFoundError" in day["error"]
+            assert _tmp_files(summary_path.parent) == []
+        finally:
+            sys.argv = saved_argv
+            shutil.rmtree(temp_dir)
+
+
+def run_all_tests() -> None:
+    """Run all tests and print results.
+
+    This can be run standalone: python -m tests.test_canonicalize
+    """
+    test_classes = [
+        TestCanonicalizeDay,
+        TestAtomicOutput,
+        TestCanonicalizeAll,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_class in test_classes:
+        instance = test_class()
+        for method_name in dir(instance):
+            if method_name.startswith("test_"):
+                method = getattr(instance, method_name)
+                try:
+                    method()
+                    print(f"  PASS: {test_class.__name__}.{method_name}")
+                    passed += 1
+                except AssertionError as e:
+                    print(f"  FAIL: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+                except Exception as e:
+                    print(f"  ERROR: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    if failed > 0:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,550 @@
+"""Tests for columnar TradeTable / TobTable containers.
+
+Checks that tables round-trip with the record types and that the pipeline
+stages produce the same results on tables as on record lists.
+"""
+
+from __future__ import annotations
+
+import pickle
+import shutil
+import tempfile
+from dataclasses import asdict, astuple, fields
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from market_forensics.data.columnar import (
+    NumericIds,
+    TobTable,
+    TradeTable,
+    datetime_to_ns,
+    encode_trade_ids,
+    ns_to_datetime,
+    seconds_to_ns,
+)
+from market_forensics.data.loaders import (
+    DataLoadError,
+    load_tob_csv,
+    load_tob_table,
+    load_trade_table,
+    load_trades_csv,
+)
+from market_forensics.data.models import (
+    Event,
+    EventDirection,
+    Side,
+    TopOfBook,
+    Trade,
+)
+from market_forensics.events.detector import detect_price_shocks
+from market_forensics.events.ordering import analyze_event_ordering
+from market_forensics.metrics.calculator import compute_window_metrics
+from market_forensics.windows.extractor import extract_window
+
+BASE_TIME = datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+
+
+def _make_trades(n: int = 40) -> list:
+    """Trades with a 2% drop in the middle."""
+    trades = []
+    for i in range(n):
+        price = 100.0 if i < n // 2 else 98.0
+        trades.append(Trade(
+            timestamp=BASE_TIME + timedelta(seconds=i * 5),
+            symbol="BTC-USDT",
+            price=price + (i % 3) * 0.01,
+            size=0.1 * (1 + i % 4),
+            side=Side.BUY if i % 2 else Side.SELL,
+            trade_id=f"t{i}",
+        ))
+    return trades
+
+
+def _make_tob(n: int = 40) -> list:
+    """Top-of-book snapshots with a 2% drop and spread widening in the middle."""
+    tob = []
+    for i in range(n):
+        mid = 100.0 if i < n // 2 else 98.0
+        spread = 0.1 if i < n // 2 else 0.5
+        tob.append(TopOfBook(
+            timestamp=BASE_TIME + timedelta(seconds=i * 5),
+            symbol="BTC-USDT",
+            bid_price=mid - spread / 2,
+            bid_size=1.0 + i,
+            ask_price=mid + spread / 2,
+            ask_size=2.0 + i,
+        ))
+    return tob
+
+
+class TestTimestampConversion:
+    """Tests for epoch-nanosecond conversion helpers."""
+
+    def test_round_trip_microseconds(self) -> None:
+        """Datetimes survive a round trip through epoch nanoseconds."""
+        dt = datetime(2024, 3, 28, 0, 20, 22, 123456, tzinfo=timezone.utc)
+        assert ns_to_datetime(datetime_to_ns(dt)) == dt
+
+    def test_naive_treated_as_utc(self) -> None:
+        """Naive datetimes are interpreted as UTC."""
+        naive = datetime(2024, 3, 28, 0, 0, 0)
+        assert datetime_to_ns(naive) == datetime_to_ns(naive.replace(tzinfo=timezone.utc))
+
+    def test_seconds_to_ns(self) -> None:
+        """Durations convert to whole nanoseconds."""
+        assert seconds_to_ns(60) == 60_000_000_000
+        assert seconds_to_ns(0.5) == 500_000_000
+
+
+class TestTables:
+    """Tests for table construction and the record compatibility view."""
+
+    def test_trade_table_round_trip(self) -> None:
+        """from_records followed by to_records returns equal trades."""
+        trades = _make_trades()
+        table = TradeTable.from_records(trades)
+        assert len(table) == len(trades)
+        assert table.to_records() == trades
+        assert table[3] == trades[3]
+        assert table[-1] == trades[-1]
+
+    def test_partition_by_symbol(self) -> None:
+        """Partitions keep each symbol's rows in order; one symbol is not copied."""
+        table = TradeTable.from_records(_make_trades())
+        assert list(table.partition_by_symbol()) == ["BTC-USDT"]
+        assert table.partition_by_symbol()["BTC-USDT"] is table
+
+        trades = [
+            Trade(t.timestamp, ("ETH-USDT", "BTC-USDT", "SOL-USDT")[i % 3 % 2 + (i % 5 == 0)],
+                  t.price, t.size, t.side, t.trade_id)
+            for i, t in enumerate(_make_trades())
+        ]
+        for trade_ids in ("strings", "numeric"):
+            table = TradeTable.from_records(trades)
+            if trade_ids == "numeric":
+                table.trade_ids = encode_trade_ids([str(i) for i in range(len(trades))])
+            expected = {}
+            for record in table.to_records():
+                expected.setdefault(record.symbol, []).append(record)
+            partitions = table.partition_by_symbol()
+            assert sorted(partitions) == sorted(expected)
+            for symbol, part in partitions.items():
+                assert part.symbols == (symbol,)
+                assert part.to_records() == expected[symbol]
+        assert TradeTable.from_records([]).partition_by_symbol() == {}
+
+    def test_tob_table_round_trip(self) -> None:
+        """from_records followed by to_records returns equal snapshots."""
+        tob = _make_tob()
+        table = TobTable.from_records(tob)
+        assert table.to_records() == tob
+        assert list(table.mid_prices()) == [t.mid_price for t in tob]
+        assert list(table.spreads_bps()) == [t.spread_bps for t in tob]
+
+    def test_symbols_are_coded(self) -> None:
+        """Symbols are stored once with a per-row code."""
+        trades = _make_trades(4)
+        trades[1] = Trade(trades[1].timestamp, "ETH-USDT", 3000.0, 1.0, Side.BUY)
+        table = TradeTable.from_records(trades)
+        assert table.symbols == ("BTC-USDT", "ETH-USDT")
+        assert list(table.symbol_codes) == [0, 1, 0, 0]
+        assert table.symbol_at(1) == "ETH-USDT"
+
+    def test_sorted_by_timestamp_is_stable(self) -> None:
+        """Sorting keeps the original order of equal timestamps."""
+        trades = _make_trades(6)
+        shuffled = [trades[3], trades[0], trades[5], trades[1], trades[4], trades[2]]
+        table = TradeTable.from_records(shuffled).sorted_by_timestamp()
+        assert table.to_records() == trades
+
+    def test_slice_returns_table(self) -> None:
+        """Slicing a table returns a table of the selected rows."""
+        table = TradeTable.from_records(_make_trades())
+        part = table[5:10]
+        assert isinstance(part, TradeTable)
+        assert part.to_records() == table.to_records()[5:10]
+        assert table[::2].to_records() == table.to_records()[::2]
+
+    def test_slice_is_zero_copy_view(self) -> None:
+        """Contiguous slices share the parent's buffers, including nested slices."""
+        table = TradeTable.from_records(_make_trades())
+        part = table[5:30][2:10]
+        assert isinstance(part.prices, memoryview)
+        assert part.prices.obj is table.prices
+        assert part.to_records() == table.to_records()[7:15]
+        assert list(part.trade_ids) == [f"t{i}" for i in range(7, 15)]
+        assert len(table.view(35, 100)) == 5
+
+    def test_window_holds_views(self) -> None:
+        """Windows extracted from tables reference the full-series columns."""
+        tob = TobTable.from_records(_make_tob())
+        event = Event(
+            timestamp=BASE_TIME + timedelta(seconds=100),
+            symbol="BTC-USDT",
+            event_type="price_shock",
+            direction=EventDirection.DOWN,
+            magnitude=-2.0,
+        )
+        window = extract_window(event, TradeTable.empty(), tob, 60, 60)
+        assert window.post_tob.bid_prices.obj is tob.bid_prices
+        assert len(window.pre_tob) == 11 and len(window.post_tob) == 12
+
+
+class TestNumericIds:
+    """Integer trade ids are stored as int64 and decoded on access."""
+
+    def test_encode_only_exact_integers(self) -> None:
+        assert isinstance(encode_trade_ids(["1", "22", "-3"]), NumericIds)
+        for values in (["1", "007"], ["1", "+2"], ["1", " 2"], ["1", "a"], ["1", ""], ["1", None]):
+            assert encode_trade_ids(values) is values
+
+    def test_table_operations_keep_ids(self) -> None:
+        """Views, takes and concatenation return the same id strings."""
+        trades = _make_trades(10)
+        table = TradeTable.from_records(trades)
+        table.trade_ids = encode_trade_ids([str(100 + i) for i in range(10)])
+        part = table[2:8][1:4]
+        assert isinstance(part.trade_ids, NumericIds)
+        assert list(part.trade_ids) == ["103", "104", "105"]
+        assert part[0].trade_id == "103"
+        assert list(table.take([9, 0]).trade_ids) == ["109", "100"]
+        merged = TradeTable.concat([table[:3], table[3:]])
+        assert isinstance(merged.trade_ids, NumericIds)
+        assert list(merged.trade_ids) == list(table.trade_ids)
+        # Mixing with string ids or missing ids falls back to a list
+        mixed = TradeTable.concat([table[:2], TradeTable.from_records(trades[:2])])
+        assert list(mixed.trade_ids) == ["100", "101", "t0", "t1"]
+        table_no_ids = TradeTable.from_records(trades[:1])
+        table_no_ids.trade_ids = None
+        padded = TradeTable.concat([table[:1], table_no_ids])
+        assert list(padded.trade_ids) == ["100", None]
+
+    def test_loader_projection_and_numeric_ids(self) -> None:
+        """Numeric ids load as int64; a projection can skip them entirely."""
+        temp_dir = tempfile.mkdtemp()
+        path = Path(temp_dir) / "trades.csv"
+        path.write_text(
+            "timestamp,symbol,price,size,side,trade_id\n"
+            "2024-01-15T10:00:00Z,BTC-USDT,100.0,1.0,buy,3001\n"
+            "2024-01-15T10:00:01Z,BTC-USDT,101.0,1.0,sell,3002\n"
+        )
+        try:
+            table = load_trade_table(path)
+            assert isinstance(table.trade_ids, NumericIds)
+            assert [t.trade_id for t in load_trades_csv(path)] == ["3001", "3002"]
+            projected = load_trade_table(path, columns=["timestamp", "price"])
+            assert projected.trade_ids is None
+            assert list(projected.prices) == [100.0, 101.0]
+            try:
+                load_trade_table(path, columns=["agg_trade_id"])
+                raised = False
+            except DataLoadError:
+                raised = True
+            assert raised, "Expected DataLoadError for an unknown column"
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class TestTobCoalescing:
+    """Redundant top-of-book updates are coalesced per symbol."""
+
+    @staticmethod
+    def _updates() -> TobTable:
+        # (ms, symbol, bid, bid_size, ask): BTC has three updates at 0 ms and a
+        # size-only change at 2 ms; ETH updates interleave at the same times
+        rows = [
+            (0, "BTC", 100.0, 1.0, 100.5), (0, "ETH", 10.0, 5.0, 10.1),
+            (0, "BTC", 100.0, 2.0, 100.5), (0, "BTC", 100.1, 3.0, 100.5),
+            (1, "ETH", 10.0, 6.0, 10.1), (2, "BTC", 100.1, 4.0, 100.5),
+            (2, "ETH", 10.0, 7.0, 10.2), (3, "BTC", 100.2, 4.0, 100.5),
+        ]
+        return TobTable.from_records(
+            TopOfBook(
+                timestamp=BASE_TIME + timedelta(milliseconds=ms), symbol=symbol,
+                bid_price=bid, bid_size=size, ask_price=ask, ask_size=1.0,
+            )
+            for ms, symbol, bid, size, ask in rows
+        )
+
+    def test_timestamp_mode_keeps_last_update(self) -> None:
+        """Each symbol keeps its last update per timestamp, in file order."""
+        table = self._updates().coalesced("timestamp")
+        rows = [(t.symbol, t.bid_size) for t in table]
+        assert rows == [
+            ("ETH", 5.0), ("BTC", 3.0), ("ETH", 6.0), ("BTC", 4.0), ("ETH", 7.0), ("BTC", 4.0),
+        ]
+
+    def test_price_mode_drops_size_only_changes(self) -> None:
+        """Updates that keep both prices of their symbol are dropped."""
+        table = self._updates().coalesced("price")
+        rows = [(t.symbol, t.bid_price, t.ask_price, t.bid_size) for t in table]
+        assert rows == [
+            ("ETH", 10.0, 10.1, 5.0), ("BTC", 100.1, 100.5, 3.0),
+            ("ETH", 10.0, 10.2, 7.0), ("BTC", 100.2, 100.5, 4.0),
+        ]
+        assert table.coalesced("price") is table
+        try:
+            table.coalesced("size")
+            raised = False
+        except ValueError:
+            raised = True
+        assert raised, "Expected ValueError for an unknown mode"
+
+    def test_loader_coalesces_after_cache(self) -> None:
+        """The loader coalesces on request; the cache keeps every row."""
+        temp_dir = tempfile.mkdtemp()
+        path = Path(temp_dir) / "tob.csv"
+        path.write_text(
+            "timestamp,symbol,bid_price,bid_size,ask_price,ask_size\n"
+            "2024-01-15T10:00:00Z,BTC-USDT,100.0,1.0,100.5,1.0\n"
+            "2024-01-15T10:00:00Z,BTC-USDT,100.0,2.0,100.5,1.0\n"
+            "2024-01-15T10:00:01Z,BTC-USDT,100.0,3.0,100.5,1.0\n"
+        )
+        try:
+            assert len(load_tob_table(path, coalesce="timestamp")) == 2
+            assert len(load_tob_table(path, coalesce="price")) == 1
+            assert len(load_tob_table(path)) == 3
+            try:
+                load_tob_table(path, coalesce="size")
+                raised = False
+            except DataLoadError:
+                raised = True
+            assert raised, "Expected DataLoadError for an unknown mode"
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class TestTableLoaders:
+    """Tests for the table loaders against the list loaders."""
+
+    def test_sample_data_matches_list_loaders(self) -> None:
+        """Table loaders return the same rows as the list loaders."""
+        sample = Path(__file__).parent.parent / "data" / "sample"
+        trades = load_trade_table(sample / "trades.csv")
+        tob = load_tob_table(sample / "tob.csv")
+        assert trades.to_records() == load_trades_csv(sample / "trades.csv")
+        assert tob.to_records() == load_tob_csv(sample / "tob.csv")
+
+    def test_invalid_row_reports_row_number(self) -> None:
+        """Validation errors name the offending row."""
+        temp_dir = tempfile.mkdtemp()
+        path = Path(temp_dir) / "trades.csv"
+        path.write_text(
+            "timestamp,symbol,price,size,side\n"
+            "2024-01-15T10:00:00Z,BTC-USDT,100.0,1.0,buy\n"
+            "2024-01-15T10:00:01Z,BTC-USDT,-1.0,1.0,buy\n"
+        )
+        try:
+            load_trade_table(path)
+            raised = False
+        except DataLoadError as e:
+            raised = True
+            assert "row 3" in str(e)
+            assert "Trade price must be positive" in str(e)
+        finally:
+            shutil.rmtree(temp_dir)
+        assert raised, "Expected DataLoadError for negative price"
+
+    def test_bad_price_before_bad_side_is_reported_first(self) -> None:
+        """A bad side does not hide invalid values on earlier rows."""
+        header = "timestamp,symbol,price,size,side\n"
+        cases = [
+            (["100.0,1.0,buy", "-1.0,1.0,buy", "100.0,1.0,xx"],
+             "row 3", "Trade price must be positive"),
+            (["100.0,1.0,buy", "100.0,1.0,buy", "100.0,1.0,xx"],
+             "row 4", "Invalid trade side: xx"),
+        ]
+        temp_dir = tempfile.mkdtemp()
+        path = Path(temp_dir) / "trades.csv"
+        try:
+            for rows, where, message in cases:
+                path.write_text(header + "".join(
+                    f"2024-01-15T10:00:0{i}Z,BTC-USDT,{row}\n" for i, row in enumerate(rows)
+                ))
+                try:
+                    load_trade_table(path)
+                    raised = False
+                except DataLoadError as e:
+                    raised = True
+                    assert where in str(e) and message in str(e), str(e)
+                assert raised, f"Expected DataLoadError for {where}"
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_bulk_checks_report_first_offending_row(self) -> None:
+        """Bulk value checks keep the row-by-row error precedence."""
+        header = "timestamp,symbol,bid_price,bid_size,ask_price,ask_size\n"
+        good = "2024-01-15T10:00:0{}Z,BTC-USDT,100.0,1.0,100.5,1.0\n"
+        crossed = "2024-01-15T10:00:0{}Z,BTC-USDT,101.0,1.0,100.5,1.0\n"
+        cases = [
+            # A crossed book before an unparseable row is reported first
+            ([good, crossed, "2024-01-15T10:00:02Z,BTC-USDT,x,1.0,100.5,1.0\n"],
+             "row 3", "cannot exceed ask price"),
+            # A bad timestamp before a crossed book is reported first
+            ([good, "not-a-time,BTC-USDT,100.0,1.0,100.5,1.0\n", crossed],
+             "not-a-time", "Cannot parse timestamp"),
+            # The first of several invalid rows is reported
+            ([good, good, "2024-01-15T10:00:02Z,BTC-USDT,100.0,-1.0,100.5,1.0\n", crossed],
+             "row 4", "Bid size must be non-negative"),
+        ]
+        temp_dir = tempfile.mkdtemp()
+        path = Path(temp_dir) / "tob.csv"
+        try:
+            for rows, where, message in cases:
+                path.write_text(header + "".join(r.format(i) for i, r in enumerate(rows)))
+                try:
+                    load_tob_table(path)
+                    raised = False
+                except DataLoadError as e:
+                    raised = True
+                    assert where in str(e) and message in str(e), str(e)
+                assert raised, f"Expected DataLoadError for {where}"
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_trusted_records_match(self) -> None:
+        """Trusted loading builds the same records without per-row checks."""
+        sample = Path(__file__).parent.parent / "data" / "sample"
+        assert load_trades_csv(sample / "trades.csv", trusted=True) == load_trades_csv(
+            sample / "trades.csv"
+        )
+        trusted = load_tob_csv(sample / "tob.csv", trusted=True)
+        assert trusted == load_tob_csv(sample / "tob.csv")
+        assert [t.spread_bps for t in trusted] == list(
+            load_tob_table(sample / "tob.csv").spreads_bps()
+        )
+
+
+class TestPipelineOnTables:
+    """Pipeline stages give identical results on tables and lists."""
+
+    def test_detector_matches_lists(self) -> None:
+        """detect_price_shocks returns the same events for tables and lists."""
+        for records, table_cls in ((_make_trades(), TradeTable), (_make_tob(), TobTable)):
+            expected = detect_price_shocks(records, threshold_pct=1.0, window_seconds=60)
+            actual = detect_price_shocks(
+                table_cls.from_records(records), threshold_pct=1.0, window_seconds=60
+            )
+            assert expected, "Expected at least one event"
+            assert actual == expected
+
+    def test_window_metrics_and_ordering_match_lists(self) -> None:
+        """Windows, metrics and ordering agree between tables and lists."""
+        trades, tob = _make_trades(), _make_tob()
+        event = Event(
+            timestamp=BASE_TIME + timedelta(seconds=100),
+            symbol="BTC-USDT",
+            event_type="price_shock",
+            direction=EventDirection.DOWN,
+            magnitude=-2.0,
+        )
+        list_window = extract_window(event, trades, tob, 60, 60)
+        table_window = extract_window(
+            event, TradeTable.from_records(trades), TobTable.from_records(tob), 60, 60
+        )
+        assert isinstance(table_window.post_tob, TobTable)
+        assert table_window.pre_trades.to_records() == list_window.pre_trades
+        assert table_window.post_tob.to_records() == list_window.post_tob
+
+        for pre_or_post in ("pre", "post"):
+            expected = compute_window_metrics(
+                getattr(list_window, f"{pre_or_post}_trades"),
+                getattr(list_window, f"{pre_or_post}_tob"),
+            )
+            actual = compute_window_metrics(
+                getattr(table_window, f"{pre_or_post}_trades"),
+                getattr(table_window, f"{pre_or_post}_tob"),
+            )
+            assert actual == expected
+
+        assert (
+            analyze_event_ordering(table_window).to_dict()
+            == analyze_event_ordering(list_window).to_dict()
+        )
+
+
+class TestRecordModels:
+    """Slotted record types keep their public behavior."""
+
+    def test_records_have_no_instance_dict(self) -> None:
+        trade, tob = _make_trades(1)[0], _make_tob(1)[0]
+        assert not hasattr(trade, "__dict__") and not hasattr(tob, "__dict__")
+
+    def test_derived_fields_match_table_columns(self) -> None:
+        """Cached mid/spread/bps equal the table's derived columns."""
+        records = _make_tob()
+        table = TobTable.from_records(records)
+        assert [t.mid_price for t in records] == list(table.mid_prices())
+        assert [t.spread for t in records] == list(table.spreads())
+        assert [t.spread_bps for t in records] == list(table.spreads_bps())
+        # Second access is served from the cache with the same value
+        assert records[0].spread_bps == (records[0].spread / records[0].mid_price) * 10000
+
+    def test_equality_hash_and_pickle(self) -> None:
+        """The derived-field cache does not affect equality, hashing or pickling."""
+        fresh, used = _make_tob(1)[0], _make_tob(1)[0]
+        used.spread_bps
+        assert fresh == used and hash(fresh) == hash(used)
+        assert pickle.loads(pickle.dumps(used)) == fresh
+        assert pickle.loads(pickle.dumps(_make_trades(1)[0])) == _make_trades(1)[0]
+        try:
+            fresh.bid_price = 1.0
+            raised = False
+        except AttributeError:
+            raised = True
+        assert raised
+
+    def test_dataclass_shape_excludes_cache(self) -> None:
+        """asdict/astuple/fields see only the snapshot fields, before and after access."""
+        tob = _make_tob(1)[0]
+        names = ["timestamp", "symbol", "bid_price", "bid_size", "ask_price", "ask_size"]
+        expected = {name: getattr(tob, name) for name in names}
+        assert [f.name for f in fields(tob)] == names
+        assert asdict(tob) == expected
+        assert astuple(tob) == tuple(expected.values())
+        tob.mid_price
+        assert asdict(tob) == expected
+        assert astuple(tob) == tuple(expected.values())
+
+
+def run_all_tests() -> None:
+    """Run all tests and print results.
+
+    This can be run standalone: python -m tests.test_columnar
+    """
+    test_classes = [
+        TestTimestampConversion,
+        TestTables,
+        TestNumericIds,
+        TestTobCoalescing,
+        TestTableLoaders,
+        TestPipelineOnTables,
+        TestRecordModels,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_class in test_classes:
+        instance = test_class()
+        for method_name in dir(instance):
+            if method_name.startswith("test_"):
+                method = getattr(instance, method_name)
+                try:
+                    method()
+                    print(f"  PASS: {test_class.__name__}.{method_name}")
+                    passed += 1
+                except AssertionError as e:
+                    print(f"  FAIL: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+                except Exception as e:
+                    print(f"  ERROR: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    if failed > 0:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
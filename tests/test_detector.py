@@ -5,6 +5,9 @@ These are unit-like checks for edge cases as required by MF-003.
 
 from __future__ import annotations
 
+import math
+import random
+import time
 from datetime import datetime, timedelta
 from typing import List
 
@@ -15,10 +18,21 @@ from market_forensics.data.models import (
     TopOfBook,
     Trade,
 )
+from market_forensics.data.columnar import NUMPY_AVAILABLE, TobTable, TradeTable
 from market_forensics.events.detector import (
+    AdaptiveThreshold,
     DetectorError,
+    StreamingShockDetector,
+    _EwmaThreshold,
+    _find_shocks,
+    _peak_to_trough_changes,
+    _scan_price_shocks,
+    _scan_price_shocks_grid,
+    _scan_price_shocks_grid_numpy,
+    _scan_price_shocks_numpy,
     detect_price_shocks,
     detect_price_shocks_from_config,
+    detect_price_shocks_grid,
 )
 
 
@@ -229,6 +243,570 @@ class TestDetectPriceShocksValidation:
         assert error_raised, "Expected DetectorError for negative window"
 
 
+class TestDetectorEngines:
+    """The vectorized engine must reproduce the loop engine exactly."""
+
+    def test_numpy_engine_matches_loop_on_random_walks(self) -> None:
+        """Both engines emit identical (index, reference, pct) on random data."""
+        if not NUMPY_AVAILABLE:
+            return
+        rng = random.Random(42)
+        for _ in range(200):
+            timestamps, prices = [], []
+            ts, price = 0, 100.0
+            for _ in range(rng.randint(0, 400)):
+                ts += rng.choice([0, 0, 1, 5, 20]) * 100_000_000
+                price *= 1 + rng.gauss(0, 0.004)
+                timestamps.append(ts)
+                prices.append(price)
+            threshold = rng.choice([0.2, 0.5, 1.0])
+            window_ns = rng.choice([1, 10, 60]) * 1_000_000_000
+            expected = _scan_price_shocks(timestamps, prices, threshold, window_ns)
+            actual = _scan_price_shocks_numpy(timestamps, prices, threshold, window_ns)
+            assert actual == expected
+
+    def test_numpy_engine_is_linear_in_dense_clusters(self) -> None:
+        """A long cluster where every row is a candidate is deduped in one pass."""
+        if not NUMPY_AVAILABLE:
+            return
+        # 10 updates/s rising steadily: every row after the first 10s is a
+        # candidate, and the cluster never has a gap of window_ns
+        timestamps = [i * 100_000_000 for i in range(300_000)]
+        prices = [100.0 + i * 0.01 for i in range(300_000)]
+        window_ns = 10_000_000_000
+        expected = _scan_price_shocks(timestamps, prices, 0.02, window_ns)
+        start = time.perf_counter()
+        actual = _scan_price_shocks_numpy(timestamps, prices, 0.02, window_ns)
+        elapsed = time.perf_counter() - start
+        assert actual == expected
+        assert len(expected) > 2900
+        # Re-reducing the rest of the cluster after each event is quadratic
+        assert elapsed < 5.0, f"Dense cluster took {elapsed:.1f}s"
+
+    def test_replacement_extends_dedup_window(self) -> None:
+        """A replaced event moves the dedup horizon to the new event time."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        trades = [
+            _make_trade(base_time, 100.0),
+            _make_trade(base_time + timedelta(seconds=10), 98.5),   # -1.5%: event
+            _make_trade(base_time + timedelta(seconds=50), 97.0),   # larger: replaces
+            _make_trade(base_time + timedelta(seconds=80), 96.0),   # within 60s of replacement
+        ]
+        result = detect_price_shocks(trades, threshold_pct=1.0, window_seconds=60)
+        assert len(result) == 1, f"Expected one event, got {len(result)}"
+        assert result[0].timestamp == base_time + timedelta(seconds=50)
+
+    def test_tob_table_matches_tob_list(self) -> None:
+        """Events from a TobTable equal those from the TopOfBook list."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        tob_data = [
+            _make_tob(base_time + timedelta(seconds=i * 7), 100.0 - (i % 11) * 0.3)
+            for i in range(60)
+        ]
+        expected = detect_price_shocks(tob_data, threshold_pct=1.0, window_seconds=60)
+        table = TobTable.from_records(tob_data)
+        actual = detect_price_shocks(table, threshold_pct=1.0, window_seconds=60)
+        assert expected, "Expected events in test data"
+        assert [e.timestamp.replace(tzinfo=None) for e in actual] == [
+            e.timestamp for e in expected
+        ]
+        assert [e.metadata for e in actual] == [e.metadata for e in expected]
+
+
+class TestDetectPriceShocksGrid:
+    """A grid sweep equals one detect_price_shocks call per pair."""
+
+    def test_grid_engines_match_single_scans(self) -> None:
+        """Both grid engines reproduce _scan_price_shocks for every pair."""
+        rng = random.Random(11)
+        thresholds = [0.2, 0.5, 0.3, 1.0]
+        windows_ns = [1_000_000_000, 10_000_000_000, 60_000_000_000]
+        for _ in range(100):
+            timestamps, prices = [], []
+            ts, price = 0, 100.0
+            for _ in range(rng.randint(0, 400)):
+                ts += rng.choice([0, 0, 1, 5, 20]) * 100_000_000
+                price *= 1 + rng.gauss(0, 0.004)
+                timestamps.append(ts)
+                prices.append(price)
+            expected = {
+                (t, w): _scan_price_shocks(timestamps, prices, t, w)
+                for t in thresholds
+                for w in windows_ns
+            }
+            assert _scan_price_shocks_grid(timestamps, prices, thresholds, windows_ns) == expected
+            if NUMPY_AVAILABLE:
+                grid = _scan_price_shocks_grid_numpy(timestamps, prices, thresholds, windows_ns)
+                assert grid == expected
+
+    def test_grid_events_match_per_pair_detection(self) -> None:
+        """Events, including metadata, equal separate runs per pair."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        tob_data = [
+            _make_tob(base_time + timedelta(seconds=i * 3), 100.0 - (i % 17) * 0.1)
+            for i in range(300)
+        ]
+        table = TobTable.from_records(tob_data)
+        grid = detect_price_shocks_grid(table, [0.5, 1.0, 1.5], [30, 60])
+        assert sorted(grid) == [(t, w) for t in (0.5, 1.0, 1.5) for w in (30, 60)]
+        assert any(grid.values()), "Expected events in test data"
+        for (threshold, window), events in grid.items():
+            assert events == detect_price_shocks(table, threshold, window)
+
+    def test_grid_validation(self) -> None:
+        """Empty grids and invalid values raise DetectorError."""
+        trades = [_make_trade(datetime(2024, 1, 15), 100.0)]
+        assert detect_price_shocks_grid([], [0.5], [60]) == {(0.5, 60): []}
+        for thresholds, windows in (([], [60]), ([0.5], []), ([0.5, -1], [60]), ([0.5], [0])):
+            try:
+                detect_price_shocks_grid(trades, thresholds, windows)
+                assert False, "Expected DetectorError"
+            except DetectorError:
+                pass
+
+
+class TestPeakToTroughMode:
+    """peak_to_trough measures moves from the window's high or low."""
+
+    def test_catches_drop_from_mid_window_high(self) -> None:
+        """A drop from a local high is caught even if the first price is close."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        trades = [
+            _make_trade(base_time, 100.0),
+            _make_trade(base_time + timedelta(seconds=30), 100.9),
+            _make_trade(base_time + timedelta(seconds=50), 99.8),
+        ]
+        assert detect_price_shocks(trades, threshold_pct=1.0, window_seconds=60) == []
+        result = detect_price_shocks(trades, 1.0, 60, mode="peak_to_trough")
+        assert len(result) == 1, f"Expected one event, got {len(result)}"
+        event = result[0]
+        assert event.direction == EventDirection.DOWN
+        assert abs(event.magnitude - (99.8 - 100.9) / 100.9 * 100) < 1e-9
+        assert event.metadata["reference_price"] == 100.9
+        assert event.metadata["mode"] == "peak_to_trough"
+        extreme_time = base_time + timedelta(seconds=30)
+        assert event.metadata["extreme_timestamp"] == extreme_time.isoformat()
+        assert event.metadata["trigger_timestamp"] == trades[2].timestamp.isoformat()
+
+    def test_changes_match_brute_force(self) -> None:
+        """The deque scan equals recomputing the window high and low per row."""
+        rng = random.Random(5)
+        for _ in range(100):
+            timestamps, prices = [], []
+            ts = 0
+            for _ in range(rng.randint(0, 200)):
+                ts += rng.choice([0, 1, 3, 10]) * 1_000_000_000
+                timestamps.append(ts)
+                prices.append(rng.choice([99.0, 100.0, 101.0, rng.uniform(98, 102)]))
+            window_ns = rng.choice([1, 5, 30]) * 1_000_000_000
+            extremes, changes = _peak_to_trough_changes(timestamps, prices, window_ns)
+            for i in range(len(timestamps)):
+                rows = [j for j in range(i + 1) if timestamps[j] >= timestamps[i] - window_ns]
+                if len(rows) < 2:
+                    assert extremes[i] == -1
+                    continue
+                high = max(prices[j] for j in rows)
+                low = min(prices[j] for j in rows)
+                expected = max((prices[i] - low) / low, (prices[i] - high) / high, key=abs) * 100
+                assert abs(abs(changes[i]) - abs(expected)) < 1e-9
+                assert prices[extremes[i]] in (high, low)
+                # Of equal extremes the latest is used
+                assert all(prices[j] != prices[extremes[i]] for j in rows if j > extremes[i])
+
+    def test_grid_streaming_and_config_agree(self) -> None:
+        """Grid, streaming and config entry points match the batch mode."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        rng = random.Random(3)
+        price = 100.0
+        trades = []
+        for i in range(500):
+            price *= 1 + rng.gauss(0, 0.003)
+            trades.append(_make_trade(base_time + timedelta(seconds=i * 2), price))
+        grid = detect_price_shocks_grid(trades, [0.5, 1.0], [30, 60], mode="peak_to_trough")
+        assert any(grid.values()), "Expected events in test data"
+        for (threshold, window), events in grid.items():
+            expected = detect_price_shocks(trades, threshold, window, mode="peak_to_trough")
+            assert events == expected
+
+            detector = StreamingShockDetector(threshold, window, "BTC-USDT", "peak_to_trough")
+            streamed = []
+            for trade in trades:
+                streamed.extend(detector.push(trade.timestamp, trade.price))
+            streamed.extend(detector.flush())
+            assert streamed == expected
+
+        config = {
+            "event_detection": {
+                "price_shock_threshold_pct": 1.0,
+                "rolling_window_seconds": 60,
+                "mode": "peak_to_trough",
+            }
+        }
+        assert detect_price_shocks_from_config(trades, config) == grid[(1.0, 60)]
+
+    def test_unknown_mode_raises_error(self) -> None:
+        """Modes other than DETECTION_MODES raise DetectorError."""
+        trades = [_make_trade(datetime(2024, 1, 15), 100.0)]
+        for bad in (
+            lambda: detect_price_shocks(trades, 1.0, 60, mode="max_min"),
+            lambda: detect_price_shocks_grid(trades, [1.0], [60], mode="max_min"),
+            lambda: StreamingShockDetector(1.0, 60, mode="max_min"),
+        ):
+            try:
+                bad()
+                assert False, "Expected DetectorError"
+            except DetectorError:
+                pass
+
+
+def _regime_trades(base_time: datetime) -> List[Trade]:
+    """An hour of calm one-second ticks with a 0.3% jump, then an hour of wild ones."""
+    rng = random.Random(11)
+    price = 100.0
+    trades = []
+    for i in range(7200):
+        volatility = 0.00001 if i < 3600 else 0.002
+        price *= 1 + rng.gauss(0, volatility)
+        if i == 1800:
+            price *= 1.003
+        trades.append(_make_trade(base_time + timedelta(seconds=i), price))
+    return trades
+
+
+class TestAdaptiveThreshold:
+    """The threshold follows an EWMA of realized volatility."""
+
+    def test_threshold_follows_regime(self) -> None:
+        """Calm stretches lower the threshold, wild stretches raise it."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        trades = _regime_trades(base_time)
+        calm_end = base_time + timedelta(seconds=3600)
+
+        fixed = detect_price_shocks(trades, 0.5, 60)
+        assert all(e.timestamp >= calm_end for e in fixed)
+        assert len(fixed) > 10, f"Expected many fixed-threshold events, got {len(fixed)}"
+
+        adaptive = AdaptiveThreshold(vol_multiplier=5.0, halflife_seconds=300)
+        events = detect_price_shocks(trades, 0.5, 60, adaptive=adaptive)
+        jump_time = base_time + timedelta(seconds=1800)
+        assert [e.timestamp for e in events if e.timestamp < calm_end] == [jump_time]
+        # The wild hour only raises alarms while the estimate catches up
+        assert len(events) < len(fixed) / 2, f"{len(events)} vs {len(fixed)}"
+        jump = events[0]
+        assert jump.metadata["threshold_pct"] == 0.1  # min_threshold_pct
+        assert 0 < jump.metadata["volatility_pct"] < 0.02
+
+    def test_warmup_uses_fixed_threshold(self) -> None:
+        """Rows within warmup_seconds of the first use threshold_pct."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        trades = [
+            _make_trade(base_time, 100.0),
+            _make_trade(base_time + timedelta(seconds=10), 100.3),
+            _make_trade(base_time + timedelta(seconds=200), 100.3),
+            _make_trade(base_time + timedelta(seconds=230), 100.45),
+        ]
+        adaptive = AdaptiveThreshold(vol_multiplier=1.0, halflife_seconds=30, warmup_seconds=100)
+        events = detect_price_shocks(trades, 0.2, 60, adaptive=adaptive)
+        assert [e.timestamp for e in events] == [trades[1].timestamp, trades[3].timestamp]
+        assert events[0].metadata["threshold_pct"] == 0.2
+        assert events[0].metadata["volatility_pct"] is None
+        # After the warmup the quiet stretch drops the threshold to its floor
+        assert events[1].metadata["threshold_pct"] == 0.1
+        assert events[1].metadata["volatility_pct"] < 0.1
+        assert len(detect_price_shocks(trades, 0.2, 60)) == 1
+
+    def test_estimate_matches_direct_sum(self) -> None:
+        """The O(1) update equals the exponentially weighted sum over earlier returns."""
+        rng = random.Random(2)
+        ts = 0
+        rows = []
+        for _ in range(300):
+            ts += rng.choice([0, 1, 2, 7]) * 1_000_000_000
+            rows.append((ts, 100 * (1 + rng.gauss(0, 0.001))))
+        adaptive = AdaptiveThreshold(vol_multiplier=3.0, halflife_seconds=20, warmup_seconds=1e-6)
+        state = _EwmaThreshold(adaptive, 0.5, 60)
+        tau = 20 / math.log(2)
+        for i, (ts, price) in enumerate(rows):
+            threshold, volatility = state.step(ts, price)
+            if i == 0:
+                assert volatility is None
+                continue
+            total = sum(
+                math.exp(-(ts - rows[j][0]) / 1e9 / tau)
+                * math.log(rows[j][1] / rows[j - 1][1]) ** 2
+                for j in range(1, i)
+            )
+            expected = 100 * math.sqrt(total * 60 / tau)
+            assert abs(volatility - expected) <= 1e-9 * max(expected, 1e-9)
+            assert threshold == max(3.0 * volatility, 0.1)
+
+    def test_streaming_and_config_match_batch(self) -> None:
+        """Per-tick updates give the batch events in both modes."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        trades = _regime_trades(base_time)[3000:4500]
+        section = {"vol_multiplier": 4.0, "halflife_seconds": 120, "max_threshold_pct": 3.0}
+        adaptive = AdaptiveThreshold(**section)
+        for mode in ("reference", "peak_to_trough"):
+            expected = detect_price_shocks(trades, 0.5, 60, mode, adaptive)
+            assert expected, mode
+            detector = StreamingShockDetector(0.5, 60, "BTC-USDT", mode, adaptive)
+            streamed = []
+            for trade in trades:
+                streamed.extend(detector.push(trade.timestamp, trade.price))
+            streamed.extend(detector.flush())
+            _assert_same_events(streamed, expected)
+
+            config = {
+                "event_detection": {
+                    "price_shock_threshold_pct": 0.5,
+                    "rolling_window_seconds": 60,
+                    "mode": mode,
+                    "adaptive_threshold": section,
+                }
+            }
+            assert detect_price_shocks_from_config(trades, config) == expected
+            detector = StreamingShockDetector.from_config(config, "BTC-USDT")
+            table = TradeTable.from_records(trades)
+            from_table = detect_price_shocks_from_config(table, config)
+            assert len(from_table) == len(expected)
+            _assert_same_events(detector.push_table(table) + detector.flush(), from_table)
+
+    def test_numpy_estimate_matches_online_update(self) -> None:
+        """The vectorized estimate matches step_many, across many rebasing blocks."""
+        if not NUMPY_AVAILABLE:
+            return
+        import numpy as np
+
+        rng = random.Random(5)
+        ts = 0
+        timestamps, prices = [], []
+        for _ in range(3000):
+            # Gaps of many half-lives skip whole blocks
+            ts += rng.choice([0, 1, 2, 7, 600]) * 1_000_000_000
+            timestamps.append(ts)
+            prices.append(100 * (1 + rng.gauss(0, 0.001)))
+        for halflife in (0.5, 20, 300):
+            adaptive = AdaptiveThreshold(vol_multiplier=3.0, halflife_seconds=halflife)
+            expected = _EwmaThreshold(adaptive, 0.5, 60).step_many(timestamps, prices)
+            thresholds, volatilities = _EwmaThreshold(adaptive, 0.5, 60).series_numpy(
+                np.array(timestamps, dtype="int64"), np.array(prices)
+            )
+            for threshold, volatility, want_threshold, want_volatility in zip(
+                thresholds.tolist(), volatilities.tolist(), *expected
+            ):
+                if want_volatility is None:
+                    assert math.isnan(volatility) and threshold == 0.5
+                    continue
+                assert abs(volatility - want_volatility) <= 1e-9 * want_volatility + 1e-15
+                assert abs(threshold - want_threshold) <= 1e-9 * want_threshold
+
+    def test_adaptive_scan_cost_stays_near_fixed_scan(self) -> None:
+        """Computing the EWMA thresholds does not dominate the vectorized scan."""
+        if not NUMPY_AVAILABLE:
+            return
+        rng = random.Random(6)
+        ts = 0
+        price = 100.0
+        timestamps, prices = [], []
+        for _ in range(300_000):
+            ts += rng.randint(1, 200) * 1_000_000
+            price *= 1 + rng.gauss(0, 0.0001)
+            timestamps.append(ts)
+            prices.append(price)
+        adaptive = AdaptiveThreshold(vol_multiplier=4.0, halflife_seconds=300)
+        elapsed = {}
+        for name, setting in (("fixed", None), ("adaptive", adaptive)):
+            start = time.perf_counter()
+            _find_shocks(timestamps, prices, 0.5, 60, "reference", setting)
+            elapsed[name] = time.perf_counter() - start
+        # The row-by-row EWMA loop alone took several times the fixed scan
+        assert elapsed["adaptive"] < 3 * elapsed["fixed"] + 0.2, elapsed
+
+    def test_invalid_settings_raise_error(self) -> None:
+        """Bad adaptive_threshold values and keys raise DetectorError."""
+        for section in (
+            {"vol_multiplier": 0},
+            {"vol_multiplier": 2.0, "halflife_seconds": -1},
+            {"vol_multiplier": 2.0, "min_threshold_pct": 0},
+            {"vol_multiplier": 2.0, "warmup_seconds": 0},
+            {"vol_multiplier": 2.0, "min_threshold_pct": 1.0, "max_threshold_pct": 0.5},
+            {"vol_multiplier": 2.0, "span": 10},
+            {},
+        ):
+            try:
+                AdaptiveThreshold.from_config({"adaptive_threshold": section})
+                assert False, f"Expected DetectorError for {section}"
+            except DetectorError:
+                pass
+        assert AdaptiveThreshold.from_config({"adaptive_threshold": None}) is None
+
+
+def _assert_same_events(actual: List[Event], expected: List[Event]) -> None:
+    """Events are equal, with thresholds and volatilities equal up to rounding.
+
+    The batch detector computes the adaptive estimate with NumPy and the
+    streaming detector row by row, so the two can differ in the last bits.
+    """
+    assert len(actual) == len(expected), (len(actual), len(expected))
+    for got, want in zip(actual, expected):
+        got_meta, want_meta = dict(got.metadata), dict(want.metadata)
+        for key in ("threshold_pct", "volatility_pct"):
+            got_value, want_value = got_meta.pop(key, None), want_meta.pop(key, None)
+            if want_value is None:
+                assert got_value is None, (key, got_value)
+            else:
+                assert abs(got_value - want_value) <= 1e-9 * abs(want_value), key
+        assert got_meta == want_meta
+        assert (got.timestamp, got.symbol, got.direction, got.magnitude) == (
+            want.timestamp, want.symbol, want.direction, want.magnitude
+        )
+
+
+def _two_symbol_trades(base_time: datetime) -> List[Trade]:
+    """Interleaved BTC and ETH random walks with shocks, sorted by timestamp."""
+    trades = []
+    for symbol, seed, offset in (("BTC-USDT", 21, 0), ("ETH-USDT", 22, 500)):
+        rng = random.Random(seed)
+        price = 100.0
+        for i in range(600):
+            price *= 1 + rng.gauss(0, 0.003)
+            ts = base_time + timedelta(seconds=i * 2, microseconds=offset)
+            trades.append(_make_trade(ts, price, symbol))
+    trades.sort(key=lambda t: t.timestamp)
+    return trades
+
+
+class TestMultiSymbolDetection:
+    """Multi-symbol data is detected per symbol and merged by (timestamp, symbol)."""
+
+    def test_matches_per_symbol_runs(self) -> None:
+        """Each symbol gets the events of its own series."""
+        trades = _two_symbol_trades(datetime(2024, 1, 15, 10, 0, 0))
+        expected = []
+        for symbol in ("BTC-USDT", "ETH-USDT"):
+            own = [t for t in trades if t.symbol == symbol]
+            events = detect_price_shocks(own, 1.0, 60)
+            assert events and all(e.symbol == symbol for e in events)
+            expected.extend(events)
+        expected.sort(key=lambda e: (e.timestamp, e.symbol))
+
+        assert detect_price_shocks(trades, 1.0, 60) == expected
+        grid = detect_price_shocks_grid(trades, [1.0, 1.5], [60])
+        assert grid[(1.0, 60)] == expected
+        assert grid[(1.5, 60)] == detect_price_shocks(trades, 1.5, 60)
+
+    def test_workers_give_same_events(self) -> None:
+        """Scanning symbols in worker processes does not change the result."""
+        trades = _two_symbol_trades(datetime(2024, 1, 15, 10, 0, 0))
+        table = TradeTable.from_records(trades)
+        config = {
+            "event_detection": {
+                "price_shock_threshold_pct": 1.0,
+                "rolling_window_seconds": 60,
+                "mode": "peak_to_trough",
+                "adaptive_threshold": {"vol_multiplier": 4.0, "halflife_seconds": 120},
+            }
+        }
+        sequential = detect_price_shocks_from_config(table, config)
+        assert {e.symbol for e in sequential} == {"BTC-USDT", "ETH-USDT"}
+        assert detect_price_shocks_from_config(table, config, workers=2) == sequential
+        assert (
+            detect_price_shocks_grid(table, [1.0], [60], workers=2)
+            == detect_price_shocks_grid(table, [1.0], [60])
+        )
+
+    def test_order_is_checked_per_symbol(self) -> None:
+        """Symbols need not be interleaved in time order, only sorted on their own."""
+        trades = _two_symbol_trades(datetime(2024, 1, 15, 10, 0, 0))
+        by_symbol = sorted(trades, key=lambda t: t.symbol)
+        assert detect_price_shocks(by_symbol, 1.0, 60) == detect_price_shocks(trades, 1.0, 60)
+
+        eth = [t for t in by_symbol if t.symbol == "ETH-USDT"]
+        unsorted = [t for t in by_symbol if t.symbol == "BTC-USDT"] + eth[::-1]
+        try:
+            detect_price_shocks(unsorted, 1.0, 60)
+            assert False, "Expected DetectorError"
+        except DetectorError as e:
+            assert "sorted" in str(e)
+
+
+class TestStreamingShockDetector:
+    """Pushing a series and flushing reproduces detect_price_shocks."""
+
+    def test_matches_batch_on_random_walks(self) -> None:
+        """Per-row pushes, random batches and the batch function agree."""
+        rng = random.Random(7)
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        for _ in range(100):
+            trades = []
+            ts, price = base_time, 100.0
+            for _ in range(rng.randint(0, 300)):
+                ts += timedelta(milliseconds=rng.choice([0, 0, 100, 500, 2000]))
+                price *= 1 + rng.gauss(0, 0.004)
+                trades.append(_make_trade(ts, price))
+            threshold = rng.choice([0.2, 0.5, 1.0])
+            window = rng.choice([1, 10, 60])
+            expected = detect_price_shocks(trades, threshold, window)
+
+            detector = StreamingShockDetector(threshold, window, symbol="BTC-USDT")
+            actual = []
+            for trade in trades:
+                actual.extend(detector.push(trade.timestamp, trade.price))
+            actual.extend(detector.flush())
+            assert actual == expected
+
+            table = TradeTable.from_records(trades)
+            detector = StreamingShockDetector(threshold, window)
+            batched = []
+            start = 0
+            while start < len(table):
+                stop = start + rng.randint(1, 50)
+                batched.extend(detector.push_table(table.view(start, min(stop, len(table)))))
+                start = stop
+            batched.extend(detector.flush())
+            assert [e.timestamp.replace(tzinfo=None) for e in batched] == [
+                e.timestamp for e in expected
+            ]
+            assert [(e.symbol, e.magnitude, e.metadata) for e in batched] == [
+                (e.symbol, e.magnitude, e.metadata) for e in expected
+            ]
+
+    def test_events_are_emitted_once_final(self) -> None:
+        """An event is returned once a row reaches its dedup horizon."""
+        detector = StreamingShockDetector(threshold_pct=1.0, window_seconds=60)
+        second = 1_000_000_000
+        assert detector.push(0, 100.0) == []
+        assert detector.push(10 * second, 98.5) == []    # event, may still be replaced
+        assert detector.push(50 * second, 97.0) == []    # replaces it
+        assert detector.push(109 * second, 97.0) == []   # within 60s of the replacement
+        emitted = detector.push(110 * second, 97.0)
+        assert len(emitted) == 1
+        assert emitted[0].magnitude == -3.0
+        assert detector.flush() == []
+
+    def test_window_holds_only_recent_rows(self) -> None:
+        """Memory stays bounded by the rolling window on long feeds."""
+        detector = StreamingShockDetector(threshold_pct=1.0, window_seconds=10)
+        detector.push_batch(range(0, 1_000_000_000_000, 100_000_000), [100.0] * 10_000)
+        assert len(detector._window) == 101
+
+    def test_rejects_unsorted_and_invalid_input(self) -> None:
+        """Out-of-order rows and bad parameters raise DetectorError."""
+        detector = StreamingShockDetector(threshold_pct=1.0, window_seconds=60)
+        detector.push(datetime(2024, 1, 15, 10, 0, 5), 100.0)
+        for bad in (
+            lambda: detector.push(datetime(2024, 1, 15, 10, 0, 0), 100.0),
+            lambda: detector.push_batch([1, 2], [100.0]),
+            lambda: StreamingShockDetector(threshold_pct=0, window_seconds=60),
+            lambda: StreamingShockDetector.from_config({"event_detection": {}}),
+        ):
+            try:
+                bad()
+                assert False, "Expected DetectorError"
+            except DetectorError:
+                pass
+
+
 def run_all_tests() -> None:
     """Run all tests and print results.
 
@@ -239,6 +817,12 @@ def run_all_tests() -> None:
         TestDetectPriceShocksBasic,
         TestDetectPriceShocksConfig,
         TestDetectPriceShocksValidation,
+        TestDetectorEngines,
+        TestDetectPriceShocksGrid,
+        TestPeakToTroughMode,
+        TestAdaptiveThreshold,
+        TestMultiSymbolDetection,
+        TestStreamingShockDetector,
     ]
 
     passed = 0
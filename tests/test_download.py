@@ -0,0 +1,265 @@
+"""Tests for the Binance downloader against a local HTTP server."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import shutil
+import sys
+import tempfile
+import threading
+import zipfile
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from download_binance_data import (  # noqa: E402
+    DownloadError,
+    HTTPSession,
+    download_file,
+    download_range,
+)
+
+
+def _zip_bytes(name: str, rows: int) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as zf:
+        zf.writestr(name, "".join(f"{i},100.0,1.0\n" for i in range(rows)))
+    return buffer.getvalue()
+
+
+class _Server:
+    """Serves in-memory files with Range and keep-alive support.
+
+    Attributes:
+        files: URL path -> body.
+        corrupt: URL paths whose body is served with its last byte flipped.
+        truncate: URL path -> bytes sent before the connection is dropped
+            (once).
+        requests: (path, Range header) per request.
+        connections: Number of TCP connections accepted.
+    """
+
+    def __init__(self) -> None:
+        self.files = {}
+        self.corrupt = set()
+        self.truncate = {}
+        self.requests = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    def add(self, path: str, body: bytes, checksum: bool = True) -> None:
+        self.files[path] = body
+        if checksum:
+            digest = hashlib.sha256(body).hexdigest()
+            self.files[path + ".CHECKSUM"] = f"{digest}  {path.rsplit('/', 1)[-1]}\n".encode()
+
+    @contextmanager
+    def running(self):
+        state = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                with state.lock:
+                    state.connections += 1
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                with state.lock:
+                    state.requests.append((self.path, self.headers.get("Range")))
+                body = state.files.get(self.path)
+                if body is None:
+                    self._send(404, b"not found")
+                    return
+                if self.path in state.corrupt:
+                    body = body[:-1] + bytes([body[-1] ^ 0xFF])
+                start = 0
+                range_header = self.headers.get("Range")
+                if range_header:
+                    start = int(range_header.split("=")[1].split("-")[0])
+                    if start >= len(body):
+                        self._send(416, b"")
+                        return
+                cut = state.truncate.pop(self.path, None)
+                self.send_response(206 if range_header else 200)
+                if range_header:
+                    self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+                self.send_header("Content-Length", str(len(body) - start))
+                self.end_headers()
+                if cut is not None:
+                    self.wfile.write(body[start:cut])
+                    self.close_connection = True
+                    return
+                self.wfile.write(body[start:])
+
+            def _send(self, status: int, body: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{server.server_address[1]}"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def _path(data_type: str, date: str, symbol: str = "BTCUSDT") -> str:
+    return f"/daily/{data_type}/{symbol}/{symbol}-{data_type}-{date}.zip"
+
+
+class TestDownloadRange:
+    """download_range fetches, verifies and extracts every archive."""
+
+    def test_downloads_verified_archives_over_kept_alive_connections(self) -> None:
+        server = _Server()
+        dates = ["2024-03-01", "2024-03-02", "2024-03-03"]
+        for date in dates:
+            for data_type in ("aggTrades", "bookTicker"):
+                name = f"BTCUSDT-{data_type}-{date}.csv"
+                server.add(_path(data_type, date), _zip_bytes(name, 50))
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            with server.running() as base_url:
+                ok = download_range(
+                    "BTCUSDT", dates[0], "2024-03-04", concurrency=2,
+                    base_url=base_url + "/daily", data_dir=temp_dir,
+                )
+            assert ok == dates
+            symbol_dir = temp_dir / "BTCUSDT"
+            assert len(list(symbol_dir.glob("*.csv"))) == 6
+            assert not list(symbol_dir.glob("*.part"))
+            # 6 archives and 8 checksum requests (2024-03-04 is missing) on at
+            # most one connection per worker thread
+            assert len(server.requests) == 16
+            assert server.connections <= 2, server.connections
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class TestDownloadFile:
+    """download_file resumes partial files and verifies checksums."""
+
+    def test_resumes_partial_download(self) -> None:
+        server = _Server()
+        body = _zip_bytes("a.csv", 2000)
+        server.add("/a.zip", body)
+        server.truncate["/a.zip"] = len(body) // 3
+        temp_dir = Path(tempfile.mkdtemp())
+        dest = temp_dir / "a.zip"
+        try:
+            # A previous run left the first 100 bytes behind
+            (temp_dir / "a.zip.part").write_bytes(body[:100])
+            with server.running() as base_url:
+                assert download_file(f"{base_url}/a.zip", dest, HTTPSession())
+            assert dest.read_bytes() == body
+            ranges = [r for path, r in server.requests if path == "/a.zip"]
+            assert ranges == ["bytes=100-", f"bytes={len(body) // 3}-"], ranges
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_replaces_files_that_fail_verification(self) -> None:
+        server = _Server()
+        body = _zip_bytes("a.csv", 100)
+        server.add("/a.zip", body)
+        temp_dir = Path(tempfile.mkdtemp())
+        dest = temp_dir / "a.zip"
+        try:
+            dest.write_bytes(b"interrupted by an older downloader")
+            with server.running() as base_url:
+                assert download_file(f"{base_url}/a.zip", dest)
+                assert dest.read_bytes() == body
+
+                server.corrupt.add("/a.zip")
+                dest.unlink()
+                try:
+                    download_file(f"{base_url}/a.zip", dest)
+                    raised = False
+                except DownloadError:
+                    raised = True
+                assert raised, "Expected DownloadError for a corrupt download"
+                assert not dest.exists() and not (temp_dir / "a.zip.part").exists()
+
+                assert not download_file(f"{base_url}/missing.zip", temp_dir / "missing.zip")
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class TestHTTPSession:
+    """HTTPSession keeps one connection per thread and closes them all."""
+
+    def test_close_closes_every_thread_connection(self) -> None:
+        server = _Server()
+        server.add("/a.zip", b"payload", checksum=False)
+        session = HTTPSession()
+        opened = []
+
+        def fetch() -> None:
+            response = session.get(f"{base_url}/a.zip")
+            assert response.read() == b"payload"
+            opened.extend(session._connections().values())
+
+        with server.running() as base_url:
+            threads = [threading.Thread(target=fetch) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert len(opened) == 3 and all(conn.sock is not None for conn in opened)
+
+            session.close()
+            assert all(conn.sock is None for conn in opened)
+            # The session stays usable: this thread reconnects on demand
+            assert session.get(f"{base_url}/a.zip").read() == b"payload"
+            session.close()
+        assert server.connections == 4
+
+
+def run_all_tests() -> None:
+    """Run all tests and print results.
+
+    This can be run standalone: python -m tests.test_download
+    """
+    test_classes = [
+        TestDownloadRange,
+        TestDownloadFile,
+        TestHTTPSession,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_class in test_classes:
+        instance = test_class()
+        for method_name in dir(instance):
+            if method_name.startswith("test_"):
+                method = getattr(instance, method_name)
+                try:
+                    method()
+                    print(f"  PASS: {test_class.__name__}.{method_name}")
+                    passed += 1
+                except AssertionError as e:
+                    print(f"  FAIL: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+                except Exception as e:
+                    print(f"  ERROR: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    if failed > 0:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
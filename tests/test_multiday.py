@@ -0,0 +1,172 @@
+"""Tests for the multi-day runner (run_days).
+
+Consecutive days run as one stream must give the events and windows of a
+single run over the days concatenated, including around midnight.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from market_forensics.data.cache import cache_dir_for
+from market_forensics.data.loaders import load_tob_table
+from market_forensics.events.detector import detect_price_shocks
+from market_forensics.run import run_days, run_pipeline
+
+MIDNIGHT = datetime(2024, 3, 28, tzinfo=timezone.utc)
+
+CONFIG = {
+    "event_detection": {"price_shock_threshold_pct": 0.5, "rolling_window_seconds": 60},
+    "windows": {"pre_event_seconds": 120, "post_event_seconds": 120},
+    "ordering_detection": {"baseline_window_seconds": 120, "threshold_std_multiplier": 2.0},
+}
+
+
+def _price(second: int) -> float:
+    """Flat at 100, except a 0.8% rise from 20s before midnight to 20s after it."""
+    if second < -20:
+        return 100.0
+    if second > 20:
+        return 100.8
+    return 100.0 + 0.8 * (second + 20) / 40
+
+
+def _write_day(day_dir: Path, seconds: range) -> None:
+    """Write trades.csv and tob.csv with one row per second (relative to MIDNIGHT)."""
+    day_dir.mkdir(parents=True)
+    trades = ["timestamp,symbol,price,size,side,trade_id"]
+    tob = ["timestamp,symbol,bid_price,bid_size,ask_price,ask_size"]
+    for second in seconds:
+        ts = (MIDNIGHT + timedelta(seconds=second)).isoformat()
+        price = _price(second)
+        side = "buy" if second % 2 else "sell"
+        trades.append(f"{ts},BTCUSDT,{price:.4f},0.5,{side},{second + 1000}")
+        tob.append(f"{ts},BTCUSDT,{price - 0.01:.4f},2.0,{price + 0.01:.4f},3.0")
+    (day_dir / "trades.csv").write_text("\n".join(trades) + "\n")
+    (day_dir / "tob.csv").write_text("\n".join(tob) + "\n")
+
+
+def _day(day_dir: Path) -> tuple:
+    return str(day_dir / "trades.csv"), str(day_dir / "tob.csv")
+
+
+def _setup(temp_dir: Path) -> None:
+    """Two days split at midnight, plus the same rows in one file."""
+    _write_day(temp_dir / "day1", range(-600, 0))
+    _write_day(temp_dir / "day2", range(0, 600))
+    _write_day(temp_dir / "both", range(-600, 600))
+    (temp_dir / "config.json").write_text(json.dumps(CONFIG))
+
+
+def _window_files(output_dir: Path) -> dict:
+    return {
+        path.name: path.read_text()
+        for path in sorted((output_dir / "windows").iterdir())
+    }
+
+
+class TestRunDays:
+    """Tests for run_days."""
+
+    def test_matches_concatenated_run(self) -> None:
+        """Events and windows across midnight match a single run over both days."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            _setup(temp_dir)
+            config = str(temp_dir / "config.json")
+            days = run_days(
+                config, [_day(temp_dir / "day1"), _day(temp_dir / "day2")],
+                str(temp_dir / "out_days"), verbose=False,
+            )
+            single = run_pipeline(
+                config, *_day(temp_dir / "both"), str(temp_dir / "out_single"), verbose=False,
+            )
+            expected = detect_price_shocks(load_tob_table(temp_dir / "both" / "tob.csv"), 0.5, 60)
+            assert len(expected) == 1
+            assert expected[0].timestamp > MIDNIGHT
+            assert days['events'] == single['events']
+            assert days['events'][0]['timestamp'] == expected[0].timestamp.isoformat()
+            assert _window_files(temp_dir / "out_days") == _window_files(temp_dir / "out_single")
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_previous_day_tail(self) -> None:
+        """With the previous day as lead-in, the midnight shock and its pre-window are found."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            _setup(temp_dir)
+            config = str(temp_dir / "config.json")
+            alone = run_days(
+                config, [_day(temp_dir / "day2")], str(temp_dir / "out_alone"), verbose=False,
+            )
+            # Day 2 on its own only sees the last half of the move
+            assert alone['events'] == []
+
+            results = run_days(
+                config, [_day(temp_dir / "day2")], str(temp_dir / "out"), verbose=False,
+                previous_day=_day(temp_dir / "day1"),
+            )
+            single = run_pipeline(
+                config, *_day(temp_dir / "both"), str(temp_dir / "out_single"), verbose=False,
+            )
+            assert results['events'] == single['events']
+            windows = _window_files(temp_dir / "out")
+            assert windows == _window_files(temp_dir / "out_single")
+            pre_tob = next(text for name, text in windows.items() if name.endswith("_pre_tob.csv"))
+            # The 119 rows after the 120s pre-window start, most from the previous day
+            assert len(pre_tob.splitlines()) == 1 + 119
+            assert "2024-03-27T23:58" in pre_tob
+            # The previous day's tail is read from the end, not parsed or indexed in full
+            assert not cache_dir_for(temp_dir / "day1" / "trades.csv").exists()
+            assert not cache_dir_for(temp_dir / "day1" / "tob.csv").exists()
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_requires_days(self) -> None:
+        """An empty day list is rejected."""
+        try:
+            run_days("config/default.json", [], "unused", verbose=False)
+            assert False, "Should have raised ValueError"
+        except ValueError:
+            pass
+
+
+def run_all_tests() -> None:
+    """Run all tests and print results.
+
+    This can be run standalone: python -m tests.test_multiday
+    """
+    test_classes = [
+        TestRunDays,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_class in test_classes:
+        instance = test_class()
+        for method_name in dir(instance):
+            if method_name.startswith("test_"):
+                method = getattr(instance, method_name)
+                try:
+                    method()
+                    print(f"  PASS: {test_class.__name__}.{method_name}")
+                    passed += 1
+                except AssertionError as e:
+                    print(f"  FAIL: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+                except Exception as e:
+                    print(f"  ERROR: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    if failed > 0:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
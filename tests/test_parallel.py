@@ -0,0 +1,205 @@
+"""Tests for parallel byte-range CSV parsing."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from market_forensics.data.columnar import TobTable, TradeTable
+from market_forensics.data.loaders import (
+    DataLoadError,
+    load_tob_table_csv,
+    load_trade_table_csv,
+)
+from market_forensics.data import parallel
+from market_forensics.data.parallel import load_table_parallel, split_byte_ranges
+
+SAMPLE_DIR = Path(__file__).parent.parent / "data" / "sample"
+BASE_TIME = datetime(2024, 3, 28, tzinfo=timezone.utc)
+SHM_DIR = Path("/dev/shm")
+
+
+def _write_trades(path: Path, n: int, bad_row: int = -1) -> None:
+    lines = ["timestamp,symbol,price,size,side,trade_id"]
+    for i in range(n):
+        ts = (BASE_TIME + timedelta(milliseconds=7 * i)).isoformat()
+        symbol = "ETHUSDT" if i % 5 == 0 else "BTCUSDT"
+        price = -1.0 if i == bad_row else 100.0 + i % 11
+        lines.append(f"{ts},{symbol},{price},0.5,{'buy' if i % 2 else 'sell'},{1000 + i}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _shm_blocks() -> set:
+    """Names of the POSIX shared memory blocks (empty where /dev/shm is absent)."""
+    return set(os.listdir(SHM_DIR)) if SHM_DIR.is_dir() else set()
+
+
+class _FailingBlock(parallel.shared_memory.SharedMemory):
+    """A real shared memory block whose buffer cannot be written."""
+
+    created: list = []
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        _FailingBlock.created.append(self.name)
+
+    @property
+    def buf(self):
+        raise MemoryError("cannot map block")
+
+
+@contextmanager
+def _failing_blocks():
+    saved = parallel.shared_memory
+    parallel.shared_memory = type("shared_memory", (), {"SharedMemory": _FailingBlock})
+    _FailingBlock.created = []
+    try:
+        yield _FailingBlock.created
+    finally:
+        parallel.shared_memory = saved
+
+
+class TestParallelLoad:
+    """Parallel parsing gives the sequential loader's results."""
+
+    def test_byte_ranges_are_line_aligned(self) -> None:
+        """Ranges cover all data rows and start at line starts."""
+        path = SAMPLE_DIR / "tob.csv"
+        data = path.read_bytes()
+        ranges = split_byte_ranges(path, 4)
+        assert ranges[0][0] == data.index(b"\n") + 1
+        assert ranges[-1][1] == len(data)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start and data[start - 1:start] == b"\n"
+
+    def test_matches_sequential(self) -> None:
+        """Trades with several symbols and ids load identically."""
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, 2000)
+        try:
+            expected = load_trade_table_csv(path, use_cache=False)
+            actual = load_table_parallel(path, TradeTable, workers=3, min_parallel_bytes=0)
+            actual = actual.sorted_by_timestamp()
+            assert actual.to_records() == expected.to_records()
+            assert list(actual.trade_ids) == list(expected.trade_ids)
+            tob = load_table_parallel(
+                SAMPLE_DIR / "tob.csv", TobTable, workers=2, min_parallel_bytes=0
+            )
+            assert tob.to_records() == load_tob_table_csv(
+                SAMPLE_DIR / "tob.csv", use_cache=False
+            ).to_records()
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_projection_skips_trade_ids(self) -> None:
+        """Without trade ids the workers neither parse nor return them."""
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, 2000)
+        try:
+            expected = load_trade_table_csv(path, use_cache=False)
+            byte_range = split_byte_ranges(path, 2)[1]
+            result = parallel._parse_range(
+                "TradeTable", str(path), byte_range, {"with_trade_ids": False}
+            )
+            parallel._unlink(result["shm"])
+            assert result["trade_ids"] is None
+            assert "trade_ids" not in [name for name, *_ in result["layout"]]
+
+            actual = load_table_parallel(
+                path, TradeTable, workers=3, min_parallel_bytes=0, with_trade_ids=False
+            )
+            assert actual.trade_ids is None
+            expected.trade_ids = None
+            assert actual.sorted_by_timestamp().to_records() == expected.to_records()
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_errors_report_file_row(self) -> None:
+        """Invalid rows are reported with their row number in the whole file."""
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, 1000, bad_row=900)
+        try:
+            load_table_parallel(path, TradeTable, workers=4, min_parallel_bytes=0)
+            raised = False
+        except DataLoadError as e:
+            raised = True
+            assert "row 902" in str(e)
+        finally:
+            shutil.rmtree(temp_dir)
+        assert raised, "Expected DataLoadError for negative price"
+
+    def test_failed_worker_leaks_no_shared_memory(self) -> None:
+        """Blocks from the workers that succeeded are unlinked when another fails."""
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, 1000, bad_row=900)
+        before = _shm_blocks()
+        try:
+            load_table_parallel(path, TradeTable, workers=4, min_parallel_bytes=0)
+            assert False, "Should have raised DataLoadError"
+        except DataLoadError:
+            pass
+        finally:
+            shutil.rmtree(temp_dir)
+        assert _shm_blocks() - before == set()
+
+    def test_worker_unlinks_block_it_cannot_hand_back(self) -> None:
+        """A worker that fails after creating its block unlinks it."""
+        path = SAMPLE_DIR / "tob.csv"
+        byte_range = split_byte_ranges(path, 1)[0]
+        with _failing_blocks() as created:
+            try:
+                parallel._parse_range("TobTable", str(path), byte_range, {})
+                assert False, "Should have raised MemoryError"
+            except MemoryError:
+                pass
+        assert len(created) == 1
+        try:
+            parallel.shared_memory.SharedMemory(name=created[0]).close()
+            assert False, "Block should have been unlinked"
+        except FileNotFoundError:
+            pass
+
+
+def run_all_tests() -> None:
+    """Run all tests and print results.
+
+    This can be run standalone: python -m tests.test_parallel
+    """
+    test_classes = [
+        TestParallelLoad,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_class in test_classes:
+        instance = test_class()
+        for method_name in dir(instance):
+            if method_name.startswith("test_"):
+                method = getattr(instance, method_name)
+                try:
+                    method()
+                    print(f"  PASS: {test_class.__name__}.{method_name}")
+                    passed += 1
+                except AssertionError as e:
+                    print(f"  FAIL: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+                except Exception as e:
+                    print(f"  ERROR: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    if failed > 0:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
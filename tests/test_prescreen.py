@@ -0,0 +1,213 @@
+"""Tests for the 1m kline prescreen."""
+
+from __future__ import annotations
+
+import random
+import shutil
+import sys
+import tempfile
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from prescreen_klines import (  # noqa: E402
+    build_manifest,
+    load_klines,
+    screen_klines,
+    screen_threshold_pct,
+)
+
+from market_forensics.data.models import Trade
+from market_forensics.events.detector import detect_price_shocks, detect_price_shocks_from_config
+
+BASE_MS = 1711584000000  # 2024-03-28 00:00:00 UTC
+MINUTE_MS = 60_000
+CONFIG = {"event_detection": {"price_shock_threshold_pct": 0.5, "rolling_window_seconds": 60}}
+ADAPTIVE_CONFIG = {
+    "event_detection": {
+        "price_shock_threshold_pct": 0.5,
+        "rolling_window_seconds": 60,
+        "adaptive_threshold": {
+            "vol_multiplier": 4,
+            "halflife_seconds": 300,
+            "min_threshold_pct": 0.1,
+        },
+    }
+}
+
+
+def _random_walk(seed: int, minutes: int, volatility: float) -> list:
+    """(timestamp_ms, price) ticks with a few jumps."""
+    rng = random.Random(seed)
+    ticks = []
+    price = 60000.0
+    ms = BASE_MS
+    while ms < BASE_MS + minutes * MINUTE_MS:
+        price *= 1 + rng.gauss(0, volatility)
+        if rng.random() < 0.002:
+            price *= 1 + rng.choice((-1, 1)) * 0.004
+        ticks.append((ms, price))
+        ms += rng.randint(200, 3000)
+    return ticks
+
+
+def _klines(ticks: list) -> list:
+    bars = {}
+    for ms, price in ticks:
+        open_ms = ms - ms % MINUTE_MS
+        high, low = bars.get(open_ms, (price, price))
+        bars[open_ms] = (max(high, price), min(low, price))
+    return [(open_ms, high, low) for open_ms, (high, low) in sorted(bars.items())]
+
+
+def _trades(ticks: list) -> list:
+    return [
+        Trade(
+            timestamp=datetime.fromtimestamp(ms / 1000, tz=timezone.utc),
+            symbol="BTCUSDT",
+            price=price,
+            size=1.0,
+            side="buy",
+        )
+        for ms, price in ticks
+    ]
+
+
+class TestScreenKlines:
+    """screen_klines never rules out a window that holds a shock."""
+
+    def test_every_shock_lies_in_a_candidate_window(self) -> None:
+        for seed in range(6):
+            ticks = _random_walk(seed, 240, 0.0001)
+            events = detect_price_shocks(_trades(ticks), 0.5, 60)
+            screen = screen_klines(_klines(ticks), 0.5, 60, margin=0.0)
+            for event in events:
+                ms = int(event.timestamp.timestamp() * 1000)
+                assert any(start <= ms < end for start, end in screen["windows"]), (seed, ms)
+            assert events, seed
+            # Only the minutes around the jumps are flagged
+            assert screen["candidate_minutes"] < 20, screen["candidate_minutes"]
+
+    def test_quiet_day_has_no_windows(self) -> None:
+        ticks = [(BASE_MS + i * 1000, 60000.0 + (i % 7)) for i in range(3600)]
+        screen = screen_klines(_klines(ticks), 0.5, 60)
+        assert screen["windows"] == []
+        assert screen["candidate_minutes"] == 0
+        assert 0 < screen["max_range_pct"] < 0.5
+
+    def test_windows_are_padded_and_merged(self) -> None:
+        bars = [(BASE_MS + i * MINUTE_MS, 100.0, 100.0) for i in range(30)]
+        bars[10] = (bars[10][0], 101.0, 100.0)
+        bars[12] = (bars[12][0], 101.0, 100.0)
+        screen = screen_klines(bars, 0.5, 60, pad_before_seconds=30, pad_after_seconds=30)
+        # Klines 10 to 13 each span a jump together with the kline before
+        # them; the padded windows overlap and merge into one
+        assert screen["candidate_minutes"] == 4
+        start = BASE_MS + 9 * MINUTE_MS - 30_000
+        assert screen["windows"] == [[start, BASE_MS + 14 * MINUTE_MS + 30_000]]
+
+    def test_gaps_do_not_join_distant_klines(self) -> None:
+        bars = [(BASE_MS, 101.0, 101.0), (BASE_MS + 10 * MINUTE_MS, 100.0, 100.0)]
+        assert screen_klines(bars, 0.5, 60)["windows"] == []
+        assert screen_klines(bars, 0.5, 600)["windows"] != []
+
+    def test_adaptive_threshold_screens_at_its_floor(self) -> None:
+        # A 0.3% move within 10s is below the fixed threshold but above the
+        # adaptive one, which is floored at min_threshold_pct
+        ticks = []
+        for i in range(3600):
+            move = 0.003 * min(max(i - 1790, 0), 10) / 10
+            ticks.append((BASE_MS + i * 1000, 60000.0 * (1 + 0.00001 * (i % 2) + move)))
+        events = detect_price_shocks_from_config(_trades(ticks), ADAPTIVE_CONFIG)
+        assert len(events) == 1
+        assert screen_klines(_klines(ticks), 0.5, 60)["windows"] == []
+
+        threshold = screen_threshold_pct(ADAPTIVE_CONFIG["event_detection"])
+        assert threshold == 0.1
+        screen = screen_klines(_klines(ticks), threshold, 60)
+        ms = int(events[0].timestamp.timestamp() * 1000)
+        assert any(start <= ms < end for start, end in screen["windows"])
+
+    def test_fixed_threshold_is_the_floor_while_warming_up(self) -> None:
+        event_config = dict(ADAPTIVE_CONFIG["event_detection"], price_shock_threshold_pct=0.05)
+        assert screen_threshold_pct(event_config) == 0.05
+        assert screen_threshold_pct(CONFIG["event_detection"]) == 0.5
+
+
+class TestManifest:
+    """Kline archives load and results become a dates manifest."""
+
+    def test_load_klines_with_and_without_header(self) -> None:
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            rows = [f"{BASE_MS + i * MINUTE_MS},1,{2 + i},{0.5 + i},1,10,0" for i in range(3)]
+            header = "open_time,open,high,low,close,volume,close_time"
+            for name, lines in (("a", [header] + rows), ("b", rows[::-1])):
+                with zipfile.ZipFile(temp_dir / f"{name}.zip", "w") as zf:
+                    zf.writestr(f"{name}.csv", "\n".join(lines) + "\n")
+            expected = [(BASE_MS + i * MINUTE_MS, 2.0 + i, 0.5 + i) for i in range(3)]
+            assert load_klines(temp_dir / "a.zip") == expected
+            assert load_klines(temp_dir / "b.zip") == expected
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_build_manifest_keeps_candidate_and_unscreened_days(self) -> None:
+        days = [
+            {"symbol": "ETHUSDT", "date": "2024-03-02", "status": "quiet", "windows": []},
+            {"symbol": "BTCUSDT", "date": "2024-03-02", "status": "missing"},
+            {"symbol": "BTCUSDT", "date": "2024-03-01", "status": "candidate",
+             "windows": [[BASE_MS, BASE_MS + MINUTE_MS]]},
+        ]
+        manifest = build_manifest(days, CONFIG, 0.1)
+        assert manifest["BTCUSDT"] == ["2024-03-01", "2024-03-02"]
+        assert "ETHUSDT" not in manifest
+        assert manifest["prescreen"]["unscreened"] == {"BTCUSDT": ["2024-03-02"]}
+        assert manifest["prescreen"]["screened"] == 2
+        assert manifest["prescreen"]["threshold_pct"] == 0.5
+        assert manifest["candidates"]["BTCUSDT"]["2024-03-01"] == [
+            ["2024-03-28T00:00:00+00:00", "2024-03-28T00:01:00+00:00"]
+        ]
+
+    def test_build_manifest_records_the_adaptive_floor(self) -> None:
+        manifest = build_manifest([], ADAPTIVE_CONFIG, 0.1)
+        assert manifest["prescreen"]["threshold_pct"] == 0.1
+
+
+def run_all_tests() -> None:
+    """Run all tests and print results.
+
+    This can be run standalone: python -m tests.test_prescreen
+    """
+    test_classes = [
+        TestScreenKlines,
+        TestManifest,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_class in test_classes:
+        instance = test_class()
+        for method_name in dir(instance):
+            if method_name.startswith("test_"):
+                method = getattr(instance, method_name)
+                try:
+                    method()
+                    print(f"  PASS: {test_class.__name__}.{method_name}")
+                    passed += 1
+                except AssertionError as e:
+                    print(f"  FAIL: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+                except Exception as e:
+                    print(f"  ERROR: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    if failed > 0:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
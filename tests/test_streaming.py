@@ -0,0 +1,186 @@
+"""Tests for streaming chunked loaders.
+
+Concatenated chunks must match the whole-file loaders, including when the
+file is out of order and the external merge sort is used.
+"""
+
+from __future__ import annotations
+
+import random
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from market_forensics.data.columnar import TobTable, TradeTable
+from market_forensics.data.loaders import (
+    DataLoadError,
+    iter_tob,
+    iter_trades,
+    load_tob_table,
+    load_trade_table_csv,
+)
+
+SAMPLE_DIR = Path(__file__).parent.parent / "data" / "sample"
+BASE_TIME = datetime(2024, 3, 28, tzinfo=timezone.utc)
+
+
+def _write_trades(path: Path, offsets_ms: list) -> None:
+    """Write a trades CSV with one row per offset (milliseconds from BASE_TIME)."""
+    symbols = ["BTCUSDT", "ETHUSDT"]
+    lines = ["timestamp,symbol,price,size,side,trade_id"]
+    for i, ms in enumerate(offsets_ms):
+        ts = (BASE_TIME + timedelta(milliseconds=ms)).isoformat()
+        side = "buy" if i % 2 else "sell"
+        lines.append(f"{ts},{symbols[i % 7 == 0]},{100 + i % 13},{0.1 + i % 3},{side},{i}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _rows(table) -> list:
+    return table.to_records()
+
+
+class TestIterChunks:
+    """Tests for iter_trades / iter_tob."""
+
+    def test_sorted_file_streams_in_chunks(self) -> None:
+        """A sorted file streams as bounded chunks equal to the full load."""
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, list(range(0, 5000, 10)))
+        try:
+            chunks = list(iter_trades(path, chunk_rows=64))
+            assert all(len(c) <= 64 for c in chunks)
+            assert len(chunks) == 8
+            expected = load_trade_table_csv(path, use_cache=False)
+            assert _rows(TradeTable.concat(chunks)) == _rows(expected)
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_disorder_uses_external_sort(self) -> None:
+        """Out-of-order rows, including across chunk boundaries, are merged stably."""
+        rng = random.Random(3)
+        # Rows jitter by up to 50ms around a rising clock; ties are common
+        offsets = [i * 10 + rng.randrange(-50, 50) // 10 * 10 for i in range(700)]
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, [max(ms, 0) for ms in offsets])
+        try:
+            chunks = list(iter_trades(path, chunk_rows=50, spill_dir=temp_dir))
+            assert all(len(c) <= 50 for c in chunks)
+            combined = TradeTable.concat(chunks)
+            assert combined.is_sorted()
+            expected = load_trade_table_csv(path, use_cache=False)
+            assert _rows(combined) == _rows(expected)
+            assert list(combined.trade_ids) == list(expected.trade_ids)
+            assert sorted(p.name for p in temp_dir.iterdir()) == ["trades.csv"]
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_many_runs_hold_no_open_files(self) -> None:
+        """Hundreds of spilled runs merge under a small open-file limit."""
+        try:
+            import resource
+        except ImportError:
+            return
+        rng = random.Random(5)
+        offsets = [i * 10 + rng.randrange(0, 100) for i in range(2000)]
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, offsets)
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        try:
+            expected = load_trade_table_csv(path, use_cache=False)
+            # 400 runs of 5 rows, each with five typed columns and trade ids
+            resource.setrlimit(resource.RLIMIT_NOFILE, (min(64, hard), hard))
+            chunks = list(iter_trades(path, chunk_rows=5, spill_dir=temp_dir))
+            resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+            combined = TradeTable.concat(chunks)
+            assert _rows(combined) == _rows(expected)
+            assert list(combined.trade_ids) == list(expected.trade_ids)
+        finally:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+            shutil.rmtree(temp_dir)
+
+    def test_disorder_behind_yielded_rows_raises(self) -> None:
+        """A row older than already-yielded chunks is an error."""
+        offsets = list(range(0, 3000, 10)) + [5]
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, offsets)
+        try:
+            list(iter_trades(path, chunk_rows=40))
+            raised = False
+        except DataLoadError as e:
+            raised = True
+            assert "out of order" in str(e)
+        finally:
+            shutil.rmtree(temp_dir)
+        assert raised, "Expected DataLoadError for unrecoverable disorder"
+
+    def test_sample_tob_and_jsonl(self) -> None:
+        """Sample top-of-book streams to the same rows as load_tob_table."""
+        chunks = list(iter_tob(SAMPLE_DIR / "tob.csv", chunk_rows=7))
+        expected = load_tob_table(SAMPLE_DIR / "tob.csv")
+        assert _rows(TobTable.concat(chunks)) == _rows(expected)
+
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "tob.jsonl"
+        path.write_text("".join(
+            '{"timestamp": "%s", "symbol": "BTC-USDT", "bid_price": 99.9, '
+            '"bid_size": 1.0, "ask_price": 100.1, "ask_size": 1.0}\n'
+            % (BASE_TIME + timedelta(seconds=i)).isoformat()
+            for i in range(10)
+        ))
+        try:
+            chunks = list(iter_tob(path, chunk_rows=4))
+            assert [len(c) for c in chunks] == [4, 4, 2]
+            assert _rows(TobTable.concat(chunks)) == _rows(load_tob_table(path))
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_missing_file(self) -> None:
+        """Missing files raise DataLoadError on first use."""
+        try:
+            next(iter_trades("/nonexistent/trades.csv"))
+            raised = False
+        except DataLoadError:
+            raised = True
+        assert raised, "Expected DataLoadError for missing file"
+
+
+def run_all_tests() -> None:
+    """Run all tests and print results.
+
+    This can be run standalone: python -m tests.test_streaming
+    """
+    test_classes = [
+        TestIterChunks,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_class in test_classes:
+        instance = test_class()
+        for method_name in dir(instance):
+            if method_name.startswith("test_"):
+                method = getattr(instance, method_name)
+                try:
+                    method()
+                    print(f"  PASS: {test_class.__name__}.{method_name}")
+                    passed += 1
+                except AssertionError as e:
+                    print(f"  FAIL: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+                except Exception as e:
+                    print(f"  ERROR: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    if failed > 0:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
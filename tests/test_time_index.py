@@ -0,0 +1,257 @@
+"""Tests for the byte-offset time index and range loaders."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from market_forensics.data.cache import cache_dir_for
+from market_forensics.data.loaders import DataLoadError, load_trade_table_csv
+from market_forensics.data.time_index import (
+    INDEX_NAME,
+    load_time_index,
+    load_tob_range,
+    load_tob_tail,
+    load_trades_range,
+    load_trades_ranges,
+    load_trades_tail,
+)
+
+SAMPLE_DIR = Path(__file__).parent.parent / "data" / "sample"
+BASE_TIME = datetime(2024, 3, 28, tzinfo=timezone.utc)
+
+
+def _write_trades(path: Path, n: int, bad_row: int = -1, swap: int = -1) -> None:
+    """Write n trades; every three consecutive rows share a timestamp."""
+    lines = ["timestamp,symbol,price,size,side,trade_id"]
+    for i in range(n):
+        ts = (BASE_TIME + timedelta(milliseconds=10 * (i // 3))).isoformat()
+        price = -1.0 if i == bad_row else 100.0 + i % 7
+        lines.append(f"{ts},BTCUSDT,{price},0.5,buy,{1000 + i}")
+        if i == 0:
+            lines.append("")
+    if swap >= 0:
+        lines[swap + 1], lines[swap + 40] = lines[swap + 40], lines[swap + 1]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _ms(n: int) -> datetime:
+    return BASE_TIME + timedelta(milliseconds=n)
+
+
+def _expected(path: Path, start: datetime, end: datetime) -> list:
+    table = load_trade_table_csv(path, use_cache=False)
+    return [r for r in table.to_records() if start <= r.timestamp < end]
+
+
+class TestTradesRange:
+    """Range loads match filtering a full load."""
+
+    def test_ranges_match_full_load(self) -> None:
+        """Ranges starting and ending on tied timestamps keep every tied row."""
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, 500)
+        try:
+            index = load_time_index(path, stride=16)
+            assert index.rows == 500 and index.is_sorted
+            for start_ms, end_ms in [(0, 10), (50, 60), (530, 1200), (1600, 5000), (9000, 9999)]:
+                start = BASE_TIME + timedelta(milliseconds=start_ms)
+                end = BASE_TIME + timedelta(milliseconds=end_ms)
+                actual = load_trades_range(path, start, end)
+                assert actual.to_records() == _expected(path, start, end), (start_ms, end_ms)
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_multiple_ranges(self) -> None:
+        """Overlapping ranges are merged and every row is loaded once."""
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, 500)
+        try:
+            load_time_index(path, stride=16)
+            ranges = [(_ms(900), _ms(1200)), (_ms(50), _ms(300)), (_ms(250), _ms(400))]
+            actual = load_trades_ranges(path, ranges)
+            expected = _expected(path, _ms(50), _ms(400)) + _expected(path, _ms(900), _ms(1200))
+            assert actual.to_records() == expected
+            assert len(load_trades_ranges(path, [])) == 0
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_unsorted_file_falls_back(self) -> None:
+        """Unsorted files are indexed as such and loaded in full."""
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, 300, swap=100)
+        try:
+            assert not load_time_index(path, stride=16).is_sorted
+            start = BASE_TIME + timedelta(milliseconds=300)
+            end = BASE_TIME + timedelta(milliseconds=700)
+            actual = load_trades_range(path, start, end)
+            assert actual.to_records() == _expected(path, start, end)
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_errors_report_file_row(self) -> None:
+        """Invalid rows in range are reported with their row in the whole file."""
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, 400, bad_row=350)
+        try:
+            load_time_index(path, stride=16)
+            start = BASE_TIME + timedelta(milliseconds=1150)
+            load_trades_range(path, start, start + timedelta(seconds=1))
+            raised = False
+        except DataLoadError as e:
+            raised = True
+            # Blank lines are not counted, as in the full loader
+            assert "row 352" in str(e), str(e)
+        finally:
+            shutil.rmtree(temp_dir)
+        assert raised, "Expected DataLoadError for negative price"
+
+    def test_missing_file(self) -> None:
+        """A missing file raises DataLoadError."""
+        try:
+            load_trades_range(Path("/nonexistent/trades.csv"), BASE_TIME, BASE_TIME)
+            raised = False
+        except DataLoadError:
+            raised = True
+        assert raised
+
+
+class TestIndexCache:
+    """The index is persisted and rebuilt when the file changes."""
+
+    def test_index_invalidated_on_change(self) -> None:
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, 100)
+        try:
+            load_time_index(path, stride=16)
+            assert (cache_dir_for(path) / INDEX_NAME).exists()
+            assert load_time_index(path).stride == 16
+            _write_trades(path, 120)
+            os.utime(path, ns=(0, 0))
+            index = load_time_index(path, stride=32)
+            assert index.stride == 32 and index.rows == 120
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_sample_tob_range(self) -> None:
+        """Top-of-book ranges work on the sample data."""
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "tob.csv"
+        shutil.copy(SAMPLE_DIR / "tob.csv", path)
+        try:
+            full = load_tob_range(path, datetime.min, datetime.max).to_records()
+            start, end = full[len(full) // 3].timestamp, full[len(full) // 2].timestamp
+            actual = load_tob_range(path, start, end).to_records()
+            assert actual == [r for r in full if start <= r.timestamp < end]
+            assert actual
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class TestTail:
+    """Tail loads read backwards from the end and match filtering a full load."""
+
+    def test_tail_matches_full_load(self) -> None:
+        """Every start and block size gives the rows from start to the end."""
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, 500)
+        try:
+            for start_ms in [-10, 0, 5, 10, 800, 1650, 1655, 1660, 5000]:
+                start = _ms(start_ms)
+                expected = _expected(path, start, datetime.max.replace(tzinfo=timezone.utc))
+                for block_bytes in [1, 7, 64, 1 << 16]:
+                    actual = load_trades_tail(path, start, block_bytes=block_bytes, use_cache=False)
+                    assert actual.to_records() == expected, (start_ms, block_bytes)
+            assert not (cache_dir_for(path) / INDEX_NAME).exists()
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_crlf_and_unterminated_last_line(self) -> None:
+        """CRLF line endings and a missing final newline are handled."""
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, 60)
+        try:
+            path.write_bytes(path.read_bytes().replace(b"\n", b"\r\n").rstrip())
+            start = _ms(150)
+            expected = _expected(path, start, _ms(10_000))
+            assert len(expected) == 15
+            for block_bytes in [5, 1 << 16]:
+                actual = load_trades_tail(path, start, block_bytes=block_bytes, use_cache=False)
+                assert actual.to_records() == expected
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_unsorted_tail_falls_back(self) -> None:
+        """A tail that is out of order is served from a full load."""
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "trades.csv"
+        _write_trades(path, 300, swap=250)
+        try:
+            start = _ms(700)
+            actual = load_trades_tail(path, start, block_bytes=256, use_cache=False)
+            assert actual.to_records() == _expected(path, start, _ms(10_000))
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_sample_tob_tail(self) -> None:
+        """Top-of-book tails work on the sample data."""
+        temp_dir = Path(tempfile.mkdtemp())
+        path = temp_dir / "tob.csv"
+        shutil.copy(SAMPLE_DIR / "tob.csv", path)
+        try:
+            full = load_tob_range(path, datetime.min, datetime.max).to_records()
+            start = full[len(full) // 2].timestamp
+            actual = load_tob_tail(path, start, block_bytes=128).to_records()
+            assert actual == [r for r in full if start <= r.timestamp]
+            assert actual
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+def run_all_tests() -> None:
+    """Run all tests and print results.
+
+    This can be run standalone: python -m tests.test_time_index
+    """
+    test_classes = [
+        TestTradesRange,
+        TestIndexCache,
+        TestTail,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_class in test_classes:
+        instance = test_class()
+        for method_name in dir(instance):
+            if method_name.startswith("test_"):
+                method = getattr(instance, method_name)
+                try:
+                    method()
+                    print(f"  PASS: {test_class.__name__}.{method_name}")
+                    passed += 1
+                except AssertionError as e:
+                    print(f"  FAIL: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+                except Exception as e:
+                    print(f"  ERROR: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    if failed > 0:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,182 @@
+"""Tests for bulk timestamp parsing.
+
+The bulk parser must agree exactly with the per-row loader parser and
+decline (return None) rather than guess on anything outside its layouts.
+"""
+
+from __future__ import annotations
+
+import random
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from market_forensics.data.columnar import datetime_to_ns
+from market_forensics.data.loaders import (
+    DataLoadError,
+    _parse_timestamp,
+    load_trade_table_csv,
+)
+from market_forensics.data.timestamps import IsoLayout, parse_timestamp_column
+
+
+def _reference_ns(values: list) -> list:
+    return [datetime_to_ns(_parse_timestamp(v)) for v in values]
+
+
+class TestParseTimestampColumn:
+    """Tests for parse_timestamp_column against the row parser."""
+
+    def test_canonical_layouts_match_row_parser(self) -> None:
+        """Every recognized ISO layout gives the row parser's nanoseconds."""
+        rng = random.Random(7)
+        base = datetime(2023, 12, 30, tzinfo=timezone.utc)
+        stamps = [
+            base + timedelta(microseconds=rng.randrange(0, 5 * 86_400 * 10**6))
+            for _ in range(500)
+        ]
+        formats = [
+            lambda dt: dt.isoformat(timespec="microseconds"),
+            lambda dt: dt.isoformat(timespec="milliseconds"),
+            lambda dt: dt.isoformat(timespec="seconds"),
+            lambda dt: dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            lambda dt: dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        ]
+        for fmt in formats:
+            values = [fmt(dt) for dt in stamps]
+            assert IsoLayout.detect(values) is not None, values[0]
+            assert list(parse_timestamp_column(values)) == _reference_ns(values)
+
+    def test_isoformat_drops_zero_fraction(self) -> None:
+        """Whole-second rows written by isoformat() mix with fractional rows."""
+        values = [
+            "2024-03-28T00:00:12+00:00",
+            "2024-03-28T00:00:12.001000+00:00",
+            "2024-03-28T00:00:13+00:00",
+        ]
+        assert IsoLayout.detect(values).fraction_digits == 6
+        assert list(parse_timestamp_column(values)) == _reference_ns(values)
+
+    def test_leap_day(self) -> None:
+        """Leap days convert; impossible dates are declined."""
+        values = ["2024-02-29T12:00:00+00:00"]
+        assert list(parse_timestamp_column(values)) == _reference_ns(values)
+        assert parse_timestamp_column(["2023-02-29T12:00:00+00:00"]) is None
+
+    def test_epoch_milliseconds_and_seconds(self) -> None:
+        """Integer epochs follow the row parser's milliseconds heuristic."""
+        values = ["1711584000123", "1711584000999", "1711584001000"]
+        assert list(parse_timestamp_column(values)) == _reference_ns(values)
+        seconds = ["1711584000", "0"]
+        assert list(parse_timestamp_column(seconds)) == _reference_ns(seconds)
+
+    def test_basic_iso_dates_are_not_epochs(self) -> None:
+        """All-digit values the row parser reads as dates fall back to it."""
+        assert _parse_timestamp("20240328") == datetime(2024, 3, 28, tzinfo=timezone.utc)
+        assert parse_timestamp_column(["20240328"]) is None
+        assert parse_timestamp_column(["1711584000", "20240328"]) is None
+        assert parse_timestamp_column(["2024032812"]) is not None
+        assert parse_timestamp_column(["20240328123"]) is None
+
+    def test_date_like_epoch_milliseconds(self) -> None:
+        """Epoch milliseconds that fromisoformat would accept stay epochs."""
+        values = ["1712031500000", "1712031500001"]
+        expected = datetime(2024, 4, 2, 4, 18, 20, tzinfo=timezone.utc)
+        assert _parse_timestamp(values[0]) == expected
+        assert list(parse_timestamp_column(values)) == _reference_ns(values)
+
+    def test_declines_other_inputs(self) -> None:
+        """Mixed, offset, malformed or fractional inputs fall back."""
+        assert parse_timestamp_column([
+            "2024-01-15T10:00:00+00:00", "2024-01-15T10:00:00Z",
+        ]) is None
+        assert parse_timestamp_column(["2024-01-15T10:00:00+01:00"]) is None
+        assert parse_timestamp_column(["2024-01-15T10:00:00+00:00x"]) is None
+        assert parse_timestamp_column(["2024-01-15T10:0a:00+00:00"]) is None
+        assert parse_timestamp_column(["2024-01-15T24:00:00+00:00"]) is None
+        assert parse_timestamp_column(["1711584000.5"]) is None
+        assert parse_timestamp_column(["1711584000", "abc"]) is None
+        assert list(parse_timestamp_column([])) == []
+
+
+class TestLoaderTimestamps:
+    """Loader behaviour is unchanged by the bulk path."""
+
+    def test_error_order_is_preserved(self) -> None:
+        """A bad timestamp before a bad price is reported first."""
+        temp_dir = tempfile.mkdtemp()
+        path = Path(temp_dir) / "trades.csv"
+        path.write_text(
+            "timestamp,symbol,price,size,side\n"
+            "2024-01-15T10:00:00+00:00,BTC-USDT,100.0,1.0,buy\n"
+            "not-a-time,BTC-USDT,100.0,1.0,buy\n"
+            "2024-01-15T10:00:02+00:00,BTC-USDT,-1.0,1.0,buy\n"
+        )
+        try:
+            load_trade_table_csv(path, use_cache=False)
+            raised = False
+        except DataLoadError as e:
+            raised = True
+            assert "Cannot parse timestamp: not-a-time" in str(e)
+        finally:
+            shutil.rmtree(temp_dir)
+        assert raised, "Expected DataLoadError for bad timestamp"
+
+    def test_mixed_formats_fall_back(self) -> None:
+        """Files mixing timestamp formats still load row by row."""
+        temp_dir = tempfile.mkdtemp()
+        path = Path(temp_dir) / "trades.csv"
+        path.write_text(
+            "timestamp,symbol,price,size,side\n"
+            "2024-01-15T10:00:00Z,BTC-USDT,100.0,1.0,buy\n"
+            "1705312801000,BTC-USDT,101.0,1.0,sell\n"
+            "2024-01-15T10:00:02.500+00:00,BTC-USDT,102.0,1.0,buy\n"
+        )
+        try:
+            table = load_trade_table_csv(path, use_cache=False)
+        finally:
+            shutil.rmtree(temp_dir)
+        assert [table.timestamp_at(i).isoformat() for i in range(3)] == [
+            "2024-01-15T10:00:00+00:00",
+            "2024-01-15T10:00:01+00:00",
+            "2024-01-15T10:00:02.500000+00:00",
+        ]
+
+
+def run_all_tests() -> None:
+    """Run all tests and print results.
+
+    This can be run standalone: python -m tests.test_timestamps
+    """
+    test_classes = [
+        TestParseTimestampColumn,
+        TestLoaderTimestamps,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_class in test_classes:
+        instance = test_class()
+        for method_name in dir(instance):
+            if method_name.startswith("test_"):
+                method = getattr(instance, method_name)
+                try:
+                    method()
+                    print(f"  PASS: {test_class.__name__}.{method_name}")
+                    passed += 1
+                except AssertionError as e:
+                    print(f"  FAIL: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+                except Exception as e:
+                    print(f"  ERROR: {test_class.__name__}.{method_name} - {e}")
+                    failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    if failed > 0:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -11,6 +11,7 @@ from typing import List
 import tempfile
 import shutil
 
+from market_forensics.data.columnar import TobTable, TradeTable
 from market_forensics.data.models import (
     Event,
     EventDirection,
@@ -21,6 +22,7 @@ from market_forensics.data.models import (
 from market_forensics.windows.extractor import (
     EventWindow,
     WindowError,
+    event_intervals,
     extract_window,
     extract_windows,
     extract_windows_from_config,
@@ -282,6 +284,23 @@ class TestExtractWindowsOverlap:
         assert len(result) == 1, "Expected only first event (overlapping skipped)"
         assert result[0].event.timestamp == base_time
 
+    def test_overlap_is_per_symbol(self) -> None:
+        """An event only hides later events of its own symbol."""
+        base_time = datetime(2024, 1, 15, 10, 5, 0, tzinfo=timezone.utc)
+        events = [
+            _make_event(base_time + timedelta(seconds=30), symbol="ETH-USDT"),
+            _make_event(base_time, symbol="ETH-USDT"),
+            _make_event(base_time, symbol="BTC-USDT"),
+            _make_event(base_time + timedelta(seconds=30), symbol="BTC-USDT"),
+        ]
+
+        result = extract_windows(events, [], [], pre_seconds=60, post_seconds=60)
+
+        assert [(w.event.timestamp, w.event.symbol) for w in result] == [
+            (base_time, "BTC-USDT"),
+            (base_time, "ETH-USDT"),
+        ]
+
     def test_non_overlapping_events_all_kept(self) -> None:
         """Non-overlapping events should all produce windows."""
         base_time = datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
@@ -435,6 +454,93 @@ class TestSaveWindow:
             shutil.rmtree(temp_dir)
 
 
+class TestExtractWindowsIndexed:
+    """Tests for index-based extraction over lists and tables."""
+
+    def _mixed_symbol_data(self):
+        base_time = datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+        trades, tob = [], []
+        for i in range(120):
+            ts = base_time + timedelta(seconds=i * 5)
+            symbol = "BTC-USDT" if i % 3 else "ETH-USDT"
+            trades.append(_make_trade(ts, 100.0 + i * 0.1, symbol=symbol))
+            tob.append(_make_tob(ts, 100.0 + i * 0.1, symbol=symbol))
+        events = [
+            _make_event(base_time + timedelta(seconds=100)),
+            _make_event(base_time + timedelta(seconds=200), symbol="ETH-USDT"),
+            _make_event(base_time + timedelta(seconds=400)),
+        ]
+        return events, trades, tob
+
+    def test_tables_match_lists_with_mixed_symbols(self) -> None:
+        """Windows from tables hold the same rows as windows from lists."""
+        events, trades, tob = self._mixed_symbol_data()
+        list_windows = extract_windows(events, trades, tob, 60, 60)
+        table_windows = extract_windows(
+            events, TradeTable.from_records(trades), TobTable.from_records(tob), 60, 60
+        )
+        assert len(list_windows) == len(table_windows) == 3
+        for lw, tw in zip(list_windows, table_windows):
+            assert tw.pre_trades.to_records() == lw.pre_trades
+            assert tw.post_trades.to_records() == lw.post_trades
+            assert tw.pre_tob.to_records() == lw.pre_tob
+            assert tw.post_tob.to_records() == lw.post_tob
+            assert all(t.symbol == lw.event.symbol for t in lw.pre_trades + lw.post_trades)
+
+    def test_unknown_symbol_gives_empty_window(self) -> None:
+        """An event for a symbol absent from the data gets empty windows."""
+        events, trades, tob = self._mixed_symbol_data()
+        event = _make_event(events[0].timestamp, symbol="SOL-USDT")
+        window = extract_window(event, TradeTable.from_records(trades), tob, 60, 60)
+        assert len(window.pre_trades) == 0 and len(window.post_trades) == 0
+        assert window.pre_tob == [] and window.post_tob == []
+
+    def test_unsorted_input_still_extracted(self) -> None:
+        """Out-of-order input is sorted per symbol before indexing."""
+        events, trades, tob = self._mixed_symbol_data()
+        expected = extract_window(events[0], trades, tob, 60, 60)
+        window = extract_window(events[0], list(reversed(trades)), tob, 60, 60)
+        assert window.pre_trades == expected.pre_trades
+        assert window.post_trades == expected.post_trades
+
+
+class TestEventIntervals:
+    """Tests for the time intervals needed by event windows."""
+
+    def test_overlapping_intervals_merged(self) -> None:
+        base_time = datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+        events = [
+            _make_event(base_time + timedelta(seconds=500)),
+            _make_event(base_time),
+            _make_event(base_time + timedelta(seconds=90)),
+        ]
+        intervals = event_intervals(events, 60, 60)
+        assert intervals == [
+            (base_time - timedelta(seconds=60), base_time + timedelta(seconds=150)),
+            (base_time + timedelta(seconds=440), base_time + timedelta(seconds=560)),
+        ]
+
+    def test_interval_data_gives_same_windows(self) -> None:
+        """Windows from only the interval trades equal windows from all trades."""
+        events, trades, tob = TestExtractWindowsIndexed()._mixed_symbol_data()
+        intervals = event_intervals(events, 60, 60)
+        needed = [t for t in trades if any(a <= t.timestamp < b for a, b in intervals)]
+        assert len(needed) < len(trades)
+        expected = extract_windows(events, trades, tob, 60, 60)
+        actual = extract_windows(events, needed, tob, 60, 60)
+        for ew, aw in zip(expected, actual):
+            assert aw.pre_trades == ew.pre_trades
+            assert aw.post_trades == ew.post_trades
+
+    def test_negative_seconds_raises_error(self) -> None:
+        try:
+            event_intervals([], -1, 60)
+            raised = False
+        except WindowError:
+            raised = True
+        assert raised
+
+
 def run_all_tests() -> None:
     """Run all tests and print results.
 
@@ -446,6 +552,8 @@ def run_all_tests() -> None:
         TestExtractWindowsOverlap,
         TestExtractWindowsFromConfig,
         TestSaveWindow,
+        TestExtractWindowsIndexed,
+        TestEventIntervals,
     ]
 
     passed = 0